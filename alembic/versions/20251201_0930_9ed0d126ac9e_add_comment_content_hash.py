@@ -0,0 +1,105 @@
+"""Add comment content hash and natural-key unique index
+
+Revision ID: 9ed0d126ac9e
+Revises: b3d3384be058
+Create Date: 2025-12-01 09:30:12.418203
+
+Adds comments.external_id (platform comment id, e.g. Apify pk) and
+comments.content_hash, backfills the hash for existing rows, removes
+duplicates the old per-record dedup let through, makes the hash NOT NULL
+and adds a unique constraint on (post_id, content_hash) so ingestion can
+dedup with a single index probe / INSERT ... ON CONFLICT. Records carrying
+a platform id are matched on (post_id, external_id) first, so that pair
+gets an index too.
+
+"""
+import hashlib
+from datetime import timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9ed0d126ac9e'
+down_revision: Union[str, None] = 'b3d3384be058'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _content_hash(author_name, text, created_at) -> str:
+    """
+    Frozen copy of et_intel_core.models.comment.compute_content_hash.
+
+    The hash never includes the platform id, so rows backfilled here match
+    re-ingested records whether or not those carry one.
+    """
+    if created_at is not None and created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    key = "\x1f".join([
+        author_name or "",
+        text or "",
+        created_at.isoformat() if created_at else "",
+    ])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column('comments', sa.Column('external_id', sa.String(), nullable=True))
+    op.add_column('comments', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    bind = op.get_bind()
+
+    # Backfill in keyset-paginated batches so large tables don't load at once
+    last_id = None
+    while True:
+        query = "SELECT id, author_name, text, created_at FROM comments"
+        params = {"limit": BACKFILL_BATCH_SIZE}
+        if last_id is not None:
+            query += " WHERE id > :last_id"
+            params["last_id"] = last_id
+        query += " ORDER BY id LIMIT :limit"
+        rows = bind.execute(sa.text(query), params).fetchall()
+        if not rows:
+            break
+        bind.execute(
+            sa.text("UPDATE comments SET content_hash = :content_hash WHERE id = :id"),
+            [
+                {"id": row.id, "content_hash": _content_hash(row.author_name, row.text, row.created_at)}
+                for row in rows
+            ]
+        )
+        last_id = rows[-1].id
+
+    # Collapse duplicates: keep the most-liked copy, drop dependents of the rest
+    duplicates = sa.text("""
+        SELECT id FROM (
+            SELECT id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY post_id, content_hash
+                       ORDER BY likes DESC, id
+                   ) AS rn
+            FROM comments
+        ) ranked
+        WHERE rn > 1
+    """)
+    duplicate_ids = [{"id": row.id} for row in bind.execute(duplicates)]
+    if duplicate_ids:
+        bind.execute(sa.text("UPDATE comments SET parent_id = NULL WHERE parent_id = :id"), duplicate_ids)
+        bind.execute(sa.text("DELETE FROM extracted_signals WHERE comment_id = :id"), duplicate_ids)
+        bind.execute(sa.text("DELETE FROM review_queue WHERE comment_id = :id"), duplicate_ids)
+        bind.execute(sa.text("DELETE FROM comments WHERE id = :id"), duplicate_ids)
+
+    op.alter_column('comments', 'content_hash', existing_type=sa.String(length=64), nullable=False)
+    op.create_unique_constraint('uq_comment_content_hash', 'comments', ['post_id', 'content_hash'])
+    op.create_index('ix_comments_post_external_id', 'comments', ['post_id', 'external_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_post_external_id', table_name='comments')
+    op.drop_constraint('uq_comment_content_hash', 'comments', type_='unique')
+    op.drop_column('comments', 'content_hash')
+    op.drop_column('comments', 'external_id')
@@ -0,0 +1,38 @@
+"""Add enrichment_claims table for multi-process enrichment workers
+
+Revision ID: 5c2e8f1a7d43
+Revises: 9ed0d126ac9e
+Create Date: 2025-12-03 10:15:41.207319
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e8f1a7d43'
+down_revision: Union[str, None] = '9ed0d126ac9e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('enrichment_claims',
+    sa.Column('comment_id', sa.UUID(), nullable=False),
+    sa.Column('worker_id', sa.String(), nullable=False),
+    sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['comment_id'], ['comments.id'], ),
+    sa.PrimaryKeyConstraint('comment_id')
+    )
+    op.create_index('ix_enrichment_claims_worker', 'enrichment_claims', ['worker_id'], unique=False)
+    op.create_index('ix_enrichment_claims_expires', 'enrichment_claims', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_enrichment_claims_expires', table_name='enrichment_claims')
+    op.drop_index('ix_enrichment_claims_worker', table_name='enrichment_claims')
+    op.drop_table('enrichment_claims')
@@ -0,0 +1,43 @@
+"""Add comment_enrichments and catalog_versions for stale-only re-enrichment
+
+Revision ID: 7a1d4c9e2b56
+Revises: 5c2e8f1a7d43
+Create Date: 2025-12-04 09:00:12.583104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a1d4c9e2b56'
+down_revision: Union[str, None] = '5c2e8f1a7d43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('comment_enrichments',
+    sa.Column('comment_id', sa.UUID(), nullable=False),
+    sa.Column('pipeline_version', sa.String(), nullable=False),
+    sa.Column('catalog_version', sa.String(length=32), nullable=False),
+    sa.Column('enriched_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['comment_id'], ['comments.id'], ),
+    sa.PrimaryKeyConstraint('comment_id')
+    )
+    op.create_index('ix_comment_enrichments_versions', 'comment_enrichments', ['pipeline_version', 'catalog_version'], unique=False)
+    op.create_table('catalog_versions',
+    sa.Column('version', sa.String(length=32), nullable=False),
+    sa.Column('entity_fingerprints', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('version')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('catalog_versions')
+    op.drop_index('ix_comment_enrichments_versions', table_name='comment_enrichments')
+    op.drop_table('comment_enrichments')
@@ -0,0 +1,42 @@
+"""Add pg_trgm GIN index on comments.text
+
+Revision ID: 3b8e6f0d9a21
+Revises: 7a1d4c9e2b56
+Create Date: 2025-12-05 11:00:37.904412
+
+Lets substring lookups on comment text (``text ILIKE '%alias%'``) use an
+index: targeted entity backfills and discovered-entity mention counts no
+longer scan the whole comments table. PostgreSQL only; other dialects
+(SQLite in tests) are left unchanged.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e6f0d9a21'
+down_revision: Union[str, None] = '7a1d4c9e2b56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_comments_text_trgm',
+        'comments',
+        ['text'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'text': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_comments_text_trgm', table_name='comments')
@@ -0,0 +1,51 @@
+"""Add discovered_entity_mentions link table
+
+Revision ID: 9c4f2a7e1d38
+Revises: 3b8e6f0d9a21
+Create Date: 2025-12-06 10:00:41.276530
+
+Enrichment records which comments mentioned each discovered entity, so
+reports no longer search comment text per name. Comments enriched before
+this migration are linked once here by the same case-insensitive substring
+match the reports used (served by the pg_trgm index on PostgreSQL).
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4f2a7e1d38'
+down_revision: Union[str, None] = '3b8e6f0d9a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('discovered_entity_mentions',
+    sa.Column('discovered_entity_id', sa.UUID(), nullable=False),
+    sa.Column('comment_id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['comment_id'], ['comments.id'], ),
+    sa.ForeignKeyConstraint(['discovered_entity_id'], ['discovered_entities.id'], ),
+    sa.PrimaryKeyConstraint('discovered_entity_id', 'comment_id')
+    )
+    op.create_index('ix_discovered_entity_mentions_comment', 'discovered_entity_mentions', ['comment_id'], unique=False)
+
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # Backfill from comment text (LIKE wildcards in names escaped)
+    op.execute(sa.text(r"""
+        INSERT INTO discovered_entity_mentions (discovered_entity_id, comment_id)
+        SELECT d.id, c.id
+        FROM discovered_entities d
+        JOIN comments c
+          ON c.text ILIKE '%' || replace(replace(replace(d.name, '\', '\\'), '%', '\%'), '_', '\_') || '%'
+        ON CONFLICT DO NOTHING
+    """))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_discovered_entity_mentions_comment', table_name='discovered_entity_mentions')
+    op.drop_table('discovered_entity_mentions')
@@ -0,0 +1,59 @@
+"""Add entity_sentiment_hourly rollup and rollup_watermarks
+
+Revision ID: e2d7b5c9f014
+Revises: 9c4f2a7e1d38
+Create Date: 2025-12-07 09:00:28.441907
+
+The rollup starts empty: analytics keeps reading raw rows until the first
+refresh (the next enrichment run, or `cli.py rebuild-rollups`) fills it.
+ix_signals_created serves the refresh's "signals written since the
+watermark" lookup.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2d7b5c9f014'
+down_revision: Union[str, None] = '9c4f2a7e1d38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('entity_sentiment_hourly',
+    sa.Column('entity_id', sa.UUID(), nullable=False),
+    sa.Column('platform', sa.String(length=50), nullable=False),
+    sa.Column('hour', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('comment_count', sa.Integer(), nullable=False),
+    sa.Column('signal_count', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.Float(), nullable=False),
+    sa.Column('score_sq_sum', sa.Float(), nullable=False),
+    sa.Column('weighted_sum', sa.Float(), nullable=False),
+    sa.Column('weight_sum', sa.Float(), nullable=False),
+    sa.Column('likes_sum', sa.Integer(), nullable=False),
+    sa.Column('score_min', sa.Float(), nullable=True),
+    sa.Column('score_max', sa.Float(), nullable=True),
+    sa.Column('label_counts', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.ForeignKeyConstraint(['entity_id'], ['monitored_entities.id'], ),
+    sa.PrimaryKeyConstraint('entity_id', 'platform', 'hour')
+    )
+    op.create_index('ix_entity_sentiment_hourly_hour', 'entity_sentiment_hourly', ['hour'], unique=False)
+    op.create_table('rollup_watermarks',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('refreshed_through', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_index('ix_signals_created', 'extracted_signals', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_signals_created', table_name='extracted_signals')
+    op.drop_table('rollup_watermarks')
+    op.drop_index('ix_entity_sentiment_hourly_hour', table_name='entity_sentiment_hourly')
+    op.drop_table('entity_sentiment_hourly')
@@ -10,6 +10,7 @@ from pathlib import Path
 import json
 import sys
 import os
+import uuid
 from datetime import datetime, timedelta
 
 # Load environment variables from .env file
@@ -128,8 +129,10 @@ def init(force):
     required=True,
     help='Path to CSV file'
 )
+@click.option('--bulk', is_flag=True, help='Use set-based bulk upserts (recommended for large exports)')
+@click.option('--chunk-size', default=5000, help='Records per bulk chunk (default: 5000)')
 @click.pass_context
-def ingest(ctx, source: str, file: Path):
+def ingest(ctx, source: str, file: Path, bulk: bool, chunk_size: int):
     """Ingest comments from CSV file."""
     verbose = ctx.obj.get('VERBOSE', False)
     
@@ -180,7 +183,10 @@ def ingest(ctx, source: str, file: Path):
                 label='Ingesting',
                 show_eta=False
             ) as bar:
-                stats = ingestion.ingest(src)
+                if bulk:
+                    stats = ingestion.ingest_bulk(src, chunk_size=chunk_size)
+                else:
+                    stats = ingestion.ingest(src)
                 bar.update(100)
             
             # Display results
@@ -500,8 +506,18 @@ def seed_entities(file: Path):
 @cli.command()
 @click.option('--since', type=str, help='Only enrich comments after this date (YYYY-MM-DD)')
 @click.option('--days', type=int, help='Only enrich comments from last N days')
+@click.option('--concurrency', type=int, default=0,
+              help='Concurrent LLM calls (OpenAI backend); 0 = sequential')
+@click.option('--rpm', type=int, help='Requests/minute limit for concurrent mode')
+@click.option('--tpm', type=int, help='Tokens/minute limit for concurrent mode')
+@click.option('--chunk-size', default=500, help='Comments per streamed chunk / commit (default: 500)')
+@click.option('--workers', default=1,
+              help='Worker processes claiming unprocessed comments in parallel (default: 1)')
+@click.option('--stale-only', is_flag=True,
+              help='Only re-enrich comments enriched under an older prompt/model/catalog version')
 @click.pass_context
-def enrich(ctx, since: str, days: int):
+def enrich(ctx, since: str, days: int, concurrency: int, rpm: int, tpm: int, chunk_size: int,
+           workers: int, stale_only: bool):
     """Extract entities and score sentiment."""
     verbose = ctx.obj.get('VERBOSE', False)
     
@@ -540,12 +556,14 @@ def enrich(ctx, since: str, days: int):
             since_date = datetime.utcnow() - timedelta(days=days)
             click.echo(info(f"   Filtering: last {days} days"))
         
+        if stale_only and workers > 1:
+            click.echo(error("✗ --stale-only runs in a single process; drop --workers"))
+            raise click.Abort()
+        
         # Count comments to process
-        from et_intel_core.models import Comment
-        query = session.query(Comment)
-        if since_date:
-            query = query.filter(Comment.created_at >= since_date)
-        total_comments = query.count()
+        total_comments = enrichment.count_comments(since=since_date, stale_only=stale_only)
+        if stale_only:
+            click.echo(info("   Mode: stale only (older prompt/model/catalog version)"))
         
         if total_comments == 0:
             click.echo(warning("\n⚠️  No comments to enrich"))
@@ -553,20 +571,59 @@ def enrich(ctx, since: str, days: int):
         
         click.echo(info(f"   Found {highlight(str(total_comments))} comments to process\n"))
         
-        # Run enrichment with progress bar
-        with click.progressbar(
-            length=total_comments,
-            label='Processing',
-            show_eta=True,
-            show_percent=True
-        ) as bar:
-            stats = enrichment.enrich_comments(since=since_date)
-            bar.update(stats['comments_processed'])
+        if workers > 1:
+            # Workers claim unprocessed comments in the DB; no shared progress bar
+            from et_intel_core.services.enrichment_workers import enrich_with_workers
+            click.echo(info(f"   Starting {highlight(str(workers))} worker processes..."))
+            stats = enrich_with_workers(session, workers, since=since_date)
+        else:
+            # Run enrichment with progress bar
+            with click.progressbar(
+                length=total_comments,
+                label='Processing',
+                show_eta=True,
+                show_percent=True
+            ) as bar:
+                if concurrency > 0:
+                    stats = enrichment.enrich_comments_concurrent(
+                        since=since_date,
+                        concurrency=concurrency,
+                        requests_per_minute=rpm,
+                        tokens_per_minute=tpm,
+                        chunk_size=chunk_size,
+                        stale_only=stale_only
+                    )
+                else:
+                    stats = enrichment.enrich_comments(
+                        since=since_date, chunk_size=chunk_size, stale_only=stale_only
+                    )
+                bar.update(stats['comments_processed'])
         
         # Display results
         click.echo(success("\n✓ Enrichment complete!"))
         click.echo(f"  Comments processed:  {highlight(str(stats['comments_processed']))}")
         click.echo(f"  Signals created:     {highlight(str(stats['signals_created']))}")
+        if verbose and workers <= 1:
+            build_ms = f"{stats['entity_context_build_seconds'] * 1000:.1f}"
+            click.echo(
+                f"  Entity context:      {stats['entity_context_builds']} build(s), "
+                f"{build_ms} ms (catalog {stats['entity_context_version']})"
+            )
+            hit_rate = f"{stats['caption_cache_hit_rate']:.0%}"
+            click.echo(f"  Caption cache:       {hit_rate} hit rate")
+        if 'escalation_rate' in stats:
+            escalation_rate = f"{stats['escalation_rate']:.0%}"
+            p95_ms = f"{stats['expensive_latency_p95'] * 1000:.0f}"
+            saved = f"${stats['cost_saved_usd']:.4f}"
+            click.echo(
+                f"  Escalations:         {escalation_rate} of {stats['sentiment_scored']} "
+                f"({stats['expensive_calls']} API calls, p95 {p95_ms} ms, ~{saved} saved)"
+            )
+        if 'comments_per_second' in stats:
+            rate = f"{stats['comments_per_second']:.1f}"
+            click.echo(f"  Throughput:          {highlight(rate)} comments/sec")
+            if stats.get('api_retries') or stats.get('api_failures'):
+                click.echo(warning(f"  API retries: {stats['api_retries']}, failures: {stats['api_failures']}"))
         
         if stats['entities_discovered'] > 0:
             click.echo(warning(f"  Entities discovered: {stats['entities_discovered']}"))
@@ -629,7 +686,9 @@ def review_entities(min_mentions: int, limit: int):
 @click.argument('name')
 @click.option('--type', 'entity_type', type=click.Choice(['person', 'show', 'couple', 'brand']), default='person')
 @click.option('--aliases', multiple=True, help='Alternate names')
-def add_entity(name: str, entity_type: str, aliases: tuple):
+@click.option('--backfill/--no-backfill', default=True,
+              help='Attach signals for the new entity to already enriched comments (default: on)')
+def add_entity(name: str, entity_type: str, aliases: tuple, backfill: bool):
     """Add entity to monitored list."""
     session = get_session()
     try:
@@ -670,12 +729,89 @@ def add_entity(name: str, entity_type: str, aliases: tuple):
             session.commit()
             click.echo(info("   ✓ Marked as reviewed in discovered entities"))
         
-        click.echo(info("\n💡 Next step: python cli.py enrich --days 7"))
+        if backfill:
+            _backfill_entity(session, entity)
+        else:
+            click.echo(info(f"\n💡 Next step: python cli.py backfill-entity \"{name}\""))
+        
+    finally:
+        session.close()
+
+
+@cli.command(name='edit-aliases')
+@click.argument('name')
+@click.option('--add', 'add_aliases', multiple=True, help='Alias to add (repeatable)')
+@click.option('--remove', 'remove_aliases', multiple=True, help='Alias to remove (repeatable)')
+@click.option('--backfill/--no-backfill', default=True,
+              help='Re-match already enriched comments for this entity (default: on)')
+def edit_aliases(name: str, add_aliases: tuple, remove_aliases: tuple, backfill: bool):
+    """Add or remove aliases of a monitored entity."""
+    session = get_session()
+    try:
+        entity = session.query(MonitoredEntity).filter_by(name=name).first()
+        if not entity:
+            click.echo(error(f"✗ Entity '{name}' not found"))
+            raise click.Abort()
+        
+        removed = {alias.lower() for alias in remove_aliases}
+        aliases = [alias for alias in (entity.aliases or []) if alias.lower() not in removed]
+        for alias in add_aliases:
+            if alias.lower() not in {existing.lower() for existing in aliases}:
+                aliases.append(alias)
+        
+        if aliases == list(entity.aliases or []):
+            click.echo(warning("⚠️  Aliases unchanged"))
+            return
+        
+        entity.aliases = aliases
+        session.commit()
+        click.echo(success(f"✓ Updated aliases for {name}"))
+        click.echo(info(f"   Aliases: {', '.join(aliases) if aliases else 'None'}"))
+        
+        if backfill and entity.is_active:
+            _backfill_entity(session, entity)
         
     finally:
         session.close()
 
 
+@cli.command(name='backfill-entity')
+@click.argument('name')
+@click.option('--chunk-size', default=500, help='Candidate comments per chunk / commit (default: 500)')
+def backfill_entity(name: str, chunk_size: int):
+    """Re-match enriched comments for one entity (after alias edits)."""
+    session = get_session()
+    try:
+        entity = session.query(MonitoredEntity).filter_by(name=name, is_active=True).first()
+        if not entity:
+            click.echo(error(f"✗ Active entity '{name}' not found"))
+            raise click.Abort()
+        _backfill_entity(session, entity, chunk_size=chunk_size)
+    finally:
+        session.close()
+
+
+def _backfill_entity(session, entity: MonitoredEntity, chunk_size: int = 500):
+    """
+    Run EnrichmentService.backfill_entity() for one entity and print its stats.
+    
+    Catalog matching only: spaCy and the sentiment provider are never loaded.
+    """
+    click.echo(info(f"\n🔎 Backfilling signals for {highlight(entity.name)}..."))
+    catalog = session.query(MonitoredEntity).filter_by(is_active=True).all()
+    enrichment = EnrichmentService(session, EntityExtractor(catalog))
+    stats = enrichment.backfill_entity(entity.id, chunk_size=chunk_size)
+    
+    click.echo(success(f"✓ Matched {stats['matched']} of {stats['candidates']} candidate comments"))
+    click.echo(info(f"   Signals created: {stats['signals_created']}"))
+    if stats['signals_removed']:
+        click.echo(info(f"   Signals removed: {stats['signals_removed']}"))
+    if stats['needs_reanalysis']:
+        click.echo(info(f"   Queued for re-analysis: {stats['needs_reanalysis']}"))
+        click.echo(info("   💡 Next step: python cli.py enrich --stale-only"))
+    click.echo(info(f"   Time: {stats['elapsed_seconds']:.1f}s"))
+
+
 @cli.command()
 @click.option('--days', default=7, help='Number of days to analyze')
 @click.option('--limit', default=10, help='Number of entities to show')
@@ -802,6 +938,65 @@ def velocity(entity_name: str, hours: int):
         session.close()
 
 
+@cli.command(name='velocity-alerts')
+@click.option('--hours', default=72, help='Window size in hours')
+@click.option('--min-sample', default=10, help='Minimum comments per window')
+@click.option('--watch', is_flag=True, help='Keep checking every --interval seconds')
+@click.option('--interval', default=300, help='Seconds between checks with --watch')
+def velocity_alerts(hours: int, min_sample: int, watch: bool, interval: int):
+    """Check velocity for every active entity (one grouped query per check)."""
+    import time
+    
+    session = get_session()
+    try:
+        analytics = AnalyticsService(session)
+        while True:
+            entities = session.query(MonitoredEntity).filter_by(is_active=True).all()
+            names = {entity.id: entity.name for entity in entities}
+            velocities = analytics.compute_velocity_many(
+                list(names), window_hours=hours, min_sample_size=min_sample
+            )
+            alerts = sorted(
+                (v for v in velocities.values() if not v.get('error') and v.get('alert')),
+                key=lambda v: abs(v['percent_change']),
+                reverse=True
+            )
+            checked_at = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+            click.echo(info(f"[{checked_at} UTC] {len(names)} entities checked, {len(alerts)} alerts"))
+            for alert in alerts:
+                name = names[uuid.UUID(alert['entity_id'])]
+                change = f"{alert['percent_change']:+.1f}%"
+                colored = error(change) if alert['percent_change'] < 0 else success(change)
+                click.echo(
+                    f"  🚨 {highlight(name)}: {colored} "
+                    f"({alert['previous_sentiment']:+.3f} → {alert['recent_sentiment']:+.3f}, "
+                    f"n={alert['recent_sample_size']}/{alert['previous_sample_size']})"
+                )
+            if not watch:
+                break
+            session.rollback()  # end the read transaction so the next check sees new rows
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        click.echo(info("\nStopped"))
+    finally:
+        session.close()
+
+
+@cli.command(name='rebuild-rollups')
+def rebuild_rollups():
+    """Rebuild the hourly entity-sentiment rollup from raw signals."""
+    from et_intel_core.analytics.hourly_rollup import rebuild_rollup
+    
+    session = get_session()
+    try:
+        click.echo(info("🔄 Rebuilding entity_sentiment_hourly..."))
+        stats = rebuild_rollup(session)
+        click.echo(success(f"✓ Wrote {stats['rollup_rows_written']} rollup rows"))
+        click.echo(info(f"   Time: {stats['rollup_refresh_seconds']:.1f}s"))
+    finally:
+        session.close()
+
+
 @cli.command()
 @click.argument('entity_name')
 @click.option('--days', default=30, help='Number of days of history')
@@ -875,8 +1070,10 @@ def sentiment_history(entity_name: str, days: int, export: str):
 @click.option('--platforms', multiple=True, help='Filter by platform (instagram, youtube, tiktok)')
 @click.option('--output', type=click.Path(), help='Output PDF filename (auto-generated if not provided)')
 @click.option('--json', 'save_json', is_flag=True, help='Also save brief data as JSON')
+@click.option('--parallel/--serial', default=None,
+              help='Build independent sections concurrently (default: BRIEF_PARALLEL_SECTIONS)')
 @click.pass_context
-def brief(ctx, start: str, end: str, platforms: tuple, output: str, save_json: bool):
+def brief(ctx, start: str, end: str, platforms: tuple, output: str, save_json: bool, parallel: bool):
     """Generate intelligence brief PDF report."""
     verbose = ctx.obj.get('VERBOSE', False)
     
@@ -906,8 +1103,15 @@ def brief(ctx, start: str, end: str, platforms: tuple, output: str, save_json: b
                 start=start_date,
                 end=end_date,
                 platforms=list(platforms) if platforms else None,
-                top_entities_limit=20
+                top_entities_limit=20,
+                parallel=parallel
             )
+            if verbose:
+                timings = brief_data.metadata['section_timings']
+                click.echo(info(f"   Built in {brief_data.metadata['build_seconds']:.2f}s "
+                                f"({brief_data.metadata['build_mode']})"))
+                for name, seconds in sorted(timings.items(), key=lambda item: item[1], reverse=True):
+                    click.echo(f"   {name:<24} {seconds:6.2f}s")
             
             # Render PDF
             reports_dir = Path('reports')
@@ -951,6 +1155,46 @@ def brief(ctx, start: str, end: str, platforms: tuple, output: str, save_json: b
         raise click.Abort()
 
 
+@cli.command(name='llm-cache')
+@click.option('--purge', 'purge_version', type=str, help='Delete cached results for this prompt version')
+@click.option('--purge-all', is_flag=True, help='Delete every cached result')
+def llm_cache(purge_version: str, purge_all: bool):
+    """Inspect or purge the persistent LLM result cache."""
+    from et_intel_core.config import settings
+    from et_intel_core.nlp.llm_cache import LLMResultCache
+    
+    cache = LLMResultCache(settings.llm_cache_path, max_entries=settings.llm_cache_max_entries)
+    try:
+        if purge_version or purge_all:
+            removed = cache.purge(None if purge_all else purge_version)
+            target = "all prompt versions" if purge_all else f"prompt version {purge_version}"
+            click.echo(success(f"✓ Removed {removed:,} cached results ({target})"))
+            return
+        
+        stats = cache.stats()
+        click.echo(info("\n🗄️  LLM Result Cache"))
+        click.echo("=" * 60)
+        click.echo(f"Path:     {stats['path']}")
+        click.echo(f"Enabled:  {'yes' if settings.llm_cache_enabled else 'no (LLM_CACHE_ENABLED=false)'}")
+        entries, hits = stats['entries'], stats['hits']
+        click.echo(f"Entries:  {highlight(f'{entries:,}')} / {stats['max_entries']:,}")
+        click.echo(f"Hits:     {highlight(f'{hits:,}')}")
+        click.echo("=" * 60)
+        
+        if stats['groups']:
+            click.echo(f"{'Kind':<10} {'Model':<16} {'Prompt version':<18} {'Entries':>10} {'Hits':>10}")
+            for group in stats['groups']:
+                click.echo(
+                    f"{group['kind']:<10} {group['model']:<16} {group['prompt_version']:<18} "
+                    f"{group['entries']:>10,} {group['hits']:>10,}"
+                )
+            click.echo(info("\n💡 Purge an old prompt: python cli.py llm-cache --purge <version>"))
+        else:
+            click.echo(info("Cache is empty"))
+    finally:
+        cache.close()
+
+
 @cli.command()
 def version():
     """Show version and system information."""
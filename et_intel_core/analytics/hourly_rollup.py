@@ -0,0 +1,618 @@
+"""
+Hourly entity-sentiment rollup: entity_sentiment_hourly maintenance and reads.
+
+Analytics windows used to re-aggregate raw ``extracted_signals JOIN comments``
+rows on every call. entity_sentiment_hourly keeps, per monitored entity,
+platform and comment hour, the sums those queries are built from: comment
+and signal counts, score sum, sum of squares, like-weighted sum and weight
+sum, likes, min/max and per-label counts. A window is split into whole
+hours, read from the rollup, and the partial hours at its edges, aggregated
+from raw rows (see split_window).
+
+Maintenance is incremental: refresh_dirty_hours() recomputes only the hours
+holding comments whose signals were written since the last refresh (the
+watermark in rollup_watermarks); enrichment calls it at the end of every
+run. An hour is recomputed from raw rows rather than patched with deltas,
+so re-enrichment (which updates signals in place) stays exact.
+
+The rollup is only read while fresh: if a signal newer than the watermark
+exists (written outside enrichment, or by a run still in progress),
+rollup_is_fresh() is False and analytics reads raw rows. Edits that don't
+write signals refresh their hours directly: ingestion calls
+refresh_comment_hours() for comments whose likes changed, and entity
+backfills recompute the hours of signals they deleted. Anything else
+(signals deleted by hand) needs `cli.py rebuild-rollups`.
+"""
+
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, distinct, false, func, or_, select
+from sqlalchemy.orm import Session
+
+from et_intel_core.config import settings
+from et_intel_core.db_upsert import chunked, dialect_name, upsert_insert
+from et_intel_core.models import (
+    Comment,
+    EntitySentimentHourly,
+    ExtractedSignal,
+    Post,
+    RollupWatermark,
+    SignalType
+)
+from et_intel_core.monitoring import get_metrics
+
+ROLLUP_NAME = "entity_sentiment_hourly"
+HOUR = timedelta(hours=1)
+_REFRESH_BATCH_RANGES = 50
+
+# (start, end, start_inclusive, end_inclusive); end None = open-ended
+Edge = Tuple[datetime, Optional[datetime], bool, bool]
+
+
+def hour_floor(moment: datetime) -> datetime:
+    """Start of the hour containing ``moment``."""
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+@dataclass(frozen=True)
+class WindowSplit:
+    """
+    A time window split into whole rollup hours and raw-row edges.
+
+    Attributes:
+        hours: (first_hour, end_hour) of the whole hours read from the rollup
+            (end exclusive, None = open-ended), or None if there are none
+        edges: Partial-hour ranges aggregated from raw rows
+    """
+    hours: Optional[Tuple[datetime, Optional[datetime]]]
+    edges: Tuple[Edge, ...]
+
+
+def split_window(
+    start: datetime,
+    end: Optional[datetime] = None,
+    start_inclusive: bool = True,
+    use_rollup: bool = True
+) -> WindowSplit:
+    """
+    Split a window into whole hours and partial-hour edges.
+
+    The window is ``start <= t <= end`` (BETWEEN), or ``start < t`` when
+    start_inclusive is False; ``end=None`` leaves it open-ended.
+
+    Args:
+        start: Window start
+        end: Window end (inclusive), or None
+        start_inclusive: Whether rows at exactly ``start`` belong to the window
+        use_rollup: False returns the whole window as one raw edge
+    """
+    whole: Edge = (start, end, start_inclusive, True)
+    if not use_rollup:
+        return WindowSplit(None, (whole,))
+
+    first_hour = hour_floor(start)
+    if first_hour < start or not start_inclusive:
+        first_hour += HOUR
+    edges: List[Edge] = []
+    if first_hour > start:
+        edges.append((start, first_hour, start_inclusive, False))
+
+    if end is None:
+        return WindowSplit((first_hour, None), tuple(edges))
+    end_hour = hour_floor(end)
+    if end_hour <= first_hour:
+        # No whole hour inside the window
+        return WindowSplit(None, (whole,))
+    # Rows at exactly ``end`` (and the rest of its partial hour) stay raw
+    edges.append((end_hour, end, True, True))
+    return WindowSplit((first_hour, end_hour), tuple(edges))
+
+
+def edge_condition(column: Any, edges: Iterable[Edge]):
+    """SQL condition matching ``column`` inside any of the edges."""
+    conditions = []
+    for start, end, start_inclusive, end_inclusive in edges:
+        parts = [column >= start if start_inclusive else column > start]
+        if end is not None:
+            parts.append(column <= end if end_inclusive else column < end)
+        conditions.append(and_(*parts))
+    return or_(*conditions) if conditions else false()
+
+
+def hour_condition(column: Any, split: WindowSplit):
+    """SQL condition matching rollup hours inside the split's whole hours."""
+    if split.hours is None:
+        return false()
+    first_hour, end_hour = split.hours
+    if end_hour is None:
+        return column >= first_hour
+    return and_(column >= first_hour, column < end_hour)
+
+
+@dataclass
+class SentimentTotals:
+    """Mergeable sentiment sums for one entity over some rows or hours."""
+    comment_count: int = 0
+    signal_count: int = 0
+    score_sum: float = 0.0
+    score_sq_sum: float = 0.0
+    weighted_sum: float = 0.0
+    weight_sum: float = 0.0
+    likes_sum: int = 0
+    score_min: Optional[float] = None
+    score_max: Optional[float] = None
+
+    def add(self, values: Tuple[Any, ...]) -> None:
+        """Add one row of measures (in _raw_measures() order)."""
+        (comment_count, signal_count, score_sum, score_sq_sum,
+         weighted_sum, weight_sum, likes_sum, score_min, score_max) = values
+        self.comment_count += int(comment_count or 0)
+        self.signal_count += int(signal_count or 0)
+        self.score_sum += float(score_sum or 0.0)
+        self.score_sq_sum += float(score_sq_sum or 0.0)
+        self.weighted_sum += float(weighted_sum or 0.0)
+        self.weight_sum += float(weight_sum or 0.0)
+        self.likes_sum += int(likes_sum or 0)
+        if score_min is not None:
+            self.score_min = score_min if self.score_min is None else min(self.score_min, score_min)
+        if score_max is not None:
+            self.score_max = score_max if self.score_max is None else max(self.score_max, score_max)
+
+    def merge(self, other: "SentimentTotals") -> None:
+        """Add another set of totals (e.g. the next hour) into this one."""
+        self.add((
+            other.comment_count, other.signal_count, other.score_sum, other.score_sq_sum,
+            other.weighted_sum, other.weight_sum, other.likes_sum, other.score_min, other.score_max
+        ))
+
+    @property
+    def avg(self) -> Optional[float]:
+        """AVG(numeric_value), or None without scored signals."""
+        return self.score_sum / self.signal_count if self.signal_count else None
+
+    @property
+    def weighted(self) -> Optional[float]:
+        """Like-weighted average (plain average when the weights sum to 0)."""
+        if self.weight_sum > 0:
+            return self.weighted_sum / self.weight_sum
+        return self.avg
+
+    @property
+    def stddev(self) -> Optional[float]:
+        """Sample standard deviation (STDDEV), or None below two signals."""
+        if self.signal_count < 2:
+            return None
+        variance = (self.score_sq_sum - self.score_sum ** 2 / self.signal_count) / (self.signal_count - 1)
+        return max(variance, 0.0) ** 0.5
+
+
+def _raw_measures(condition: Any = None) -> list:
+    """Aggregates over raw signal rows (only rows matching ``condition``, if given)."""
+    score = ExtractedSignal.numeric_value
+
+    def when(value):
+        return case((condition, value)) if condition is not None else value
+
+    return [
+        func.count(distinct(when(ExtractedSignal.comment_id))),
+        func.count(when(score)),
+        func.sum(when(score)),
+        func.sum(when(score * score)),
+        func.sum(when(score * ExtractedSignal.weight_score)),
+        func.sum(when(ExtractedSignal.weight_score)),
+        func.sum(when(Comment.likes)),
+        func.min(when(score)),
+        func.max(when(score)),
+    ]
+
+
+def _rollup_measures(condition: Any) -> list:
+    """Aggregates over rollup rows matching ``condition``."""
+    rollup = EntitySentimentHourly
+
+    def when(column):
+        return case((condition, column))
+
+    return [
+        func.sum(when(rollup.comment_count)),
+        func.sum(when(rollup.signal_count)),
+        func.sum(when(rollup.score_sum)),
+        func.sum(when(rollup.score_sq_sum)),
+        func.sum(when(rollup.weighted_sum)),
+        func.sum(when(rollup.weight_sum)),
+        func.sum(when(rollup.likes_sum)),
+        func.min(when(rollup.score_min)),
+        func.max(when(rollup.score_max)),
+    ]
+
+
+_MEASURE_COUNT = 9
+
+
+def hour_bucket(session: Session, column: Any):
+    """SQL expression truncating a timestamp column to its hour."""
+    if dialect_name(session) == "sqlite":
+        return func.strftime('%Y-%m-%d %H:00:00', column)
+    return func.date_trunc('hour', column)
+
+
+def day_bucket(session: Session, column: Any):
+    """SQL expression truncating a timestamp column to its day."""
+    if dialect_name(session) == "sqlite":
+        return func.date(column)
+    return func.date_trunc('day', column)
+
+
+def as_bucket(value: Any) -> datetime:
+    """Normalize an hour_bucket()/day_bucket() result (SQLite returns text)."""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def sentiment_totals(
+    session: Session,
+    windows: Dict[str, WindowSplit],
+    entity_ids: Optional[List[uuid.UUID]] = None,
+    platforms: Optional[List[str]] = None,
+    by_hour: bool = False
+) -> Dict[Tuple[str, uuid.UUID, Optional[datetime]], SentimentTotals]:
+    """
+    Entity sentiment totals for several windows, one query per source.
+
+    Whole hours come from entity_sentiment_hourly and edges from raw
+    scored sentiment signals; each window is a CASE bucket, so any number
+    of windows costs one rollup query plus one raw query.
+
+    Args:
+        session: Database session
+        windows: Bucket name -> window split (see split_window)
+        entity_ids: Only these entities (all monitored entities if None)
+        platforms: Only comments on these platforms
+        by_hour: Keep hours apart instead of summing the whole window
+
+    Returns:
+        (bucket, entity_id, hour or None) -> SentimentTotals
+    """
+    totals: Dict[Tuple[str, uuid.UUID, Optional[datetime]], SentimentTotals] = defaultdict(SentimentTotals)
+
+    rollup_windows = {name: split for name, split in windows.items() if split.hours is not None}
+    if rollup_windows:
+        rollup = EntitySentimentHourly
+        conditions = {name: hour_condition(rollup.hour, split) for name, split in rollup_windows.items()}
+        keys = [rollup.entity_id, rollup.hour] if by_hour else [rollup.entity_id]
+        query = (
+            select(*keys, *[m for cond in conditions.values() for m in _rollup_measures(cond)])
+            .where(or_(*conditions.values()))
+            .group_by(*keys)
+        )
+        if entity_ids is not None:
+            query = query.where(rollup.entity_id.in_(entity_ids))
+        if platforms:
+            query = query.where(rollup.platform.in_(platforms))
+        for row in session.execute(query):
+            hour = row[1] if by_hour else None
+            _add_buckets(totals, list(conditions), row[len(keys):], row[0], hour)
+
+    edge_windows = {name: split for name, split in windows.items() if split.edges}
+    if edge_windows:
+        conditions = {
+            name: edge_condition(Comment.created_at, split.edges) for name, split in edge_windows.items()
+        }
+        keys = [ExtractedSignal.entity_id]
+        if by_hour:
+            keys.append(hour_bucket(session, Comment.created_at))
+        query = (
+            select(*keys, *[m for cond in conditions.values() for m in _raw_measures(cond)])
+            .join(Comment, ExtractedSignal.comment_id == Comment.id)
+            .where(
+                ExtractedSignal.signal_type == SignalType.SENTIMENT,
+                ExtractedSignal.numeric_value.isnot(None),
+                ExtractedSignal.entity_id.isnot(None),
+                or_(*conditions.values())
+            )
+            .group_by(*keys)
+        )
+        if entity_ids is not None:
+            query = query.where(ExtractedSignal.entity_id.in_(entity_ids))
+        if platforms:
+            query = query.join(Post, Comment.post_id == Post.id).where(Post.platform.in_(platforms))
+        for row in session.execute(query):
+            hour = as_bucket(row[1]) if by_hour else None
+            _add_buckets(totals, list(conditions), row[len(keys):], row[0], hour)
+
+    return dict(totals)
+
+
+def _add_buckets(totals, names: List[str], measures, entity_id, hour) -> None:
+    """Split one result row's measures into its CASE buckets."""
+    for index, name in enumerate(names):
+        values = tuple(measures[index * _MEASURE_COUNT:(index + 1) * _MEASURE_COUNT])
+        if values[1]:  # scored signals in this bucket
+            totals[(name, entity_id, hour)].add(values)
+
+
+def label_totals(session: Session, split: WindowSplit, entity_id: uuid.UUID) -> Dict[str, int]:
+    """
+    Sentiment label counts of one entity over a window.
+
+    Whole hours are summed from the rollup's label_counts, edges counted
+    from raw sentiment signals (with or without a numeric score).
+    """
+    counts: Dict[str, int] = defaultdict(int)
+    if split.hours is not None:
+        rollup = EntitySentimentHourly
+        rows = session.execute(
+            select(rollup.label_counts).where(
+                rollup.entity_id == entity_id,
+                hour_condition(rollup.hour, split)
+            )
+        ).scalars()
+        for label_counts in rows:
+            for label, count in (label_counts or {}).items():
+                counts[label] += count
+    if split.edges:
+        rows = session.execute(
+            select(ExtractedSignal.value, func.count())
+            .join(Comment, ExtractedSignal.comment_id == Comment.id)
+            .where(
+                ExtractedSignal.signal_type == SignalType.SENTIMENT,
+                ExtractedSignal.entity_id == entity_id,
+                edge_condition(Comment.created_at, split.edges)
+            )
+            .group_by(ExtractedSignal.value)
+        )
+        for label, count in rows:
+            counts[label] += count
+    return dict(counts)
+
+
+def _hour_ranges(hours: List[datetime]) -> List[Tuple[datetime, datetime]]:
+    """Merge sorted hours into contiguous [start, end) ranges."""
+    ranges: List[Tuple[datetime, datetime]] = []
+    for hour in hours:
+        if ranges and ranges[-1][1] == hour:
+            ranges[-1] = (ranges[-1][0], hour + HOUR)
+        else:
+            ranges.append((hour, hour + HOUR))
+    return ranges
+
+
+def refresh_hours(session: Session, hours: Optional[Iterable[datetime]] = None) -> int:
+    """
+    Recompute rollup rows of ``hours`` from raw signals (every hour if None).
+
+    Rows of those hours are deleted, then re-inserted with
+    INSERT ... ON CONFLICT DO UPDATE (so concurrent refreshes of the same
+    hour don't collide). The caller commits.
+
+    Returns:
+        Number of rollup rows written
+    """
+    rollup = EntitySentimentHourly
+    if hours is None:
+        session.execute(delete(rollup))
+        batches: List[Optional[List[Tuple[datetime, datetime]]]] = [None]
+    else:
+        ranges = _hour_ranges(sorted({hour_floor(as_bucket(hour)) for hour in hours}))
+        batches = [list(batch) for batch in chunked(ranges, _REFRESH_BATCH_RANGES)]
+
+    hour = hour_bucket(session, Comment.created_at)
+    written = 0
+    for batch in batches:
+        scope = [
+            ExtractedSignal.signal_type == SignalType.SENTIMENT,
+            ExtractedSignal.entity_id.isnot(None),
+        ]
+        if batch is not None:
+            session.execute(delete(rollup).where(or_(
+                *(and_(rollup.hour >= start, rollup.hour < end) for start, end in batch)
+            )))
+            scope.append(or_(
+                *(and_(Comment.created_at >= start, Comment.created_at < end) for start, end in batch)
+            ))
+        keys = (ExtractedSignal.entity_id, Post.platform, hour)
+
+        rows: Dict[tuple, Dict[str, Any]] = {}
+
+        def row_for(entity_id, platform, bucket):
+            key = (entity_id, platform, as_bucket(bucket))
+            if key not in rows:
+                rows[key] = {
+                    "entity_id": entity_id,
+                    "platform": platform,
+                    "hour": key[2],
+                    "comment_count": 0,
+                    "signal_count": 0,
+                    "score_sum": 0.0,
+                    "score_sq_sum": 0.0,
+                    "weighted_sum": 0.0,
+                    "weight_sum": 0.0,
+                    "likes_sum": 0,
+                    "score_min": None,
+                    "score_max": None,
+                    "label_counts": {},
+                }
+            return rows[key]
+
+        measures = session.execute(
+            select(*keys, *_raw_measures())
+            .join(Comment, ExtractedSignal.comment_id == Comment.id)
+            .join(Post, Comment.post_id == Post.id)
+            .where(*scope, ExtractedSignal.numeric_value.isnot(None))
+            .group_by(*keys)
+        )
+        for row in measures:
+            totals = SentimentTotals()
+            totals.add(tuple(row[3:]))
+            target = row_for(row[0], row[1], row[2])
+            target.update(
+                comment_count=totals.comment_count,
+                signal_count=totals.signal_count,
+                score_sum=totals.score_sum,
+                score_sq_sum=totals.score_sq_sum,
+                weighted_sum=totals.weighted_sum,
+                weight_sum=totals.weight_sum,
+                likes_sum=totals.likes_sum,
+                score_min=totals.score_min,
+                score_max=totals.score_max,
+            )
+
+        labels = session.execute(
+            select(*keys, ExtractedSignal.value, func.count())
+            .join(Comment, ExtractedSignal.comment_id == Comment.id)
+            .join(Post, Comment.post_id == Post.id)
+            .where(*scope)
+            .group_by(*keys, ExtractedSignal.value)
+        )
+        for entity_id, platform, bucket, label, count in labels:
+            row_for(entity_id, platform, bucket)["label_counts"][label] = count
+
+        if rows:
+            stmt = upsert_insert(session, rollup)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["entity_id", "platform", "hour"],
+                set_={
+                    column: getattr(stmt.excluded, column)
+                    for column in (
+                        "comment_count", "signal_count", "score_sum", "score_sq_sum", "weighted_sum",
+                        "weight_sum", "likes_sum", "score_min", "score_max", "label_counts",
+                    )
+                }
+            )
+            session.execute(stmt, list(rows.values()))
+            written += len(rows)
+    return written
+
+
+def comment_hours(session: Session, comment_ids: Iterable[uuid.UUID]) -> List[datetime]:
+    """Distinct creation hours of the given comments (for refresh_hours)."""
+    hours = set()
+    for batch in chunked(list(comment_ids), 500):
+        result = session.execute(
+            select(hour_bucket(session, Comment.created_at)).where(Comment.id.in_(batch)).distinct()
+        ).scalars()
+        hours.update(as_bucket(value) for value in result)
+    return sorted(hours)
+
+
+def refresh_comment_hours(session: Session, comment_ids: Iterable[uuid.UUID]) -> int:
+    """
+    Recompute the rollup hours of comments edited without writing signals.
+
+    Used by ingestion when a re-scrape changes likes (likes_sum is part of
+    the rollup). Does nothing before the first refresh, since that one
+    rebuilds every hour anyway. The caller commits.
+
+    Returns:
+        Number of rollup rows written
+    """
+    comment_ids = list(comment_ids)
+    if not comment_ids:
+        return 0
+    has_watermark = session.execute(
+        select(RollupWatermark.name).where(RollupWatermark.name == ROLLUP_NAME)
+    ).first()
+    if has_watermark is None:
+        return 0
+    hours = comment_hours(session, comment_ids)
+    return refresh_hours(session, hours) if hours else 0
+
+
+def refresh_dirty_hours(session: Session, overlap_seconds: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Bring the rollup up to date with signals written since the last refresh.
+
+    Recomputes the hours of comments whose signals have ``created_at`` after
+    the watermark (minus ``overlap_seconds``, to catch signals committed
+    after a concurrent refresh read the watermark), then advances the
+    watermark. Without a watermark every hour is rebuilt. Commits.
+
+    Args:
+        session: Database session
+        overlap_seconds: Look-back before the watermark
+            (settings.rollup_refresh_overlap_seconds)
+
+    Returns:
+        Dictionary with rollup_hours_refreshed (None for a full rebuild),
+        rollup_rows_written and rollup_refresh_seconds
+    """
+    started = time.perf_counter()
+    if overlap_seconds is None:
+        overlap_seconds = settings.rollup_refresh_overlap_seconds
+    latest = session.execute(select(func.max(ExtractedSignal.created_at))).scalar()
+    watermark = session.execute(
+        select(RollupWatermark.refreshed_through).where(RollupWatermark.name == ROLLUP_NAME)
+    ).first()
+
+    if watermark is None:
+        hours = None
+        written = refresh_hours(session, None)
+    else:
+        query = (
+            select(hour_bucket(session, Comment.created_at))
+            .join(ExtractedSignal, ExtractedSignal.comment_id == Comment.id)
+            .distinct()
+        )
+        if watermark.refreshed_through is not None:
+            since = watermark.refreshed_through - timedelta(seconds=overlap_seconds)
+            query = query.where(ExtractedSignal.created_at > since)
+        hours = [as_bucket(value) for value in session.execute(query).scalars()]
+        written = refresh_hours(session, hours) if hours else 0
+
+    refreshed_through = latest
+    if refreshed_through is None and watermark is not None:
+        refreshed_through = watermark.refreshed_through
+    stmt = upsert_insert(session, RollupWatermark).values(
+        name=ROLLUP_NAME,
+        refreshed_through=refreshed_through,
+        refreshed_at=datetime.utcnow()
+    )
+    session.execute(stmt.on_conflict_do_update(
+        index_elements=["name"],
+        set_={
+            "refreshed_through": stmt.excluded.refreshed_through,
+            "refreshed_at": stmt.excluded.refreshed_at,
+        }
+    ))
+    session.commit()
+
+    elapsed = time.perf_counter() - started
+    get_metrics().record_timing("analytics.rollup_refresh", elapsed)
+    return {
+        "rollup_hours_refreshed": None if hours is None else len(hours),
+        "rollup_rows_written": written,
+        "rollup_refresh_seconds": elapsed,
+    }
+
+
+def rebuild_rollup(session: Session) -> Dict[str, Any]:
+    """
+    Rebuild every rollup hour from raw signals and reset the watermark.
+
+    Use after changes refresh_dirty_hours() can't see (signals deleted by
+    hand). Commits.
+
+    Returns:
+        refresh_dirty_hours() statistics
+    """
+    session.execute(delete(RollupWatermark).where(RollupWatermark.name == ROLLUP_NAME))
+    return refresh_dirty_hours(session)
+
+
+def rollup_is_fresh(session: Session) -> bool:
+    """True when the rollup has absorbed every signal written so far."""
+    watermark = session.execute(
+        select(RollupWatermark.refreshed_through).where(RollupWatermark.name == ROLLUP_NAME)
+    ).first()
+    if watermark is None:
+        return False
+    latest = session.execute(select(func.max(ExtractedSignal.created_at))).scalar()
+    if latest is None:
+        return True
+    return watermark.refreshed_through is not None and latest <= watermark.refreshed_through
@@ -9,11 +9,23 @@ import pandas as pd
 from sqlalchemy.orm import Session
 from sqlalchemy import text, func, and_, or_, select
 
+from et_intel_core.analytics.hourly_rollup import (
+    SentimentTotals,
+    as_bucket,
+    day_bucket,
+    label_totals,
+    rollup_is_fresh,
+    sentiment_totals,
+    split_window
+)
+from et_intel_core.config import settings
+from et_intel_core.nlp.catalog_matcher import CatalogMatcher
 from et_intel_core.models import (
     Comment,
     ExtractedSignal,
     MonitoredEntity,
     DiscoveredEntity,
+    DiscoveredEntityMention,
     Post,
     SignalType
 )
@@ -30,16 +42,36 @@ class AnalyticsService:
     - Time-windowed aggregations
     - Velocity detection (sentiment change over time)
     - Entity comparisons
+    - Whole hours read from the entity_sentiment_hourly rollup while it is
+      fresh (see analytics/hourly_rollup.py)
     """
     
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, use_rollup: Optional[bool] = None):
         """
         Initialize analytics service.
         
         Args:
             session: SQLAlchemy database session
+            use_rollup: Read whole hours from entity_sentiment_hourly
+                (settings.analytics_use_hourly_rollup); raw rows are used
+                anyway while the rollup is behind
         """
         self.session = session
+        self.use_rollup = settings.analytics_use_hourly_rollup if use_rollup is None else use_rollup
+        self._caption_matcher_cache: Optional[Tuple[tuple, CatalogMatcher, List[str]]] = None
+    
+    def _rollup_ready(self) -> bool:
+        """Whether entity-scoped queries may read the hourly rollup."""
+        return self.use_rollup and rollup_is_fresh(self.session)
+    
+    def _entity_info(self, entity_ids) -> Dict[uuid.UUID, MonitoredEntity]:
+        """Monitored entities by id (for rollup-path result rows)."""
+        if not entity_ids:
+            return {}
+        entities = self.session.execute(
+            select(MonitoredEntity).where(MonitoredEntity.id.in_(list(entity_ids)))
+        ).scalars()
+        return {entity.id: entity for entity in entities}
     
     def get_top_entities(
         self,
@@ -65,6 +97,9 @@ class AnalyticsService:
             - total_likes: Sum of likes on comments
             - weighted_sentiment: Like-weighted average sentiment
         """
+        if self._rollup_ready():
+            return self._top_entities_from_rollup(time_window, platforms, limit)
+        
         query = text("""
         SELECT 
             me.id as entity_id,
@@ -117,6 +152,38 @@ class AnalyticsService:
         
         return df
     
+    def _top_entities_from_rollup(
+        self,
+        time_window: Tuple[datetime, datetime],
+        platforms: Optional[List[str]],
+        limit: int
+    ) -> pd.DataFrame:
+        """get_top_entities() over rollup hours plus raw partial-hour edges."""
+        totals = sentiment_totals(
+            self.session,
+            {"window": split_window(time_window[0], time_window[1])},
+            platforms=platforms
+        )
+        entities = self._entity_info({entity_id for _, entity_id, _ in totals})
+        rows = [
+            {
+                "entity_id": entity_id,
+                "entity_name": entities[entity_id].name,
+                "entity_type": entities[entity_id].entity_type,
+                "mention_count": total.comment_count,
+                "avg_sentiment": total.avg,
+                "total_likes": total.likes_sum,
+                "weighted_sentiment": total.weighted,
+            }
+            for (_, entity_id, _), total in totals.items()
+            if entity_id in entities
+        ]
+        rows.sort(key=lambda row: row["mention_count"], reverse=True)
+        return pd.DataFrame(rows[:limit], columns=[
+            "entity_id", "entity_name", "entity_type", "mention_count",
+            "avg_sentiment", "total_likes", "weighted_sentiment"
+        ])
+    
     def compute_velocity(
         self,
         entity_id: uuid.UUID,
@@ -150,94 +217,84 @@ class AnalyticsService:
             
             Or {"error": "message"} if insufficient data
         """
+        return self.compute_velocity_many(
+            [entity_id], window_hours=window_hours, min_sample_size=min_sample_size
+        )[entity_id]
+    
+    def compute_velocity_many(
+        self,
+        entity_ids: List[uuid.UUID],
+        window_hours: int = 72,
+        min_sample_size: int = 10
+    ) -> Dict[uuid.UUID, Dict]:
+        """
+        compute_velocity() for several entities at once.
+        
+        Recent and previous windows of every entity come from one grouped
+        query with a CASE bucket per window (plus one rollup query for the
+        whole hours when the hourly rollup is fresh), instead of two
+        queries per entity.
+        
+        Args:
+            entity_ids: UUIDs of entities to analyze
+            window_hours: Hours to look back (default 72)
+            min_sample_size: Minimum comments required (default 10)
+            
+        Returns:
+            Entity UUID -> compute_velocity() result for that entity
+        """
         now = datetime.utcnow()
         recent_start = now - timedelta(hours=window_hours)
         previous_start = now - timedelta(hours=window_hours * 2)
+        entity_ids = list(dict.fromkeys(entity_ids))
+        if not entity_ids:
+            return {}
         
-        # Convert UUID to string for SQLite compatibility
-        try:
-            is_sqlite = self.session.bind.dialect.name == 'sqlite'
-        except (AttributeError, TypeError):
-            is_sqlite = False
-        
-        # For SQLite, UUIDs are stored as TEXT, but we need to handle format differences
-        # SQLAlchemy might store with or without dashes, so we normalize
-        if is_sqlite:
-            # Convert UUID to string and remove dashes for consistent comparison
-            entity_id_param = str(entity_id).replace('-', '')
-            # Use LIKE or = with normalized format
-            entity_condition = "REPLACE(es.entity_id, '-', '') = :entity_id"
-        else:
-            entity_id_param = entity_id
-            entity_condition = "es.entity_id = :entity_id"
-        
-        recent_query = text(f"""
-            SELECT 
-                AVG(es.numeric_value) as avg_sentiment,
-                COUNT(*) as count
-            FROM extracted_signals es
-            JOIN comments c ON es.comment_id = c.id
-            WHERE {entity_condition}
-              AND es.signal_type = 'sentiment'
-              AND es.numeric_value IS NOT NULL
-              AND c.created_at BETWEEN :recent_start AND :now
-        """)
-        
-        recent = self.session.execute(
-            recent_query,
-            {"entity_id": entity_id_param, "recent_start": recent_start, "now": now}
-        ).fetchone()
-        
-        # Previous sentiment (previous N hours)
-        previous_query = text(f"""
-            SELECT 
-                AVG(es.numeric_value) as avg_sentiment,
-                COUNT(*) as count
-            FROM extracted_signals es
-            JOIN comments c ON es.comment_id = c.id
-            WHERE {entity_condition}
-              AND es.signal_type = 'sentiment'
-              AND es.numeric_value IS NOT NULL
-              AND c.created_at BETWEEN :previous_start AND :recent_start
-        """)
+        use_rollup = self._rollup_ready()
+        totals = sentiment_totals(
+            self.session,
+            {
+                "recent": split_window(recent_start, now, use_rollup=use_rollup),
+                "previous": split_window(previous_start, recent_start, use_rollup=use_rollup),
+            },
+            entity_ids=entity_ids
+        )
         
-        previous = self.session.execute(
-            previous_query,
-            {"entity_id": entity_id_param, "previous_start": previous_start, "recent_start": recent_start}
-        ).fetchone()
-        
-        # Validation
-        recent_count = recent.count if recent and recent.count else 0
-        previous_count = previous.count if previous and previous.count else 0
-        
-        if recent_count < min_sample_size or previous_count < min_sample_size:
-            return {
-                "error": "Insufficient data",
-                "recent_count": recent_count,
-                "previous_count": previous_count,
-                "min_required": min_sample_size
+        results = {}
+        for entity_id in entity_ids:
+            recent = totals.get(("recent", entity_id, None))
+            previous = totals.get(("previous", entity_id, None))
+            recent_count = recent.signal_count if recent else 0
+            previous_count = previous.signal_count if previous else 0
+            
+            if recent_count < min_sample_size or previous_count < min_sample_size:
+                results[entity_id] = {
+                    "error": "Insufficient data",
+                    "recent_count": recent_count,
+                    "previous_count": previous_count,
+                    "min_required": min_sample_size
+                }
+                continue
+            
+            # Calculate velocity
+            if previous.avg == 0:
+                percent_change = 0
+            else:
+                percent_change = ((recent.avg - previous.avg) / abs(previous.avg)) * 100
+            
+            results[entity_id] = {
+                "entity_id": str(entity_id),
+                "window_hours": window_hours,
+                "recent_sentiment": round(float(recent.avg), 3),
+                "previous_sentiment": round(float(previous.avg), 3),
+                "percent_change": round(percent_change, 1),
+                "recent_sample_size": recent_count,
+                "previous_sample_size": previous_count,
+                "alert": abs(percent_change) > 30,  # Alert threshold
+                "direction": "up" if percent_change > 0 else "down",
+                "calculated_at": now.isoformat()
             }
-        
-        # Calculate velocity
-        if previous.avg_sentiment == 0:
-            percent_change = 0
-        else:
-            percent_change = (
-                (recent.avg_sentiment - previous.avg_sentiment) / abs(previous.avg_sentiment)
-            ) * 100
-        
-        return {
-            "entity_id": str(entity_id),
-            "window_hours": window_hours,
-            "recent_sentiment": round(float(recent.avg_sentiment), 3),
-            "previous_sentiment": round(float(previous.avg_sentiment), 3),
-            "percent_change": round(percent_change, 1),
-            "recent_sample_size": recent.count,
-            "previous_sample_size": previous.count,
-            "alert": abs(percent_change) > 30,  # Alert threshold
-            "direction": "up" if percent_change > 0 else "down",
-            "calculated_at": now.isoformat()
-        }
+        return results
     
     def compute_brief_velocity(
         self,
@@ -588,6 +645,9 @@ class AnalyticsService:
         except (AttributeError, TypeError):
             is_sqlite = False
         
+        if self._rollup_ready():
+            return self._sentiment_history_from_rollup(entity_id, days, is_sqlite)
+        
         if is_sqlite:
             # SQLite-compatible query
             entity_id_param = str(entity_id).replace('-', '')
@@ -637,6 +697,181 @@ class AnalyticsService:
         
         return df
     
+    def _sentiment_history_from_rollup(
+        self,
+        entity_id: uuid.UUID,
+        days: int,
+        is_sqlite: bool
+    ) -> pd.DataFrame:
+        """get_entity_sentiment_history() from rollup hours, summed per day."""
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        totals = sentiment_totals(
+            self.session,
+            {"history": split_window(cutoff_date, start_inclusive=False)},
+            entity_ids=[entity_id],
+            by_hour=True
+        )
+        per_day: Dict[datetime, SentimentTotals] = {}
+        for (_, _, hour), total in totals.items():
+            day = hour.replace(hour=0)
+            if day in per_day:
+                per_day[day].merge(total)
+            else:
+                per_day[day] = total
+        rows = [
+            {
+                # Same date format as the raw queries: DATE() text / DATE_TRUNC timestamp
+                "date": day.date().isoformat() if is_sqlite else day,
+                "avg_sentiment": total.avg,
+                "mention_count": total.comment_count,
+                "total_likes": total.likes_sum,
+            }
+            for day, total in sorted(per_day.items())
+        ]
+        return pd.DataFrame(rows, columns=["date", "avg_sentiment", "mention_count", "total_likes"])
+    
+    def get_sentiment_history_many(
+        self,
+        entity_ids: List[uuid.UUID],
+        time_window: Tuple[datetime, datetime],
+        platforms: Optional[List[str]] = None
+    ) -> Dict[uuid.UUID, List[Dict[str, Any]]]:
+        """
+        Daily sentiment series for several entities at once (trend charts).
+        
+        One query grouped by (entity, day) over raw rows, or the hourly
+        rollup plus raw partial-hour edges while the rollup is fresh, no
+        matter how many entities are requested.
+        
+        Args:
+            entity_ids: UUIDs of entities to chart
+            time_window: Tuple of (start_date, end_date)
+            platforms: Optional list of platforms to filter by
+            
+        Returns:
+            Entity UUID -> list of dicts ordered by date, each with:
+            - date: Day (datetime at midnight)
+            - avg_sentiment: Average sentiment that day
+            - mention_count: Number of comments mentioning the entity that day
+            - total_likes: Sum of likes that day
+            Entities without mentions in the window map to an empty list.
+        """
+        series: Dict[uuid.UUID, List[Dict[str, Any]]] = {entity_id: [] for entity_id in entity_ids}
+        if not series:
+            return series
+        
+        per_day: Dict[Tuple[uuid.UUID, datetime], SentimentTotals] = {}
+        if self._rollup_ready():
+            totals = sentiment_totals(
+                self.session,
+                {"window": split_window(time_window[0], time_window[1])},
+                entity_ids=list(series),
+                platforms=platforms,
+                by_hour=True
+            )
+            for (_, entity_id, hour), total in totals.items():
+                key = (entity_id, hour.replace(hour=0))
+                if key in per_day:
+                    per_day[key].merge(total)
+                else:
+                    per_day[key] = total
+        else:
+            day = day_bucket(self.session, Comment.created_at)
+            query = (
+                select(
+                    ExtractedSignal.entity_id,
+                    day,
+                    func.avg(ExtractedSignal.numeric_value),
+                    func.count(func.distinct(ExtractedSignal.comment_id)),
+                    func.sum(Comment.likes)
+                )
+                .join(Comment, ExtractedSignal.comment_id == Comment.id)
+                .where(
+                    ExtractedSignal.entity_id.in_(list(series)),
+                    ExtractedSignal.signal_type == SignalType.SENTIMENT,
+                    ExtractedSignal.numeric_value.isnot(None),
+                    Comment.created_at.between(time_window[0], time_window[1])
+                )
+                .group_by(ExtractedSignal.entity_id, day)
+            )
+            if platforms:
+                query = query.join(Post, Comment.post_id == Post.id).where(Post.platform.in_(platforms))
+            for entity_id, bucket, avg_sentiment, mention_count, total_likes in self.session.execute(query):
+                series[entity_id].append({
+                    "date": as_bucket(bucket),
+                    "avg_sentiment": float(avg_sentiment),
+                    "mention_count": int(mention_count),
+                    "total_likes": int(total_likes or 0),
+                })
+        
+        for (entity_id, date), total in per_day.items():
+            series[entity_id].append({
+                "date": date,
+                "avg_sentiment": total.avg,
+                "mention_count": total.comment_count,
+                "total_likes": total.likes_sum,
+            })
+        for points in series.values():
+            points.sort(key=lambda point: point["date"])
+        return series
+    
+    def get_platform_sentiment_many(
+        self,
+        entity_ids: List[uuid.UUID],
+        time_window: Tuple[datetime, datetime],
+        platforms: Optional[List[str]] = None
+    ) -> Dict[uuid.UUID, List[Dict[str, Any]]]:
+        """
+        Per-platform sentiment of several entities (cross-platform deltas).
+        
+        One query grouped by (entity, platform), however many entities are
+        requested.
+        
+        Args:
+            entity_ids: UUIDs of entities to analyze
+            time_window: Tuple of (start_date, end_date)
+            platforms: Optional list of platforms to filter by
+            
+        Returns:
+            Entity UUID -> list of dicts ordered by platform, each with:
+            - platform: Platform name
+            - avg_sentiment: Average sentiment on that platform
+            - mention_count: Number of comments mentioning the entity there
+            Entities without mentions in the window map to an empty list.
+        """
+        breakdown: Dict[uuid.UUID, List[Dict[str, Any]]] = {entity_id: [] for entity_id in entity_ids}
+        if not breakdown:
+            return breakdown
+        
+        query = (
+            select(
+                ExtractedSignal.entity_id,
+                Post.platform,
+                func.avg(ExtractedSignal.numeric_value),
+                func.count(func.distinct(Comment.id))
+            )
+            .join(Comment, ExtractedSignal.comment_id == Comment.id)
+            .join(Post, Comment.post_id == Post.id)
+            .where(
+                ExtractedSignal.entity_id.in_(list(breakdown)),
+                ExtractedSignal.signal_type == SignalType.SENTIMENT,
+                ExtractedSignal.numeric_value.isnot(None),
+                Comment.created_at.between(time_window[0], time_window[1])
+            )
+            .group_by(ExtractedSignal.entity_id, Post.platform)
+            .order_by(ExtractedSignal.entity_id, Post.platform)
+        )
+        if platforms:
+            query = query.where(Post.platform.in_(platforms))
+        
+        for entity_id, platform, avg_sentiment, mention_count in self.session.execute(query):
+            breakdown[entity_id].append({
+                "platform": platform,
+                "avg_sentiment": float(avg_sentiment),
+                "mention_count": int(mention_count),
+            })
+        return breakdown
+    
     def get_comment_count(self, time_window: Tuple[datetime, datetime]) -> int:
         """
         Simple count of comments in window.
@@ -694,7 +929,9 @@ class AnalyticsService:
         self,
         min_mentions: int = 5,
         reviewed: bool = False,
-        limit: int = 50
+        limit: int = 50,
+        time_window: Optional[Tuple[datetime, datetime]] = None,
+        platforms: Optional[List[str]] = None
     ) -> pd.DataFrame:
         """
         Get list of entities discovered by spaCy but not in MonitoredEntity.
@@ -704,10 +941,43 @@ class AnalyticsService:
             min_mentions: Minimum mention count to include
             reviewed: Include only reviewed (True) or unreviewed (False)
             limit: Maximum number to return
+            time_window: Count only mentions in this (start, end) window,
+                from the discovered_entity_mentions links (all-time counts
+                from discovered_entities if None)
+            platforms: Optional list of platforms to filter by (time_window only)
             
         Returns:
-            DataFrame with discovered entity information
+            DataFrame with discovered entity information; with a time_window
+            also total_likes, avg_sentiment and weighted_sentiment
         """
+        if time_window is not None:
+            rows = self._discovered_window_stats(
+                time_window[0],
+                time_window[1],
+                platforms=platforms,
+                min_mentions=min_mentions,
+                reviewed=reviewed,
+                limit=limit
+            )
+            records = []
+            for row in rows:
+                avg_sentiment, weighted_sentiment = self._discovered_sentiment(row)
+                records.append({
+                    'name': row.name,
+                    'entity_type': row.entity_type,
+                    'mention_count': row.mention_count,
+                    'first_seen_at': row.first_seen_at,
+                    'last_seen_at': row.last_seen_at,
+                    'sample_mentions': row.sample_mentions,
+                    'total_likes': row.total_likes or 0,
+                    'avg_sentiment': round(avg_sentiment, 3),
+                    'weighted_sentiment': round(weighted_sentiment, 3)
+                })
+            return pd.DataFrame(records, columns=[
+                'name', 'entity_type', 'mention_count', 'first_seen_at', 'last_seen_at',
+                'sample_mentions', 'total_likes', 'avg_sentiment', 'weighted_sentiment'
+            ])
+        
         query = text("""
         SELECT 
             name,
@@ -751,6 +1021,9 @@ class AnalyticsService:
         Returns:
             DataFrame with comparison metrics for each entity
         """
+        if self._rollup_ready():
+            return self._entity_comparison_from_rollup(entity_ids, time_window)
+        
         query = text("""
         SELECT 
             me.name as entity_name,
@@ -823,6 +1096,39 @@ class AnalyticsService:
         
         return df
     
+    def _entity_comparison_from_rollup(
+        self,
+        entity_ids: List[uuid.UUID],
+        time_window: Tuple[datetime, datetime]
+    ) -> pd.DataFrame:
+        """get_entity_comparison() over rollup hours plus raw partial-hour edges."""
+        totals = sentiment_totals(
+            self.session,
+            {"window": split_window(time_window[0], time_window[1])},
+            entity_ids=list(entity_ids)
+        )
+        is_sqlite = self.session.bind.dialect.name == 'sqlite'
+        entities = self._entity_info({entity_id for _, entity_id, _ in totals})
+        rows = [
+            {
+                "entity_name": entities[entity_id].name,
+                "mention_count": total.comment_count,
+                "avg_sentiment": total.avg,
+                "min_sentiment": total.score_min,
+                "max_sentiment": total.score_max,
+                # The SQLite query has no STDDEV and reports 0.0
+                "sentiment_stddev": 0.0 if is_sqlite else total.stddev,
+                "total_likes": total.likes_sum,
+            }
+            for (_, entity_id, _), total in totals.items()
+            if entity_id in entities
+        ]
+        rows.sort(key=lambda row: row["mention_count"], reverse=True)
+        return pd.DataFrame(rows, columns=[
+            "entity_name", "mention_count", "avg_sentiment", "min_sentiment",
+            "max_sentiment", "sentiment_stddev", "total_likes"
+        ])
+    
     def get_sentiment_distribution(
         self,
         time_window: Tuple[datetime, datetime],
@@ -838,6 +1144,11 @@ class AnalyticsService:
         Returns:
             Dictionary with counts: {"positive": 100, "negative": 50, "neutral": 25}
         """
+        if entity_id and self._rollup_ready():
+            return label_totals(
+                self.session, split_window(time_window[0], time_window[1]), entity_id
+            )
+        
         query_str = """
         SELECT 
             es.value as sentiment_label,
@@ -873,6 +1184,37 @@ class AnalyticsService:
         
         return distribution
     
+    def _caption_matcher(self) -> Tuple[CatalogMatcher, List[str]]:
+        """
+        Compiled matcher over active monitored entity names and aliases.
+        
+        Rebuilt only when the active catalog changes (one column query per
+        call to check).
+        
+        Returns:
+            (matcher, entity name per pattern id); patterns are lowercased and
+            ordered by entity name, so the lowest hit id is the first entity
+        """
+        rows = self.session.query(
+            MonitoredEntity.name,
+            MonitoredEntity.aliases
+        ).filter(MonitoredEntity.is_active.is_(True)).order_by(MonitoredEntity.name).all()
+        catalog = tuple((row.name, tuple(alias for alias in (row.aliases or []) if alias)) for row in rows)
+        
+        cached = self._caption_matcher_cache
+        if cached is not None and cached[0] == catalog:
+            return cached[1], cached[2]
+        
+        patterns: List[str] = []
+        pattern_names: List[str] = []
+        for name, aliases in catalog:
+            for pattern in (name, *aliases):
+                patterns.append(pattern.strip().lower())
+                pattern_names.append(name)
+        matcher = CatalogMatcher(patterns)
+        self._caption_matcher_cache = (catalog, matcher, pattern_names)
+        return matcher, pattern_names
+    
     def get_top_posts(
         self,
         start_date: datetime,
@@ -883,82 +1225,113 @@ class AnalyticsService:
         """
         Get top posts by comment volume with sentiment analysis.
         
+        Comment count, likes, average sentiment and the most-mentioned
+        monitored entity in the comments come from one grouped query (CTEs
+        plus a ROW_NUMBER window), however many posts are returned. The top
+        entity is taken from the post caption first, matched with a compiled
+        CatalogMatcher, and falls back to the comment mentions.
+        
         Returns list of dicts with post performance metrics.
         """
+        window_comments = (
+            select(
+                Comment.id.label('comment_id'),
+                Comment.post_id.label('post_id'),
+                Comment.likes.label('likes')
+            )
+            .where(Comment.created_at.between(start_date, end_date))
+        )
+        if platform:
+            window_comments = window_comments.join(Post, Comment.post_id == Post.id).where(
+                Post.platform == platform
+            )
+        window_comments = window_comments.cte('window_comments')
+        
+        comment_count = func.count(window_comments.c.comment_id)
+        top_posts = (
+            select(
+                window_comments.c.post_id.label('post_id'),
+                comment_count.label('comment_count'),
+                func.sum(window_comments.c.likes).label('total_likes')
+            )
+            .group_by(window_comments.c.post_id)
+            .order_by(comment_count.desc(), window_comments.c.post_id)
+            .limit(limit)
+            .cte('top_posts')
+        )
+        
+        # Sentiment signals on the window comments of the top posts only
+        post_signals = (
+            select(
+                window_comments.c.post_id.label('post_id'),
+                ExtractedSignal.id.label('signal_id'),
+                ExtractedSignal.entity_id.label('entity_id'),
+                ExtractedSignal.numeric_value.label('numeric_value')
+            )
+            .select_from(ExtractedSignal)
+            .join(window_comments, ExtractedSignal.comment_id == window_comments.c.comment_id)
+            .where(
+                window_comments.c.post_id.in_(select(top_posts.c.post_id)),
+                ExtractedSignal.signal_type == SignalType.SENTIMENT
+            )
+            .cte('post_signals')
+        )
+        
+        post_sentiment = (
+            select(
+                post_signals.c.post_id.label('post_id'),
+                func.avg(post_signals.c.numeric_value).label('avg_sentiment')
+            )
+            .group_by(post_signals.c.post_id)
+            .subquery('post_sentiment')
+        )
+        
+        mentions = func.count(post_signals.c.signal_id)
+        ranked_entities = (
+            select(
+                post_signals.c.post_id.label('post_id'),
+                MonitoredEntity.name.label('entity_name'),
+                func.row_number().over(
+                    partition_by=post_signals.c.post_id,
+                    order_by=(mentions.desc(), MonitoredEntity.name)
+                ).label('entity_rank')
+            )
+            .join(MonitoredEntity, MonitoredEntity.id == post_signals.c.entity_id)
+            .group_by(post_signals.c.post_id, MonitoredEntity.name)
+            .subquery('ranked_entities')
+        )
+        
         query = (
-            self.session.query(
+            select(
                 Post.id,
                 Post.platform,
                 Post.url,
                 Post.caption,
-                func.count(Comment.id).label('comment_count'),
-                func.sum(Comment.likes).label('total_likes'),
+                top_posts.c.comment_count,
+                top_posts.c.total_likes,
+                post_sentiment.c.avg_sentiment,
+                ranked_entities.c.entity_name.label('comment_top_entity')
             )
-            .join(Comment, Comment.post_id == Post.id)
-            .filter(Comment.created_at.between(start_date, end_date))
-            .group_by(Post.id, Post.platform, Post.url, Post.caption)
-            .order_by(func.count(Comment.id).desc())
-            .limit(limit)
+            .join(top_posts, top_posts.c.post_id == Post.id)
+            .outerjoin(post_sentiment, post_sentiment.c.post_id == Post.id)
+            .outerjoin(
+                ranked_entities,
+                and_(ranked_entities.c.post_id == Post.id, ranked_entities.c.entity_rank == 1)
+            )
+            .order_by(top_posts.c.comment_count.desc(), Post.id)
         )
+        rows = self.session.execute(query).all()
+        if not rows:
+            return []
         
-        if platform:
-            query = query.filter(Post.platform == platform)
-        
-        # Get all monitored entities once for caption matching
-        monitored_entities = self.session.query(MonitoredEntity).filter_by(is_active=True).all()
+        matcher, pattern_names = self._caption_matcher()
         
         results = []
-        for row in query.all():
-            # Get average sentiment for this post's comments
-            sentiment_query = (
-                self.session.query(func.avg(ExtractedSignal.numeric_value))
-                .join(Comment, ExtractedSignal.comment_id == Comment.id)
-                .filter(
-                    Comment.post_id == row.id,
-                    ExtractedSignal.signal_type == SignalType.SENTIMENT,
-                    Comment.created_at.between(start_date, end_date)
-                )
-            )
-            avg_sentiment = sentiment_query.scalar() or 0.0
-            
-            # FIX 1: Get top entity from POST CAPTION first (not from comment signals)
-            # This ensures a post about "Meghan Markle" shows Meghan as top entity
-            top_entity = None
-            caption_lower = (row.caption or '').lower()
-            
-            # Check if any monitored entity appears in the post caption
-            for entity in monitored_entities:
-                names_to_check = [entity.name.lower()]
-                if entity.aliases:
-                    names_to_check.extend([alias.lower() for alias in entity.aliases])
-                
-                for name in names_to_check:
-                    if name in caption_lower:
-                        top_entity = entity.name
-                        break
-                if top_entity:
-                    break
-            
-            # If no entity found in caption, fall back to most-mentioned in comments
-            if not top_entity:
-                top_entity_query = (
-                    self.session.query(
-                        MonitoredEntity.name,
-                        func.count(ExtractedSignal.id).label('mention_count')
-                    )
-                    .join(ExtractedSignal, ExtractedSignal.entity_id == MonitoredEntity.id)
-                    .join(Comment, ExtractedSignal.comment_id == Comment.id)
-                    .filter(
-                        Comment.post_id == row.id,
-                        ExtractedSignal.signal_type == SignalType.SENTIMENT,
-                        ExtractedSignal.entity_id.isnot(None),
-                        Comment.created_at.between(start_date, end_date)
-                    )
-                    .group_by(MonitoredEntity.name)
-                    .order_by(func.count(ExtractedSignal.id).desc())
-                    .first()
-                )
-                top_entity = top_entity_query[0] if top_entity_query else None
+        for row in rows:
+            # Top entity from the POST CAPTION first (not from comment signals),
+            # so a post about "Meghan Markle" shows Meghan as top entity
+            hits = matcher.find((row.caption or '').lower()) if len(matcher) else []
+            top_entity = pattern_names[hits[0]] if hits else row.comment_top_entity
             
             caption = row.caption
             if caption and len(caption) > 100:
@@ -971,7 +1344,7 @@ class AnalyticsService:
                 'caption': caption or '',
                 'comment_count': row.comment_count,
                 'total_likes': row.total_likes or 0,
-                'avg_sentiment': round(float(avg_sentiment), 2),
+                'avg_sentiment': round(float(row.avg_sentiment or 0.0), 2),
                 'top_entity': top_entity,
             })
         
@@ -1096,13 +1469,6 @@ class AnalyticsService:
         if len(monitored_df) > 0:
             monitored_df['is_monitored'] = True
         
-        # Get discovered entities with enough mentions in the time period
-        # For discovered entities, we need to count mentions by searching comment text
-        # since they don't have entity_id links in ExtractedSignal
-        all_discovered = self.session.query(DiscoveredEntity).filter(
-            DiscoveredEntity.mention_count >= min_mentions
-        ).limit(limit * 3).all()
-        
         # FIX 3B: Filter garbage entities at query time
         # Blocklist matching enrichment.py and cleanup script
         BLOCKLIST = {
@@ -1118,123 +1484,46 @@ class AnalyticsService:
             'mexico', 'america', 'usa', 'uk', 'canada',
         }
         
-        # Filter out garbage entities
-        all_discovered = [
-            d for d in all_discovered
-            if d.name.lower().strip() not in BLOCKLIST
-            and '■' not in d.name
-            and '□' not in d.name
-            and len(d.name) >= 2
-            and any(c.isalpha() for c in d.name)
-        ]
-        
-        discovered_results = []
-        for discovered in all_discovered:
-            entity_name = discovered.name
-            
-            # Count mentions in time period by searching comment text
-            mention_query = (
-                self.session.query(
-                    func.count(Comment.id).label('mention_count'),
-                    func.sum(Comment.likes).label('total_likes')
-                )
-                .join(Post, Comment.post_id == Post.id)
-                .filter(
-                    Comment.created_at.between(start_date, end_date),
-                    Comment.text.ilike(f"%{entity_name}%")
-                )
-            )
-            
-            if platforms:
-                mention_query = mention_query.filter(Post.platform.in_(platforms))
-            
-            mention_result = mention_query.first()
-            if mention_result and mention_result.mention_count and mention_result.mention_count >= min_mentions:
-                discovered_results.append({
-                    'name': entity_name,
-                    'entity_type': discovered.entity_type or 'unknown',
-                    'mention_count': mention_result.mention_count,
-                    'total_likes': mention_result.total_likes or 0
-                })
-        
-        # Calculate sentiment for discovered entities
-        discovered_entities = []
+        # Get discovered entities with enough mentions in the time period:
+        # counts, likes and sentiment come from the discovered_entity_mentions
+        # links written during enrichment, in one grouped query
+        discovered_rows = self._discovered_window_stats(
+            start_date,
+            end_date,
+            platforms=platforms,
+            min_mentions=min_mentions,
+            exclude_names=BLOCKLIST,
+            limit=limit * 3
+        )
         monitored_names = set(monitored_df['entity_name'].str.lower()) if len(monitored_df) > 0 else set()
         
-        for row in discovered_results:
-            if isinstance(row, dict):
-                entity_name = row['name']
-                mention_count = row['mention_count']
-                total_likes = row['total_likes']
-                entity_type = row['entity_type']
-            else:
-                # Fallback for tuple/object format
-                entity_name = row.name if hasattr(row, 'name') else row[0]
-                mention_count = row.mention_count if hasattr(row, 'mention_count') else row[1]
-                total_likes = row.total_likes if hasattr(row, 'total_likes') else row[2]
-                entity_type = row.entity_type if hasattr(row, 'entity_type') else row[3]
+        discovered_entities = []
+        for row in discovered_rows:
+            entity_name = row.name
+            # Filter out garbage entities
+            if (
+                '■' in entity_name
+                or '□' in entity_name
+                or len(entity_name) < 2
+                or not any(c.isalpha() for c in entity_name)
+            ):
+                continue
             
             # Skip if already in monitored (monitored takes precedence)
             if entity_name.lower() in monitored_names:
                 continue
             
-            # Get sentiment for comments mentioning this discovered entity
-            # Find comments where entity name appears in comment text
-            # Then get average sentiment from those comments' sentiment signals
-            mention_comment_ids = (
-                self.session.query(Comment.id)
-                .join(Post, Comment.post_id == Post.id)
-                .filter(
-                    Comment.created_at.between(start_date, end_date),
-                    Comment.text.ilike(f"%{entity_name}%")
-                )
-            )
-            
-            if platforms:
-                mention_comment_ids = mention_comment_ids.filter(Post.platform.in_(platforms))
-            
-            comment_id_list = [c.id for c in mention_comment_ids.all()]
-            
-            if not comment_id_list:
-                avg_sentiment = 0.0
-                weighted_sentiment = 0.0
-            else:
-                sentiment_result = (
-                    self.session.query(
-                        func.avg(ExtractedSignal.numeric_value).label('avg_sentiment'),
-                        func.sum(ExtractedSignal.numeric_value * ExtractedSignal.weight_score).label('weighted_sum'),
-                        func.sum(ExtractedSignal.weight_score).label('weight_sum')
-                    )
-                    .filter(
-                        ExtractedSignal.comment_id.in_(comment_id_list),
-                        ExtractedSignal.signal_type == SignalType.SENTIMENT,
-                        ExtractedSignal.numeric_value.isnot(None)
-                    )
-                ).first()
-            
-            avg_sentiment = 0.0
-            weighted_sentiment = 0.0
-            
-            if sentiment_result and sentiment_result.avg_sentiment:
-                avg_sentiment = float(sentiment_result.avg_sentiment)
-                if sentiment_result.weight_sum and sentiment_result.weight_sum > 0:
-                    weighted_sentiment = float(sentiment_result.weighted_sum) / float(sentiment_result.weight_sum)
-                else:
-                    weighted_sentiment = avg_sentiment
-            
+            avg_sentiment, weighted_sentiment = self._discovered_sentiment(row)
             discovered_entities.append({
                 'entity_id': None,  # No entity_id for discovered entities
                 'entity_name': entity_name,
-                'entity_type': entity_type or 'unknown',
-                'mention_count': mention_count,
+                'entity_type': row.entity_type or 'unknown',
+                'mention_count': row.mention_count,
                 'avg_sentiment': round(avg_sentiment, 3),
-                'total_likes': total_likes or 0,
+                'total_likes': row.total_likes or 0,
                 'weighted_sentiment': round(weighted_sentiment, 3),
                 'is_monitored': False
             })
-            
-            # Skip rest of loop if we've processed this entity
-            continue
         
         # Combine monitored and discovered
         if len(monitored_df) > 0:
@@ -1256,3 +1545,103 @@ class AnalyticsService:
                 'avg_sentiment', 'total_likes', 'weighted_sentiment', 'is_monitored'
             ])
 
+    def _discovered_window_stats(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        platforms: Optional[List[str]] = None,
+        min_mentions: int = 1,
+        reviewed: Optional[bool] = None,
+        exclude_names: Optional[set] = None,
+        limit: Optional[int] = None
+    ) -> list:
+        """
+        Per-window mention stats of discovered entities, in one grouped join.
+        
+        Joins discovered_entity_mentions to the comments in the window; the
+        sentiment signals of those comments are pre-aggregated per comment so
+        the likes sum isn't multiplied by the number of signals.
+        
+        Args:
+            start_date: Start of time window
+            end_date: End of time window
+            platforms: Optional list of platforms to filter by
+            min_mentions: Minimum mentions in the window
+            reviewed: Only reviewed (True) / unreviewed (False) entities, or all
+            exclude_names: Lowercased names to skip
+            limit: Maximum number of rows, by mentions descending
+            
+        Returns:
+            Rows with name, entity_type, first_seen_at, last_seen_at,
+            sample_mentions, mention_count, total_likes and the sentiment
+            sums read by _discovered_sentiment
+        """
+        mentions = (
+            select(
+                DiscoveredEntityMention.discovered_entity_id.label('discovered_entity_id'),
+                Comment.id.label('comment_id'),
+                Comment.likes.label('likes')
+            )
+            .join(Comment, Comment.id == DiscoveredEntityMention.comment_id)
+            .where(Comment.created_at.between(start_date, end_date))
+        )
+        if platforms:
+            mentions = mentions.join(Post, Comment.post_id == Post.id).where(Post.platform.in_(platforms))
+        mentions = mentions.cte('window_mentions')
+        
+        sentiment = (
+            select(
+                ExtractedSignal.comment_id.label('comment_id'),
+                func.sum(ExtractedSignal.numeric_value).label('score_sum'),
+                func.count(ExtractedSignal.numeric_value).label('score_count'),
+                func.sum(ExtractedSignal.numeric_value * ExtractedSignal.weight_score).label('weighted_sum'),
+                func.sum(ExtractedSignal.weight_score).label('weight_sum')
+            )
+            .where(
+                ExtractedSignal.comment_id.in_(select(mentions.c.comment_id)),
+                ExtractedSignal.signal_type == SignalType.SENTIMENT,
+                ExtractedSignal.numeric_value.isnot(None)
+            )
+            .group_by(ExtractedSignal.comment_id)
+            .subquery('comment_sentiment')
+        )
+        
+        mention_count = func.count(mentions.c.comment_id)
+        query = (
+            select(
+                DiscoveredEntity.name,
+                DiscoveredEntity.entity_type,
+                DiscoveredEntity.first_seen_at,
+                DiscoveredEntity.last_seen_at,
+                DiscoveredEntity.sample_mentions,
+                mention_count.label('mention_count'),
+                func.sum(mentions.c.likes).label('total_likes'),
+                func.sum(sentiment.c.score_sum).label('score_sum'),
+                func.sum(sentiment.c.score_count).label('score_count'),
+                func.sum(sentiment.c.weighted_sum).label('weighted_sum'),
+                func.sum(sentiment.c.weight_sum).label('weight_sum')
+            )
+            .join(mentions, mentions.c.discovered_entity_id == DiscoveredEntity.id)
+            .outerjoin(sentiment, sentiment.c.comment_id == mentions.c.comment_id)
+            .group_by(DiscoveredEntity.id)
+            .having(mention_count >= min_mentions)
+            .order_by(mention_count.desc(), DiscoveredEntity.name)
+        )
+        if reviewed is not None:
+            query = query.where(DiscoveredEntity.reviewed == reviewed)
+        if exclude_names:
+            query = query.where(func.lower(func.trim(DiscoveredEntity.name)).notin_(exclude_names))
+        if limit:
+            query = query.limit(limit)
+        
+        return self.session.execute(query).all()
+    
+    @staticmethod
+    def _discovered_sentiment(row) -> Tuple[float, float]:
+        """(avg_sentiment, weighted_sentiment) of a _discovered_window_stats row."""
+        if not row.score_count or not row.score_sum:
+            return 0.0, 0.0
+        avg_sentiment = float(row.score_sum) / float(row.score_count)
+        if row.weight_sum and row.weight_sum > 0:
+            return avg_sentiment, float(row.weighted_sum) / float(row.weight_sum)
+        return avg_sentiment, avg_sentiment
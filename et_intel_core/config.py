@@ -15,6 +15,50 @@ class Settings(BaseSettings):
     
     # OpenAI API (optional)
     openai_api_key: str | None = None
+    openai_base_url: str | None = None  # Override for proxies / local fake endpoints
+    
+    # Concurrent enrichment (cli.py enrich --concurrency)
+    enrichment_concurrency: int = 8
+    openai_requests_per_minute: int = 500
+    openai_tokens_per_minute: int = 200_000
+    openai_max_retries: int = 5
+    
+    # Hybrid sentiment: concurrent escalations per batch, and token prices
+    # used to estimate the cost saved by not escalating
+    hybrid_escalation_concurrency: int = 8
+    openai_input_cost_per_1m_tokens: float = 0.15
+    openai_output_cost_per_1m_tokens: float = 0.60
+    
+    # Multi-process enrichment (cli.py enrich --workers)
+    enrichment_claim_batch_size: int = 200
+    enrichment_claim_ttl_seconds: int = 600
+    
+    # LLM result cache (see et_intel_core/nlp/llm_cache.py)
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = "data/llm_cache.sqlite3"
+    llm_cache_max_entries: int = 200_000
+    llm_cache_timeout_seconds: float = 30.0  # wait for another process's write lock
+    
+    # Hourly entity-sentiment rollup (see et_intel_core/analytics/hourly_rollup.py):
+    # read it for whole hours of analytics windows; how far before the last
+    # refresh to look for late-committed signals when refreshing
+    analytics_use_hourly_rollup: bool = True
+    rollup_refresh_overlap_seconds: int = 900
+    
+    # Brief building (BriefBuilder.build): run independent sections on a
+    # thread pool, one pooled session per section
+    brief_parallel_sections: bool = False
+    brief_section_workers: int = 4
+    
+    # Brief narratives (NarrativeGenerator.generate_many): concurrent LLM
+    # calls, seconds per call, seconds before all pending calls fall back
+    narrative_concurrency: int = 8
+    narrative_timeout_seconds: float = 20.0
+    narrative_budget_seconds: float = 45.0
+    
+    # spaCy NER batching (EntityExtractor.extract_many)
+    spacy_batch_size: int = 256
+    spacy_n_process: int = 1
     
     # Sentiment Backend
     sentiment_backend: Literal["rule_based", "openai", "hybrid"] = "rule_based"
@@ -0,0 +1,45 @@
+"""
+Substring search on comment text that can use the trigram index.
+
+PostgreSQL is the production target: comments.text carries a GIN
+``gin_trgm_ops`` index (migration 3b8e6f0d9a21), so ``text ILIKE '%term%'``
+is answered from the index for terms of TRIGRAM_MIN_LENGTH or more
+characters instead of scanning the table. SQLite (the test suite) has no
+trigram support; ILIKE compiles to ``lower(text) LIKE lower(pattern)`` there,
+a table scan with the same results.
+"""
+
+from typing import Any, Iterable
+
+from sqlalchemy import false, or_
+
+# pg_trgm can't use the index for shorter patterns (it falls back to a scan)
+TRIGRAM_MIN_LENGTH = 3
+LIKE_ESCAPE = "\\"
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so the term matches literally."""
+    return (
+        term.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+
+
+def contains(column: Any, term: str):
+    """Case-insensitive substring condition on ``column``."""
+    return column.ilike(f"%{escape_like(term)}%", escape=LIKE_ESCAPE)
+
+
+def contains_any(column: Any, terms: Iterable[str]):
+    """
+    Case-insensitive "contains any of" condition on ``column``.
+
+    Empty terms are dropped and duplicates (ignoring case) collapsed; with no
+    terms left the condition is always false.
+    """
+    unique = list(dict.fromkeys(term.strip().lower() for term in terms if term and term.strip()))
+    if not unique:
+        return false()
+    return or_(*(contains(column, term) for term in unique))
@@ -0,0 +1,93 @@
+"""
+Dialect-aware INSERT ... ON CONFLICT helpers for set-based writes.
+
+PostgreSQL is the production target; SQLite is used by the test suite.
+Both support ``INSERT ... ON CONFLICT`` through SQLAlchemy's dialect-specific
+``insert()`` constructs, so bulk write paths build statements through here
+instead of importing a dialect directly.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, TypeVar
+
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
+
+T = TypeVar("T")
+
+
+def dialect_name(session: Session) -> str:
+    """
+    Return the dialect name of the session's bind ("postgresql", "sqlite", ...).
+
+    Falls back to "postgresql" when the bind can't be inspected (e.g. mocks).
+    """
+    try:
+        return session.bind.dialect.name
+    except (AttributeError, TypeError):
+        return "postgresql"
+
+
+def upsert_insert(session: Session, table: Any):
+    """
+    Build a dialect-specific INSERT that supports ``on_conflict_do_*``.
+
+    Args:
+        session: SQLAlchemy session (used to pick the dialect)
+        table: Mapped class or Table to insert into
+
+    Returns:
+        A PostgreSQL or SQLite ``Insert`` construct
+    """
+    if dialect_name(session) == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
+
+
+def conflict_target(session: Session, constraint: str, columns: List[str]) -> Dict[str, Any]:
+    """
+    Keyword arguments naming the ON CONFLICT target for the session's dialect.
+
+    PostgreSQL can target a named constraint directly; SQLite only accepts the
+    indexed column list, so the same unique key is spelled out by column.
+
+    Args:
+        session: SQLAlchemy session (used to pick the dialect)
+        constraint: Name of the unique constraint/index (PostgreSQL)
+        columns: Columns covered by that constraint (SQLite)
+    """
+    if dialect_name(session) == "sqlite":
+        return {"index_elements": columns}
+    return {"constraint": constraint}
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Yield lists of at most ``size`` items from any iterable.
+
+    Args:
+        items: Source iterable (consumed lazily)
+        size: Maximum chunk length (must be >= 1)
+    """
+    if size < 1:
+        raise ValueError("chunk size must be >= 1")
+    chunk: List[T] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def dedupe_rows(rows: Iterable[Dict[str, Any]], key_columns: List[str]) -> List[Dict[str, Any]]:
+    """
+    Collapse rows sharing the same conflict key, keeping the last one.
+
+    PostgreSQL rejects an ``ON CONFLICT DO UPDATE`` statement that touches the
+    same row twice, so every chunk must be unique on its conflict target.
+    """
+    latest: Dict[tuple, Dict[str, Any]] = {}
+    for row in rows:
+        latest[tuple(row[col] for col in key_columns)] = row
+    return list(latest.values())
@@ -20,7 +20,13 @@ from et_intel_core.models.comment import Comment
 from et_intel_core.models.monitored_entity import MonitoredEntity
 from et_intel_core.models.extracted_signal import ExtractedSignal
 from et_intel_core.models.discovered_entity import DiscoveredEntity
+from et_intel_core.models.discovered_entity_mention import DiscoveredEntityMention
 from et_intel_core.models.review_queue import ReviewQueue
+from et_intel_core.models.enrichment_claim import EnrichmentClaim
+from et_intel_core.models.comment_enrichment import CommentEnrichment
+from et_intel_core.models.catalog_version import CatalogVersion
+from et_intel_core.models.entity_sentiment_hourly import EntitySentimentHourly
+from et_intel_core.models.rollup_watermark import RollupWatermark
 
 __all__ = [
     "Base",
@@ -33,6 +39,12 @@ __all__ = [
     "MonitoredEntity",
     "ExtractedSignal",
     "DiscoveredEntity",
+    "DiscoveredEntityMention",
     "ReviewQueue",
+    "EnrichmentClaim",
+    "CommentEnrichment",
+    "CatalogVersion",
+    "EntitySentimentHourly",
+    "RollupWatermark",
 ]
 
@@ -0,0 +1,34 @@
+"""
+CatalogVersion model - per-entity fingerprints of each catalog version used.
+"""
+
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+
+from et_intel_core.models.base import Base
+
+
+class CatalogVersion(Base):
+    """
+    Written the first time enrichment runs on a monitored-entity catalog.
+    
+    entity_fingerprints maps entity id -> fingerprint of its name, canonical
+    name, type and aliases. Diffing an old version against the current one
+    tells which entities were edited, added or removed, so only comments
+    mentioning those need re-enrichment.
+    """
+    __tablename__ = "catalog_versions"
+    
+    version: Mapped[str] = mapped_column(String(32), primary_key=True)
+    entity_fingerprints: Mapped[Dict[str, str]] = mapped_column(JSONB, default=dict)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow
+    )
+
+    def __repr__(self) -> str:
+        return f"<CatalogVersion(version={self.version}, entities={len(self.entity_fingerprints or {})})>"
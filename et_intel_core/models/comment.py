@@ -2,11 +2,12 @@
 Comment model - the atomic unit of data.
 """
 
+import hashlib
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional
 
-from sqlalchemy import String, DateTime, ForeignKey, Text, Integer
+from sqlalchemy import String, DateTime, ForeignKey, Text, Integer, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 
@@ -14,6 +15,58 @@ from et_intel_core.models.base import Base
 from et_intel_core.models.enums import ContextType
 
 
+def normalize_comment_timestamp(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalize a timestamp to naive UTC so DB values and source values compare equal."""
+    if value is None:
+        return None
+    if hasattr(value, "to_pydatetime"):
+        value = value.to_pydatetime()
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def compute_content_hash(
+    author_name: str,
+    text: str,
+    created_at: Optional[datetime]
+) -> str:
+    """
+    Natural-key hash used to dedupe comments within a post.
+    
+    Covers author, text and the UTC-normalized timestamp, i.e. the same key
+    the ingestion service has always deduped on. It never depends on the
+    platform comment id, so records with and without one (and rows from
+    before external_id existed) hash alike; the id is matched separately on
+    (post_id, external_id).
+    
+    Args:
+        author_name: Comment author username
+        text: Comment text
+        created_at: When the comment was posted
+        
+    Returns:
+        Hex SHA-256 digest (64 chars)
+    """
+    ts = normalize_comment_timestamp(created_at)
+    key = "\x1f".join([
+        author_name or "",
+        text or "",
+        ts.isoformat() if ts else "",
+    ])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _default_content_hash(context) -> str:
+    """Column default: fill content_hash for rows inserted without one."""
+    params = context.get_current_parameters()
+    return compute_content_hash(
+        params.get("author_name"),
+        params.get("text"),
+        params.get("created_at"),
+    )
+
+
 class Comment(Base):
     """
     The atomic unit of data.
@@ -42,6 +95,15 @@ class Comment(Base):
     likes: Mapped[int] = mapped_column(Integer, default=0)
     reply_count: Mapped[int] = mapped_column(Integer, default=0)
     
+    # Identity (dedup keys for re-ingest): platform comment id when the
+    # source has one, else content_hash (see compute_content_hash)
+    external_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    content_hash: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        default=_default_content_hash
+    )
+    
     # Threading
     parent_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         ForeignKey("comments.id"), 
@@ -71,6 +133,13 @@ class Comment(Base):
     )
     review_queue_items: Mapped[List["ReviewQueue"]] = relationship(back_populates="comment")
 
+    __table_args__ = (
+        # One row per natural key within a post; also the ON CONFLICT target
+        UniqueConstraint('post_id', 'content_hash', name='uq_comment_content_hash'),
+        # Re-scrapes carrying a platform comment id are matched on it first
+        Index('ix_comments_post_external_id', 'post_id', 'external_id'),
+    )
+
     def __repr__(self) -> str:
         return f"<Comment(id={self.id}, author={self.author_name}, text={self.text[:50]}...)>"
 
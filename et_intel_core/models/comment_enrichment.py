@@ -0,0 +1,46 @@
+"""
+CommentEnrichment model - which pipeline and catalog version enriched a comment.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from et_intel_core.models.base import Base
+
+
+class CommentEnrichment(Base):
+    """
+    One row per enriched comment, rewritten on every re-enrichment.
+    
+    pipeline_version identifies the sentiment provider, model and prompt
+    versions; catalog_version is the EntityContextSnapshot fingerprint of
+    the monitored-entity catalog in use. `cli.py enrich --stale-only`
+    compares both with the current ones to re-enrich only what changed.
+    """
+    __tablename__ = "comment_enrichments"
+    
+    comment_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("comments.id"),
+        primary_key=True
+    )
+    pipeline_version: Mapped[str] = mapped_column(String)
+    catalog_version: Mapped[str] = mapped_column(String(32))
+    enriched_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow
+    )
+    
+    __table_args__ = (
+        Index('ix_comment_enrichments_versions', 'pipeline_version', 'catalog_version'),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<CommentEnrichment(comment_id={self.comment_id}, "
+            f"pipeline={self.pipeline_version}, catalog={self.catalog_version})>"
+        )
@@ -0,0 +1,43 @@
+"""
+DiscoveredEntityMention model - which comments mentioned a discovered entity.
+"""
+
+import uuid
+
+from sqlalchemy import ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from et_intel_core.models.base import Base
+
+
+class DiscoveredEntityMention(Base):
+    """
+    Link between a DiscoveredEntity and a comment it was found in.
+    
+    Written during enrichment (see DiscoveredEntityBuffer), so reports can
+    count per-window mentions, likes and sentiment of discovered entities
+    with one grouped join instead of searching comment text per name.
+    """
+    __tablename__ = "discovered_entity_mentions"
+    
+    discovered_entity_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("discovered_entities.id"),
+        primary_key=True
+    )
+    comment_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("comments.id"),
+        primary_key=True
+    )
+    
+    __table_args__ = (
+        Index('ix_discovered_entity_mentions_comment', 'comment_id'),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<DiscoveredEntityMention(discovered_entity_id={self.discovered_entity_id}, "
+            f"comment_id={self.comment_id})>"
+        )
@@ -0,0 +1,54 @@
+"""
+EnrichmentClaim model - work claims for multi-process enrichment workers.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from et_intel_core.models.base import Base
+
+
+class EnrichmentClaim(Base):
+    """
+    One row per comment a worker has claimed (cli.py enrich --workers N).
+    
+    Lifecycle:
+    1. Worker locks unclaimed comments (SELECT ... FOR UPDATE SKIP LOCKED)
+       and inserts claims that expire at expires_at
+    2. Worker enriches the batch and sets completed_at
+    3. A crashed worker never completes; once expires_at passes, another
+       worker may take the claim over
+    
+    Completed claims stop a run from re-claiming comments that produced no
+    signals; they are purged when the next multi-worker run starts.
+    """
+    __tablename__ = "enrichment_claims"
+    
+    comment_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("comments.id"),
+        primary_key=True
+    )
+    worker_id: Mapped[str] = mapped_column(String)
+    claimed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True
+    )
+    
+    __table_args__ = (
+        Index('ix_enrichment_claims_worker', 'worker_id'),
+        Index('ix_enrichment_claims_expires', 'expires_at'),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<EnrichmentClaim(comment_id={self.comment_id}, worker={self.worker_id}, "
+            f"expires_at={self.expires_at}, completed_at={self.completed_at})>"
+        )
@@ -0,0 +1,58 @@
+"""
+EntitySentimentHourly model - pre-aggregated entity sentiment per hour.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import String, DateTime, ForeignKey, Float, Integer, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+from et_intel_core.models.base import Base
+
+
+class EntitySentimentHourly(Base):
+    """
+    Sentiment signals of one monitored entity, on one platform, for the
+    comments created in one hour.
+    
+    Holds the sums analytics windows need (counts, score sum, sum of
+    squares, like-weighted sum, likes, min/max and per-label counts), so
+    whole hours of a window are read from here instead of re-aggregating
+    extracted_signals. Maintained by et_intel_core.analytics.hourly_rollup.
+    """
+    __tablename__ = "entity_sentiment_hourly"
+    
+    entity_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("monitored_entities.id"),
+        primary_key=True
+    )
+    platform: Mapped[str] = mapped_column(String(50), primary_key=True)
+    hour: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    
+    # Over signals with a numeric score
+    comment_count: Mapped[int] = mapped_column(Integer, default=0)
+    signal_count: Mapped[int] = mapped_column(Integer, default=0)
+    score_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    score_sq_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    weighted_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    weight_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    likes_sum: Mapped[int] = mapped_column(Integer, default=0)
+    score_min: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    score_max: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    
+    # Over all sentiment signals: label ("positive", ...) -> count
+    label_counts: Mapped[Dict[str, int]] = mapped_column(JSONB, default=dict)
+    
+    __table_args__ = (
+        Index('ix_entity_sentiment_hourly_hour', 'hour'),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<EntitySentimentHourly(entity_id={self.entity_id}, platform={self.platform}, "
+            f"hour={self.hour}, signals={self.signal_count})>"
+        )
@@ -87,6 +87,7 @@ class ExtractedSignal(Base):
         Index('ix_signals_entity_type', 'entity_id', 'signal_type'),
         Index('ix_signals_comment', 'comment_id'),
         Index('ix_signals_numeric', 'signal_type', 'numeric_value'),
+        Index('ix_signals_created', 'created_at'),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,35 @@
+"""
+RollupWatermark model - how far a pre-aggregated table has been refreshed.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from et_intel_core.models.base import Base
+
+
+class RollupWatermark(Base):
+    """
+    One row per rollup table.
+    
+    refreshed_through is the newest extracted_signals.created_at the rollup
+    has absorbed; a newer signal means the rollup is stale until the next
+    refresh.
+    """
+    __tablename__ = "rollup_watermarks"
+    
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    refreshed_through: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True
+    )
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow
+    )
+
+    def __repr__(self) -> str:
+        return f"<RollupWatermark(name={self.name}, refreshed_through={self.refreshed_through})>"
@@ -3,6 +3,7 @@ NLP components for entity extraction and sentiment analysis.
 """
 
 from et_intel_core.nlp.entity_extractor import EntityExtractor, EntityMention
+from et_intel_core.nlp.catalog_matcher import CatalogMatcher
 from et_intel_core.nlp.sentiment import (
     SentimentProvider,
     SentimentResult,
@@ -11,15 +12,18 @@ from et_intel_core.nlp.sentiment import (
     HybridSentimentProvider,
     get_sentiment_provider
 )
+from et_intel_core.nlp.llm_cache import LLMResultCache
 
 __all__ = [
     "EntityExtractor",
     "EntityMention",
+    "CatalogMatcher",
     "SentimentProvider",
     "SentimentResult",
     "RuleBasedSentimentProvider",
     "OpenAISentimentProvider",
     "HybridSentimentProvider",
     "get_sentiment_provider",
+    "LLMResultCache",
 ]
 
@@ -0,0 +1,120 @@
+"""
+Aho-Corasick multi-pattern matcher for catalog names and aliases.
+
+Testing every alias with ``alias in text`` costs O(aliases) per comment.
+The automaton is compiled once from all patterns and then scans each text in
+a single pass, so per-comment cost depends on the text length (plus the
+number of hits), not on the catalog size.
+
+Matches are word-boundary aware: a pattern that starts (ends) with a word
+character only matches where the preceding (following) character is not one,
+the same rule as a regex ``\\b``. "Taylor" matches "taylor's tour" and
+"#taylor" but not "taylormade".
+"""
+
+from typing import Dict, Iterable, List, Set
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class CatalogMatcher:
+    """
+    Compiled automaton over a fixed list of (already lowercased) patterns.
+
+    Pattern ids are positions in the input list, so callers can map a hit
+    back to their own ordering. Empty and duplicate patterns are ignored
+    (a duplicate reports the id of its first occurrence).
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        Compile the automaton.
+
+        Args:
+            patterns: Patterns to match, in caller order (match case-sensitively;
+                lowercase both patterns and text for case-insensitive matching)
+        """
+        self.patterns: List[str] = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        seen: Set[str] = set()
+        for pattern_id, pattern in enumerate(self.patterns):
+            if not pattern or pattern in seen:
+                continue
+            seen.add(pattern)
+            self._add(pattern, pattern_id)
+        self._link()
+
+        self._word_start = [bool(p) and _is_word_char(p[0]) for p in self.patterns]
+        self._word_end = [bool(p) and _is_word_char(p[-1]) for p in self.patterns]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _add(self, pattern: str, pattern_id: int) -> None:
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append(pattern_id)
+
+    def _link(self) -> None:
+        """Breadth-first failure links; outputs are merged along them."""
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                if self._out[self._fail[child]]:
+                    self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> List[int]:
+        """
+        Ids of patterns occurring in ``text`` at word boundaries.
+
+        Returns:
+            Sorted, de-duplicated pattern ids
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        patterns = self.patterns
+        word_start = self._word_start
+        word_end = self._word_end
+        text_length = len(text)
+
+        found: Set[int] = set()
+        state = 0
+        for end, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            for pattern_id in out[state]:
+                if pattern_id in found:
+                    continue
+                if word_end[pattern_id] and end + 1 < text_length and _is_word_char(text[end + 1]):
+                    continue
+                start = end - len(patterns[pattern_id]) + 1
+                if word_start[pattern_id] and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                found.add(pattern_id)
+        return sorted(found)
@@ -4,13 +4,21 @@ Entity extraction using spaCy + custom catalog matching.
 
 import uuid
 from dataclasses import dataclass
-from typing import List, Tuple, Optional, Dict, Set
-from collections import defaultdict
+from typing import Any, FrozenSet, List, Tuple, Optional, Dict, Sequence, Set
+from collections import OrderedDict, defaultdict
 import re
 import spacy
 from spacy.language import Language
 
+from et_intel_core.config import settings
 from et_intel_core.models import MonitoredEntity
+from et_intel_core.nlp.catalog_matcher import CatalogMatcher
+
+# Only doc.ents is used; NER doesn't depend on these components
+NER_DISABLED_PIPES = ("parser", "lemmatizer")
+
+# Distinct captions whose context is kept (LRU); one post = one caption
+CAPTION_CACHE_SIZE = 10_000
 
 
 @dataclass
@@ -29,13 +37,23 @@ class DiscoveredEntityMention:
     confidence: float
 
 
+@dataclass(frozen=True)
+class CaptionContext:
+    """Per-post caption results shared by every comment on the post."""
+    context_entities: FrozenSet[str]  # Catalog entity IDs referenced in the caption
+    ents: Tuple[Tuple[str, str], ...]  # (text, label) spaCy entities in the caption
+
+
+_EMPTY_CAPTION_CONTEXT = CaptionContext(context_entities=frozenset(), ents=())
+
+
 class EntityExtractor:
     """
     Pure function: takes text, returns entities.
     No database coupling, easily testable.
     
     Strategy:
-    1. Check catalog first (fast exact/alias matching)
+    1. Check catalog first (single-pass Aho-Corasick name/alias matching)
     2. Use spaCy NER for discovery (people/orgs not in catalog)
     """
     
@@ -45,22 +63,55 @@ class EntityExtractor:
         
         Args:
             entity_catalog: List of monitored entities to match against
-            nlp: Optional spaCy language model (loads en_core_web_sm if None)
+            nlp: Optional spaCy language model (loads en_core_web_sm on first
+                use if None, so catalog-only matching never loads it)
+        """
+        self._nlp = nlp
+        self._caption_cache: "OrderedDict[str, CaptionContext]" = OrderedDict()
+        self.caption_cache_hits = 0
+        self.caption_cache_misses = 0
+        self.load_catalog(entity_catalog)
+    
+    @property
+    def nlp(self) -> Language:
+        """spaCy pipeline, loaded the first time NER is needed."""
+        if self._nlp is None:
+            self._nlp = spacy.load("en_core_web_sm")
+        return self._nlp
+    
+    def load_catalog(self, entity_catalog: List[MonitoredEntity]):
+        """
+        Replace the catalog and rebuild the lookup index.
+        
+        Args:
+            entity_catalog: Monitored entities (or objects with the same
+                id/name/aliases attributes) to match against
         """
-        self.catalog = entity_catalog
-        self.nlp = nlp or spacy.load("en_core_web_sm")
+        self.catalog = list(entity_catalog)
         
         # Build lookup index for fast matching
         self._build_lookup_index()
+        
+        # Caption context entities depend on the catalog
+        self._caption_cache.clear()
     
     def _build_lookup_index(self):
-        """Build lowercase lookup index for catalog matching."""
+        """
+        Build lowercase lookup index for catalog matching.
+        
+        Compiles every name/alias into one CatalogMatcher automaton, so
+        per-comment matching cost doesn't grow with the catalog, and indexes
+        first/last names so partial-name matching only visits entities whose
+        names actually occur in the comment.
+        """
         self.name_to_entity: Dict[str, MonitoredEntity] = {}
         self.entity_metadata: Dict[str, dict] = {}
+        self._entity_order: Dict[str, int] = {}
+        self._key_entity_ids: Dict[str, List[str]] = defaultdict(list)
         first_name_map: Dict[str, List[MonitoredEntity]] = defaultdict(list)
         last_name_map: Dict[str, List[MonitoredEntity]] = defaultdict(list)
         
-        for entity in self.catalog:
+        for order, entity in enumerate(self.catalog):
             canonical = entity.name.strip()
             canonical_lower = canonical.lower()
             aliases = [alias.strip().lower() for alias in (entity.aliases or []) if alias]
@@ -68,13 +119,18 @@ class EntityExtractor:
             first_name = tokens[0] if tokens else None
             last_name = tokens[-1] if len(tokens) > 1 else None
             
-            self.entity_metadata[str(entity.id)] = {
+            entity_key = str(entity.id)
+            self.entity_metadata[entity_key] = {
                 "entity": entity,
                 "canonical": canonical_lower,
                 "aliases": aliases,
                 "first": first_name,
                 "last": last_name,
             }
+            self._entity_order.setdefault(entity_key, order)
+            for name in (canonical_lower, *aliases):
+                if name and entity_key not in self._key_entity_ids[name]:
+                    self._key_entity_ids[name].append(entity_key)
             
             if canonical_lower:
                 self.name_to_entity[canonical_lower] = entity
@@ -92,6 +148,19 @@ class EntityExtractor:
         self.unique_last_names: Set[str] = {
             name for name, ents in last_name_map.items() if len(ents) == 1
         }
+        self._first_name_ids: Dict[str, List[str]] = {
+            name: [str(e.id) for e in ents] for name, ents in first_name_map.items()
+        }
+        self._last_name_ids: Dict[str, List[str]] = {
+            name: [str(e.id) for e in ents] for name, ents in last_name_map.items()
+        }
+        
+        # Pattern ids follow name_to_entity order, so hits can be replayed in
+        # the same order the old per-key loop visited them
+        self._catalog_keys: List[str] = list(self.name_to_entity)
+        self._catalog_matcher = CatalogMatcher(self._catalog_keys)
+        self._context_keys: List[str] = list(self._key_entity_ids)
+        self._context_matcher = CatalogMatcher(self._context_keys)
     
     def extract(
         self, 
@@ -110,56 +179,177 @@ class EntityExtractor:
             - catalog_mentions: Entities found in our catalog
             - discovered_mentions: Entities found by spaCy but not in catalog
         """
+        caption_context = self.caption_context(post_caption)
+        catalog_mentions = self._catalog_mentions(text, caption_context)
+        
+        # 2. spaCy NER for discovery (people/orgs not in catalog)
+        doc = self.nlp(text, disable=self._ner_disabled_pipes())
+        return catalog_mentions, self._discovered_mentions(caption_context, doc, catalog_mentions)
+    
+    def extract_many(
+        self,
+        texts: Sequence[str],
+        captions: Optional[Sequence[Optional[str]]] = None,
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None
+    ) -> List[Tuple[List[EntityMention], List[DiscoveredEntityMention]]]:
+        """
+        Batch version of extract(): same results, one nlp.pipe() pass.
+        
+        spaCy batches the documents through the pipeline (and can fan out to
+        worker processes), and the parser/lemmatizer are skipped since only
+        doc.ents is used. Captions not yet in the caption cache are parsed
+        in the same batched way, once each.
+        
+        Args:
+            texts: Comment texts
+            captions: Post caption per text (or None for no captions)
+            batch_size: Docs per nlp.pipe batch (settings.spacy_batch_size)
+            n_process: spaCy worker processes (settings.spacy_n_process)
+            
+        Returns:
+            One (catalog_mentions, discovered_mentions) tuple per text, in order
+        """
+        if captions is None:
+            captions = [None] * len(texts)
+        if len(captions) != len(texts):
+            raise ValueError("texts and captions must have the same length")
+        
+        pipe_options = {
+            "batch_size": batch_size or settings.spacy_batch_size,
+            "n_process": n_process or settings.spacy_n_process,
+            "disable": self._ner_disabled_pipes(),
+        }
+        
+        # Parse captions the cache hasn't seen (one miss each); the first
+        # comment on such a caption uses the fresh result, the rest are hits
+        new_captions = list(dict.fromkeys(
+            caption for caption in captions if caption and caption not in self._caption_cache
+        ))
+        fresh: Dict[str, CaptionContext] = {}
+        if new_captions:
+            for caption, doc in zip(new_captions, self.nlp.pipe(new_captions, **pipe_options)):
+                fresh[caption] = self._store_caption_context(caption, doc)
+        
+        caption_contexts = [
+            fresh.pop(caption) if caption in fresh else self.caption_context(caption)
+            for caption in captions
+        ]
+        catalog_results = [
+            self._catalog_mentions(text, context) for text, context in zip(texts, caption_contexts)
+        ]
+        docs = self.nlp.pipe(texts, **pipe_options)
+        return [
+            (catalog_mentions, self._discovered_mentions(context, doc, catalog_mentions))
+            for catalog_mentions, context, doc in zip(catalog_results, caption_contexts, docs)
+        ]
+    
+    def caption_context(self, post_caption: Optional[str]) -> CaptionContext:
+        """
+        Caption context entities and NER, computed once per distinct caption.
+        
+        Every comment on a post shares its caption, so this is effectively a
+        per-post cache (LRU-bounded at CAPTION_CACHE_SIZE captions).
+        """
+        if not post_caption:
+            return _EMPTY_CAPTION_CONTEXT
+        
+        cached = self._caption_cache.get(post_caption)
+        if cached is not None:
+            self._caption_cache.move_to_end(post_caption)
+            self.caption_cache_hits += 1
+            return cached
+        
+        doc = self.nlp(post_caption, disable=self._ner_disabled_pipes())
+        return self._store_caption_context(post_caption, doc)
+    
+    def caption_cache_stats(self) -> Dict[str, Any]:
+        """Cumulative caption cache hits, misses and hit rate."""
+        lookups = self.caption_cache_hits + self.caption_cache_misses
+        return {
+            "hits": self.caption_cache_hits,
+            "misses": self.caption_cache_misses,
+            "hit_rate": self.caption_cache_hits / lookups if lookups else 0.0,
+            "size": len(self._caption_cache),
+        }
+    
+    def _store_caption_context(self, post_caption: str, doc) -> CaptionContext:
+        """Build and cache the context for a caption from its parsed doc (a cache miss)."""
+        context = CaptionContext(
+            context_entities=frozenset(self._get_context_entities(post_caption.lower())),
+            ents=tuple((ent.text, ent.label_) for ent in doc.ents)
+        )
+        self.caption_cache_misses += 1
+        self._caption_cache[post_caption] = context
+        if len(self._caption_cache) > CAPTION_CACHE_SIZE:
+            self._caption_cache.popitem(last=False)
+        return context
+    
+    def _catalog_mentions(self, text: str, caption_context: CaptionContext) -> List[EntityMention]:
+        """Catalog matches in the comment text, using the caption only for context."""
         catalog_mentions: List[EntityMention] = []
-        discovered_mentions = []
         
         # Use caption for context but only extract entities from comment text
         comment_text_lower = text.lower()
-        caption_lower = post_caption.lower() if post_caption else ""
-        context_entities = self._get_context_entities(caption_lower)
-        
-        # Combine for spaCy analysis (for pronoun resolution) but don't use for entity matching
-        full_text = text
-        if post_caption:
-            full_text = f"{post_caption} {text}"
-        
-        # 1. Check catalog (fast exact/alias matching) - ONLY in comment text
-        for name_lower, entity in self.name_to_entity.items():
-            if name_lower in comment_text_lower:  # Only check comment text, not caption
-                # Check if already found (avoid duplicates from aliases)
-                if not any(m.entity_id == entity.id for m in catalog_mentions):
-                    catalog_mentions.append(EntityMention(
-                        entity_id=entity.id,
-                        mention_text=name_lower,
-                        confidence=1.0 if name_lower == entity.name.lower() else 0.9
-                    ))
         
-        catalog_mentions = self._match_partial_names(
+        # 1. Check catalog (one automaton pass) - ONLY in comment text, not caption
+        for pattern_id in self._catalog_matcher.find(comment_text_lower):
+            name_lower = self._catalog_keys[pattern_id]
+            entity = self.name_to_entity[name_lower]
+            # Check if already found (avoid duplicates from aliases)
+            if not any(m.entity_id == entity.id for m in catalog_mentions):
+                catalog_mentions.append(EntityMention(
+                    entity_id=entity.id,
+                    mention_text=name_lower,
+                    confidence=1.0 if name_lower == entity.name.lower() else 0.9
+                ))
+        
+        return self._match_partial_names(
             comment_text_lower,  # Only match in comment text
             catalog_mentions,
-            context_entities  # But use caption for context
+            caption_context.context_entities  # But use caption for context
         )
+    
+    def _ner_disabled_pipes(self) -> List[str]:
+        """Pipeline components NER doesn't need that are present in this model."""
+        return [name for name in NER_DISABLED_PIPES if name in self.nlp.pipe_names]
+    
+    @staticmethod
+    def _discovered_mentions(
+        caption_context: CaptionContext,
+        doc,
+        catalog_mentions: List[EntityMention]
+    ) -> List[DiscoveredEntityMention]:
+        """
+        PERSON/ORG entities the catalog didn't already match.
         
-        # 2. spaCy NER for discovery (people/orgs not in catalog)
-        doc = self.nlp(full_text)
-        for ent in doc.ents:
-            if ent.label_ in ["PERSON", "ORG"]:
+        Caption entities come first, then the comment's, the order NER over
+        "{caption} {text}" reported them in.
+        """
+        discovered_mentions = []
+        entities = [*caption_context.ents, *((ent.text, ent.label_) for ent in doc.ents)]
+        for ent_text, label in entities:
+            if label in ["PERSON", "ORG"]:
                 # Check if already found via catalog
-                if not any(m.mention_text.lower() == ent.text.lower() for m in catalog_mentions):
+                if not any(m.mention_text.lower() == ent_text.lower() for m in catalog_mentions):
                     # New entity discovered
                     discovered_mentions.append(DiscoveredEntityMention(
-                        name=ent.text,
-                        entity_type=ent.label_,
+                        name=ent_text,
+                        entity_type=label,
                         confidence=0.7  # spaCy confidence
                     ))
-        
-        return catalog_mentions, discovered_mentions
+        return discovered_mentions
     
     def extract_catalog_only(self, text: str, post_caption: Optional[str] = None) -> List[EntityMention]:
         """
         Extract only catalog entities (skip discovery).
         Useful when you don't want to track discovered entities.
         
+        Nothing is run through spaCy (a caption only contributes its catalog
+        context entities), so this is cheap enough for scanning many
+        historical comments and never loads the model, e.g. in
+        EnrichmentService.backfill_entity.
+        
         Args:
             text: Comment text to analyze
             post_caption: Optional post caption for context
@@ -167,8 +357,15 @@ class EntityExtractor:
         Returns:
             List of EntityMention objects from catalog
         """
-        catalog_mentions, _ = self.extract(text, post_caption)
-        return catalog_mentions
+        if not post_caption:
+            return self._catalog_mentions(text, _EMPTY_CAPTION_CONTEXT)
+        cached = self._caption_cache.get(post_caption)
+        if cached is None:
+            cached = CaptionContext(
+                context_entities=frozenset(self._get_context_entities(post_caption.lower())),
+                ents=()
+            )
+        return self._catalog_mentions(text, cached)
     
     def _get_context_entities(self, caption_lower: str) -> Set[str]:
         """Return entity IDs referenced in the caption."""
@@ -176,12 +373,8 @@ class EntityExtractor:
         if not caption_lower:
             return context_ids
         
-        for entity_id, meta in self.entity_metadata.items():
-            names_to_check = [meta["canonical"], *(meta["aliases"] or [])]
-            for name in names_to_check:
-                if name and name in caption_lower:
-                    context_ids.add(entity_id)
-                    break
+        for pattern_id in self._context_matcher.find(caption_lower):
+            context_ids.update(self._key_entity_ids[self._context_keys[pattern_id]])
         return context_ids
     
     def _match_partial_names(
@@ -195,8 +388,16 @@ class EntityExtractor:
         tokens = set(re.findall(r"\b[a-zA-Z']+\b", text_lower))
         pronouns = {"she", "her", "hers", "he", "him", "his"}
         
-        for entity_id, meta in self.entity_metadata.items():
-            if entity_id in matched_ids:
+        # Only entities whose first/last name occurs, or that the caption
+        # references, can match; visit them in catalog order
+        candidates: Set[str] = set(context_entities)
+        for token in tokens:
+            candidates.update(self._first_name_ids.get(token, ()))
+            candidates.update(self._last_name_ids.get(token, ()))
+        
+        for entity_id in sorted(candidates, key=lambda eid: self._entity_order.get(eid, 0)):
+            meta = self.entity_metadata.get(entity_id)
+            if meta is None or entity_id in matched_ids:
                 continue
             
             entity = meta["entity"]
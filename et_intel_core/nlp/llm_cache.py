@@ -0,0 +1,288 @@
+"""
+Persistent content-addressed cache for LLM analysis results.
+
+The same comment text ("❤️❤️❤️", "she ate", copy-pasted spam) shows up
+thousands of times, and re-running enrichment re-bills comments that were
+already scored. Results are stored in a local SQLite file keyed by a hash
+of everything that determines the answer:
+
+    (kind, model, prompt version, normalized text, caption hash, entity-list hash)
+
+Bumping a provider's prompt version therefore invalidates old entries
+without touching them; `cli.py llm-cache --purge VERSION` reclaims the space.
+
+The cache is a plain file (stdlib sqlite3), so it needs no database session
+and works the same from the CLI, the async workers and tests. Several
+processes share one file, so it runs in WAL mode with a generous busy
+timeout, and any SQLite error is logged and treated as a miss: the cache
+can only save API calls, never fail an enrichment run.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from et_intel_core.config import settings
+from et_intel_core.monitoring import get_metrics
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Inserts between recounts of a shared file (other processes insert too)
+_RECOUNT_INTERVAL = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_llm_cache_last_used ON llm_cache (last_used_at);
+CREATE INDEX IF NOT EXISTS ix_llm_cache_prompt_version ON llm_cache (prompt_version);
+"""
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """
+    Normalize comment text for cache keys.
+
+    NFKC-folds compatibility characters and collapses whitespace; case and
+    emoji are kept because they carry sentiment ("SHE ATE" vs "she ate").
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text or "")).strip()
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def cache_key(
+    kind: str,
+    model: str,
+    prompt_version: str,
+    text: str,
+    caption: str = "",
+    entities: Optional[Sequence[str]] = None
+) -> str:
+    """
+    Content-addressed key for one LLM call.
+
+    Args:
+        kind: Call type ("analysis", "score")
+        model: Model name
+        prompt_version: Provider prompt version
+        text: Comment text (normalized here)
+        caption: Post caption (hashed after normalization)
+        entities: Monitored-entity context list (order-insensitive)
+    """
+    entity_hash = _digest("\x1f".join(sorted(entities or [])))
+    caption_hash = _digest(normalize_text(caption))
+    return _digest("\x1e".join([
+        kind, model, prompt_version, normalize_text(text), caption_hash, entity_hash,
+    ]))
+
+
+class LLMResultCache:
+    """
+    Size-bounded LRU cache of JSON results in a SQLite file.
+
+    Hits refresh ``last_used_at``, but the writes are buffered and applied
+    in one batch every ``touch_batch_size`` hits (and before evicting or
+    closing), so a hit is a single read. Once the entry count passes
+    ``max_entries`` the least recently used rows are deleted. The count kept
+    here only sees this process's inserts, so the table is recounted every
+    few inserts and before anything is evicted. Hit/miss, eviction and error counts go to
+    MetricsCollector as ``llm_cache.hits``, ``llm_cache.misses``,
+    ``llm_cache.evictions`` and ``llm_cache.errors``.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_entries: int = 200_000,
+        timeout: float = 30.0,
+        touch_batch_size: int = 256
+    ):
+        """
+        Open (or create) the cache file.
+
+        Args:
+            path: SQLite file path (":memory:" for a throwaway cache)
+            max_entries: LRU bound on the number of stored results
+            timeout: Seconds to wait for another process's write lock
+            touch_batch_size: Hits buffered before their LRU refresh is written
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        if touch_batch_size < 1:
+            raise ValueError("touch_batch_size must be >= 1")
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.touch_batch_size = touch_batch_size
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=timeout, check_same_thread=False)
+        if self.path != ":memory:":
+            # Readers don't block the writer (and vice versa) across processes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._touched: Dict[str, List[float]] = {}  # key -> [last_used_at, hits]
+        self._count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        self._inserts_since_count = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached result for ``key`` (or None) and refresh its LRU position."""
+        with self._lock:
+            try:
+                row = self._conn.execute("SELECT result FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    touch = self._touched.setdefault(key, [0.0, 0])
+                    touch[0] = time.time()
+                    touch[1] += 1
+                    if len(self._touched) >= self.touch_batch_size:
+                        self._flush_touches()
+                        self._conn.commit()
+            except sqlite3.Error as e:
+                self._record_error("get", e)
+                row = None
+        if row is None:
+            get_metrics().increment("llm_cache.misses")
+            return None
+        get_metrics().increment("llm_cache.hits")
+        return json.loads(row[0])
+
+    def put(self, key: str, result: Any, kind: str, model: str, prompt_version: str) -> None:
+        """Store a result, evicting least recently used entries past max_entries."""
+        now = time.time()
+        evicted = 0
+        with self._lock:
+            try:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO llm_cache "
+                    "(key, kind, model, prompt_version, result, created_at, last_used_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, kind, model, prompt_version, json.dumps(result), now, now)
+                )
+                self._count += cursor.rowcount
+                self._inserts_since_count += cursor.rowcount
+                if self._count > self.max_entries or self._inserts_since_count >= _RECOUNT_INTERVAL:
+                    # Other processes insert and evict too; only the table knows
+                    self._count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+                    self._inserts_since_count = 0
+                if self._count > self.max_entries:
+                    self._flush_touches()
+                    evicted = self._conn.execute(
+                        "DELETE FROM llm_cache WHERE key IN ("
+                        "SELECT key FROM llm_cache ORDER BY last_used_at LIMIT ?)",
+                        (self._count - self.max_entries,)
+                    ).rowcount
+                    self._count -= evicted
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._record_error("put", e)
+                return
+        if evicted:
+            get_metrics().increment("llm_cache.evictions", evicted)
+
+    def _flush_touches(self) -> None:
+        """Write buffered LRU refreshes (caller holds the lock and commits)."""
+        if not self._touched:
+            return
+        self._conn.executemany(
+            "UPDATE llm_cache SET last_used_at = MAX(last_used_at, ?), hits = hits + ? WHERE key = ?",
+            [(used_at, hits, key) for key, (used_at, hits) in self._touched.items()]
+        )
+        self._touched.clear()
+
+    def _record_error(self, operation: str, error: sqlite3.Error) -> None:
+        """Log a SQLite failure (caller holds the lock); it counts as a miss / skipped write."""
+        get_metrics().increment("llm_cache.errors")
+        logger.warning("LLM cache %s failed (%s): %s", operation, self.path, error)
+        try:
+            self._conn.rollback()
+        except sqlite3.Error:
+            pass
+
+    def purge(self, prompt_version: Optional[str] = None) -> int:
+        """
+        Delete entries for one prompt version (or everything if None).
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if prompt_version is None:
+                removed = self._conn.execute("DELETE FROM llm_cache").rowcount
+            else:
+                removed = self._conn.execute(
+                    "DELETE FROM llm_cache WHERE prompt_version = ?", (prompt_version,)
+                ).rowcount
+            self._conn.commit()
+            self._count -= removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Summarize cache contents.
+
+        Returns:
+            Dictionary with entries, max_entries, total stored hits and a
+            per-(kind, model, prompt_version) breakdown
+        """
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+            rows = self._conn.execute(
+                "SELECT kind, model, prompt_version, COUNT(*), COALESCE(SUM(hits), 0) "
+                "FROM llm_cache GROUP BY kind, model, prompt_version "
+                "ORDER BY kind, model, prompt_version"
+            ).fetchall()
+        groups: List[Dict[str, Any]] = [
+            {"kind": kind, "model": model, "prompt_version": version, "entries": entries, "hits": hits}
+            for kind, model, version, entries, hits in rows
+        ]
+        return {
+            "path": self.path,
+            "entries": sum(g["entries"] for g in groups),
+            "max_entries": self.max_entries,
+            "hits": sum(g["hits"] for g in groups),
+            "groups": groups,
+        }
+
+    def close(self) -> None:
+        """Write buffered LRU refreshes and close the underlying connection."""
+        with self._lock:
+            try:
+                self._flush_touches()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._record_error("close", e)
+            self._conn.close()
+
+
+def get_llm_cache() -> Optional[LLMResultCache]:
+    """
+    Cache configured from settings (LLM_CACHE_*), or None when disabled.
+    """
+    if not settings.llm_cache_enabled:
+        return None
+    return LLMResultCache(
+        settings.llm_cache_path,
+        max_entries=settings.llm_cache_max_entries,
+        timeout=settings.llm_cache_timeout_seconds
+    )
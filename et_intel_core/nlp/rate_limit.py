@@ -0,0 +1,147 @@
+"""
+Rate limiting and retry helpers for concurrent LLM calls.
+
+OpenAI enforces both requests/minute and tokens/minute limits per key, so
+the concurrent enrichment engine paces itself with two token buckets and
+backs off with jitter when the API still answers 429 or 5xx.
+"""
+
+import asyncio
+import random
+import time
+from typing import Optional
+
+from openai import APIConnectionError, APIStatusError, APITimeoutError
+
+
+class TokenBucket:
+    """
+    Async token bucket: ``rate_per_minute`` units refill continuously.
+
+    The bucket starts full, so a burst of up to one minute's budget goes out
+    immediately and the rest is smoothed at the refill rate.
+    """
+
+    def __init__(self, rate_per_minute: float, clock=time.monotonic):
+        """
+        Initialize bucket.
+
+        Args:
+            rate_per_minute: Capacity and refill rate (units per minute)
+            clock: Monotonic time source (overridable in tests)
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be > 0")
+        self.capacity = float(rate_per_minute)
+        self.refill_per_second = rate_per_minute / 60.0
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """
+        Wait until ``amount`` units are available and take them.
+
+        Requests larger than the capacity are clamped to it, so one oversized
+        prompt can't deadlock the bucket.
+
+        Returns:
+            Seconds spent waiting
+        """
+        amount = min(float(amount), self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.refill_per_second
+                await asyncio.sleep(delay)
+                waited += delay
+
+
+class RateLimiter:
+    """Combined requests/minute and tokens/minute limiter."""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None
+    ):
+        """
+        Initialize limiter. Either limit may be None (unlimited).
+
+        Args:
+            requests_per_minute: Max API requests per minute
+            tokens_per_minute: Max estimated tokens per minute
+        """
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    async def acquire(self, tokens: int) -> float:
+        """
+        Reserve one request and ``tokens`` tokens.
+
+        Returns:
+            Total seconds spent waiting on either bucket
+        """
+        waited = 0.0
+        if self.requests:
+            waited += await self.requests.acquire(1)
+        if self.tokens:
+            waited += await self.tokens.acquire(tokens)
+        return waited
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    True for errors worth retrying: 429, 5xx, timeouts and connection drops.
+
+    Other 4xx responses (bad request, auth) will fail the same way again.
+    """
+    if isinstance(error, (APITimeoutError, APIConnectionError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = 0.5,
+    cap: float = 30.0,
+    rng: random.Random = random
+) -> float:
+    """
+    Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt)).
+
+    Jitter spreads retries out so concurrent workers that hit the same 429
+    don't all come back at the same instant.
+
+    Args:
+        attempt: Zero-based retry attempt
+        base: Delay scale for the first retry (seconds)
+        cap: Upper bound on the delay (seconds)
+        rng: Random source (seedable in tests)
+    """
+    return rng.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Parse a Retry-After header (seconds) from an API error, if present."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
@@ -2,15 +2,25 @@
 Sentiment analysis providers with swappable backends.
 """
 
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Protocol, Optional, List, Dict, Any
+from typing import Protocol, Optional, List, Dict, Any, Tuple
 import re
 import json
+import logging
+import threading
+import time
 
 from textblob import TextBlob
-from openai import OpenAI
+from textblob.en import sentiment as pattern_sentiment
+from openai import OpenAI, AsyncOpenAI
 
 from et_intel_core.config import settings
+from et_intel_core.nlp.llm_cache import LLMResultCache, cache_key, get_llm_cache
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -65,6 +75,28 @@ class RuleBasedSentimentProvider:
     # Negative emojis
     NEGATIVE_EMOJIS = ["😡", "🤮", "💔", "😤", "🙄", "😬", "👎", "😒"]
     
+    # Recorded on enriched comments; bump when the lexicon or rules change
+    version = "rule_based-v1"
+    
+    # Fall-through TextBlob results kept per provider (short comments repeat a lot)
+    TEXTBLOB_CACHE_SIZE = 10_000
+    
+    def __init__(self):
+        """Prepare the lexicon weights and TextBlob cache used by score_batch()."""
+        entries = list(dict.fromkeys(
+            self.POSITIVE_TERMS + self.NEGATIVE_TERMS + self.POSITIVE_EMOJIS + self.NEGATIVE_EMOJIS
+        ))
+        positive = self.POSITIVE_TERMS + self.POSITIVE_EMOJIS
+        negative = self.NEGATIVE_TERMS + self.NEGATIVE_EMOJIS
+        # (positive, negative) weight per entry; repeated list entries count each time in score()
+        self._lexicon = [
+            (entry, positive.count(entry), negative.count(entry)) for entry in entries
+        ]
+        self._batch_separator = next(
+            ch for ch in ("\x00", "\x1f", "\n") if not any(ch in entry for entry in entries)
+        )
+        self._textblob_cache: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+    
     def score(self, text: str) -> SentimentResult:
         """Score sentiment using rules + TextBlob."""
         text_lower = text.lower()
@@ -108,6 +140,82 @@ class RuleBasedSentimentProvider:
             confidence=confidence,
             source_model="rule_based"
         )
+    
+    def score_batch(self, texts: List[str]) -> List[SentimentResult]:
+        """
+        Score many texts at once; results are identical to score() per text.
+        
+        Each lexicon entry is searched once across the joined batch instead
+        of once per text, and TextBlob only runs on rows with fewer than two
+        lexicon hits (cached by text, so repeated comments are analyzed once).
+        
+        Args:
+            texts: Texts to analyze
+            
+        Returns:
+            One SentimentResult per text, in order
+        """
+        if not texts:
+            return []
+        
+        # Lowercased batch joined once; no entry contains the separator, so
+        # every occurrence lies inside one row. Emojis are unaffected by lower().
+        lowered = [text.lower() for text in texts]
+        starts = []
+        offset = 0
+        for text_lower in lowered:
+            starts.append(offset)
+            offset += len(text_lower) + 1
+        joined = self._batch_separator.join(lowered)
+        
+        # score() counts each entry at most once per text (plain substring
+        # test), so record the last row each entry was credited to
+        pos_totals = [0] * len(texts)
+        neg_totals = [0] * len(texts)
+        for entry, pos_weight, neg_weight in self._lexicon:
+            last_row = -1
+            position = joined.find(entry)
+            while position != -1:
+                row = bisect_right(starts, position) - 1
+                if row != last_row:
+                    pos_totals[row] += pos_weight
+                    neg_totals[row] += neg_weight
+                    last_row = row
+                # Skip to the next row: further hits in this one add nothing
+                next_start = starts[row + 1] if row + 1 < len(starts) else len(joined)
+                position = joined.find(entry, next_start)
+        
+        results = []
+        for text, pos_total, neg_total in zip(texts, pos_totals, neg_totals):
+            if pos_total + neg_total >= 2:
+                results.append(SentimentResult(
+                    score=(pos_total - neg_total) / (pos_total + neg_total),
+                    confidence=min(0.8, 0.5 + (pos_total + neg_total) * 0.1),
+                    source_model="rule_based"
+                ))
+                continue
+            
+            polarity, subjectivity = self._textblob_sentiment(text)
+            results.append(SentimentResult(
+                score=polarity,
+                confidence=0.3 + (subjectivity * 0.4),
+                source_model="rule_based"
+            ))
+        return results
+    
+    def _textblob_sentiment(self, text: str) -> Tuple[float, float]:
+        """TextBlob (polarity, subjectivity) for text, via a small LRU cache."""
+        cached = self._textblob_cache.get(text)
+        if cached is not None:
+            self._textblob_cache.move_to_end(text)
+            return cached
+        # Same analyzer TextBlob(text).sentiment uses, minus the per-call
+        # namedtuple class it builds
+        polarity, subjectivity = pattern_sentiment(text)
+        self._textblob_cache[text] = (polarity, subjectivity)
+        if len(self._textblob_cache) > self.TEXTBLOB_CACHE_SIZE:
+            self._textblob_cache.popitem(last=False)
+        return polarity, subjectivity
 
 
 class OpenAISentimentProvider:
@@ -168,20 +276,102 @@ CRITICAL RULES:
 - Use post caption context to disambiguate (e.g., Hailey Bieber post → "Justin" = Justin Bieber)
 - If you cannot confidently determine which entity, put in ambiguous_mentions for human review"""
     
-    def __init__(self, api_key: str | None = None, model: str = "gpt-4o-mini"):
+    # Per-comment analysis rules shared by the single and packed prompts
+    ANALYSIS_GUIDELINES = """CRITICAL INSTRUCTIONS - ENTITY SCORING:
+- Score ONLY entities that are ACTUALLY MENTIONED in the comment text
+- If the comment says "she" or "he", use post caption context to determine who
+- If a monitored entity is NOT mentioned in this specific comment, do NOT include it in entity_scores
+- Return empty entity_scores {} if no monitored entities are mentioned
+- If an entity is mentioned but not in monitored list, include it in other_entities
+- DO NOT score entities just because they're in the caption if the comment doesn't reference them
+
+CONFIDENCE GUIDELINES:
+- 0.9-1.0: Full name mentioned (e.g., "Justin Baldoni") or clear context
+- 0.7-0.9: First name + strong context (e.g., "Justin" on Colleen Hoover post about Justin Baldoni)
+- 0.5-0.7: First name + weak context → ambiguous_mentions
+- < 0.5: Cannot determine → ambiguous_mentions
+
+SARCASM & SENTIMENT:
+- Detect sarcasm: 💐 + "you earned it" = sarcasm, negative sentiment
+- Questions like "Is X true?" are neutral (0.0) unless clearly rhetorical
+- High like counts indicate community agreement - weight sarcasm detection accordingly
+- Context matters: "I feel bad for X" = positive toward X, negative toward situation
+
+DISAMBIGUATION EXAMPLES:
+- Comment: "Justin didn't attend" on Hailey Bieber post → "Justin Bieber" (confidence 0.8+)
+- Comment: "Justin is wrong" on Colleen Hoover post → "Justin Baldoni" (confidence 0.8+)
+- Comment: "Justin" on unrelated post → ambiguous_mentions (confidence < 0.7)
+
+FIX 5: DO NOT hallucinate entity mentions. Only score entities actually discussed in the comment."""
+    
+    # Legacy score() prompt and completion budget
+    SCORE_SYSTEM_PROMPT = (
+        "You are a sentiment analyzer for entertainment social media comments. "
+        "Understand stan culture, sarcasm, and entertainment language. "
+        "Return ONLY a number from -1.0 (very negative) to 1.0 (very positive)."
+    )
+    SCORE_MAX_TOKENS = 10
+    
+    # Bump when a prompt changes so cached results for the old one stop matching
+    SCORE_PROMPT_VERSION = "score-v1"
+    ANALYSIS_PROMPT_VERSION = "analysis-v1"
+    
+    # Completion budget for one analyze_comment() response
+    ANALYSIS_MAX_TOKENS = 400
+    
+    # Packed requests (analyze_comments): comments per request, completion
+    # tokens budgeted per comment, and the model's completion ceiling
+    MAX_PACKED_COMMENTS = 20
+    PACKED_TOKENS_PER_COMMENT = 250
+    PACKED_MAX_TOKENS = 4096
+    
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str = "gpt-4o-mini",
+        base_url: str | None = None,
+        cache: LLMResultCache | None = None
+    ):
         """
         Initialize OpenAI provider.
         
         Args:
             api_key: OpenAI API key (uses settings.openai_api_key if None)
             model: Model to use (default: gpt-4o-mini)
+            base_url: API base URL (uses settings.openai_base_url if None;
+                      point at a local fake endpoint for tests)
+            cache: Optional persistent result cache for score()/analyze_comment()
         """
         self.api_key = api_key or settings.openai_api_key
         if not self.api_key:
             raise ValueError("OpenAI API key required. Set OPENAI_API_KEY in .env")
         
-        self.client = OpenAI(api_key=self.api_key)
+        self.base_url = base_url or settings.openai_base_url
+        self.client = OpenAI(api_key=self.api_key, base_url=self.base_url)
         self.model = model
+        self.cache = cache
+        self._async_client: AsyncOpenAI | None = None
+    
+    @property
+    def version(self) -> str:
+        """Model and prompt versions, recorded on enriched comments."""
+        return f"{self.model}:{self.ANALYSIS_PROMPT_VERSION}:{self.SCORE_PROMPT_VERSION}"
+    
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """
+        Lazily created asyncio client for analyze_comment_async().
+        
+        SDK-level retries are disabled: the concurrent enrichment engine owns
+        retry/backoff so it can coordinate it with rate limiting.
+        """
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                max_retries=0
+            )
+        return self._async_client
     
     def score(self, text: str) -> SentimentResult:
         """
@@ -189,21 +379,24 @@ CRITICAL RULES:
         
         Use analyze_comment() for enhanced multi-signal extraction.
         """
+        key = None
+        if self.cache:
+            key = cache_key("score", self.model, self.SCORE_PROMPT_VERSION, text)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return SentimentResult(score=cached["score"], confidence=0.9, source_model=self.model)
+        
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[{
                     "role": "system",
-                    "content": (
-                        "You are a sentiment analyzer for entertainment social media comments. "
-                        "Understand stan culture, sarcasm, and entertainment language. "
-                        "Return ONLY a number from -1.0 (very negative) to 1.0 (very positive)."
-                    )
+                    "content": self.SCORE_SYSTEM_PROMPT
                 }, {
                     "role": "user",
                     "content": f"Score sentiment: {text}"
                 }],
-                max_tokens=10,
+                max_tokens=self.SCORE_MAX_TOKENS,
                 temperature=0.3
             )
             
@@ -211,13 +404,16 @@ CRITICAL RULES:
             score = float(score_text)
             score = max(-1.0, min(1.0, score))
             
+            if key:
+                self.cache.put(key, {"score": score}, "score", self.model, self.SCORE_PROMPT_VERSION)
+            
             return SentimentResult(
                 score=score,
                 confidence=0.9,
                 source_model=self.model
             )
         except Exception as e:
-            print(f"OpenAI API error: {e}")
+            logger.warning("OpenAI score request failed: %s", e)
             return SentimentResult(
                 score=0.0,
                 confidence=0.0,
@@ -252,43 +448,13 @@ CRITICAL RULES:
                 "toxicity": 0.3
             }
         """
-        monitored_list = ", ".join(monitored_entities) if monitored_entities else "none"
+        key, cached = self._cached_analysis(comment_text, post_caption, monitored_entities)
+        if cached is not None:
+            return cached
         
-        prompt = f'''Post caption: "{post_caption[:500]}"
-Comment: "{comment_text[:1000]}"
-Comment likes: {comment_likes}
-Monitored entities (for reference): {monitored_list}
-
-Extract signals from this comment. 
-
-CRITICAL INSTRUCTIONS - ENTITY SCORING:
-- Score ONLY entities that are ACTUALLY MENTIONED in the comment text
-- If the comment says "she" or "he", use post caption context to determine who
-- If a monitored entity is NOT mentioned in this specific comment, do NOT include it in entity_scores
-- Return empty entity_scores {{}} if no monitored entities are mentioned
-- If an entity is mentioned but not in monitored list, include it in other_entities
-- DO NOT score entities just because they're in the caption if the comment doesn't reference them
-
-CONFIDENCE GUIDELINES:
-- 0.9-1.0: Full name mentioned (e.g., "Justin Baldoni") or clear context
-- 0.7-0.9: First name + strong context (e.g., "Justin" on Colleen Hoover post about Justin Baldoni)
-- 0.5-0.7: First name + weak context → ambiguous_mentions
-- < 0.5: Cannot determine → ambiguous_mentions
-
-SARCASM & SENTIMENT:
-- Detect sarcasm: 💐 + "you earned it" = sarcasm, negative sentiment
-- Questions like "Is X true?" are neutral (0.0) unless clearly rhetorical
-- High like counts indicate community agreement - weight sarcasm detection accordingly
-- Context matters: "I feel bad for X" = positive toward X, negative toward situation
-
-DISAMBIGUATION EXAMPLES:
-- Comment: "Justin didn't attend" on Hailey Bieber post → "Justin Bieber" (confidence 0.8+)
-- Comment: "Justin is wrong" on Colleen Hoover post → "Justin Baldoni" (confidence 0.8+)
-- Comment: "Justin" on unrelated post → ambiguous_mentions (confidence < 0.7)
-
-FIX 5: DO NOT hallucinate entity mentions. Only score entities actually discussed in the comment.
-
-Return valid JSON only.'''
+        prompt = self._build_analysis_prompt(
+            comment_text, post_caption, comment_likes, monitored_entities
+        )
         
         try:
             response = self.client.chat.completions.create(
@@ -298,7 +464,7 @@ Return valid JSON only.'''
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
-                max_tokens=400,  # Increased from 200 to reduce truncation
+                max_tokens=self.ANALYSIS_MAX_TOKENS,  # Increased from 200 to reduce truncation
                 response_format={"type": "json_object"}  # Force JSON output
             )
             
@@ -309,45 +475,437 @@ Return valid JSON only.'''
             
             # Try to parse JSON with error recovery
             result = self._parse_json_with_recovery(response_text)
-            
-            # Validate and normalize result
-            normalized = {
-                "entity_scores": self._validate_entity_scores(result.get("entity_scores", {}), monitored_entities, comment_text, result.get("stance")),
-                "entity_confidence": self._validate_entity_confidence(result.get("entity_confidence", {}), result.get("entity_scores", {})),
-                "emotion": self._validate_emotion(result.get("emotion", "neutral")),
-                "stance": self._validate_stance(result.get("stance", "neutral")),
-                "topics": self._validate_topics(result.get("topics", [])),
-                "other_entities": self._validate_other_entities(result.get("other_entities", [])),
-                "sarcasm": bool(result.get("sarcasm", False)),
-                "toxicity": self._validate_toxicity(result.get("toxicity", 0.0)),
-                "ambiguous_mentions": self._validate_ambiguous_mentions(result.get("ambiguous_mentions", []))
-            }
-            
-            # Ensure entity_scores is always a dict (even if empty)
-            if not isinstance(normalized["entity_scores"], dict):
-                normalized["entity_scores"] = {}
-            
-            # Don't force entity scores - GPT should only score entities actually mentioned
-            # If no entity_scores returned, that's fine - the comment might not mention any monitored entities
-            
+            normalized = self._normalize_analysis(result, monitored_entities, comment_text)
+            self._store_analysis(key, normalized)
             return normalized
             
         except Exception as e:
-            print(f"OpenAI API error: {e}")
+            preview = ""
             if 'response' in locals() and hasattr(response, 'choices'):
-                print(f"Response preview: {response.choices[0].message.content[:200] if response.choices else 'No response'}")
+                preview = response.choices[0].message.content[:200] if response.choices else "No response"
+            logger.warning("OpenAI analysis request failed, using defaults: %s (response preview: %r)", e, preview)
             # Return safe defaults
-            return {
-                "entity_scores": {},
-                "entity_confidence": {},
-                "emotion": "neutral",
-                "stance": "neutral",
-                "topics": [],
-                "other_entities": [],
-                "sarcasm": False,
-                "toxicity": 0.0,
-                "ambiguous_mentions": []
-            }
+            return self._default_analysis()
+    
+    def analyze_comments(
+        self,
+        comments: List[Dict[str, Any]],
+        post_caption: str = "",
+        monitored_entities: Optional[List[str]] = None,
+        max_batch_size: Optional[int] = None
+    ) -> Dict[Any, Dict[str, Any]]:
+        """
+        Extract signals for several comments on the same post in one request.
+        
+        The system prompt, caption, entity list and guidelines are sent once
+        per request instead of once per comment. Items the model drops or
+        truncates are re-requested as a smaller pack; a request that yields
+        nothing is split in half, and a single comment goes through
+        analyze_comment().
+        
+        Args:
+            comments: Dicts with "id", "text" and optional "likes"
+            post_caption: Caption shared by every comment in the batch
+            monitored_entities: List of all monitored entities (for context)
+            max_batch_size: Comments per request (default MAX_PACKED_COMMENTS)
+            
+        Returns:
+            Mapping of comment id -> analysis dict (same shape as analyze_comment())
+        """
+        size = max_batch_size or self.MAX_PACKED_COMMENTS
+        results: Dict[Any, Dict[str, Any]] = {}
+        
+        # Cached comments never enter a request
+        pending = []
+        for comment in comments:
+            _, cached = self._cached_analysis(comment["text"], post_caption, monitored_entities)
+            if cached is not None:
+                results[comment["id"]] = cached
+            else:
+                pending.append(comment)
+        
+        for i in range(0, len(pending), size):
+            results.update(self._analyze_packed(pending[i:i + size], post_caption, monitored_entities))
+        return results
+    
+    def _analyze_packed(
+        self,
+        comments: List[Dict[str, Any]],
+        post_caption: str,
+        monitored_entities: Optional[List[str]]
+    ) -> Dict[Any, Dict[str, Any]]:
+        """One packed request, then split-and-retry for whatever came back missing."""
+        if len(comments) == 1:
+            comment = comments[0]
+            return {comment["id"]: self.analyze_comment(
+                comment_text=comment["text"],
+                post_caption=post_caption,
+                comment_likes=comment.get("likes", 0) or 0,
+                monitored_entities=monitored_entities
+            )}
+        
+        parsed: Dict[str, Dict[str, Any]] = {}
+        try:
+            response = self.client.chat.completions.create(
+                **self._packed_request(comments, post_caption, monitored_entities)
+            )
+            choice = response.choices[0]
+            response_text = (choice.message.content or "").strip()
+            self._last_response = response_text
+            parsed = self._parse_packed_response(response_text, truncated=choice.finish_reason == "length")
+        except Exception as e:
+            logger.warning("OpenAI packed analysis of %d comments failed: %s", len(comments), e)
+        
+        results = self._collect_packed(comments, parsed, post_caption, monitored_entities)
+        missing = [comment for comment in comments if comment["id"] not in results]
+        if not missing:
+            return results
+        if results:
+            # Partial answer: re-request just the missing items as a smaller pack
+            parts = [missing]
+        else:
+            # No progress (API error / unparseable): split so a bad item is isolated
+            half = (len(missing) + 1) // 2
+            parts = [missing[:half], missing[half:]]
+        for part in parts:
+            results.update(self._analyze_packed(part, post_caption, monitored_entities))
+        return results
+    
+    async def analyze_packed_async(
+        self,
+        comments: List[Dict[str, Any]],
+        post_caption: str = "",
+        monitored_entities: Optional[List[str]] = None
+    ) -> Dict[Any, Dict[str, Any]]:
+        """
+        asyncio variant of one analyze_comments() request for concurrent enrichment.
+        
+        Sends a single packed request (no split-and-retry) and returns only
+        the items the model answered; the caller handles whatever is
+        missing. API errors are raised so the caller can back off and retry.
+        """
+        results: Dict[Any, Dict[str, Any]] = {}
+        pending = []
+        for comment in comments:
+            _, cached = self._cached_analysis(comment["text"], post_caption, monitored_entities)
+            if cached is not None:
+                results[comment["id"]] = cached
+            else:
+                pending.append(comment)
+        if not pending:
+            return results
+        
+        response = await self.async_client.chat.completions.create(
+            **self._packed_request(pending, post_caption, monitored_entities)
+        )
+        choice = response.choices[0]
+        response_text = (choice.message.content or "").strip()
+        parsed = self._parse_packed_response(response_text, truncated=choice.finish_reason == "length")
+        results.update(self._collect_packed(pending, parsed, post_caption, monitored_entities))
+        return results
+    
+    def _packed_request(
+        self,
+        comments: List[Dict[str, Any]],
+        post_caption: str,
+        monitored_entities: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """chat.completions.create() arguments for one packed request."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "user", "content": self._build_packed_prompt(comments, post_caption, monitored_entities)}
+            ],
+            "temperature": 0.3,
+            "max_tokens": min(self.PACKED_MAX_TOKENS, self.PACKED_TOKENS_PER_COMMENT * len(comments)),
+            "response_format": {"type": "json_object"}
+        }
+    
+    def _collect_packed(
+        self,
+        comments: List[Dict[str, Any]],
+        parsed: Dict[str, Dict[str, Any]],
+        post_caption: str,
+        monitored_entities: Optional[List[str]]
+    ) -> Dict[Any, Dict[str, Any]]:
+        """Normalize and cache the parsed items of a packed response, keyed by comment id."""
+        results = {}
+        for comment in comments:
+            item = parsed.get(str(comment["id"]))
+            if item is None:
+                continue
+            normalized = self._normalize_analysis(item, monitored_entities, comment["text"])
+            self._store_analysis(self._analysis_cache_key(comment["text"], post_caption, monitored_entities), normalized)
+            results[comment["id"]] = normalized
+        return results
+    
+    def _build_packed_prompt(
+        self,
+        comments: List[Dict[str, Any]],
+        post_caption: str,
+        monitored_entities: Optional[List[str]]
+    ) -> str:
+        """Build the analyze_comments() user prompt for one packed request."""
+        monitored_list = ", ".join(monitored_entities) if monitored_entities else "none"
+        items = json.dumps(
+            [
+                {"id": str(c["id"]), "text": c["text"][:1000], "likes": c.get("likes", 0) or 0}
+                for c in comments
+            ],
+            ensure_ascii=False
+        )
+        
+        return f'''Post caption: "{post_caption[:500]}"
+Monitored entities (for reference): {monitored_list}
+Comments (JSON array, all on this post): {items}
+
+Extract signals from EACH comment independently. 
+
+{self.ANALYSIS_GUIDELINES}
+
+Return valid JSON only, with one result per comment, in input order:
+{{"results": [{{"id": "<comment id>", "entity_scores": {{}}, "entity_confidence": {{}}, "emotion": "...", "stance": "...", "topics": [], "other_entities": [], "sarcasm": false, "toxicity": 0.0, "ambiguous_mentions": []}}]}}'''
+    
+    def _parse_packed_response(self, text: str, truncated: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Parse a packed response into {comment id: raw result}.
+        
+        A complete response goes through _parse_json_with_recovery(). When
+        that fails, or the completion hit max_tokens, items are decoded one
+        object at a time so every complete item survives; an item that is
+        malformed but bounded by the next one is salvaged with
+        _extract_partial_json(), and the cut-off tail is dropped so the
+        caller re-requests it.
+        """
+        if not truncated:
+            parsed = self._parse_json_with_recovery(text)
+            items = parsed.get("results") if isinstance(parsed, dict) else None
+            if isinstance(items, list):
+                return {
+                    str(item["id"]): item
+                    for item in items if isinstance(item, dict) and item.get("id") is not None
+                }
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        starts = [m.start() for m in re.finditer(r'\{\s*"id"\s*:', text)]
+        decoder = json.JSONDecoder()
+        for i, start in enumerate(starts):
+            try:
+                item, _ = decoder.raw_decode(text, start)
+            except json.JSONDecodeError:
+                if i + 1 == len(starts):
+                    break  # Truncated tail: leave it missing
+                segment = text[start:starts[i + 1]]
+                id_match = re.search(r'"id"\s*:\s*"?([^",}]+)"?', segment)
+                if not id_match:
+                    continue
+                item = self._extract_partial_json(segment)
+                item["id"] = id_match.group(1)
+            if isinstance(item, dict) and item.get("id") is not None:
+                results[str(item["id"])] = item
+        return results
+    
+    async def analyze_comment_async(
+        self,
+        comment_text: str,
+        post_caption: str = "",
+        comment_likes: int = 0,
+        monitored_entities: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        asyncio variant of analyze_comment() for concurrent enrichment.
+        
+        Same prompt and normalization, but API errors (429, 5xx, timeouts)
+        are raised instead of swallowed so the caller can back off and retry.
+        Malformed model output still goes through JSON recovery.
+        """
+        key, cached = self._cached_analysis(comment_text, post_caption, monitored_entities)
+        if cached is not None:
+            return cached
+        
+        prompt = self._build_analysis_prompt(
+            comment_text, post_caption, comment_likes, monitored_entities
+        )
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=self.ANALYSIS_MAX_TOKENS,
+            response_format={"type": "json_object"}
+        )
+        response_text = (response.choices[0].message.content or "").strip()
+        result = self._parse_json_with_recovery(response_text)
+        normalized = self._normalize_analysis(result, monitored_entities, comment_text)
+        self._store_analysis(key, normalized)
+        return normalized
+    
+    def estimate_analysis_tokens(
+        self,
+        comment_text: str,
+        post_caption: str = "",
+        monitored_entities: Optional[List[str]] = None
+    ) -> int:
+        """
+        Rough token cost of one analyze_comment() call (prompt + completion).
+        
+        Uses the ~4 characters/token rule of thumb; good enough for
+        tokens-per-minute rate limiting without pulling in a tokenizer.
+        """
+        chars = (
+            len(self.SYSTEM_PROMPT)
+            + len(self._build_analysis_prompt(comment_text, post_caption, 0, monitored_entities))
+        )
+        return chars // 4 + self.ANALYSIS_MAX_TOKENS
+    
+    def estimate_packed_tokens(
+        self,
+        comments: List[Dict[str, Any]],
+        post_caption: str = "",
+        monitored_entities: Optional[List[str]] = None
+    ) -> int:
+        """Rough token cost of one packed analyze_comments() request (prompt + completion)."""
+        chars = (
+            len(self.SYSTEM_PROMPT)
+            + len(self._build_packed_prompt(comments, post_caption, monitored_entities))
+        )
+        return chars // 4 + min(self.PACKED_MAX_TOKENS, self.PACKED_TOKENS_PER_COMMENT * len(comments))
+    
+    def estimate_score_cost(self, text: str) -> float:
+        """
+        Rough USD cost of one score() call, from the configured token prices.
+        
+        Same ~4 characters/token rule as estimate_analysis_tokens(); the
+        completion is budgeted at SCORE_MAX_TOKENS.
+        """
+        prompt_tokens = (len(self.SCORE_SYSTEM_PROMPT) + len("Score sentiment: ") + len(text)) // 4
+        return (
+            prompt_tokens * settings.openai_input_cost_per_1m_tokens
+            + self.SCORE_MAX_TOKENS * settings.openai_output_cost_per_1m_tokens
+        ) / 1_000_000
+    
+    def _analysis_cache_key(
+        self,
+        comment_text: str,
+        post_caption: str,
+        monitored_entities: Optional[List[str]]
+    ) -> Optional[str]:
+        """Cache key for an analysis call, or None when caching is off."""
+        if not self.cache:
+            return None
+        return cache_key(
+            "analysis", self.model, self.ANALYSIS_PROMPT_VERSION,
+            comment_text, post_caption, monitored_entities
+        )
+    
+    def cached_analysis(
+        self,
+        comment_text: str,
+        post_caption: str = "",
+        monitored_entities: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Cached analyze_comment() result, or None on a miss (or with no cache).
+        
+        Lets the concurrent enrichment engine skip the rate limiter for
+        comments that will not reach the API.
+        """
+        _, cached = self._cached_analysis(comment_text, post_caption, monitored_entities)
+        return cached
+    
+    def _cached_analysis(
+        self,
+        comment_text: str,
+        post_caption: str,
+        monitored_entities: Optional[List[str]]
+    ) -> tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Look up an analysis result.
+        
+        Like counts are deliberately not part of the key: they only nudge
+        sarcasm weighting, and keying on them would defeat the cache for
+        the repeated short comments it exists for.
+        
+        Returns:
+            (cache key or None, cached result or None)
+        """
+        key = self._analysis_cache_key(comment_text, post_caption, monitored_entities)
+        if key is None:
+            return None, None
+        return key, self.cache.get(key)
+    
+    def _store_analysis(self, key: Optional[str], analysis: Dict[str, Any]) -> None:
+        """Cache a successful analysis (failures return defaults and are never stored)."""
+        if key:
+            self.cache.put(key, analysis, "analysis", self.model, self.ANALYSIS_PROMPT_VERSION)
+    
+    def _build_analysis_prompt(
+        self,
+        comment_text: str,
+        post_caption: str,
+        comment_likes: int,
+        monitored_entities: Optional[List[str]]
+    ) -> str:
+        """Build the analyze_comment() user prompt."""
+        monitored_list = ", ".join(monitored_entities) if monitored_entities else "none"
+        
+        prompt = f'''Post caption: "{post_caption[:500]}"
+Comment: "{comment_text[:1000]}"
+Comment likes: {comment_likes}
+Monitored entities (for reference): {monitored_list}
+
+Extract signals from this comment. 
+
+{self.ANALYSIS_GUIDELINES}
+
+Return valid JSON only.'''
+        return prompt
+    
+    def _normalize_analysis(
+        self,
+        result: Dict[str, Any],
+        monitored_entities: Optional[List[str]],
+        comment_text: str
+    ) -> Dict[str, Any]:
+        """Validate and normalize a parsed analysis response."""
+        normalized = {
+            "entity_scores": self._validate_entity_scores(result.get("entity_scores", {}), monitored_entities, comment_text, result.get("stance")),
+            "entity_confidence": self._validate_entity_confidence(result.get("entity_confidence", {}), result.get("entity_scores", {})),
+            "emotion": self._validate_emotion(result.get("emotion", "neutral")),
+            "stance": self._validate_stance(result.get("stance", "neutral")),
+            "topics": self._validate_topics(result.get("topics", [])),
+            "other_entities": self._validate_other_entities(result.get("other_entities", [])),
+            "sarcasm": bool(result.get("sarcasm", False)),
+            "toxicity": self._validate_toxicity(result.get("toxicity", 0.0)),
+            "ambiguous_mentions": self._validate_ambiguous_mentions(result.get("ambiguous_mentions", []))
+        }
+        
+        # Ensure entity_scores is always a dict (even if empty)
+        if not isinstance(normalized["entity_scores"], dict):
+            normalized["entity_scores"] = {}
+        
+        # Don't force entity scores - GPT should only score entities actually mentioned
+        # If no entity_scores returned, that's fine - the comment might not mention any monitored entities
+        
+        return normalized
+    
+    @staticmethod
+    def _default_analysis() -> Dict[str, Any]:
+        """Safe defaults returned when analysis fails."""
+        return {
+            "entity_scores": {},
+            "entity_confidence": {},
+            "emotion": "neutral",
+            "stance": "neutral",
+            "topics": [],
+            "other_entities": [],
+            "sarcasm": False,
+            "toxicity": 0.0,
+            "ambiguous_mentions": []
+        }
     
     def _parse_json_with_recovery(self, text: str) -> Dict[str, Any]:
         """
@@ -568,12 +1126,22 @@ class HybridSentimentProvider:
     1. Try rule-based first (free, fast)
     2. If confidence < 0.7 OR score is neutral (-0.2 to 0.2), escalate to OpenAI
     3. This saves ~60-70% of API costs while maintaining quality
+    
+    score_batch() scores a whole chunk cheaply first, then sends only the
+    uncertain rows (deduplicated by text) to the expensive provider
+    concurrently. escalation_stats() reports the escalation rate,
+    expensive-call latency percentiles and estimated cost saved.
     """
     
+    # Escalate below this cheap-model confidence, or inside the neutral band
+    ESCALATION_CONFIDENCE = 0.7
+    NEUTRAL_BAND = 0.2
+    
     def __init__(
         self, 
         cheap: SentimentProvider | None = None,
-        expensive: SentimentProvider | None = None
+        expensive: SentimentProvider | None = None,
+        escalation_concurrency: int | None = None
     ):
         """
         Initialize hybrid provider.
@@ -581,28 +1149,143 @@ class HybridSentimentProvider:
         Args:
             cheap: Cheap sentiment provider (defaults to RuleBasedSentimentProvider)
             expensive: Expensive provider (defaults to OpenAISentimentProvider)
+            escalation_concurrency: Concurrent expensive calls in score_batch()
+                (uses settings.hybrid_escalation_concurrency if None)
         """
         self.cheap = cheap or RuleBasedSentimentProvider()
         self.expensive = expensive or OpenAISentimentProvider()
+        self.escalation_concurrency = escalation_concurrency or settings.hybrid_escalation_concurrency
+        self._stats_lock = threading.Lock()
+        self.reset_escalation_stats()
     
-    def score(self, text: str) -> SentimentResult:
-        """Score sentiment with escalation strategy."""
-        # Try cheap first
-        result = self.cheap.score(text)
-        
+    @property
+    def version(self) -> str:
+        """Both providers' versions, recorded on enriched comments."""
+        cheap = getattr(self.cheap, 'version', type(self.cheap).__name__)
+        expensive = getattr(self.expensive, 'version', type(self.expensive).__name__)
+        return f"hybrid({cheap}|{expensive})"
+    
+    def _should_escalate(self, result: SentimentResult) -> bool:
         # Escalate if:
         # 1. Low confidence (< 0.7)
         # 2. Neutral score (-0.2 to 0.2) - these are often misclassified
-        should_escalate = (
-            result.confidence < 0.7 or 
-            abs(result.score) < 0.2
+        return (
+            result.confidence < self.ESCALATION_CONFIDENCE or 
+            abs(result.score) < self.NEUTRAL_BAND
         )
+    
+    def score(self, text: str) -> SentimentResult:
+        """Score sentiment with escalation strategy."""
+        # Try cheap first
+        result = self.cheap.score(text)
+        self._scored += 1
         
-        if should_escalate:
+        if self._should_escalate(result):
             # Use expensive model
-            return self.expensive.score(text)
+            self._escalated += 1
+            return self._score_expensive(text)
         
+        self._record_saved(text)
         return result
+    
+    def score_batch(self, texts: List[str]) -> List[SentimentResult]:
+        """
+        Score a batch: cheap pass over every text, one concurrent expensive
+        pass over the texts that need escalation.
+        
+        Args:
+            texts: Texts to analyze
+            
+        Returns:
+            One SentimentResult per text, in input order
+        """
+        if hasattr(self.cheap, 'score_batch'):
+            results = list(self.cheap.score_batch(texts))
+        else:
+            results = [self.cheap.score(text) for text in texts]
+        self._scored += len(texts)
+        
+        escalate: Dict[str, List[int]] = {}
+        for index, (text, result) in enumerate(zip(texts, results)):
+            if self._should_escalate(result):
+                escalate.setdefault(text, []).append(index)
+            else:
+                self._record_saved(text)
+        if not escalate:
+            return results
+        
+        self._escalated += sum(len(indexes) for indexes in escalate.values())
+        unique_texts = list(escalate)
+        # Repeated uncertain texts cost one call
+        for text in unique_texts:
+            for _ in escalate[text][1:]:
+                self._record_saved(text)
+        
+        workers = min(self.escalation_concurrency, len(unique_texts))
+        if workers <= 1:
+            expensive = [self._score_expensive(text) for text in unique_texts]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                expensive = list(pool.map(self._score_expensive, unique_texts))
+        
+        for text, result in zip(unique_texts, expensive):
+            for index in escalate[text]:
+                results[index] = result
+        return results
+    
+    def _score_expensive(self, text: str) -> SentimentResult:
+        """One timed expensive-provider call."""
+        started = time.perf_counter()
+        try:
+            return self.expensive.score(text)
+        finally:
+            with self._stats_lock:
+                self._expensive_latencies.append(time.perf_counter() - started)
+    
+    def _record_saved(self, text: str) -> None:
+        """Count an expensive call that was avoided and its estimated cost."""
+        self._calls_saved += 1
+        estimate = getattr(self.expensive, 'estimate_score_cost', None)
+        if estimate is not None:
+            self._cost_saved += estimate(text)
+    
+    def reset_escalation_stats(self) -> None:
+        """Start a new stats window (EnrichmentService resets once per run)."""
+        self._scored = 0
+        self._escalated = 0
+        self._calls_saved = 0
+        self._cost_saved = 0.0
+        self._expensive_latencies: List[float] = []
+    
+    def escalation_stats(self) -> Dict[str, Any]:
+        """
+        Escalation statistics since the last reset.
+        
+        Returns:
+            Dict with sentiment_scored, sentiment_escalated, escalation_rate,
+            expensive_calls, expensive_calls_saved, cost_saved_usd and
+            expensive_latency_p50/p95/p99 (seconds, 0.0 without calls)
+        """
+        latencies = sorted(self._expensive_latencies)
+        n = len(latencies)
+        stats = {
+            "sentiment_scored": self._scored,
+            "sentiment_escalated": self._escalated,
+            "escalation_rate": self._escalated / self._scored if self._scored else 0.0,
+            "expensive_calls": n,
+            "expensive_calls_saved": self._calls_saved,
+            "cost_saved_usd": self._cost_saved,
+        }
+        for name, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+            stats[f"expensive_latency_{name}"] = latencies[int(n * fraction)] if n else 0.0
+        return stats
+
+
+def _cached_openai_provider() -> OpenAISentimentProvider:
+    """OpenAI provider with the configured result cache (API key validated before the cache opens)."""
+    provider = OpenAISentimentProvider()
+    provider.cache = get_llm_cache()
+    return provider
 
 
 def get_sentiment_provider(backend: str | None = None) -> SentimentProvider:
@@ -619,9 +1302,9 @@ def get_sentiment_provider(backend: str | None = None) -> SentimentProvider:
     backend = backend or settings.sentiment_backend
     
     if backend == "openai":
-        return OpenAISentimentProvider()
+        return _cached_openai_provider()
     elif backend == "hybrid":
-        return HybridSentimentProvider()
+        return HybridSentimentProvider(expensive=_cached_openai_provider())
     else:  # "rule_based" or default
         return RuleBasedSentimentProvider()
 
@@ -4,15 +4,21 @@ Brief Builder - Composes analytics results into brief structure.
 Separates computation from presentation - pure data assembly.
 """
 
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any, Tuple
+from typing import Callable, List, Dict, Optional, Any, Tuple
 from datetime import datetime
+import copy
+import time
 import pandas as pd
 import uuid
 import json
 
+from sqlalchemy.orm import Session, sessionmaker
+
 from et_intel_core.analytics import AnalyticsService
-from et_intel_core.reporting.narrative_generator import NarrativeGenerator
+from et_intel_core.config import settings
+from et_intel_core.reporting.narrative_generator import NarrativeGenerator, NarrativeRequest
 
 # Scale limits for report generation
 TOP_ENTITIES_DETAILED_NARRATIVE = 3  # Only write detailed context for top 3
@@ -20,6 +26,33 @@ TOP_ENTITIES_TABLE = 10              # Show top 10 in main table
 TOP_ENTITIES_CHART = 7               # Plot top 7 in trend chart
 MAX_VELOCITY_ALERTS = 8              # Show up to 8 alerts (if >30% change)
 MAX_DISCOVERED_ENTITIES = 10         # Show top 10 discovered entities
+TOP_ENTITIES_CROSS_PLATFORM = 5      # Compare platforms for top 5
+
+# Brief sections and the sections each one needs first. In parallel build
+# mode every section whose dependencies are done runs concurrently.
+SECTION_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    'top_entities_df': (),
+    'total_comments': (),
+    'monitored_entities': ('top_entities_df',),
+    'velocity_alerts': ('monitored_entities',),
+    'entity_trends': ('top_entities_df', 'monitored_entities'),
+    'discovered_df': (),
+    'platform_breakdown': (),
+    'sentiment_distribution': (),
+    # Contextual + velocity narratives: one concurrent LLM stage
+    'narratives': ('top_entities_df', 'velocity_alerts', 'platform_breakdown'),
+    'entity_comparison': ('top_entities_df',),
+    'what_changed': ('top_entities_df', 'velocity_alerts'),
+    'cross_platform_deltas': ('top_entities_df',),
+    'key_risks': ('velocity_alerts', 'top_entities_df', 'platform_breakdown'),
+    'entity_micro_insights': ('top_entities_df', 'velocity_alerts'),
+    'storylines': ('top_entities_df',),
+    'emotion_analysis': ('top_entities_df',),
+    'topic_clusters': (),
+    'toxicity_alerts': (),
+    'stance_summary': ('top_entities_df',),
+    'post_performance': (),
+}
 
 
 @dataclass
@@ -58,6 +91,7 @@ class IntelligenceBriefData:
     toxicity_alerts: BriefSection = field(default_factory=lambda: BriefSection(title="Toxicity Alerts", items=[]))
     stance_summary: BriefSection = field(default_factory=lambda: BriefSection(title="Stance Summary", items=[]))
     post_performance: BriefSection = field(default_factory=lambda: BriefSection(title="Post Performance", items=[]))
+    entity_trends: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)  # entity name -> daily series
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert brief data to dictionary for JSON serialization."""
@@ -97,9 +131,28 @@ class BriefBuilder:
     No presentation logic - just data assembly.
     """
     
-    def __init__(self, analytics: AnalyticsService, narrative_generator: Optional[NarrativeGenerator] = None):
+    def __init__(
+        self,
+        analytics: AnalyticsService,
+        narrative_generator: Optional[NarrativeGenerator] = None,
+        session_factory: Optional[Callable[[], Session]] = None,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Initialize brief builder.
+        
+        Args:
+            analytics: Analytics service (its session is used in serial mode)
+            narrative_generator: Narrative generator (default NarrativeGenerator())
+            session_factory: Opens one pooled session per section task in
+                parallel mode (default: sessions on the analytics engine)
+            max_workers: Section threads in parallel mode
+                (settings.brief_section_workers)
+        """
         self.analytics = analytics
         self.narrative = narrative_generator or NarrativeGenerator()
+        self.session_factory = session_factory or sessionmaker(bind=analytics.session.get_bind())
+        self.max_workers = max_workers or settings.brief_section_workers
     
     def build(
         self,
@@ -107,7 +160,8 @@ class BriefBuilder:
         end: datetime,
         platforms: Optional[List[str]] = None,
         focus_entities: Optional[List[uuid.UUID]] = None,
-        top_entities_limit: int = 20
+        top_entities_limit: int = 20,
+        parallel: Optional[bool] = None
     ) -> IntelligenceBriefData:
         """
         Build intelligence brief from analytics.
@@ -118,69 +172,26 @@ class BriefBuilder:
             platforms: Optional list of platforms to filter
             focus_entities: Optional list of entity IDs to focus on
             top_entities_limit: Maximum number of top entities to include
+            parallel: Run independent sections concurrently on a thread pool,
+                one session per task (settings.brief_parallel_sections)
             
         Returns:
-            IntelligenceBriefData with all sections populated
+            IntelligenceBriefData with all sections populated; per-section
+            seconds are in metadata['section_timings']
         """
         time_window = (start, end)
+        parallel = settings.brief_parallel_sections if parallel is None else parallel
         
-        # Compute all metrics using dynamic entities (monitored + high-volume discovered)
-        # This includes any entity with 10+ mentions, not just pre-monitored ones
-        top_entities_df = self.analytics.get_dynamic_entities(
-            start_date=start,
-            end_date=end,
-            min_mentions=10,
-            platforms=platforms,
-            limit=TOP_ENTITIES_TABLE  # Use scale limit
-        )
+        build_started = time.perf_counter()
+        results, timings = self._run_sections(self._section_tasks(time_window, platforms), parallel)
+        build_seconds = time.perf_counter() - build_started
         
-        # Get total comment count
-        total_comments = self.analytics.get_comment_count(time_window)
-        
-        # Velocity checks for top entities
-        velocity_alerts = []
-        if len(top_entities_df) > 0:
-            # Get entity IDs from top entities
-            # We need to query the database to get entity IDs from names
-            from et_intel_core.models import MonitoredEntity
-            from et_intel_core.db import get_session
-            
-            session = get_session()
-            try:
-                entity_ids_to_check = []
-                entity_name_map = {}  # Map entity_id to name
-                
-                for _, row in top_entities_df.head(10).iterrows():
-                    # Only check velocity for monitored entities (discovered entities don't have entity_id)
-                    entity_id = row.get('entity_id')
-                    entity_name = row.get('entity_name', 'Unknown')
-                    
-                    # Skip if entity_id is None (discovered entities)
-                    if entity_id and pd.notna(entity_id):
-                        entity_ids_to_check.append(uuid.UUID(str(entity_id)))
-                        entity_name_map[uuid.UUID(str(entity_id))] = entity_name
-                    else:
-                        # For discovered entities, try to find if they're now monitored
-                        entity = session.query(MonitoredEntity).filter_by(
-                            name=entity_name
-                        ).first()
-                        if entity:
-                            entity_ids_to_check.append(entity.id)
-                            entity_name_map[entity.id] = entity_name
-                
-                # Check velocity for each
-                for entity_id in entity_ids_to_check:
-                    velocity = self.analytics.compute_velocity(entity_id, window_hours=72)
-                    if velocity and not velocity.get('error') and velocity.get('alert'):
-                        # Add entity name to velocity data
-                        velocity['entity_name'] = entity_name_map.get(entity_id, 'Unknown')
-                        velocity_alerts.append(velocity)
-                
-                # Sort by absolute change (biggest swings first) and limit
-                velocity_alerts.sort(key=lambda x: abs(x.get('percent_change', 0)), reverse=True)
-                velocity_alerts = velocity_alerts[:MAX_VELOCITY_ALERTS]
-            finally:
-                session.close()
+        top_entities_df = results['top_entities_df']
+        total_comments = results['total_comments']
+        velocity_alerts = results['velocity_alerts']
+        velocity_narratives = results['narratives']['velocity']
+        discovered_df = results['discovered_df']
+        platform_breakdown = results['platform_breakdown']
         
         # Count critical alerts (>50% change)
         critical_alerts = len([
@@ -188,59 +199,6 @@ class BriefBuilder:
             if abs(v.get('percent_change', 0)) > 50
         ])
         
-        # Get discovered entities (with scale limit)
-        discovered_df = self.analytics.get_discovered_entities(
-            min_mentions=10,  # Increased threshold for scale
-            reviewed=False,
-            limit=MAX_DISCOVERED_ENTITIES
-        )
-        
-        # Get platform breakdown
-        platform_breakdown = self._get_platform_breakdown(time_window, platforms)
-        
-        # Get sentiment distribution
-        sentiment_dist = self._get_sentiment_distribution(time_window, platforms)
-        
-        # Generate contextual narrative (with LLM if available) - only top 3 entities
-        contextual_narrative = self._generate_contextual_narrative(
-            top_entities_df.head(TOP_ENTITIES_DETAILED_NARRATIVE),  # Only top 3 for narrative
-            velocity_alerts, 
-            platform_breakdown, 
-            time_window
-        )
-        
-        # Generate velocity narratives (LLM explanations for each alert)
-        velocity_narratives = {}
-        for alert in velocity_alerts:
-            entity_name = alert.get('entity_name', 'Unknown')
-            velocity_narratives[entity_name] = self.narrative.generate_velocity_narrative(
-                alert, entity_name
-            )
-        
-        # Get entity comparison (week-over-week changes)
-        entity_comparison = self._get_entity_comparison(time_window, top_entities_df)
-        
-        # Get "What Changed This Week" section
-        what_changed = self._get_what_changed(time_window, top_entities_df, velocity_alerts)
-        
-        # Get cross-platform deltas
-        cross_platform_deltas = self._get_cross_platform_deltas(time_window, top_entities_df)
-        
-        # Generate key risks/watchouts
-        key_risks = self._generate_key_risks(velocity_alerts, top_entities_df, platform_breakdown)
-        
-        # Generate micro-insights per entity
-        entity_micro_insights = self._generate_entity_micro_insights(top_entities_df, velocity_alerts)
-        
-        # Generate new signal type sections
-        emotion_analysis = self._get_emotion_analysis(time_window, top_entities_df)
-        topic_clusters = self._get_topic_clusters(time_window)
-        toxicity_alerts = self._get_toxicity_alerts(time_window)
-        stance_summary = self._get_stance_summary(time_window, top_entities_df)
-        
-        # Generate post performance section
-        post_performance = self._get_post_performance(time_window)
-        
         # Assemble brief
         return IntelligenceBriefData(
             timeframe={'start': start, 'end': end},
@@ -276,31 +234,225 @@ class BriefBuilder:
                 items=platform_breakdown,
                 summary="Comment volume and sentiment by platform"
             ),
-            sentiment_distribution=sentiment_dist,
-            contextual_narrative=contextual_narrative,
-            entity_comparison=entity_comparison,
-            what_changed=what_changed,
-            key_risks=key_risks,
-            entity_micro_insights=entity_micro_insights,
-            cross_platform_deltas=cross_platform_deltas,
-            storylines=self._detect_storylines(time_window, top_entities_df),
+            sentiment_distribution=results['sentiment_distribution'],
+            contextual_narrative=results['narratives']['contextual'],
+            entity_comparison=results['entity_comparison'],
+            what_changed=results['what_changed'],
+            key_risks=results['key_risks'],
+            entity_micro_insights=results['entity_micro_insights'],
+            cross_platform_deltas=results['cross_platform_deltas'],
+            storylines=results['storylines'],
             risk_signals=BriefSection(
                 title="Risk Signals",
                 items=[],  # TODO: Implement risk detection in future
                 summary="Risk signal detection not yet implemented"
             ),
-            emotion_analysis=emotion_analysis,
-            topic_clusters=topic_clusters,
-            toxicity_alerts=toxicity_alerts,
-            stance_summary=stance_summary,
-            post_performance=post_performance,
+            emotion_analysis=results['emotion_analysis'],
+            topic_clusters=results['topic_clusters'],
+            toxicity_alerts=results['toxicity_alerts'],
+            stance_summary=results['stance_summary'],
+            post_performance=results['post_performance'],
+            entity_trends=results['entity_trends'],
             metadata={
                 'generated_at': datetime.utcnow(),
                 'platforms': platforms or ['all'],
-                'focus_entities': [str(eid) for eid in (focus_entities or [])]
+                'focus_entities': [str(eid) for eid in (focus_entities or [])],
+                'build_mode': 'parallel' if parallel else 'serial',
+                'build_seconds': round(build_seconds, 3),
+                'section_timings': timings,
+                'narrative_stats': results['narratives']['stats']
             }
         )
     
+    def _section_tasks(
+        self,
+        time_window: Tuple[datetime, datetime],
+        platforms: Optional[List[str]]
+    ) -> Dict[str, Callable[["BriefBuilder", Dict[str, Any]], Any]]:
+        """
+        Brief sections as tasks, keyed like SECTION_DEPENDENCIES.
+        
+        Each task gets the builder to run on (its analytics may be bound to a
+        task session) and the results of the sections it depends on.
+        """
+        start, end = time_window
+        return {
+            # Dynamic entities (monitored + high-volume discovered): any
+            # entity with 10+ mentions, not just pre-monitored ones
+            'top_entities_df': lambda b, r: b.analytics.get_dynamic_entities(
+                start_date=start,
+                end_date=end,
+                min_mentions=10,
+                platforms=platforms,
+                limit=TOP_ENTITIES_TABLE  # Use scale limit
+            ),
+            'total_comments': lambda b, r: b.analytics.get_comment_count(time_window),
+            # Monitored entity ids behind the top rows (velocity + trend chart)
+            'monitored_entities': lambda b, r: b._resolve_monitored_entities(r['top_entities_df'].head(10)),
+            'velocity_alerts': lambda b, r: b._get_velocity_alerts(r['monitored_entities']),
+            'entity_trends': lambda b, r: b._get_entity_trends(
+                time_window, platforms, r['top_entities_df'], r['monitored_entities']
+            ),
+            'discovered_df': lambda b, r: b.analytics.get_discovered_entities(
+                min_mentions=10,  # Increased threshold for scale
+                reviewed=False,
+                limit=MAX_DISCOVERED_ENTITIES,
+                time_window=time_window,
+                platforms=platforms
+            ),
+            'platform_breakdown': lambda b, r: b._get_platform_breakdown(time_window, platforms),
+            'sentiment_distribution': lambda b, r: b._get_sentiment_distribution(time_window, platforms),
+            # LLM narratives - contextual one only for the top 3 entities
+            'narratives': lambda b, r: b._generate_narratives(
+                r['top_entities_df'],
+                r['velocity_alerts'],
+                r['platform_breakdown'],
+                time_window
+            ),
+            'entity_comparison': lambda b, r: b._get_entity_comparison(time_window, r['top_entities_df']),
+            'what_changed': lambda b, r: b._get_what_changed(
+                time_window, r['top_entities_df'], r['velocity_alerts']
+            ),
+            'cross_platform_deltas': lambda b, r: b._get_cross_platform_deltas(time_window, r['top_entities_df']),
+            'key_risks': lambda b, r: b._generate_key_risks(
+                r['velocity_alerts'], r['top_entities_df'], r['platform_breakdown']
+            ),
+            'entity_micro_insights': lambda b, r: b._generate_entity_micro_insights(
+                r['top_entities_df'], r['velocity_alerts']
+            ),
+            'storylines': lambda b, r: b._detect_storylines(time_window, r['top_entities_df']),
+            'emotion_analysis': lambda b, r: b._get_emotion_analysis(time_window, r['top_entities_df']),
+            'topic_clusters': lambda b, r: b._get_topic_clusters(time_window),
+            'toxicity_alerts': lambda b, r: b._get_toxicity_alerts(time_window),
+            'stance_summary': lambda b, r: b._get_stance_summary(time_window, r['top_entities_df']),
+            'post_performance': lambda b, r: b._get_post_performance(time_window),
+        }
+    
+    def _run_sections(
+        self,
+        tasks: Dict[str, Callable[["BriefBuilder", Dict[str, Any]], Any]],
+        parallel: bool
+    ) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        Run section tasks in SECTION_DEPENDENCIES order.
+        
+        Serial mode runs them one after another on this builder. Parallel mode
+        submits every task whose dependencies are done to a thread pool; each
+        task runs on a copy of the builder whose analytics uses its own
+        session from session_factory (sessions aren't thread-safe).
+        
+        Returns:
+            (section name -> result, section name -> seconds)
+        """
+        results: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+        
+        def run(name: str, builder: "BriefBuilder") -> Any:
+            started = time.perf_counter()
+            try:
+                return tasks[name](builder, results)
+            finally:
+                timings[name] = round(time.perf_counter() - started, 3)
+        
+        if not parallel:
+            for name in SECTION_DEPENDENCIES:
+                results[name] = run(name, self)
+            return results, timings
+        
+        def run_in_session(name: str) -> Any:
+            session = self.session_factory()
+            try:
+                builder = copy.copy(self)
+                builder.analytics = AnalyticsService(session, use_rollup=self.analytics.use_rollup)
+                return run(name, builder)
+            finally:
+                session.close()
+        
+        pending = dict(SECTION_DEPENDENCIES)
+        running: Dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                for name, dependencies in list(pending.items()):
+                    if all(dependency in results for dependency in dependencies):
+                        running[pool.submit(run_in_session, name)] = name
+                        del pending[name]
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception:
+                        for other in running:
+                            other.cancel()
+                        raise
+        return results, timings
+    
+    def _get_velocity_alerts(self, entity_name_map: Dict[uuid.UUID, str]) -> List[Dict[str, Any]]:
+        """Velocity alerts of the top monitored entities, all in one grouped query."""
+        velocity_alerts = []
+        if not entity_name_map:
+            return velocity_alerts
+        
+        velocities = self.analytics.compute_velocity_many(list(entity_name_map), window_hours=72)
+        for entity_id, velocity in velocities.items():
+            if velocity and not velocity.get('error') and velocity.get('alert'):
+                # Add entity name to velocity data
+                velocity['entity_name'] = entity_name_map.get(entity_id, 'Unknown')
+                velocity_alerts.append(velocity)
+        
+        # Sort by absolute change (biggest swings first) and limit
+        velocity_alerts.sort(key=lambda x: abs(x.get('percent_change', 0)), reverse=True)
+        return velocity_alerts[:MAX_VELOCITY_ALERTS]
+    
+    def _resolve_monitored_entities(self, top_entities_df: pd.DataFrame) -> Dict[uuid.UUID, str]:
+        """
+        Map top entity rows to monitored entity ids, in row order.
+        
+        Discovered entities have no entity_id; those that have since been
+        added to monitoring are looked up by name (one query).
+        """
+        from et_intel_core.models import MonitoredEntity
+        
+        entity_name_map: Dict[uuid.UUID, str] = {}
+        unresolved = []
+        for _, row in top_entities_df.iterrows():
+            entity_id = row.get('entity_id')
+            entity_name = row.get('entity_name', 'Unknown')
+            if entity_id is not None and pd.notna(entity_id):
+                entity_name_map[uuid.UUID(str(entity_id))] = entity_name
+            else:
+                unresolved.append(entity_name)
+        
+        if unresolved:
+            monitored = self.analytics.session.query(MonitoredEntity.id, MonitoredEntity.name).filter(
+                MonitoredEntity.name.in_(unresolved)
+            )
+            for entity_id, entity_name in monitored:
+                entity_name_map.setdefault(entity_id, entity_name)
+        return entity_name_map
+    
+    def _get_entity_trends(
+        self,
+        time_window: tuple[datetime, datetime],
+        platforms: Optional[List[str]],
+        top_entities_df: pd.DataFrame,
+        entity_name_map: Dict[uuid.UUID, str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Daily sentiment series of the charted top entities, keyed by name."""
+        chart_names = list(top_entities_df.head(TOP_ENTITIES_CHART)['entity_name']) if len(top_entities_df) else []
+        ids_by_name = {name: entity_id for entity_id, name in entity_name_map.items()}
+        chart_ids = [ids_by_name[name] for name in chart_names if name in ids_by_name]
+        if not chart_ids:
+            return {}
+        
+        history = self.analytics.get_sentiment_history_many(chart_ids, time_window, platforms=platforms)
+        return {
+            entity_name_map[entity_id]: history[entity_id]
+            for entity_id in chart_ids
+            if history.get(entity_id)
+        }
+    
     def _summarize_top_entities(self, df: pd.DataFrame) -> str:
         """Generate executive summary text for top entities."""
         if len(df) == 0:
@@ -426,20 +578,84 @@ class BriefBuilder:
         likes = comment.get("likes", 0) or 0
         return f"{likes:,} likes · {text}"
     
-    def _generate_contextual_narrative(
+    def _generate_narratives(
         self,
         top_entities_df: pd.DataFrame,
         velocity_alerts: List[Dict[str, Any]],
         platform_breakdown: List[Dict[str, Any]],
         time_window: tuple[datetime, datetime]
-    ) -> str:
+    ) -> Dict[str, Any]:
         """
-        Generate contextual narrative using LLM if available.
+        Contextual narrative and one narrative per velocity alert.
+        
+        All prompts go out at once through NarrativeGenerator.generate_many
+        (capped concurrency, per-call timeouts, overall budget); each one
+        falls back to its deterministic text if its call fails or runs late.
+        
+        Returns:
+            Dict with 'contextual' (str), 'velocity' (entity name -> str)
+            and 'stats' (NarrativeGenerator.last_batch_stats)
+        """
+        requests = [
+            self.narrative.velocity_narrative_request(alert, alert.get('entity_name', 'Unknown'))
+            for alert in velocity_alerts
+        ]
+        contextual_request = self._contextual_narrative_request(
+            top_entities_df.head(TOP_ENTITIES_DETAILED_NARRATIVE),  # Only top 3 for narrative
+            velocity_alerts,
+            platform_breakdown,
+            time_window
+        )
+        if contextual_request is not None:
+            requests.append(contextual_request)
+        
+        texts = self.narrative.generate_many(requests)
+        
+        velocity_narratives = {}
+        for alert, text in zip(velocity_alerts, texts):
+            velocity_narratives[alert.get('entity_name', 'Unknown')] = text
+        
+        if contextual_request is not None:
+            contextual = texts[-1]
+        else:
+            contextual = "No significant entity activity in this period."
+        
+        return {
+            'contextual': contextual,
+            'velocity': velocity_narratives,
+            'stats': dict(self.narrative.last_batch_stats)
+        }
+    
+    def _contextual_narrative_request(
+        self,
+        top_entities_df: pd.DataFrame,
+        velocity_alerts: List[Dict[str, Any]],
+        platform_breakdown: List[Dict[str, Any]],
+        time_window: tuple[datetime, datetime]
+    ) -> Optional[NarrativeRequest]:
+        """
+        Contextual narrative prompt (LLM) or executive summary request.
         
         Only uses top 3 entities for detailed narrative (scale optimization).
+        Without an LLM, the executive summary's deterministic fallback is
+        used and no sample comments are fetched.
+        
+        Returns:
+            Request whose fallback is the deterministic summary, or None
+            without top entities
         """
         if len(top_entities_df) == 0:
-            return "No significant entity activity in this period."
+            return None
+        
+        top_entities_list = top_entities_df.to_dict('records')
+        summary_request = self.narrative.brief_summary_request(
+            top_entities_list,
+            velocity_alerts,
+            platform_breakdown,
+            {'start': time_window[0], 'end': time_window[1]}
+        )
+        if not self.narrative.enabled:
+            return summary_request
         
         # Build context from top entities (already limited to top 3)
         context = []
@@ -478,24 +694,22 @@ class BriefBuilder:
                 "sample_comments": formatted_samples
             })
         
-        # Use LLM if available
-        if self.narrative.enabled and hasattr(self.narrative, 'client') and self.narrative.client:
-            # Build prompt for GPT-4o-mini
-            context_lines = []
-            for entry in context:
-                lines = [
-                    f"- {entry['name']}: {entry['mentions']} mentions, sentiment {entry['sentiment']:+.2f}"
-                ]
-                if entry["velocity"]:
-                    lines.append(f"  Velocity: {entry['velocity']:+.1f}% change")
-                if entry["sample_comments"]:
-                    lines.append("  Representative comments:")
-                    for comment in entry["sample_comments"]:
-                        lines.append(f"    • {comment}")
-                context_lines.append("\n".join(lines))
-            prompt_context = "\n".join(context_lines)
-            
-            prompt = f"""Use the following entity summaries and representative comments to write a 3-4 sentence intelligence brief.
+        # Build prompt for GPT-4o-mini
+        context_lines = []
+        for entry in context:
+            lines = [
+                f"- {entry['name']}: {entry['mentions']} mentions, sentiment {entry['sentiment']:+.2f}"
+            ]
+            if entry["velocity"]:
+                lines.append(f"  Velocity: {entry['velocity']:+.1f}% change")
+            if entry["sample_comments"]:
+                lines.append("  Representative comments:")
+                for comment in entry["sample_comments"]:
+                    lines.append(f"    • {comment}")
+            context_lines.append("\n".join(lines))
+        prompt_context = "\n".join(context_lines)
+        
+        prompt = f"""Use the following entity summaries and representative comments to write a 3-4 sentence intelligence brief.
 
 Data:
 {prompt_context}
@@ -508,32 +722,13 @@ STRICT RULES:
 5. Focus on WHAT the data shows, not WHY it might be happening
 
 Do NOT mention anything not directly supported by the data above. Be factual and data-driven."""
-            
-            try:
-                response = self.narrative.client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": "You are an entertainment industry intelligence analyst. Write concise, factual summaries."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=300,
-                    temperature=0.7
-                )
-                return response.choices[0].message.content.strip()
-            except Exception as e:
-                # Fallback to existing method
-                pass
         
-        # Fallback to existing narrative generator
-        top_entities_list = top_entities_df.to_dict('records')
-        narrative = self.narrative.generate_brief_summary(
-            top_entities_list,
-            velocity_alerts,
-            platform_breakdown,
-            {'start': time_window[0], 'end': time_window[1]}
+        return NarrativeRequest(
+            system="You are an entertainment industry intelligence analyst. Write concise, factual summaries.",
+            prompt=prompt,
+            max_tokens=300,
+            fallback=summary_request.fallback
         )
-        
-        return narrative
     
     def _get_entity_comparison(
         self,
@@ -719,88 +914,70 @@ Do NOT mention anything not directly supported by the data above. Be factual and
     def _get_cross_platform_deltas(
         self,
         time_window: tuple[datetime, datetime],
-        top_entities_df: pd.DataFrame
+        top_entities_df: pd.DataFrame,
+        limit: int = TOP_ENTITIES_CROSS_PLATFORM
     ) -> BriefSection:
-        """Get cross-platform deltas showing platform-specific insights."""
-        from et_intel_core.models import Post, Comment, ExtractedSignal, MonitoredEntity
-        from et_intel_core.models.enums import SignalType
-        from sqlalchemy import func
-        from et_intel_core.db import get_session
+        """
+        Get cross-platform deltas showing platform-specific insights.
         
-        session = get_session()
-        try:
-            deltas = []
+        Platform sentiment of all `limit` top entities comes from one grouped
+        query, so the section scales to large entity rosters.
+        """
+        entities_df = top_entities_df.head(limit)
+        entity_name_map = self._resolve_monitored_entities(entities_df)
+        ids_by_name = {name: entity_id for entity_id, name in entity_name_map.items()}
+        platform_sentiment = self.analytics.get_platform_sentiment_many(list(entity_name_map), time_window)
+        
+        deltas = []
+        for entity_name in entities_df['entity_name'] if len(entities_df) else []:
+            entity_id = ids_by_name.get(entity_name)
+            if entity_id is None:
+                continue
             
-            # For each top entity, get platform-specific sentiment
-            for _, entity_row in top_entities_df.head(5).iterrows():
-                entity_name = entity_row['entity_name']
-                entity = session.query(MonitoredEntity).filter_by(name=entity_name).first()
-                
-                if not entity:
-                    continue
-                
-                # Get sentiment by platform
-                platform_sentiment = session.query(
-                    Post.platform,
-                    func.avg(ExtractedSignal.numeric_value).label('avg_sentiment'),
-                    func.count(func.distinct(Comment.id)).label('mention_count')
-                ).join(
-                    Comment, Post.id == Comment.post_id
-                ).join(
-                    ExtractedSignal, Comment.id == ExtractedSignal.comment_id
-                ).filter(
-                    ExtractedSignal.entity_id == entity.id,
-                    ExtractedSignal.signal_type == SignalType.SENTIMENT,
-                    ExtractedSignal.numeric_value.isnot(None),
-                    Comment.created_at.between(time_window[0], time_window[1])
-                ).group_by(Post.platform).all()
-                
-                if len(platform_sentiment) < 2:
-                    continue  # Need at least 2 platforms for comparison
-                
-                # Find best and worst platform
-                platform_data = [
-                    {'platform': p.platform, 'sentiment': float(p.avg_sentiment), 'mentions': int(p.mention_count)}
-                    for p in platform_sentiment
-                ]
-                best_platform = max(platform_data, key=lambda x: x['sentiment'])
-                worst_platform = min(platform_data, key=lambda x: x['sentiment'])
-                
-                # Generate insight
-                if best_platform['sentiment'] - worst_platform['sentiment'] > 0.3:
-                    insight = (
-                        f"{entity_name} shows {best_platform['platform'].title()}-driven positivity "
-                        f"({best_platform['sentiment']:+.2f}) while {worst_platform['platform'].title()} "
-                        f"is more negative ({worst_platform['sentiment']:+.2f})"
-                    )
-                elif worst_platform['sentiment'] - best_platform['sentiment'] < -0.3:
-                    insight = (
-                        f"{entity_name} is being discussed more negatively on {worst_platform['platform'].title()} "
-                        f"({worst_platform['sentiment']:+.2f}) than {best_platform['platform'].title()} "
-                        f"({best_platform['sentiment']:+.2f})"
-                    )
-                else:
-                    insight = (
-                        f"{entity_name} sentiment is consistent across platforms "
-                        f"({best_platform['platform'].title()}: {best_platform['sentiment']:+.2f}, "
-                        f"{worst_platform['platform'].title()}: {worst_platform['sentiment']:+.2f})"
-                    )
-                
-                deltas.append({
-                    'entity': entity_name,
-                    'insight': insight,
-                    'best_platform': best_platform['platform'],
-                    'worst_platform': worst_platform['platform'],
-                    'delta': best_platform['sentiment'] - worst_platform['sentiment']
-                })
+            platform_data = [
+                {'platform': p['platform'], 'sentiment': p['avg_sentiment'], 'mentions': p['mention_count']}
+                for p in platform_sentiment[entity_id]
+            ]
+            if len(platform_data) < 2:
+                continue  # Need at least 2 platforms for comparison
             
-            return BriefSection(
-                title="Cross-Platform Deltas",
-                items=deltas,
-                summary=f"Platform-specific sentiment analysis for {len(deltas)} top entities"
-            )
-        finally:
-            session.close()
+            # Find best and worst platform
+            best_platform = max(platform_data, key=lambda x: x['sentiment'])
+            worst_platform = min(platform_data, key=lambda x: x['sentiment'])
+            
+            # Generate insight
+            if best_platform['sentiment'] - worst_platform['sentiment'] > 0.3:
+                insight = (
+                    f"{entity_name} shows {best_platform['platform'].title()}-driven positivity "
+                    f"({best_platform['sentiment']:+.2f}) while {worst_platform['platform'].title()} "
+                    f"is more negative ({worst_platform['sentiment']:+.2f})"
+                )
+            elif worst_platform['sentiment'] - best_platform['sentiment'] < -0.3:
+                insight = (
+                    f"{entity_name} is being discussed more negatively on {worst_platform['platform'].title()} "
+                    f"({worst_platform['sentiment']:+.2f}) than {best_platform['platform'].title()} "
+                    f"({best_platform['sentiment']:+.2f})"
+                )
+            else:
+                insight = (
+                    f"{entity_name} sentiment is consistent across platforms "
+                    f"({best_platform['platform'].title()}: {best_platform['sentiment']:+.2f}, "
+                    f"{worst_platform['platform'].title()}: {worst_platform['sentiment']:+.2f})"
+                )
+            
+            deltas.append({
+                'entity': entity_name,
+                'insight': insight,
+                'best_platform': best_platform['platform'],
+                'worst_platform': worst_platform['platform'],
+                'delta': best_platform['sentiment'] - worst_platform['sentiment']
+            })
+        
+        return BriefSection(
+            title="Cross-Platform Deltas",
+            items=deltas,
+            summary=f"Platform-specific sentiment analysis for {len(deltas)} top entities"
+        )
     
     def _generate_key_risks(
         self,
@@ -899,82 +1076,79 @@ Do NOT mention anything not directly supported by the data above. Be factual and
         """Detect storylines through keyword clustering and repeated phrases."""
         from et_intel_core.models import Comment, ExtractedSignal, Post
         from et_intel_core.models.enums import SignalType
-        from et_intel_core.db import get_session
         from collections import Counter
         import re
         
-        session = get_session()
-        try:
-            # Get comments with high engagement (likely to contain storylines)
-            high_engagement_comments = session.query(Comment).join(
-                Post, Comment.post_id == Post.id
-            ).filter(
-                Comment.created_at.between(time_window[0], time_window[1]),
-                Comment.likes >= 10  # High engagement threshold
-            ).order_by(Comment.likes.desc()).limit(200).all()
-            
-            if len(high_engagement_comments) == 0:
-                return BriefSection(
-                    title="Active Storylines",
-                    items=[],
-                    summary="No high-engagement comments found for storyline detection"
-                )
-            
-            # Extract keywords and phrases
-            all_text = " ".join([c.text.lower() for c in high_engagement_comments])
-            
-            # Common entertainment keywords/phrases
-            storyline_patterns = [
-                r'\bdivorce\b', r'\bpregnancy\b', r'\bbreakup\b', r'\bengagement\b',
-                r'\bcontroversy\b', r'\bscandal\b', r'\blawsuit\b', r'\bfeud\b',
-                r'\bcollab\b', r'\bcollaboration\b', r'\bcomeback\b', r'\bretirement\b',
-                r'\bnew album\b', r'\bnew movie\b', r'\bnew show\b', r'\btour\b',
-                r'\baward\b', r'\bnomination\b', r'\bwin\b', r'\bloss\b'
-            ]
-            
-            storyline_counts = {}
-            for pattern in storyline_patterns:
-                matches = len(re.findall(pattern, all_text))
-                if matches >= 3:  # At least 3 mentions
-                    storyline_name = pattern.replace(r'\b', '').replace('\\', '').title()
-                    storyline_counts[storyline_name] = matches
-            
-            # Get top entities mentioned with storylines
-            storylines = []
-            for storyline, count in sorted(storyline_counts.items(), key=lambda x: x[1], reverse=True)[:5]:
-                # Find which entities are associated with this storyline
-                associated_entities = []
-                for _, row in top_entities_df.iterrows():
-                    entity_name = row['entity_name'].lower()
-                    # Simple check: if entity name appears in comments mentioning this storyline
-                    storyline_comments = [c for c in high_engagement_comments 
-                                         if storyline.lower() in c.text.lower() 
-                                         and entity_name in c.text.lower()]
-                    if len(storyline_comments) >= 2:
-                        associated_entities.append(row['entity_name'])
-                
-                storylines.append({
-                    'storyline': storyline,
-                    'mention_count': count,
-                    'entities': ', '.join(associated_entities[:3]) if associated_entities else 'General',
-                    'type': 'trending'
-                })
-            
-            # If no storylines detected, create placeholder
-            if len(storylines) == 0:
-                return BriefSection(
-                    title="Active Storylines",
-                    items=[],
-                    summary="No clear storylines detected in high-engagement comments"
-                )
+        session = self.analytics.session
+        
+        # Get comments with high engagement (likely to contain storylines)
+        high_engagement_comments = session.query(Comment).join(
+            Post, Comment.post_id == Post.id
+        ).filter(
+            Comment.created_at.between(time_window[0], time_window[1]),
+            Comment.likes >= 10  # High engagement threshold
+        ).order_by(Comment.likes.desc()).limit(200).all()
+        
+        if len(high_engagement_comments) == 0:
+            return BriefSection(
+                title="Active Storylines",
+                items=[],
+                summary="No high-engagement comments found for storyline detection"
+            )
+        
+        # Extract keywords and phrases
+        all_text = " ".join([c.text.lower() for c in high_engagement_comments])
+        
+        # Common entertainment keywords/phrases
+        storyline_patterns = [
+            r'\bdivorce\b', r'\bpregnancy\b', r'\bbreakup\b', r'\bengagement\b',
+            r'\bcontroversy\b', r'\bscandal\b', r'\blawsuit\b', r'\bfeud\b',
+            r'\bcollab\b', r'\bcollaboration\b', r'\bcomeback\b', r'\bretirement\b',
+            r'\bnew album\b', r'\bnew movie\b', r'\bnew show\b', r'\btour\b',
+            r'\baward\b', r'\bnomination\b', r'\bwin\b', r'\bloss\b'
+        ]
+        
+        storyline_counts = {}
+        for pattern in storyline_patterns:
+            matches = len(re.findall(pattern, all_text))
+            if matches >= 3:  # At least 3 mentions
+                storyline_name = pattern.replace(r'\b', '').replace('\\', '').title()
+                storyline_counts[storyline_name] = matches
+        
+        # Get top entities mentioned with storylines
+        storylines = []
+        for storyline, count in sorted(storyline_counts.items(), key=lambda x: x[1], reverse=True)[:5]:
+            # Find which entities are associated with this storyline
+            associated_entities = []
+            for _, row in top_entities_df.iterrows():
+                entity_name = row['entity_name'].lower()
+                # Simple check: if entity name appears in comments mentioning this storyline
+                storyline_comments = [c for c in high_engagement_comments 
+                                     if storyline.lower() in c.text.lower() 
+                                     and entity_name in c.text.lower()]
+                if len(storyline_comments) >= 2:
+                    associated_entities.append(row['entity_name'])
             
+            storylines.append({
+                'storyline': storyline,
+                'mention_count': count,
+                'entities': ', '.join(associated_entities[:3]) if associated_entities else 'General',
+                'type': 'trending'
+            })
+        
+        # If no storylines detected, create placeholder
+        if len(storylines) == 0:
             return BriefSection(
                 title="Active Storylines",
-                items=storylines,
-                summary=f"{len(storylines)} storylines detected from {len(high_engagement_comments)} high-engagement comments"
+                items=[],
+                summary="No clear storylines detected in high-engagement comments"
             )
-        finally:
-            session.close()
+        
+        return BriefSection(
+            title="Active Storylines",
+            items=storylines,
+            summary=f"{len(storylines)} storylines detected from {len(high_engagement_comments)} high-engagement comments"
+        )
     
     def _get_emotion_analysis(
         self,
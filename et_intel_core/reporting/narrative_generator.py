@@ -4,13 +4,35 @@ Narrative Generator - Uses LLM to generate contextual insights.
 Takes analytics data and generates human-readable narrative summaries.
 """
 
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import os
+import time
 
 from openai import OpenAI
 from et_intel_core.config import settings
 
+NARRATIVE_MODEL = "gpt-4o-mini"
+ANALYST_SYSTEM_PROMPT = (
+    "You are an entertainment industry intelligence analyst. Provide concise, data-driven insights."
+)
+
+
+@dataclass(frozen=True)
+class NarrativeRequest:
+    """One narrative prompt plus the deterministic text used if its call fails."""
+    system: str
+    prompt: str
+    max_tokens: int
+    fallback: str
+    
+    @property
+    def key(self) -> Tuple[str, str, int]:
+        """Identical prompts share one LLM call (see generate_many)."""
+        return (self.system, self.prompt, self.max_tokens)
+
 
 class NarrativeGenerator:
     """Generates narrative summaries using LLM."""
@@ -29,6 +51,92 @@ class NarrativeGenerator:
         else:
             self.client = OpenAI(api_key=api_key)
             self.enabled = True
+        self.last_batch_stats: Dict[str, Any] = {}
+    
+    def complete(self, request: NarrativeRequest, timeout: Optional[float] = None) -> str:
+        """
+        Run one narrative request, falling back to its deterministic text.
+        
+        Args:
+            request: Prompt and fallback text
+            timeout: Seconds before the call is abandoned (client default if None)
+        """
+        if not self.enabled:
+            return request.fallback
+        try:
+            return self._call(request, timeout)
+        except Exception:
+            return request.fallback
+    
+    def generate_many(
+        self,
+        requests: List[NarrativeRequest],
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        budget_seconds: Optional[float] = None
+    ) -> List[str]:
+        """
+        Run narrative requests concurrently, coalescing identical prompts.
+        
+        Calls run on a thread pool capped at max_concurrency, each with its
+        own timeout. Whatever hasn't finished when budget_seconds run out is
+        abandoned, so the caller never waits longer than the budget. Failed,
+        timed-out and abandoned requests get their fallback text. Counts are
+        kept in last_batch_stats.
+        
+        Args:
+            requests: Narrative requests, in output order
+            max_concurrency: Concurrent calls (settings.narrative_concurrency)
+            timeout: Seconds per call (settings.narrative_timeout_seconds)
+            budget_seconds: Seconds for the whole batch (settings.narrative_budget_seconds)
+            
+        Returns:
+            Narrative text per request
+        """
+        max_concurrency = max_concurrency or settings.narrative_concurrency
+        timeout = timeout or settings.narrative_timeout_seconds
+        budget_seconds = budget_seconds or settings.narrative_budget_seconds
+        
+        unique = {request.key: request for request in requests}
+        self.last_batch_stats = {
+            "requests": len(requests),
+            "calls": len(unique) if self.enabled else 0,
+            "fallbacks": len(requests) if not self.enabled else 0,
+            "seconds": 0.0
+        }
+        if not self.enabled or not requests:
+            return [request.fallback for request in requests]
+        
+        started = time.perf_counter()
+        pool = ThreadPoolExecutor(max_workers=min(max_concurrency, len(unique)))
+        futures = {key: pool.submit(self._call, request, timeout) for key, request in unique.items()}
+        done, _ = wait(futures.values(), timeout=budget_seconds)
+        # Don't wait for stragglers; they end at their own timeout
+        pool.shutdown(wait=False, cancel_futures=True)
+        
+        texts: Dict[Tuple[str, str, int], Optional[str]] = {}
+        for key, future in futures.items():
+            texts[key] = future.result() if future in done and future.exception() is None else None
+        
+        results = [texts[request.key] or request.fallback for request in requests]
+        self.last_batch_stats["fallbacks"] = sum(1 for request in requests if not texts[request.key])
+        self.last_batch_stats["seconds"] = round(time.perf_counter() - started, 3)
+        return results
+    
+    def _call(self, request: NarrativeRequest, timeout: Optional[float] = None) -> str:
+        """One chat completion for a request (raises on API errors)."""
+        options = {"timeout": timeout} if timeout else {}
+        response = self.client.chat.completions.create(
+            model=NARRATIVE_MODEL,
+            messages=[
+                {"role": "system", "content": request.system},
+                {"role": "user", "content": request.prompt}
+            ],
+            max_tokens=request.max_tokens,
+            temperature=0.7,
+            **options
+        )
+        return response.choices[0].message.content.strip()
     
     def generate_velocity_narrative(
         self,
@@ -45,12 +153,19 @@ class NarrativeGenerator:
         Returns:
             Narrative text explaining the change
         """
-        if not self.enabled:
-            return (
-                f"{entity_name} experienced a {velocity_data.get('percent_change', 0):+.1f}% "
-                f"sentiment shift from {velocity_data.get('previous_sentiment', 0):.2f} to "
-                f"{velocity_data.get('recent_sentiment', 0):.2f}."
-            )
+        return self.complete(self.velocity_narrative_request(velocity_data, entity_name))
+    
+    def velocity_narrative_request(
+        self,
+        velocity_data: Dict[str, Any],
+        entity_name: str
+    ) -> NarrativeRequest:
+        """Velocity narrative prompt, with the simple shift sentence as fallback."""
+        fallback = (
+            f"{entity_name} experienced a {velocity_data.get('percent_change', 0):+.1f}% "
+            f"sentiment shift from {velocity_data.get('previous_sentiment', 0):.2f} to "
+            f"{velocity_data.get('recent_sentiment', 0):.2f}."
+        )
         
         change_pct = velocity_data.get('percent_change', 0)
         previous = velocity_data.get('previous_sentiment', 0)
@@ -84,24 +199,12 @@ Provide a data-driven explanation that would be useful for entertainment industr
 
 Use clear language: say "sentiment improving" not "negativity improving". Describe the direction of change clearly."""
 
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an entertainment industry intelligence analyst. Provide concise, data-driven insights."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.7
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            # Fallback to simple narrative
-            return (
-                f"{entity_name} experienced a {velocity_data.get('percent_change', 0):+.1f}% "
-                f"sentiment shift from {velocity_data.get('previous_sentiment', 0):.2f} to "
-                f"{velocity_data.get('recent_sentiment', 0):.2f}."
-            )
+        return NarrativeRequest(
+            system=ANALYST_SYSTEM_PROMPT,
+            prompt=prompt,
+            max_tokens=200,
+            fallback=fallback
+        )
     
     def generate_brief_summary(
         self,
@@ -124,7 +227,18 @@ Use clear language: say "sentiment improving" not "negativity improving". Descri
         """
         if not self.enabled:
             return self._generate_fallback_summary(top_entities, velocity_alerts)
-        
+        return self.complete(
+            self.brief_summary_request(top_entities, velocity_alerts, platform_breakdown, timeframe)
+        )
+    
+    def brief_summary_request(
+        self,
+        top_entities: List[Dict[str, Any]],
+        velocity_alerts: List[Dict[str, Any]],
+        platform_breakdown: List[Dict[str, Any]],
+        timeframe: Dict[str, datetime]
+    ) -> NarrativeRequest:
+        """Executive summary prompt, with the fallback summary as fallback."""
         # Build context
         top_entity = top_entities[0] if top_entities else None
         critical_alert = next((a for a in velocity_alerts if abs(a.get('percent_change', 0)) > 50), None)
@@ -146,19 +260,15 @@ STRICT RULES:
 
 Write a professional, concise summary that highlights the most important insights. Focus on what executives need to know. Do NOT mention anything not directly supported by the data above."""
 
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an entertainment industry intelligence analyst. Write executive summaries that are concise, data-driven, and actionable."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=250,
-                temperature=0.7
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            return self._generate_fallback_summary(top_entities, velocity_alerts)
+        return NarrativeRequest(
+            system=(
+                "You are an entertainment industry intelligence analyst. Write executive summaries "
+                "that are concise, data-driven, and actionable."
+            ),
+            prompt=prompt,
+            max_tokens=250,
+            fallback=self._generate_fallback_summary(top_entities, velocity_alerts)
+        )
     
     def _generate_fallback_summary(
         self,
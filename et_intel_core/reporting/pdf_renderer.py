@@ -1175,33 +1175,19 @@ class PDFRenderer:
         elements.append(Paragraph("Entity Sentiment Trends", self.styles['SectionTitle']))
         elements.append(Spacer(1, 0.2*inch))
         
-        # Get top entities for comparison (limit for scale)
-        top_entities = brief.top_entities.items[:limit]
-        
-        if len(top_entities) < 2:
+        # Daily series fetched by BriefBuilder (one query for all entities),
+        # in top-entity order
+        top_names = [entity.get('entity_name', 'Unknown') for entity in brief.top_entities.items[:limit]]
+        entities_data = {
+            name: brief.entity_trends[name]
+            for name in top_names
+            if brief.entity_trends.get(name)
+        }
+        
+        if len(entities_data) < 2:
             return elements
         
-        # For demo, we'll create a simple comparison chart
-        # In production, this would use actual historical data from AnalyticsService
         try:
-            # Create mock trend data for demo
-            from datetime import timedelta
-            entities_data = {}
-            for entity in top_entities:
-                entity_name = entity.get('entity_name', 'Unknown')
-                # Mock 7 days of data
-                trend_data = []
-                base_sentiment = entity.get('avg_sentiment', 0.0)
-                for i in range(7):
-                    date = brief.timeframe['end'] - timedelta(days=6-i)
-                    # Add some variation
-                    sentiment = base_sentiment + (i - 3) * 0.05
-                    trend_data.append({
-                        'date': date,
-                        'avg_sentiment': sentiment
-                    })
-                entities_data[entity_name] = trend_data
-            
             chart_path = self.chart_generator.generate_entity_comparison_trend(entities_data)
             chart_img = Image(str(chart_path), width=7*inch, height=4.5*inch)
             elements.append(chart_img)
@@ -21,6 +21,7 @@ class RawComment(BaseModel):
     comment_text: str = Field(..., description="Comment text content")
     comment_timestamp: datetime = Field(..., description="When comment was posted")
     like_count: int = Field(default=0, description="Number of likes")
+    external_comment_id: Optional[str] = Field(None, description="Comment ID from platform (e.g. Apify pk)")
     raw: dict = Field(default_factory=dict, description="Original row for debugging")
 
     class Config:
@@ -35,6 +36,7 @@ class RawComment(BaseModel):
                 "comment_text": "Love this!",
                 "comment_timestamp": "2024-01-01T12:00:00Z",
                 "like_count": 42,
+                "external_comment_id": "17890000000000001",
                 "raw": {}
             }
         }
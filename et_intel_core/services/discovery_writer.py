@@ -0,0 +1,237 @@
+"""
+In-memory aggregation of discovered entities, merged once per chunk.
+
+Tracking a discovered name used to cost a flush, a SELECT by name and often
+a second flush per name per comment. DiscoveredEntityBuffer instead keeps
+per-name counts, first/last-seen times and a reservoir of sample mentions in
+memory, and flush() merges them into discovered_entities with one
+INSERT ... ON CONFLICT (name) DO UPDATE.
+
+mention_count is incremented in SQL (``mention_count + excluded.mention_count``),
+so concurrent enrichment workers flushing the same name never lose counts.
+Sample mentions are best-effort: each flush merges its reservoir with the
+stored one, weighted by mention counts, and the last writer's merge wins.
+
+When the mentioning comment is known, the flush also links it to the
+entity in discovered_entity_mentions (INSERT ... ON CONFLICT DO NOTHING),
+which is what the report queries count per time window.
+"""
+
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from et_intel_core.db_upsert import chunked, upsert_insert
+from et_intel_core.models import DiscoveredEntity, DiscoveredEntityMention
+from et_intel_core.monitoring import get_metrics
+
+MAX_SAMPLE_MENTIONS = 10
+SAMPLE_MENTION_LENGTH = 200
+_LOOKUP_BATCH_SIZE = 500
+
+
+@dataclass
+class DiscoveredAggregate:
+    """Mentions of one discovered name since the last flush."""
+    entity_type: str
+    first_seen_at: datetime
+    last_seen_at: datetime
+    count: int = 0
+    samples: List[str] = field(default_factory=list)
+    comment_ids: Set[uuid.UUID] = field(default_factory=set)
+
+
+def merge_samples(
+    stored: Sequence[str],
+    stored_count: int,
+    new: Sequence[str],
+    new_count: int,
+    k: int = MAX_SAMPLE_MENTIONS,
+    rng: random.Random = random
+) -> List[str]:
+    """
+    Merge two mention reservoirs into one of at most ``k`` samples.
+
+    Each side's samples stand in for its mention count, so the result is a
+    uniform sample of all mentions. While the combined population still
+    fits in ``k``, everything is kept (stored samples first).
+
+    Args:
+        stored: Samples already in the database
+        stored_count: Mentions those samples represent
+        new: Samples collected since the last flush
+        new_count: Mentions those samples represent
+        k: Reservoir size
+        rng: Random source (seedable in tests)
+    """
+    if stored_count + new_count <= k or len(stored) + len(new) <= k:
+        return (list(stored) + list(new))[:k]
+
+    stored_pool, new_pool = list(stored), list(new)
+    stored_weight, new_weight = max(stored_count, len(stored_pool)), max(new_count, len(new_pool))
+    merged: List[str] = []
+    while len(merged) < k and (stored_pool or new_pool):
+        take_stored = stored_pool and (
+            not new_pool or rng.random() * (stored_weight + new_weight) < stored_weight
+        )
+        if take_stored:
+            merged.append(stored_pool.pop(rng.randrange(len(stored_pool))))
+            stored_weight = max(stored_weight - 1, len(stored_pool))
+        else:
+            merged.append(new_pool.pop(rng.randrange(len(new_pool))))
+            new_weight = max(new_weight - 1, len(new_pool))
+    return merged
+
+
+class DiscoveredEntityBuffer:
+    """
+    Aggregates discovered-entity mentions and merges them per flush.
+
+    Each flush is timed in MetricsCollector as ``enrichment.discovered_flush``.
+    """
+
+    def __init__(self, session: Session, rng: Optional[random.Random] = None):
+        """
+        Initialize buffer.
+
+        Args:
+            session: Session the merge is written through (caller commits)
+            rng: Random source for reservoir sampling (seedable in tests)
+        """
+        self.session = session
+        self.rng = rng or random.Random()
+        self._aggregates: Dict[str, DiscoveredAggregate] = {}
+
+    def __len__(self) -> int:
+        return len(self._aggregates)
+
+    def add(
+        self,
+        name: str,
+        entity_type: str,
+        context: str,
+        seen_at: Optional[datetime] = None,
+        comment_id: Optional[uuid.UUID] = None
+    ) -> None:
+        """
+        Record one mention of ``name``.
+
+        Args:
+            name: Entity name (exact, as stored in discovered_entities.name)
+            entity_type: Entity type from spaCy/GPT (kept from the first mention)
+            context: Comment text the name appeared in
+            seen_at: Mention time (defaults to now)
+            comment_id: Comment the name appeared in (linked on flush)
+        """
+        seen_at = seen_at or datetime.utcnow()
+        aggregate = self._aggregates.get(name)
+        if aggregate is None:
+            aggregate = self._aggregates[name] = DiscoveredAggregate(
+                entity_type=entity_type,
+                first_seen_at=seen_at,
+                last_seen_at=seen_at
+            )
+        aggregate.last_seen_at = max(aggregate.last_seen_at, seen_at)
+        aggregate.count += 1
+        if comment_id is not None:
+            aggregate.comment_ids.add(comment_id)
+
+        # Reservoir sampling (Algorithm R) over this flush window
+        sample = context[:SAMPLE_MENTION_LENGTH]
+        if len(aggregate.samples) < MAX_SAMPLE_MENTIONS:
+            aggregate.samples.append(sample)
+        else:
+            slot = self.rng.randrange(aggregate.count)
+            if slot < MAX_SAMPLE_MENTIONS:
+                aggregate.samples[slot] = sample
+
+    def flush(self) -> int:
+        """
+        Merge buffered aggregates into discovered_entities and clear the buffer.
+
+        Returns:
+            Number of distinct names written
+        """
+        if not self._aggregates:
+            return 0
+
+        started = time.perf_counter()
+        aggregates, self._aggregates = self._aggregates, {}
+
+        stored: Dict[str, tuple] = {}
+        for names in chunked(aggregates.keys(), _LOOKUP_BATCH_SIZE):
+            result = self.session.execute(
+                select(
+                    DiscoveredEntity.name,
+                    DiscoveredEntity.mention_count,
+                    DiscoveredEntity.sample_mentions
+                ).where(DiscoveredEntity.name.in_(names))
+            )
+            for name, mention_count, sample_mentions in result:
+                stored[name] = (mention_count or 0, sample_mentions or [])
+
+        rows = []
+        for name, aggregate in aggregates.items():
+            stored_count, stored_samples = stored.get(name, (0, []))
+            rows.append({
+                "id": uuid.uuid4(),
+                "name": name,
+                "entity_type": aggregate.entity_type,
+                "first_seen_at": aggregate.first_seen_at,
+                "last_seen_at": aggregate.last_seen_at,
+                "mention_count": aggregate.count,
+                "sample_mentions": merge_samples(
+                    stored_samples, stored_count, aggregate.samples, aggregate.count, rng=self.rng
+                ),
+                "reviewed": False,
+            })
+
+        table = DiscoveredEntity.__table__
+        stmt = upsert_insert(self.session, DiscoveredEntity)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["name"],
+            set_={
+                "mention_count": table.c.mention_count + stmt.excluded.mention_count,
+                "last_seen_at": stmt.excluded.last_seen_at,
+                "sample_mentions": stmt.excluded.sample_mentions,
+            }
+        )
+        self.session.execute(stmt, rows)
+        links = self._write_mentions(aggregates)
+
+        metrics = get_metrics()
+        metrics.record_timing("enrichment.discovered_flush", time.perf_counter() - started)
+        metrics.increment("enrichment.discovered_names_written", len(rows))
+        metrics.increment("enrichment.discovered_mentions_linked", links)
+        return len(rows)
+
+    def _write_mentions(self, aggregates: Dict[str, DiscoveredAggregate]) -> int:
+        """Insert (discovered entity, comment) links for the flushed names."""
+        linked = [name for name, aggregate in aggregates.items() if aggregate.comment_ids]
+        if not linked:
+            return 0
+        # Ids are read back rather than taken from the rows: a name another
+        # worker inserted first keeps that worker's id
+        entity_ids: Dict[str, uuid.UUID] = {}
+        for names in chunked(linked, _LOOKUP_BATCH_SIZE):
+            result = self.session.execute(
+                select(DiscoveredEntity.name, DiscoveredEntity.id).where(DiscoveredEntity.name.in_(names))
+            )
+            entity_ids.update((name, entity_id) for name, entity_id in result)
+
+        links = [
+            {"discovered_entity_id": entity_ids[name], "comment_id": comment_id}
+            for name in linked
+            for comment_id in aggregates[name].comment_ids
+        ]
+        stmt = upsert_insert(self.session, DiscoveredEntityMention).on_conflict_do_nothing(
+            index_elements=["discovered_entity_id", "comment_id"]
+        )
+        self.session.execute(stmt, links)
+        return len(links)
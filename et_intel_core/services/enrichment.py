@@ -2,21 +2,52 @@
 Enrichment service - extracts entities and scores sentiment.
 """
 
+import asyncio
+import logging
+import time
 import uuid
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import Any, Awaitable, Callable, Iterator, List, Optional, Dict, Set, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import exists
+from sqlalchemy import delete, exists, func, or_, select, tuple_
 
 from et_intel_core.models import (
     Comment,
+    Post,
     ExtractedSignal,
-    DiscoveredEntity,
-    MonitoredEntity,
     ReviewQueue,
     SignalType
 )
-from et_intel_core.nlp import EntityExtractor, SentimentProvider
+from et_intel_core.nlp import EntityExtractor, SentimentProvider, SentimentResult
+from et_intel_core.nlp.rate_limit import (
+    RateLimiter,
+    backoff_delay,
+    is_retryable_error,
+    retry_after_seconds
+)
+from et_intel_core.analytics.hourly_rollup import comment_hours, refresh_dirty_hours, refresh_hours
+from et_intel_core.config import settings
+from et_intel_core.db_text_search import contains_any
+from et_intel_core.monitoring import get_metrics
+from et_intel_core.services.entity_context import (
+    CatalogEntity,
+    EntityContextSnapshot,
+    entity_search_terms
+)
+from et_intel_core.services.signal_writer import SignalBuffer
+from et_intel_core.services.discovery_writer import DiscoveredEntityBuffer
+from et_intel_core.services.enrichment_versions import (
+    mark_for_reanalysis,
+    pipeline_version,
+    record_catalog_version,
+    record_enriched,
+    stale_comment_filter
+)
+
+logger = logging.getLogger(__name__)
+
+# Comments fetched per keyset page (one query, one commit, then expunged)
+DEFAULT_ENRICH_CHUNK_SIZE = 500
 
 
 class EnrichmentService:
@@ -26,16 +57,18 @@ class EnrichmentService:
     
     Key features:
     - Idempotent: can re-run on same comments (updates existing signals)
-    - Batch processing: commits every 50 comments
+    - Streaming: keyset-paginated chunks, one commit per chunk, flat memory
     - Entity discovery: tracks unknown entities
+    - Entity context: one catalog snapshot per run, rebuilt only on change
     - Like-weighted scoring: high-engagement comments matter more
+    - Concurrent mode: enrich_comments_concurrent() overlaps LLM calls
     """
     
     def __init__(
         self,
         session: Session,
         extractor: EntityExtractor,
-        sentiment_provider: SentimentProvider
+        sentiment_provider: Optional[SentimentProvider] = None
     ):
         """
         Initialize enrichment service.
@@ -43,415 +76,1192 @@ class EnrichmentService:
         Args:
             session: SQLAlchemy database session
             extractor: Entity extractor instance
-            sentiment_provider: Sentiment scoring provider
+            sentiment_provider: Sentiment scoring provider (not needed for
+                backfill_entity, which only reads existing signals)
         """
         self.session = session
         self.extractor = extractor
         self.sentiment_provider = sentiment_provider
+        self._entity_context: Optional[EntityContextSnapshot] = None
+        self._signal_buffer = SignalBuffer(session)
+        self._discovered_buffer = DiscoveredEntityBuffer(session)
     
     def enrich_comments(
         self,
         comment_ids: Optional[List[uuid.UUID]] = None,
-        since: Optional[datetime] = None
-    ) -> Dict[str, int]:
+        since: Optional[datetime] = None,
+        chunk_size: int = DEFAULT_ENRICH_CHUNK_SIZE,
+        stale_only: bool = False,
+        refresh_rollup: bool = True,
+        before_commit: Optional[Callable[[Set[uuid.UUID]], None]] = None
+    ) -> Dict[str, Any]:
         """
         Enrich comments with entities + sentiment.
         Idempotent: can be re-run to update signals.
         
+        Comments are streamed in keyset-paginated chunks (see
+        _iter_comment_chunks); each chunk is committed and expunged before
+        the next is fetched, so memory stays flat on full backfills.
+        
         Args:
             comment_ids: Specific comments to enrich (or None for all unprocessed)
             since: Only enrich comments created after this date
+            chunk_size: Comments per keyset page / commit
+            stale_only: Only enrich comments enriched under an older pipeline
+                or catalog version (see enrichment_versions)
+            refresh_rollup: Bring entity_sentiment_hourly up to date at the
+                end of the run (see analytics/hourly_rollup.py)
+            before_commit: Called with each chunk's comment ids once its
+                writes are flushed, in the same transaction; if it raises,
+                the chunk is rolled back and the exception propagates
+                (see enrichment_workers.ClaimQueue.complete_owned)
             
         Returns:
             Dictionary with enrichment statistics:
             - comments_processed: Number of comments enriched
             - signals_created: Number of new signals created
             - entities_discovered: Number of new entities discovered
+            - entity_context_version: Catalog version the run finished on
+            - entity_context_builds / entity_context_build_seconds: Snapshot
+              (re)builds and their total cost
+            - caption_cache_hits / caption_cache_misses / caption_cache_hit_rate:
+              Per-post caption context reuse (see EntityExtractor.caption_context)
+            - escalation_rate, expensive_latency_p50/p95/p99, cost_saved_usd, ...:
+              Hybrid provider only (see HybridSentimentProvider.escalation_stats)
+            - rollup_hours_refreshed / rollup_rows_written / rollup_refresh_seconds:
+              Hourly rollup maintenance (with refresh_rollup)
         """
-        stats = {
-            "comments_processed": 0,
-            "signals_created": 0,
-            "entities_discovered": 0
-        }
-        
-        # Query comments to process
-        query = self.session.query(Comment)
-        
-        if comment_ids:
-            query = query.filter(Comment.id.in_(comment_ids))
-        elif since:
-            query = query.filter(Comment.created_at >= since)
-        else:
-            # Default: only unprocessed comments (no signals yet)
-            query = query.filter(
-                ~exists().where(
-                    ExtractedSignal.comment_id == Comment.id
-                )
-            )
+        stats = self._new_stats()
+        caption_cache_start = self.extractor.caption_cache_stats()
+        if hasattr(self.sentiment_provider, 'reset_escalation_stats'):
+            self.sentiment_provider.reset_escalation_stats()
         
-        comments = query.all()
-        
-        for comment in comments:
-            # Extract entities first (needed for enhanced analysis)
-            catalog_mentions, discovered = self.extractor.extract(
-                comment.text,
-                post_caption=comment.post.caption or comment.post.subject_line or ""
-            )
-            
-            # Track discovered entities from spaCy
-            for disc in discovered:
-                self._track_discovered_entity(disc.name, disc.entity_type, comment.text)
-                stats["entities_discovered"] += 1
-            
-            # Get post caption for context
-            post_caption = comment.post.caption or comment.post.subject_line or ""
+        for chunk in self._iter_comment_chunks(comment_ids, since, chunk_size, stale_only):
+            # Built once, rebuilt only if monitored_entities changed mid-run
+            entity_context = self._refresh_entity_context(stats)
+            monitored_entity_list = entity_context.prompt_entities
             
-            # Get ALL monitored entities as context (not just ones found in comment)
-            # Let GPT determine which ones are actually relevant
-            all_monitored_entities = self.session.query(MonitoredEntity).filter_by(is_active=True).all()
-            monitored_entity_list = []
-            for entity in all_monitored_entities:
-                # Add disambiguation for common confusions
-                entity_info = entity.name
-                if "Justin" in entity.name and "Baldoni" in entity.name:
-                    entity_info += " (the director, not Justin Bieber)"
-                elif "Blake" in entity.name and "Lively" in entity.name:
-                    entity_info += " (the actress, not Blake Shelton)"
-                elif entity.aliases:
-                    aliases_str = ", ".join(entity.aliases[:3])
-                    entity_info += f" (aliases: {aliases_str})"
-                monitored_entity_list.append(entity_info)
+            # Extract entities for the whole chunk first (needed for enhanced
+            # analysis); spaCy batches the NER pass
+            extractions = self._extract_chunk(chunk)
+            batch_scores = self._score_chunk(chunk)
+            packed_analyses = self._analyze_chunk(chunk, monitored_entity_list or None)
             
-            # Calculate like-weighted score
-            weight_score = 1.0 + (comment.likes / 100.0)
-            
-            # Use enhanced OpenAI provider if available, otherwise fallback
-            if hasattr(self.sentiment_provider, 'analyze_comment'):
-                # Enhanced multi-signal extraction
-                # Pass monitored entities as context, not targets
-                # GPT will determine which ones are actually mentioned
-                analysis = self.sentiment_provider.analyze_comment(
-                    comment_text=comment.text,
-                    post_caption=post_caption,
-                    comment_likes=comment.likes or 0,
-                    monitored_entities=monitored_entity_list if monitored_entity_list else None
-                )
+            for (comment, post_caption), (catalog_mentions, discovered), batch_score, analysis in zip(
+                chunk, extractions, batch_scores, packed_analyses
+            ):
+                # Track discovered entities from spaCy
+                for disc in discovered:
+                    self._track_discovered_entity(disc.name, disc.entity_type, comment.text, comment.id)
+                    stats["entities_discovered"] += 1
                 
-                # Get confidence scores
-                entity_confidence = analysis.get("entity_confidence", {})
+                # Calculate like-weighted score
+                weight_score = 1.0 + (comment.likes / 100.0)
                 
-                # Create entity-targeted sentiment signals (only if confidence >= 0.7)
-                for entity_name_raw, score in analysis.get("entity_scores", {}).items():
-                    # Strip disambiguation hints from entity name
-                    entity_name = entity_name_raw.split(" (")[0].strip()
-                    
-                    # FIX 2: Validate entity name before processing
-                    if not self._is_valid_entity_name(entity_name):
-                        continue
-                    
-                    # Check confidence
-                    confidence = entity_confidence.get(entity_name, 0.8)  # Default 0.8 if not provided
-                    
-                    if confidence < 0.7:
-                        # Low confidence - queue for human review instead of creating signal
-                        self._queue_for_review(
-                            comment=comment,
-                            entity_mention=entity_name,
-                            confidence=confidence,
-                            possible_entities=[entity_name],
-                            reason=f"Low confidence ({confidence:.2f}) for entity assignment"
+                # Use enhanced OpenAI provider if available, otherwise fallback
+                if hasattr(self.sentiment_provider, 'analyze_comment'):
+                    # Enhanced multi-signal extraction
+                    # Pass monitored entities as context, not targets
+                    # GPT will determine which ones are actually mentioned
+                    if analysis is None:
+                        # Not answered by a packed request
+                        analysis = self.sentiment_provider.analyze_comment(
+                            comment_text=comment.text,
+                            post_caption=post_caption,
+                            comment_likes=comment.likes or 0,
+                            monitored_entities=monitored_entity_list if monitored_entity_list else None
                         )
-                        stats["queued_for_review"] = stats.get("queued_for_review", 0) + 1
-                        continue
                     
-                    # High confidence - create signal
-                    entity = self._resolve_entity_by_name(entity_name)
-                    if entity:
-                        self._create_signal(
-                            comment_id=comment.id,
-                            entity_id=entity.id,
-                            signal_type=SignalType.SENTIMENT,
-                            value=self._sentiment_label(score),
-                            numeric_value=float(score),
-                            source_model=getattr(self.sentiment_provider, 'model', 'gpt-4o-mini'),
-                            confidence=confidence,
-                            weight_score=weight_score
-                        )
-                        stats["signals_created"] += 1
+                    self._apply_analysis(comment, post_caption, analysis, catalog_mentions, weight_score, stats)
                 
-                # If no entity scores but we have catalog mentions, use general sentiment
-                if not analysis.get("entity_scores") and catalog_mentions:
-                    # Calculate average sentiment from entity scores or use stance
-                    general_sentiment = 0.0
-                    if analysis.get("stance") == "oppose":
-                        general_sentiment = -0.5
-                    elif analysis.get("stance") == "support":
-                        general_sentiment = 0.5
+                else:
+                    # Fallback to legacy sentiment scoring
+                    sentiment_result = batch_score or self.sentiment_provider.score(comment.text)
+                    
+                    # Create general comment sentiment signal (no entity)
+                    self._create_signal(
+                        comment_id=comment.id,
+                        entity_id=None,
+                        signal_type=SignalType.SENTIMENT,
+                        value=self._sentiment_label(sentiment_result.score),
+                        numeric_value=sentiment_result.score,
+                        source_model=sentiment_result.source_model,
+                        confidence=sentiment_result.confidence,
+                        weight_score=weight_score
+                    )
+                    stats["signals_created"] += 1
                     
+                    # Create entity-specific signals
                     for entity_mention in catalog_mentions:
                         self._create_signal(
                             comment_id=comment.id,
                             entity_id=entity_mention.entity_id,
                             signal_type=SignalType.SENTIMENT,
-                            value=self._sentiment_label(general_sentiment),
-                            numeric_value=general_sentiment,
-                            source_model=getattr(self.sentiment_provider, 'model', 'gpt-4o-mini'),
-                            confidence=0.7,
-                            weight_score=weight_score
-                        )
-                        stats["signals_created"] += 1
-                
-                # FIX 6: Emotion signals - per entity for entity-specific emotions
-                # This allows queries like "what emotions are people expressing about Blake?"
-                if analysis.get("emotion") and catalog_mentions:
-                    for entity_mention in catalog_mentions:
-                        self._create_signal(
-                            comment_id=comment.id,
-                            entity_id=entity_mention.entity_id,  # Link to entity!
-                            signal_type=SignalType.EMOTION,
-                            value=analysis["emotion"],
-                            numeric_value=None,
-                            source_model=getattr(self.sentiment_provider, 'model', 'gpt-4o-mini'),
-                            confidence=0.8,
+                            value=self._sentiment_label(sentiment_result.score),
+                            numeric_value=sentiment_result.score,
+                            source_model=sentiment_result.source_model,
+                            confidence=entity_mention.confidence * sentiment_result.confidence,
                             weight_score=weight_score
                         )
                         stats["signals_created"] += 1
-                elif analysis.get("emotion"):
-                    # Comment-level emotion if no specific entity mentioned
-                    self._create_signal(
-                        comment_id=comment.id,
-                        entity_id=None,
-                        signal_type=SignalType.EMOTION,
-                        value=analysis["emotion"],
-                        numeric_value=None,
-                        source_model=getattr(self.sentiment_provider, 'model', 'gpt-4o-mini'),
-                        confidence=0.8,
-                        weight_score=weight_score
-                    )
-                    stats["signals_created"] += 1
-                
-                # FIX 7: Stance signals - DISABLED until GPT returns per-entity stances
-                # Current issue: if comment mentions Blake and Ryan with different stances,
-                # both get the same stance value. Need to update GPT prompt to return
-                # entity_stances: {"Blake Lively": "oppose", "Ryan Reynolds": "support"}
-                # For now, disable to prevent incorrect data
-                # TODO: Implement entity_stances in GPT prompt and uncomment this
-                # if analysis.get("entity_stances"):
-                #     for entity_name, stance in analysis["entity_stances"].items():
-                #         entity = self._resolve_entity_by_name(entity_name)
-                #         if entity:
-                #             self._create_signal(
-                #                 comment_id=comment.id,
-                #                 entity_id=entity.id,
-                #                 signal_type=SignalType.STANCE,
-                #                 value=stance,
-                #                 numeric_value=None,
-                #                 source_model=getattr(self.sentiment_provider, 'model', 'gpt-4o-mini'),
-                #                 confidence=0.8,
-                #                 weight_score=weight_score
-                #             )
-                #             stats["signals_created"] += 1
-                
-                # Topic signals
-                for topic in analysis.get("topics", []):
-                    self._create_signal(
-                        comment_id=comment.id,
-                        entity_id=None,
-                        signal_type=SignalType.TOPIC,
-                        value=topic,
-                        numeric_value=None,
-                        source_model=getattr(self.sentiment_provider, 'model', 'gpt-4o-mini'),
-                        confidence=0.7,
-                        weight_score=weight_score
-                    )
-                    stats["signals_created"] += 1
                 
-                # Toxicity signal
-                if analysis.get("toxicity") is not None:
-                    toxicity_score = float(analysis["toxicity"])
-                    # Categorize toxicity level for value field
-                    if toxicity_score >= 0.7:
-                        toxicity_label = "high"
-                    elif toxicity_score >= 0.4:
-                        toxicity_label = "medium"
-                    else:
-                        toxicity_label = "low"
-                    
-                    self._create_signal(
-                        comment_id=comment.id,
-                        entity_id=None,
-                        signal_type=SignalType.TOXICITY,
-                        value=toxicity_label,
-                        numeric_value=toxicity_score,
-                        source_model=getattr(self.sentiment_provider, 'model', 'gpt-4o-mini'),
-                        confidence=0.8,
-                        weight_score=weight_score
+                stats["comments_processed"] += 1
+            
+            self._finish_chunk(chunk, before_commit)
+        
+        self._record_caption_cache_stats(stats, caption_cache_start)
+        self._record_escalation_stats(stats)
+        if refresh_rollup:
+            stats.update(refresh_dirty_hours(self.session))
+        return stats
+    
+    def enrich_comments_concurrent(
+        self,
+        comment_ids: Optional[List[uuid.UUID]] = None,
+        since: Optional[datetime] = None,
+        concurrency: Optional[int] = None,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        chunk_size: int = DEFAULT_ENRICH_CHUNK_SIZE,
+        stale_only: bool = False,
+        refresh_rollup: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Enrich comments with up to ``concurrency`` LLM calls in flight.
+        
+        Same selection and signal semantics as enrich_comments(), but the
+        provider's API calls overlap instead of running back to back:
+        - a feeder extracts entities and queues work (bounded queue), one
+          job per pack of comments sharing a post caption
+        - N workers call the API behind a requests/min + tokens/min limiter,
+          retrying 429/5xx/timeouts with jittered exponential backoff; a
+          pack goes through analyze_packed_async() when the provider has
+          it, and comments it leaves unanswered through analyze_comment_async()
+        - results stream to a single writer, the only code touching the
+          session, which creates signals; each keyset chunk is committed
+          and expunged before the next one is fetched
+        
+        Providers without analyze_comment_async() (rule-based, hybrid) fall
+        back to enrich_comments().
+        
+        Args:
+            comment_ids: Specific comments to enrich (or None for all unprocessed)
+            since: Only enrich comments created after this date
+            concurrency: Max in-flight API calls (settings.enrichment_concurrency)
+            requests_per_minute: Request budget (settings.openai_requests_per_minute)
+            tokens_per_minute: Token budget (settings.openai_tokens_per_minute)
+            max_retries: Retries per comment before giving up (settings.openai_max_retries)
+            chunk_size: Comments per keyset page / commit
+            stale_only: Only enrich stale comments (see enrich_comments)
+            refresh_rollup: Refresh the hourly rollup at the end (see enrich_comments)
+            
+        Returns:
+            enrich_comments() statistics plus:
+            - api_retries: Retried API calls
+            - api_failures: Comments analyzed with safe defaults after retries ran out
+            - rate_limit_wait_seconds: Time workers spent waiting on the limiter
+            - elapsed_seconds / comments_per_second: Run throughput
+        """
+        if not hasattr(self.sentiment_provider, 'analyze_comment_async'):
+            return self.enrich_comments(
+                comment_ids=comment_ids, since=since, chunk_size=chunk_size, stale_only=stale_only,
+                refresh_rollup=refresh_rollup
+            )
+        
+        stats = asyncio.run(self._enrich_concurrent(
+            comment_ids=comment_ids,
+            since=since,
+            concurrency=concurrency or settings.enrichment_concurrency,
+            limiter=RateLimiter(
+                requests_per_minute or settings.openai_requests_per_minute,
+                tokens_per_minute or settings.openai_tokens_per_minute
+            ),
+            max_retries=settings.openai_max_retries if max_retries is None else max_retries,
+            chunk_size=chunk_size,
+            stale_only=stale_only
+        ))
+        if refresh_rollup:
+            stats.update(refresh_dirty_hours(self.session))
+        return stats
+    
+    async def _enrich_concurrent(
+        self,
+        comment_ids: Optional[List[uuid.UUID]],
+        since: Optional[datetime],
+        concurrency: int,
+        limiter: RateLimiter,
+        max_retries: int,
+        chunk_size: int = DEFAULT_ENRICH_CHUNK_SIZE,
+        stale_only: bool = False
+    ) -> Dict[str, Any]:
+        """Feeder -> workers -> single writer pipeline for enrich_comments_concurrent()."""
+        stats = self._new_stats()
+        caption_cache_start = self.extractor.caption_cache_stats()
+        stats.update({
+            "api_retries": 0,
+            "api_failures": 0,
+            "rate_limit_wait_seconds": 0.0,
+        })
+        started = time.perf_counter()
+        
+        # Get ALL monitored entities as context (not just ones found in comment)
+        # Let GPT determine which ones are actually relevant
+        monitored_entity_list: Optional[List[str]] = None
+        
+        # Bounded queues keep at most a few batches of prompts in memory
+        jobs: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        results: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        
+        # Comments on the same post share one packed request when the
+        # provider supports it
+        provider = self.sentiment_provider
+        pack_size = (
+            getattr(provider, 'MAX_PACKED_COMMENTS', 1)
+            if hasattr(provider, 'analyze_packed_async') else 1
+        )
+        
+        async def feed(chunk):
+            extractions = self._extract_chunk(chunk)
+            extracted = {comment.id: extraction for (comment, _), extraction in zip(chunk, extractions)}
+            for post_caption, comments in self._caption_groups(chunk).items():
+                for i in range(0, len(comments), pack_size):
+                    pack = comments[i:i + pack_size]
+                    await jobs.put((post_caption, [(comment, *extracted[comment.id]) for comment in pack]))
+            for _ in range(concurrency):
+                await jobs.put(None)
+        
+        async def work():
+            while True:
+                job = await jobs.get()
+                if job is None:
+                    await results.put(None)
+                    return
+                post_caption, pack = job
+                analyses = {}
+                if len(pack) > 1:
+                    analyses = await self._analyze_pack_with_retry(
+                        [comment for comment, _, _ in pack], post_caption, monitored_entity_list,
+                        limiter, max_retries, stats
                     )
-                    stats["signals_created"] += 1
+                for comment, catalog_mentions, discovered in pack:
+                    # Per-comment fallback for whatever the pack left unanswered
+                    analysis = analyses.get(comment.id)
+                    if analysis is None:
+                        analysis = await self._analyze_with_retry(
+                            comment, post_caption, monitored_entity_list, limiter, max_retries, stats
+                        )
+                    await results.put((comment, post_caption, catalog_mentions, discovered, analysis))
+        
+        async def write():
+            finished_workers = 0
+            while finished_workers < concurrency:
+                item = await results.get()
+                if item is None:
+                    finished_workers += 1
+                    continue
+                comment, post_caption, catalog_mentions, discovered, analysis = item
                 
-                # Sarcasm signal
-                if analysis.get("sarcasm"):
-                    self._create_signal(
-                        comment_id=comment.id,
-                        entity_id=None,
-                        signal_type=SignalType.SARCASM,
-                        value="sarcasm",
-                        numeric_value=1.0,
-                        source_model=getattr(self.sentiment_provider, 'model', 'gpt-4o-mini'),
-                        confidence=0.7,
-                        weight_score=weight_score
-                    )
-                    stats["signals_created"] += 1
+                # Track discovered entities from spaCy
+                for disc in discovered:
+                    self._track_discovered_entity(disc.name, disc.entity_type, comment.text, comment.id)
+                    stats["entities_discovered"] += 1
                 
-                # Handle ambiguous mentions - queue for human review
-                for ambiguous in analysis.get("ambiguous_mentions", []):
-                    self._queue_for_review(
-                        comment=comment,
-                        entity_mention=ambiguous.get("name", ""),
-                        confidence=ambiguous.get("confidence", 0.5),
-                        possible_entities=ambiguous.get("possible_entities", []),
-                        reason=ambiguous.get("reason", "Ambiguous entity mention")
+                weight_score = 1.0 + ((comment.likes or 0) / 100.0)
+                self._apply_analysis(comment, post_caption, analysis, catalog_mentions, weight_score, stats)
+                stats["comments_processed"] += 1
+        
+        # One pipeline pass per keyset chunk; the chunk is committed and
+        # expunged once every comment in it has been written
+        for chunk in self._iter_comment_chunks(comment_ids, since, chunk_size, stale_only):
+            monitored_entity_list = self._refresh_entity_context(stats).prompt_entities or None
+            await asyncio.gather(feed(chunk), write(), *(work() for _ in range(concurrency)))
+            self._finish_chunk(chunk)
+        
+        self._record_caption_cache_stats(stats, caption_cache_start)
+        elapsed = time.perf_counter() - started
+        stats["elapsed_seconds"] = elapsed
+        stats["comments_per_second"] = stats["comments_processed"] / elapsed if elapsed > 0 else 0.0
+        get_metrics().record_value("enrichment.comments_per_second", stats["comments_per_second"])
+        return stats
+    
+    async def _analyze_with_retry(
+        self,
+        comment: Comment,
+        post_caption: str,
+        monitored_entity_list: Optional[List[str]],
+        limiter: RateLimiter,
+        max_retries: int,
+        stats: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Rate-limited analyze_comment_async() with jittered backoff.
+        
+        Cached results are returned without touching the limiter.
+        Non-retryable errors and exhausted retries fall back to the
+        provider's safe defaults, matching analyze_comment()'s behaviour.
+        """
+        provider = self.sentiment_provider
+        lookup = getattr(provider, 'cached_analysis', None)
+        cached = lookup(comment.text, post_caption, monitored_entity_list) if lookup else None
+        if cached is not None:
+            return cached
+        
+        estimate = getattr(provider, 'estimate_analysis_tokens', None)
+        tokens = estimate(comment.text, post_caption, monitored_entity_list) if estimate else 1
+        
+        analysis = await self._call_with_retry(
+            lambda: provider.analyze_comment_async(
+                comment_text=comment.text,
+                post_caption=post_caption,
+                comment_likes=comment.likes or 0,
+                monitored_entities=monitored_entity_list
+            ),
+            tokens, limiter, max_retries, stats, f"comment {comment.id}"
+        )
+        if analysis is not None:
+            return analysis
+        
+        stats["api_failures"] += 1
+        get_metrics().increment("enrichment.llm_failures")
+        default = getattr(provider, '_default_analysis', None)
+        return default() if default else {}
+    
+    async def _analyze_pack_with_retry(
+        self,
+        comments: List[Comment],
+        post_caption: str,
+        monitored_entity_list: Optional[List[str]],
+        limiter: RateLimiter,
+        max_retries: int,
+        stats: Dict[str, Any]
+    ) -> Dict[uuid.UUID, Dict[str, Any]]:
+        """
+        Rate-limited analyze_packed_async() for comments sharing a caption.
+        
+        Cached results are served first and never reach the limiter; the
+        rest go out as one request when more than one is left. Returns the
+        analyses found, keyed by comment id. The caller falls back to
+        _analyze_with_retry() for anything missing.
+        """
+        provider = self.sentiment_provider
+        lookup = getattr(provider, 'cached_analysis', None)
+        analyses: Dict[uuid.UUID, Dict[str, Any]] = {}
+        items = []
+        for comment in comments:
+            cached = lookup(comment.text, post_caption, monitored_entity_list) if lookup else None
+            if cached is not None:
+                analyses[comment.id] = cached
+            else:
+                items.append(self._packed_item(comment))
+        if len(items) < 2:
+            return analyses
+        
+        estimate = getattr(provider, 'estimate_packed_tokens', None)
+        tokens = estimate(items, post_caption, monitored_entity_list) if estimate else len(items)
+        packed = await self._call_with_retry(
+            lambda: provider.analyze_packed_async(items, post_caption, monitored_entity_list),
+            tokens, limiter, max_retries, stats, f"a pack of {len(items)} comments"
+        )
+        analyses.update(packed or {})
+        return analyses
+    
+    async def _call_with_retry(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        tokens: int,
+        limiter: RateLimiter,
+        max_retries: int,
+        stats: Dict[str, Any],
+        subject: str
+    ) -> Any:
+        """
+        Await ``call()`` behind the limiter, retrying 429/5xx/timeouts with
+        jittered backoff. Returns None (after logging) when the error is not
+        retryable or retries ran out.
+        """
+        metrics = get_metrics()
+        for attempt in range(max_retries + 1):
+            stats["rate_limit_wait_seconds"] += await limiter.acquire(tokens)
+            call_started = time.perf_counter()
+            try:
+                result = await call()
+                metrics.record_timing("enrichment.llm_call", time.perf_counter() - call_started)
+                return result
+            except Exception as e:
+                if not is_retryable_error(e) or attempt == max_retries:
+                    logger.warning(
+                        "LLM analysis failed for %s after %d attempt(s): %s",
+                        subject, attempt + 1, e
                     )
-                    stats["queued_for_review"] = stats.get("queued_for_review", 0) + 1
-                
-                # FIX 8: Track discovered entities, preventing double-counting
-                # An entity can appear in both other_entities and entity_scores
-                tracked_this_comment = set()
-                
-                # Track discovered entities from GPT "other_entities"
-                for discovered_name in analysis.get("other_entities", []):
-                    name_lower = discovered_name.lower().strip()
-                    if name_lower not in tracked_this_comment:
-                        self._track_discovered_entity(discovered_name, "PERSON", comment.text)
-                        tracked_this_comment.add(name_lower)
-                        stats["entities_discovered"] += 1
-                
-                # Also check entity_scores for entities not in our catalog (like Colleen Hoover)
-                # These should be tracked as discovered entities
-                for entity_name_raw in analysis.get("entity_scores", {}).keys():
-                    # Strip disambiguation hints
-                    entity_name = entity_name_raw.split(" (")[0].strip()
-                    name_lower = entity_name.lower().strip()
-                    
-                    # Skip if already tracked in this comment
-                    if name_lower not in tracked_this_comment:
-                        # Check if this entity is in our catalog
-                        entity = self._resolve_entity_by_name(entity_name)
-                        if not entity:
-                            # Not in catalog - track as discovered
-                            self._track_discovered_entity(entity_name, "PERSON", comment.text)
-                            tracked_this_comment.add(name_lower)
-                            stats["entities_discovered"] += 1
-                    
+                    return None
+                stats["api_retries"] += 1
+                metrics.increment("enrichment.llm_retries")
+                delay = retry_after_seconds(e)
+                await asyncio.sleep(delay if delay is not None else backoff_delay(attempt))
+        return None
+    
+    def backfill_entity(
+        self,
+        entity_id: uuid.UUID,
+        chunk_size: int = DEFAULT_ENRICH_CHUNK_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Bring historical signals up to date for one new or edited entity.
+        
+        After `add-entity` or an alias change, only comments that can match
+        the entity need another look. Candidates are found with substring
+        lookups on comments.text (served by the pg_trgm index, see
+        db_text_search) for the entity's name, aliases and first/last name,
+        plus comments on posts whose caption references the entity (pronoun
+        matches) and comments that already have signals for it. Catalog
+        matching is then re-run on the candidates only, and only this
+        entity's mentions are kept.
+        
+        No comment is sent through the sentiment provider here. With a
+        legacy provider, an entity signal is derived from each matched
+        comment's existing comment-level sentiment signal (same score, model
+        and weight, as enrich_comments() would have written), and signals of
+        comments that no longer match are deleted. When the provider uses
+        analyze_comment(), entity scores come from the model and there is no
+        comment-level sentiment to derive from, so nothing is written or
+        deleted. In both cases matched comments that can't be given a signal
+        here (model-scored without a score for this entity, or never
+        enriched) are queued for re-analysis by the next
+        `enrich --stale-only` run (see mark_for_reanalysis).
+        
+        Args:
+            entity_id: Active monitored entity to backfill
+            chunk_size: Candidates per keyset page / commit
+            
+        Returns:
+            Dictionary with backfill statistics:
+            - candidates: Comments returned by the text search
+            - matched: Candidates the catalog matcher attributes to the entity
+            - signals_created: Entity signals derived from existing signals
+            - signals_removed: Signals deleted from comments that no longer match
+            - needs_reanalysis: Matched comments queued for `enrich --stale-only`
+            - elapsed_seconds: Wall time of the backfill
+            - rollup_*: Hourly rollup refresh (see enrich_comments)
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        
+        started = time.perf_counter()
+        entity = self._refresh_entity_context().by_id.get(entity_id)
+        if entity is None:
+            raise ValueError(f"Entity {entity_id} is not an active monitored entity")
+        
+        stats: Dict[str, Any] = {
+            "candidates": 0,
+            "matched": 0,
+            "signals_created": 0,
+            "signals_removed": 0,
+            "needs_reanalysis": 0,
+        }
+        text_terms, caption_terms = entity_search_terms(entity)
+        has_signal = exists().where(
+            ExtractedSignal.comment_id == Comment.id,
+            ExtractedSignal.entity_id == entity.id
+        )
+        post_caption = func.coalesce(
+            func.nullif(Post.caption, ''),
+            func.nullif(Post.subject_line, ''),
+            ''
+        )
+        base = (
+            select(Comment.id, Comment.created_at, Comment.text, post_caption)
+            .join(Post, Comment.post_id == Post.id)
+            .where(or_(
+                contains_any(Comment.text, text_terms),
+                contains_any(Post.caption, caption_terms),
+                contains_any(Post.subject_line, caption_terms),
+                has_signal
+            ))
+            .order_by(Comment.created_at, Comment.id)
+        )
+        
+        removed_from: List[uuid.UUID] = []
+        last_key = None
+        while True:
+            query = base
+            if last_key is not None:
+                query = query.where(tuple_(Comment.created_at, Comment.id) > last_key)
+            rows = self.session.execute(query.limit(chunk_size)).all()
+            if not rows:
+                break
+            last_key = (rows[-1].created_at, rows[-1].id)
+            stats["candidates"] += len(rows)
+            
+            matched: Dict[uuid.UUID, float] = {}
+            unmatched: List[uuid.UUID] = []
+            for comment_id, _, text, caption in rows:
+                mention = next(
+                    (m for m in self.extractor.extract_catalog_only(text or "", caption or "")
+                     if m.entity_id == entity.id),
+                    None
+                )
+                if mention is None:
+                    unmatched.append(comment_id)
+                else:
+                    matched[comment_id] = mention.confidence
+            stats["matched"] += len(matched)
+            
+            self._backfill_chunk(entity, matched, unmatched, removed_from, stats)
+            self._signal_buffer.flush()
+            self.session.commit()
+            if len(rows) < chunk_size:
+                break
+        
+        # Deleted signals leave no newer created_at behind, so their hours
+        # are recomputed explicitly before the regular dirty-hour refresh
+        if removed_from:
+            refresh_hours(self.session, comment_hours(self.session, removed_from))
+        stats.update(refresh_dirty_hours(self.session))
+        
+        stats["elapsed_seconds"] = time.perf_counter() - started
+        get_metrics().record_timing("enrichment.entity_backfill", stats["elapsed_seconds"])
+        return stats
+    
+    def _backfill_chunk(
+        self,
+        entity: CatalogEntity,
+        matched: Dict[uuid.UUID, float],
+        unmatched: List[uuid.UUID],
+        removed_from: List[uuid.UUID],
+        stats: Dict[str, Any]
+    ) -> None:
+        """
+        Write one backfill chunk's entity signals (see backfill_entity).
+        
+        Args:
+            entity: Entity being backfilled
+            matched: Matched comment id -> mention confidence
+            unmatched: Candidates that do not mention the entity
+            removed_from: Collects comments whose entity signals were deleted
+            stats: Backfill stats to update
+        """
+        if self._model_scores_entities():
+            # Entity signals come from the model's entity_scores, which a
+            # catalog change alone doesn't invalidate, and _apply_analysis()
+            # writes no comment-level sentiment to derive one from; comments
+            # the model hasn't scored for this entity go back to the model
+            scored = set(self.session.execute(
+                select(ExtractedSignal.comment_id)
+                .where(
+                    ExtractedSignal.comment_id.in_(list(matched)),
+                    ExtractedSignal.entity_id == entity.id,
+                    ExtractedSignal.signal_type == SignalType.SENTIMENT
+                )
+            ).scalars()) if matched else set()
+            stats["needs_reanalysis"] += mark_for_reanalysis(
+                self.session, [comment_id for comment_id in matched if comment_id not in scored]
+            )
+            return
+        
+        stale = self.session.execute(
+            select(ExtractedSignal.comment_id)
+            .where(
+                ExtractedSignal.comment_id.in_(unmatched),
+                ExtractedSignal.entity_id == entity.id
+            )
+            .distinct()
+        ).scalars().all() if unmatched else []
+        if stale:
+            stats["signals_removed"] += self.session.execute(
+                delete(ExtractedSignal)
+                .where(
+                    ExtractedSignal.comment_id.in_(stale),
+                    ExtractedSignal.entity_id == entity.id
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            removed_from.extend(stale)
+        
+        if not matched:
+            return
+        general = self.session.execute(
+            select(
+                ExtractedSignal.comment_id,
+                ExtractedSignal.numeric_value,
+                ExtractedSignal.confidence,
+                ExtractedSignal.weight_score,
+                ExtractedSignal.source_model
+            ).where(
+                ExtractedSignal.comment_id.in_(list(matched)),
+                ExtractedSignal.entity_id.is_(None),
+                ExtractedSignal.signal_type == SignalType.SENTIMENT
+            )
+        ).all()
+        
+        covered = set()
+        for comment_id, score, confidence, weight_score, source_model in general:
+            if score is None:
+                continue
+            self._create_signal(
+                comment_id=comment_id,
+                entity_id=entity.id,
+                signal_type=SignalType.SENTIMENT,
+                value=self._sentiment_label(score),
+                numeric_value=score,
+                source_model=source_model,
+                confidence=matched[comment_id] * (confidence or 0.0),
+                weight_score=weight_score
+            )
+            stats["signals_created"] += 1
+            covered.add(comment_id)
+        # No comment-level signal: never enriched
+        stats["needs_reanalysis"] += mark_for_reanalysis(
+            self.session, [comment_id for comment_id in matched if comment_id not in covered]
+        )
+    
+    def _model_scores_entities(self) -> bool:
+        """
+        Whether entity signals come from the model (analyze_comment()).
+        
+        Without a provider (catalog-only backfills) the configured backend
+        decides, so no provider has to be built just to ask.
+        """
+        if self.sentiment_provider is None:
+            return settings.sentiment_backend == "openai"
+        return hasattr(self.sentiment_provider, 'analyze_comment')
+    
+    def _select_comments(
+        self,
+        comment_ids: Optional[List[uuid.UUID]] = None,
+        since: Optional[datetime] = None,
+        stale_only: bool = False
+    ):
+        """Build the query for comments to enrich (see enrich_comments)."""
+        query = self.session.query(Comment)
+        
+        if stale_only:
+            query = query.filter(self._stale_filter())
+            if comment_ids:
+                query = query.filter(Comment.id.in_(comment_ids))
+            if since:
+                query = query.filter(Comment.created_at >= since)
+        elif comment_ids:
+            query = query.filter(Comment.id.in_(comment_ids))
+        elif since:
+            query = query.filter(Comment.created_at >= since)
+        else:
+            # Default: only unprocessed comments (no signals yet)
+            query = query.filter(
+                ~exists().where(
+                    ExtractedSignal.comment_id == Comment.id
+                )
+            )
+        
+        return query
+    
+    def count_comments(self, since: Optional[datetime] = None, stale_only: bool = False) -> int:
+        """
+        Number of comments a run with these options would start with.
+        
+        Without stale_only this counts every comment (since ``since``), like
+        the CLI always has; with it, only the stale ones.
+        """
+        if stale_only:
+            return self._select_comments(since=since, stale_only=True).count()
+        query = self.session.query(Comment)
+        if since:
+            query = query.filter(Comment.created_at >= since)
+        return query.count()
+    
+    def _stale_filter(self):
+        """Condition matching comments enriched under an older pipeline/catalog version."""
+        entities = EntityContextSnapshot.fetch_catalog(self.session)
+        return stale_comment_filter(
+            self.session,
+            pipeline_version(self.sentiment_provider),
+            EntityContextSnapshot.fingerprint(entities),
+            EntityContextSnapshot.entity_fingerprints(entities),
+            entities
+        )
+    
+    def _iter_comment_chunks(
+        self,
+        comment_ids: Optional[List[uuid.UUID]] = None,
+        since: Optional[datetime] = None,
+        chunk_size: int = DEFAULT_ENRICH_CHUNK_SIZE,
+        stale_only: bool = False
+    ) -> Iterator[List[Tuple[Comment, str]]]:
+        """
+        Stream comments to enrich as keyset-paginated chunks.
+        
+        Pages on (created_at, id) rather than OFFSET: with the default
+        "no signals yet" filter, rows drop out of the result set as they are
+        enriched, so an offset would skip them. The post caption (falling
+        back to the subject line) is joined in the same query, so no
+        per-comment lazy load of comment.post is needed.
+        
+        Args:
+            comment_ids: Specific comments to enrich (or None for all unprocessed)
+            since: Only enrich comments created after this date
+            chunk_size: Rows per page
+            stale_only: Only comments enriched under an older version
+            
+        Yields:
+            Lists of (comment, post_caption) tuples, in (created_at, id) order
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        
+        post_caption = func.coalesce(
+            func.nullif(Post.caption, ''),
+            func.nullif(Post.subject_line, ''),
+            ''
+        )
+        base = (
+            self._select_comments(comment_ids, since, stale_only)
+            .join(Post, Comment.post_id == Post.id)
+            .add_columns(post_caption)
+            .order_by(Comment.created_at, Comment.id)
+        )
+        
+        last_key = None
+        while True:
+            query = base
+            if last_key is not None:
+                query = query.filter(tuple_(Comment.created_at, Comment.id) > last_key)
+            chunk = [(comment, caption or "") for comment, caption in query.limit(chunk_size).all()]
+            if not chunk:
+                return
+            last_comment = chunk[-1][0]
+            last_key = (last_comment.created_at, last_comment.id)
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+    
+    def _extract_chunk(self, chunk: List[Tuple[Comment, str]]) -> list:
+        """Run EntityExtractor.extract_many() over a chunk's comments and captions."""
+        return self.extractor.extract_many(
+            [comment.text for comment, _ in chunk],
+            [post_caption for _, post_caption in chunk]
+        )
+    
+    def _score_chunk(self, chunk: List[Tuple[Comment, str]]) -> List[Optional[SentimentResult]]:
+        """
+        Legacy sentiment scores for a chunk via the provider's score_batch().
+        
+        Returns None per comment when the provider uses analyze_comment() or
+        has no score_batch() (the loop then calls score() per comment).
+        """
+        provider = self.sentiment_provider
+        if hasattr(provider, 'analyze_comment') or not hasattr(provider, 'score_batch'):
+            return [None] * len(chunk)
+        return provider.score_batch([comment.text for comment, _ in chunk])
+    
+    def _analyze_chunk(
+        self,
+        chunk: List[Tuple[Comment, str]],
+        monitored_entity_list: Optional[List[str]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Packed analyses for a chunk via the provider's analyze_comments().
+        
+        Comments are grouped by post caption so each request shares one
+        caption. Returns None per comment when the provider has no
+        analyze_comments() or a comment came back unanswered (the loop then
+        calls analyze_comment() for it).
+        """
+        provider = self.sentiment_provider
+        if not hasattr(provider, 'analyze_comments'):
+            return [None] * len(chunk)
+        
+        analyses: Dict[uuid.UUID, Dict[str, Any]] = {}
+        for post_caption, comments in self._caption_groups(chunk).items():
+            analyses.update(provider.analyze_comments(
+                [self._packed_item(comment) for comment in comments],
+                post_caption=post_caption,
+                monitored_entities=monitored_entity_list
+            ))
+        return [analyses.get(comment.id) for comment, _ in chunk]
+    
+    @staticmethod
+    def _caption_groups(chunk: List[Tuple[Comment, str]]) -> Dict[str, List[Comment]]:
+        """A chunk's comments grouped by post caption, in chunk order."""
+        groups: Dict[str, List[Comment]] = {}
+        for comment, post_caption in chunk:
+            groups.setdefault(post_caption, []).append(comment)
+        return groups
+    
+    @staticmethod
+    def _packed_item(comment: Comment) -> Dict[str, Any]:
+        """One comment as an analyze_comments() item."""
+        return {"id": comment.id, "text": comment.text, "likes": comment.likes or 0}
+    
+    def _finish_chunk(
+        self,
+        chunk: List[Tuple[Comment, str]],
+        before_commit: Optional[Callable[[Set[uuid.UUID]], None]] = None
+    ) -> None:
+        """
+        Commit a chunk and drop its rows from the session.
+        
+        Buffered signals and discovered entities are written with one upsert
+        each, then the chunk's comments and the signals / review items loaded
+        for them are flushed, expunged, then committed. Expunging before the
+        commit leaves the detached objects readable (commit would expire
+        them) for callers still holding a reference. Objects not tied to the
+        chunk (the caller's own rows) stay attached. If ``before_commit``
+        raises, the chunk's writes are rolled back instead.
+        """
+        chunk_ids = {comment.id for comment, _ in chunk}
+        record_enriched(
+            self.session,
+            chunk_ids,
+            pipeline_version(self.sentiment_provider),
+            self._current_entity_context().version
+        )
+        self._signal_buffer.flush()
+        self._discovered_buffer.flush()
+        self.session.flush()
+        if before_commit is not None:
+            try:
+                before_commit(chunk_ids)
+            except Exception:
+                self.session.rollback()
+                raise
+        for obj in list(self.session.identity_map.values()):
+            if isinstance(obj, Comment):
+                owner_id = obj.id
+            elif isinstance(obj, (ExtractedSignal, ReviewQueue)):
+                owner_id = obj.comment_id
             else:
-                # Fallback to legacy sentiment scoring
-                sentiment_result = self.sentiment_provider.score(comment.text)
-                
-                # Create general comment sentiment signal (no entity)
+                continue
+            if owner_id in chunk_ids:
+                self.session.expunge(obj)
+        self.session.commit()
+    
+    @staticmethod
+    def _new_stats() -> Dict[str, Any]:
+        """Counters shared by the sequential and concurrent paths."""
+        return {
+            "comments_processed": 0,
+            "signals_created": 0,
+            "entities_discovered": 0,
+            "entity_context_version": None,
+            "entity_context_builds": 0,
+            "entity_context_build_seconds": 0.0,
+            "caption_cache_hits": 0,
+            "caption_cache_misses": 0,
+            "caption_cache_hit_rate": 0.0,
+        }
+    
+    def _record_caption_cache_stats(self, stats: Dict[str, Any], start: Dict[str, Any]) -> None:
+        """Store this run's caption cache hits/misses (extractor counters are cumulative)."""
+        end = self.extractor.caption_cache_stats()
+        hits = end["hits"] - start["hits"]
+        misses = end["misses"] - start["misses"]
+        stats["caption_cache_hits"] = hits
+        stats["caption_cache_misses"] = misses
+        stats["caption_cache_hit_rate"] = hits / (hits + misses) if hits + misses else 0.0
+        get_metrics().record_value("enrichment.caption_cache_hit_rate", stats["caption_cache_hit_rate"])
+    
+    def _record_escalation_stats(self, stats: Dict[str, Any]) -> None:
+        """Copy the hybrid provider's escalation stats for this run into stats."""
+        if not hasattr(self.sentiment_provider, 'escalation_stats'):
+            return
+        escalation = self.sentiment_provider.escalation_stats()
+        stats.update(escalation)
+        metrics = get_metrics()
+        metrics.record_value("enrichment.escalation_rate", escalation["escalation_rate"])
+        metrics.record_value("enrichment.cost_saved_usd", escalation["cost_saved_usd"])
+    
+    def _refresh_entity_context(self, stats: Optional[Dict[str, Any]] = None) -> EntityContextSnapshot:
+        """
+        Return the entity-context snapshot, rebuilding it only if the active
+        catalog's version changed since it was built.
+        
+        The version check is a single column query; the prompt strings,
+        alias map and extractor index are only rebuilt on a change.
+        
+        Args:
+            stats: Enrichment stats dict to record builds and their cost in
+        """
+        entities = EntityContextSnapshot.fetch_catalog(self.session)
+        version = EntityContextSnapshot.fingerprint(entities)
+        
+        if self._entity_context is None or self._entity_context.version != version:
+            self._entity_context = EntityContextSnapshot.build(entities, self.extractor, version)
+            record_catalog_version(
+                self.session, version, EntityContextSnapshot.entity_fingerprints(entities)
+            )
+            get_metrics().record_timing("enrichment.entity_context_build", self._entity_context.build_seconds)
+            if stats is not None:
+                stats["entity_context_builds"] += 1
+                stats["entity_context_build_seconds"] += self._entity_context.build_seconds
+        
+        if stats is not None:
+            stats["entity_context_version"] = version
+        return self._entity_context
+    
+    def _current_entity_context(self) -> EntityContextSnapshot:
+        """Snapshot for the current run (built on first use)."""
+        if self._entity_context is None:
+            return self._refresh_entity_context()
+        return self._entity_context
+    
+    def _apply_analysis(
+        self,
+        comment: Comment,
+        post_caption: str,
+        analysis: Dict[str, Any],
+        catalog_mentions: list,
+        weight_score: float,
+        stats: Dict[str, Any]
+    ) -> None:
+        """
+        Turn one analyze_comment() result into signals, review items and
+        discovered entities.
+        
+        Args:
+            comment: Comment that was analyzed
+            post_caption: The chunk's post caption (or subject line)
+            analysis: Normalized analysis dict from the provider
+            catalog_mentions: Catalog EntityMentions found by the extractor
+            weight_score: Like-weighted signal weight
+            stats: Enrichment stats dict (updated in place)
+        """
+        # Get confidence scores
+        entity_confidence = analysis.get("entity_confidence", {})
+        
+        # Create entity-targeted sentiment signals (only if confidence >= 0.7)
+        for entity_name_raw, score in analysis.get("entity_scores", {}).items():
+            # Strip disambiguation hints from entity name
+            entity_name = entity_name_raw.split(" (")[0].strip()
+        
+            # FIX 2: Validate entity name before processing
+            if not self._is_valid_entity_name(entity_name):
+                continue
+        
+            # Check confidence
+            confidence = entity_confidence.get(entity_name, 0.8)  # Default 0.8 if not provided
+        
+            if confidence < 0.7:
+                # Low confidence - queue for human review instead of creating signal
+                self._queue_for_review(
+                    comment=comment,
+                    post_caption=post_caption,
+                    entity_mention=entity_name,
+                    confidence=confidence,
+                    possible_entities=[entity_name],
+                    reason=f"Low confidence ({confidence:.2f}) for entity assignment"
+                )
+                stats["queued_for_review"] = stats.get("queued_for_review", 0) + 1
+                continue
+        
+            # High confidence - create signal
+            entity = self._resolve_entity_by_name(entity_name)
+            if entity:
                 self._create_signal(
                     comment_id=comment.id,
-                    entity_id=None,
+                    entity_id=entity.id,
                     signal_type=SignalType.SENTIMENT,
-                    value=self._sentiment_label(sentiment_result.score),
-                    numeric_value=sentiment_result.score,
-                    source_model=sentiment_result.source_model,
-                    confidence=sentiment_result.confidence,
+                    value=self._sentiment_label(score),
+                    numeric_value=float(score),
+                    source_model=getattr(self.sentiment_provider, 'model', 'gpt-4o-mini'),
+                    confidence=confidence,
                     weight_score=weight_score
                 )
                 stats["signals_created"] += 1
-                
-                # Create entity-specific signals
-                for entity_mention in catalog_mentions:
-                    self._create_signal(
-                        comment_id=comment.id,
-                        entity_id=entity_mention.entity_id,
-                        signal_type=SignalType.SENTIMENT,
-                        value=self._sentiment_label(sentiment_result.score),
-                        numeric_value=sentiment_result.score,
-                        source_model=sentiment_result.source_model,
-                        confidence=entity_mention.confidence * sentiment_result.confidence,
-                        weight_score=weight_score
-                    )
-                    stats["signals_created"] += 1
-            
-            stats["comments_processed"] += 1
-            
-            # Commit in batches
-            if stats["comments_processed"] % 50 == 0:
-                self.session.commit()
         
-        # Final commit
-        self.session.commit()
-        return stats
+        # If no entity scores but we have catalog mentions, use general sentiment
+        if not analysis.get("entity_scores") and catalog_mentions:
+            # Calculate average sentiment from entity scores or use stance
+            general_sentiment = 0.0
+            if analysis.get("stance") == "oppose":
+                general_sentiment = -0.5
+            elif analysis.get("stance") == "support":
+                general_sentiment = 0.5
+        
+            for entity_mention in catalog_mentions:
+                self._create_signal(
+                    comment_id=comment.id,
+                    entity_id=entity_mention.entity_id,
+                    signal_type=SignalType.SENTIMENT,
+                    value=self._sentiment_label(general_sentiment),
+                    numeric_value=general_sentiment,
+                    source_model=getattr(self.sentiment_provider, 'model', 'gpt-4o-mini'),
+                    confidence=0.7,
+                    weight_score=weight_score
+                )
+                stats["signals_created"] += 1
+        
+        # FIX 6: Emotion signals - per entity for entity-specific emotions
+        # This allows queries like "what emotions are people expressing about Blake?"
+        if analysis.get("emotion") and catalog_mentions:
+            for entity_mention in catalog_mentions:
+                self._create_signal(
+                    comment_id=comment.id,
+                    entity_id=entity_mention.entity_id,  # Link to entity!
+                    signal_type=SignalType.EMOTION,
+                    value=analysis["emotion"],
+                    numeric_value=None,
+                    source_model=getattr(self.sentiment_provider, 'model', 'gpt-4o-mini'),
+                    confidence=0.8,
+                    weight_score=weight_score
+                )
+                stats["signals_created"] += 1
+        elif analysis.get("emotion"):
+            # Comment-level emotion if no specific entity mentioned
+            self._create_signal(
+                comment_id=comment.id,
+                entity_id=None,
+                signal_type=SignalType.EMOTION,
+                value=analysis["emotion"],
+                numeric_value=None,
+                source_model=getattr(self.sentiment_provider, 'model', 'gpt-4o-mini'),
+                confidence=0.8,
+                weight_score=weight_score
+            )
+            stats["signals_created"] += 1
+        
+        # FIX 7: Stance signals - DISABLED until GPT returns per-entity stances
+        # Current issue: if comment mentions Blake and Ryan with different stances,
+        # both get the same stance value. Need to update GPT prompt to return
+        # entity_stances: {"Blake Lively": "oppose", "Ryan Reynolds": "support"}
+        # For now, disable to prevent incorrect data
+        # TODO: Implement entity_stances in GPT prompt and uncomment this
+        # if analysis.get("entity_stances"):
+        #     for entity_name, stance in analysis["entity_stances"].items():
+        #         entity = self._resolve_entity_by_name(entity_name)
+        #         if entity:
+        #             self._create_signal(
+        #                 comment_id=comment.id,
+        #                 entity_id=entity.id,
+        #                 signal_type=SignalType.STANCE,
+        #                 value=stance,
+        #                 numeric_value=None,
+        #                 source_model=getattr(self.sentiment_provider, 'model', 'gpt-4o-mini'),
+        #                 confidence=0.8,
+        #                 weight_score=weight_score
+        #             )
+        #             stats["signals_created"] += 1
+        
+        # Topic signals
+        for topic in analysis.get("topics", []):
+            self._create_signal(
+                comment_id=comment.id,
+                entity_id=None,
+                signal_type=SignalType.TOPIC,
+                value=topic,
+                numeric_value=None,
+                source_model=getattr(self.sentiment_provider, 'model', 'gpt-4o-mini'),
+                confidence=0.7,
+                weight_score=weight_score
+            )
+            stats["signals_created"] += 1
+        
+        # Toxicity signal
+        if analysis.get("toxicity") is not None:
+            toxicity_score = float(analysis["toxicity"])
+            # Categorize toxicity level for value field
+            if toxicity_score >= 0.7:
+                toxicity_label = "high"
+            elif toxicity_score >= 0.4:
+                toxicity_label = "medium"
+            else:
+                toxicity_label = "low"
+        
+            self._create_signal(
+                comment_id=comment.id,
+                entity_id=None,
+                signal_type=SignalType.TOXICITY,
+                value=toxicity_label,
+                numeric_value=toxicity_score,
+                source_model=getattr(self.sentiment_provider, 'model', 'gpt-4o-mini'),
+                confidence=0.8,
+                weight_score=weight_score
+            )
+            stats["signals_created"] += 1
+        
+        # Sarcasm signal
+        if analysis.get("sarcasm"):
+            self._create_signal(
+                comment_id=comment.id,
+                entity_id=None,
+                signal_type=SignalType.SARCASM,
+                value="sarcasm",
+                numeric_value=1.0,
+                source_model=getattr(self.sentiment_provider, 'model', 'gpt-4o-mini'),
+                confidence=0.7,
+                weight_score=weight_score
+            )
+            stats["signals_created"] += 1
+        
+        # Handle ambiguous mentions - queue for human review
+        for ambiguous in analysis.get("ambiguous_mentions", []):
+            self._queue_for_review(
+                comment=comment,
+                post_caption=post_caption,
+                entity_mention=ambiguous.get("name", ""),
+                confidence=ambiguous.get("confidence", 0.5),
+                possible_entities=ambiguous.get("possible_entities", []),
+                reason=ambiguous.get("reason", "Ambiguous entity mention")
+            )
+            stats["queued_for_review"] = stats.get("queued_for_review", 0) + 1
+        
+        # FIX 8: Track discovered entities, preventing double-counting
+        # An entity can appear in both other_entities and entity_scores
+        tracked_this_comment = set()
+        
+        # Track discovered entities from GPT "other_entities"
+        for discovered_name in analysis.get("other_entities", []):
+            name_lower = discovered_name.lower().strip()
+            if name_lower not in tracked_this_comment:
+                self._track_discovered_entity(discovered_name, "PERSON", comment.text, comment.id)
+                tracked_this_comment.add(name_lower)
+                stats["entities_discovered"] += 1
+        
+        # Also check entity_scores for entities not in our catalog (like Colleen Hoover)
+        # These should be tracked as discovered entities
+        for entity_name_raw in analysis.get("entity_scores", {}).keys():
+            # Strip disambiguation hints
+            entity_name = entity_name_raw.split(" (")[0].strip()
+            name_lower = entity_name.lower().strip()
+        
+            # Skip if already tracked in this comment
+            if name_lower not in tracked_this_comment:
+                # Check if this entity is in our catalog
+                entity = self._resolve_entity_by_name(entity_name)
+                if not entity:
+                    # Not in catalog - track as discovered
+                    self._track_discovered_entity(entity_name, "PERSON", comment.text, comment.id)
+                    tracked_this_comment.add(name_lower)
+                    stats["entities_discovered"] += 1
     
     def _create_signal(self, **kwargs):
         """
         Create or update signal (idempotent).
         
-        Checks for existing signal with same:
+        Signals are identified by:
         - comment_id
         - entity_id
         - signal_type
         - source_model
         
-        If exists, updates. If not, creates new.
+        Rows are buffered and written at the end of the chunk with one
+        INSERT ... ON CONFLICT DO UPDATE (see SignalBuffer), so an existing
+        signal is updated and a new one created without a read per signal.
         """
-        # Check for existing signal
-        existing = self.session.query(ExtractedSignal).filter(
-            ExtractedSignal.comment_id == kwargs['comment_id'],
-            ExtractedSignal.entity_id == kwargs.get('entity_id'),
-            ExtractedSignal.signal_type == kwargs['signal_type'],
-            ExtractedSignal.source_model == kwargs.get('source_model', 'unknown')
-        ).first()
-        
-        if existing:
-            # Update existing
-            if 'value' in kwargs:
-                existing.value = kwargs['value']
-            if 'numeric_value' in kwargs:
-                existing.numeric_value = kwargs['numeric_value']
-            if 'confidence' in kwargs:
-                existing.confidence = kwargs['confidence']
-            if 'weight_score' in kwargs:
-                existing.weight_score = kwargs['weight_score']
-            existing.created_at = datetime.utcnow()  # Update timestamp
-        else:
-            # Create new
-            signal = ExtractedSignal(**kwargs, created_at=datetime.utcnow())
-            self.session.add(signal)
+        self._signal_buffer.add(**kwargs)
     
-    def _resolve_entity_by_name(self, entity_name: str) -> Optional[MonitoredEntity]:
+    def _resolve_entity_by_name(self, entity_name: str) -> Optional[CatalogEntity]:
         """
-        FIX 9: Resolve entity name to MonitoredEntity, checking aliases.
+        FIX 9: Resolve entity name to a monitored entity, checking aliases.
         
         This allows GPT to return "JLo" and have it match "Jennifer Lopez".
-        Uses a cached lookup for performance with many entities.
+        Uses the entity-context snapshot's alias map (name, canonical_name
+        and all aliases).
         """
-        # Build alias cache on first use
-        if not hasattr(self, '_alias_cache') or self._alias_cache is None:
-            self._build_alias_cache()
-        
-        # Lookup in cache (includes name, canonical_name, and all aliases)
-        return self._alias_cache.get(entity_name.lower().strip())
-    
-    def _build_alias_cache(self):
-        """Build lookup dict: alias -> entity for fast resolution."""
-        self._alias_cache = {}
-        for entity in self.session.query(MonitoredEntity).filter_by(is_active=True).all():
-            # Add primary name
-            self._alias_cache[entity.name.lower()] = entity
-            
-            # Add canonical name if present
-            if entity.canonical_name:
-                self._alias_cache[entity.canonical_name.lower()] = entity
-            
-            # Add all aliases
-            for alias in (entity.aliases or []):
-                self._alias_cache[alias.lower()] = entity
+        return self._current_entity_context().resolve(entity_name)
     
     def _get_entity_name(self, entity_id: uuid.UUID) -> Optional[str]:
         """Get entity name from ID."""
-        entity = self.session.query(MonitoredEntity).filter_by(id=entity_id).first()
+        entity = self._current_entity_context().by_id.get(entity_id)
         return entity.name if entity else None
     
     def _sentiment_label(self, score: float) -> str:
@@ -475,48 +1285,32 @@ class EnrichmentService:
         else:
             return "Strongly Negative"
     
-    def _track_discovered_entity(self, name: str, entity_type: str, context: str):
+    def _track_discovered_entity(
+        self,
+        name: str,
+        entity_type: str,
+        context: str,
+        comment_id: Optional[uuid.UUID] = None
+    ):
         """
         Track an entity that spaCy found but isn't in MonitoredEntity.
         
+        Counts, first/last-seen times, sample mentions and the mentioning
+        comments accumulate in a DiscoveredEntityBuffer and are upserted at
+        the end of the chunk.
+        
         Args:
             name: Entity name
             entity_type: Entity type from spaCy (PERSON, ORG, etc.)
             context: Comment text where entity was found
+            comment_id: Comment the entity was found in
         """
         # Filter out invalid entities
         if not self._is_valid_discovered_entity(name, entity_type):
             return
         
-        # Flush pending changes to ensure we see recently added entities
-        self.session.flush()
-        
-        discovered = self.session.query(DiscoveredEntity).filter(
-            DiscoveredEntity.name == name
-        ).first()
-        
-        now = datetime.utcnow()
-        
-        if discovered:
-            # Update existing
-            discovered.last_seen_at = now
-            discovered.mention_count += 1
-            # Keep up to 10 sample mentions
-            if len(discovered.sample_mentions) < 10:
-                discovered.sample_mentions = discovered.sample_mentions + [context[:200]]
-        else:
-            # Create new
-            discovered = DiscoveredEntity(
-                name=name,
-                entity_type=entity_type,
-                first_seen_at=now,
-                last_seen_at=now,
-                mention_count=1,
-                sample_mentions=[context[:200]]
-            )
-            self.session.add(discovered)
-            # Flush immediately to make it visible for subsequent queries in this batch
-            self.session.flush()
+        # Aggregated in memory; merged into discovered_entities once per chunk
+        self._discovered_buffer.add(name, entity_type, context, comment_id=comment_id)
     
     def _is_valid_entity_name(self, name: str) -> bool:
         """
@@ -691,6 +1485,7 @@ class EnrichmentService:
     def _queue_for_review(
         self,
         comment: Comment,
+        post_caption: str,
         entity_mention: str,
         confidence: float,
         possible_entities: List[str],
@@ -701,6 +1496,8 @@ class EnrichmentService:
         
         Args:
             comment: The comment containing the ambiguous mention
+            post_caption: Post caption (or subject line) already selected
+                with the comment's chunk, so comment.post isn't loaded
             entity_mention: The ambiguous entity name (e.g., "Justin")
             confidence: GPT's confidence score (0.0-1.0)
             possible_entities: List of possible entity matches
@@ -724,7 +1521,7 @@ class EnrichmentService:
                 comment_id=comment.id,
                 entity_mention=entity_mention,
                 context=comment.text,
-                post_caption=comment.post.caption or comment.post.subject_line,
+                post_caption=post_caption or None,
                 confidence=confidence,
                 possible_entities=possible_entities,
                 reason=reason
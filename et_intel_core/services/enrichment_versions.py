@@ -0,0 +1,178 @@
+"""
+Enrichment versioning: what produced each comment's signals, and what is stale.
+
+Every enriched comment gets a comment_enrichments row with the pipeline
+version (sentiment provider, model and prompt versions) and the catalog
+version (EntityContextSnapshot fingerprint) it was enriched under. Each
+catalog version's per-entity fingerprints are kept in catalog_versions.
+
+A comment is stale when:
+- it has no comment_enrichments row (unprocessed, or enriched before
+  versions were recorded)
+- its pipeline version differs from the current one
+- its catalog version differs and it either has signals for an entity
+  that was edited or removed since, or its text (or post caption)
+  contains a search term of an entity edited or added since, e.g. a new
+  alias (see entity_context.entity_search_terms and
+  `cli.py enrich --stale-only`)
+
+mark_for_reanalysis() drops a comment's row, which makes it stale, so the
+next `enrich --stale-only` run analyzes it again.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Set
+
+from sqlalchemy import and_, delete, exists, or_, select
+from sqlalchemy.orm import Session
+
+from et_intel_core.db_text_search import contains_any
+from et_intel_core.db_upsert import upsert_insert
+from et_intel_core.models import CatalogVersion, Comment, CommentEnrichment, ExtractedSignal, Post
+from et_intel_core.services.entity_context import CatalogEntity, entity_search_terms
+
+
+def pipeline_version(provider: Any) -> str:
+    """Version string of a sentiment provider (its ``version``, else its class name)."""
+    return getattr(provider, 'version', None) or type(provider).__name__
+
+
+def record_catalog_version(session: Session, version: str, entity_fingerprints: Dict[str, str]) -> None:
+    """Store a catalog version's entity fingerprints (no-op if already stored)."""
+    stmt = upsert_insert(session, CatalogVersion).values(
+        version=version,
+        entity_fingerprints=entity_fingerprints,
+        created_at=datetime.utcnow()
+    )
+    session.execute(stmt.on_conflict_do_nothing(index_elements=["version"]))
+
+
+def record_enriched(
+    session: Session,
+    comment_ids: Iterable[uuid.UUID],
+    pipeline: str,
+    catalog: str
+) -> int:
+    """
+    Upsert comment_enrichments rows for freshly enriched comments.
+
+    Returns:
+        Number of rows written
+    """
+    now = datetime.utcnow()
+    rows = [
+        {"comment_id": comment_id, "pipeline_version": pipeline, "catalog_version": catalog, "enriched_at": now}
+        for comment_id in comment_ids
+    ]
+    if not rows:
+        return 0
+    stmt = upsert_insert(session, CommentEnrichment)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["comment_id"],
+        set_={
+            "pipeline_version": stmt.excluded.pipeline_version,
+            "catalog_version": stmt.excluded.catalog_version,
+            "enriched_at": stmt.excluded.enriched_at,
+        }
+    )
+    session.execute(stmt, rows)
+    return len(rows)
+
+
+def mark_for_reanalysis(session: Session, comment_ids: Iterable[uuid.UUID]) -> int:
+    """
+    Make comments stale so the next `enrich --stale-only` re-analyzes them.
+
+    Returns:
+        Number of comments queued (including ones never enriched)
+    """
+    comment_ids = list(comment_ids)
+    if comment_ids:
+        session.execute(
+            delete(CommentEnrichment)
+            .where(CommentEnrichment.comment_id.in_(comment_ids))
+            .execution_options(synchronize_session=False)
+        )
+    return len(comment_ids)
+
+
+def changed_entity_ids(old: Dict[str, str], new: Dict[str, str]) -> Set[uuid.UUID]:
+    """Entities edited, added or removed between two fingerprint maps."""
+    return {
+        uuid.UUID(entity_id)
+        for entity_id in set(old) | set(new)
+        if old.get(entity_id) != new.get(entity_id)
+    }
+
+
+def stale_comment_filter(
+    session: Session,
+    pipeline: str,
+    catalog: str,
+    entity_fingerprints: Dict[str, str],
+    entities: Iterable[CatalogEntity]
+):
+    """
+    SQL condition on Comment matching comments enriched under older versions.
+
+    Args:
+        session: Session used to read the stored catalog versions
+        pipeline: Current pipeline version (see pipeline_version)
+        catalog: Current catalog version
+        entity_fingerprints: Current per-entity fingerprints
+        entities: Current catalog entities, whose search terms find
+            comments an edited or added entity may now match
+    """
+    entities_by_id = {entity.id: entity for entity in entities}
+    record = select(CommentEnrichment.comment_id).where(CommentEnrichment.comment_id == Comment.id)
+    conditions: List[Any] = [
+        ~exists(record),
+        exists(record.where(CommentEnrichment.pipeline_version != pipeline)),
+    ]
+
+    old_versions = session.execute(
+        select(CommentEnrichment.catalog_version)
+        .where(CommentEnrichment.catalog_version != catalog)
+        .distinct()
+    ).scalars().all()
+    stored = {
+        row.version: row.entity_fingerprints or {}
+        for row in session.execute(
+            select(CatalogVersion.version, CatalogVersion.entity_fingerprints)
+            .where(CatalogVersion.version.in_(old_versions))
+        )
+    } if old_versions else {}
+
+    for old_version in old_versions:
+        under_old = exists(record.where(CommentEnrichment.catalog_version == old_version))
+        if old_version not in stored:
+            # Fingerprints unknown: anything enriched under it is suspect
+            conditions.append(under_old)
+            continue
+        changed = changed_entity_ids(stored[old_version], entity_fingerprints)
+        if not changed:
+            continue
+        affected = [
+            exists().where(
+                ExtractedSignal.comment_id == Comment.id,
+                ExtractedSignal.entity_id.in_(changed)
+            )
+        ]
+        for entity_id in changed:
+            if entity_id not in entities_by_id:
+                continue  # Removed: only its existing signals matter
+            text_terms, caption_terms = entity_search_terms(entities_by_id[entity_id])
+            affected.append(contains_any(Comment.text, text_terms))
+            # correlate_except: the enrichment query already joins Post
+            affected.append(exists(
+                select(Post.id)
+                .where(
+                    Post.id == Comment.post_id,
+                    or_(contains_any(Post.caption, caption_terms), contains_any(Post.subject_line, caption_terms))
+                )
+                .correlate_except(Post)
+            ))
+        conditions.append(and_(under_old, or_(*affected)))
+
+    return or_(*conditions)
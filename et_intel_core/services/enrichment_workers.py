@@ -0,0 +1,327 @@
+"""
+Multi-process enrichment: workers claim disjoint comment batches in the DB.
+
+The rule-based/TextBlob + spaCy path is CPU-bound, so one process uses one
+core. `cli.py enrich --workers N` starts N processes. Each one has its own
+engine, session, extractor and sentiment provider, and loops:
+
+1. claim a batch: lock unprocessed, unclaimed comments with
+   SELECT ... FOR UPDATE SKIP LOCKED and record claims in enrichment_claims
+   (expiring after a TTL), then commit
+2. enrich the claimed comments and, in the same transaction, mark the
+   claims completed, provided this worker still holds all of them
+
+Workers never wait on each other's locks, and a crashed worker's claims
+expire and are taken over by the others. A worker that outlives its claims
+(a batch slower than the TTL) finds them taken over or expired at commit
+time and drops the batch, so the comments are enriched (and discovered
+entity mentions counted) once.
+"""
+
+import os
+import socket
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, exists, or_, select, update
+from sqlalchemy.orm import Session
+
+from et_intel_core.analytics.hourly_rollup import refresh_dirty_hours
+from et_intel_core.config import settings
+from et_intel_core.db_upsert import upsert_insert
+from et_intel_core.models import Comment, EnrichmentClaim, ExtractedSignal, MonitoredEntity
+from et_intel_core.monitoring import get_metrics
+from et_intel_core.services.enrichment import EnrichmentService
+
+
+class ClaimLost(Exception):
+    """A worker's claims expired or were taken over before its batch committed."""
+
+
+def make_worker_id(index: int = 0) -> str:
+    """Unique worker id: host, pid, worker index and a random suffix."""
+    return f"{socket.gethostname()}:{os.getpid()}:{index}:{uuid.uuid4().hex[:8]}"
+
+
+class ClaimQueue:
+    """
+    Claims batches of unprocessed comments for one worker.
+
+    A comment is claimable when it has no signals yet and has no live claim.
+    Live means either completed in this run or not yet expired.
+    """
+
+    def __init__(self, session: Session, worker_id: str, claim_ttl_seconds: int):
+        """
+        Initialize queue.
+
+        Args:
+            session: Worker's own session
+            worker_id: Unique id for this worker (see make_worker_id)
+            claim_ttl_seconds: Seconds before an uncompleted claim may be taken over
+        """
+        self.session = session
+        self.worker_id = worker_id
+        self.claim_ttl = timedelta(seconds=claim_ttl_seconds)
+
+    def claim(self, batch_size: int, since: Optional[datetime] = None) -> List[uuid.UUID]:
+        """
+        Claim up to ``batch_size`` comments and commit the claims.
+
+        Args:
+            batch_size: Maximum comments to claim
+            since: Only claim comments created after this date
+
+        Returns:
+            Claimed comment ids (empty when nothing is left)
+        """
+        now = datetime.utcnow()
+        live_claim = exists().where(
+            EnrichmentClaim.comment_id == Comment.id,
+            or_(EnrichmentClaim.completed_at.isnot(None), EnrichmentClaim.expires_at > now)
+        )
+        has_signal = exists().where(ExtractedSignal.comment_id == Comment.id)
+
+        candidates = select(Comment.id).where(~has_signal, ~live_claim)
+        if since:
+            candidates = candidates.where(Comment.created_at >= since)
+        candidates = (
+            candidates
+            .order_by(Comment.created_at, Comment.id)
+            .limit(batch_size)
+            .with_for_update(of=Comment, skip_locked=True)
+        )
+        candidate_ids = list(self.session.execute(candidates).scalars())
+        if not candidate_ids:
+            self.session.commit()
+            return []
+
+        # Take over only expired, uncompleted claims; anything else stays put
+        stmt = upsert_insert(self.session, EnrichmentClaim)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["comment_id"],
+            set_={
+                "worker_id": stmt.excluded.worker_id,
+                "claimed_at": stmt.excluded.claimed_at,
+                "expires_at": stmt.excluded.expires_at,
+            },
+            where=(EnrichmentClaim.completed_at.is_(None)) & (EnrichmentClaim.expires_at <= now)
+        )
+        self.session.execute(stmt, [
+            {
+                "comment_id": comment_id,
+                "worker_id": self.worker_id,
+                "claimed_at": now,
+                "expires_at": now + self.claim_ttl,
+                "completed_at": None,
+            }
+            for comment_id in candidate_ids
+        ])
+
+        claimed = list(self.session.execute(
+            select(EnrichmentClaim.comment_id).where(
+                EnrichmentClaim.comment_id.in_(candidate_ids),
+                EnrichmentClaim.worker_id == self.worker_id,
+                EnrichmentClaim.completed_at.is_(None)
+            )
+        ).scalars())
+        self.session.commit()
+        get_metrics().increment("enrichment.claimed", len(claimed))
+        return claimed
+
+    def complete_owned(self, comment_ids: Iterable[uuid.UUID]) -> None:
+        """
+        Mark claims completed inside the caller's transaction, if still held.
+
+        Passed to enrich_comments() as before_commit, so claims and the
+        batch's signals commit together. Raises ClaimLost (and the batch is
+        rolled back) unless every claim still belongs to this worker,
+        uncompleted and unexpired.
+        """
+        comment_ids = list(comment_ids)
+        completed = self.session.execute(
+            update(EnrichmentClaim)
+            .where(
+                EnrichmentClaim.comment_id.in_(comment_ids),
+                EnrichmentClaim.worker_id == self.worker_id,
+                EnrichmentClaim.completed_at.is_(None),
+                EnrichmentClaim.expires_at > datetime.utcnow()
+            )
+            .values(completed_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if completed != len(comment_ids):
+            raise ClaimLost(
+                f"{self.worker_id} holds {completed} of {len(comment_ids)} claims"
+            )
+
+    def complete(self, comment_ids: List[uuid.UUID]) -> None:
+        """Mark this worker's claims on ``comment_ids`` completed and commit."""
+        self.session.execute(
+            update(EnrichmentClaim)
+            .where(
+                EnrichmentClaim.comment_id.in_(comment_ids),
+                EnrichmentClaim.worker_id == self.worker_id
+            )
+            .values(completed_at=datetime.utcnow())
+        )
+        self.session.commit()
+
+    def release(self, comment_ids: List[uuid.UUID]) -> None:
+        """Drop this worker's uncompleted claims (after a failed batch) and commit."""
+        self.session.execute(
+            delete(EnrichmentClaim).where(
+                EnrichmentClaim.comment_id.in_(comment_ids),
+                EnrichmentClaim.worker_id == self.worker_id,
+                EnrichmentClaim.completed_at.is_(None)
+            )
+        )
+        self.session.commit()
+
+    @staticmethod
+    def purge_completed(session: Session) -> int:
+        """
+        Delete completed claims so a new run re-checks every comment without signals.
+
+        Returns:
+            Number of claims removed
+        """
+        removed = session.execute(
+            delete(EnrichmentClaim).where(EnrichmentClaim.completed_at.isnot(None))
+        ).rowcount
+        session.commit()
+        return removed
+
+
+def run_claim_loop(
+    service: EnrichmentService,
+    queue: ClaimQueue,
+    batch_size: int,
+    since: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Claim, enrich and complete batches until nothing claimable is left.
+
+    Args:
+        service: Enrichment service bound to the worker's session
+        queue: The worker's claim queue (same session)
+        batch_size: Comments per claim
+        since: Only claim comments created after this date
+
+    Returns:
+        Summed enrich_comments() counters plus batches, batches_dropped
+        (claims lost before commit) and worker_id
+    """
+    totals: Dict[str, Any] = {
+        "worker_id": queue.worker_id,
+        "batches": 0,
+        "batches_dropped": 0,
+        "comments_processed": 0,
+        "signals_created": 0,
+        "entities_discovered": 0,
+    }
+    while True:
+        comment_ids = queue.claim(batch_size, since=since)
+        if not comment_ids:
+            return totals
+        try:
+            # The coordinator refreshes the hourly rollup once, after all workers
+            stats = service.enrich_comments(
+                comment_ids=comment_ids, chunk_size=batch_size, refresh_rollup=False,
+                before_commit=queue.complete_owned
+            )
+        except ClaimLost:
+            # Rolled back; whoever holds the claims now enriches the comments
+            totals["batches_dropped"] += 1
+            get_metrics().increment("enrichment.claims_lost", len(comment_ids))
+            continue
+        except Exception:
+            queue.session.rollback()
+            queue.release(comment_ids)
+            raise
+        totals["batches"] += 1
+        for key in ("comments_processed", "signals_created", "entities_discovered"):
+            totals[key] += stats.get(key, 0)
+
+
+def run_enrichment_worker(
+    index: int,
+    batch_size: int,
+    claim_ttl_seconds: int,
+    since: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Process entry point for one worker: builds its own session and pipeline.
+
+    Args:
+        index: Worker number (used in the worker id)
+        batch_size: Comments per claim
+        claim_ttl_seconds: Claim expiry
+        since: Only claim comments created after this date
+    """
+    # Imported here so each spawned process creates its own engine
+    from et_intel_core.db import get_session
+    from et_intel_core.nlp import EntityExtractor, get_sentiment_provider
+
+    session = get_session()
+    try:
+        catalog = session.query(MonitoredEntity).filter_by(is_active=True).all()
+        service = EnrichmentService(session, EntityExtractor(catalog), get_sentiment_provider())
+        queue = ClaimQueue(session, make_worker_id(index), claim_ttl_seconds)
+        return run_claim_loop(service, queue, batch_size, since=since)
+    finally:
+        session.close()
+
+
+def enrich_with_workers(
+    session: Session,
+    workers: int,
+    batch_size: Optional[int] = None,
+    claim_ttl_seconds: Optional[int] = None,
+    since: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Run ``workers`` enrichment processes to completion.
+
+    Args:
+        session: Coordinator session (used to purge completed claims)
+        workers: Number of worker processes
+        batch_size: Comments per claim (settings.enrichment_claim_batch_size)
+        claim_ttl_seconds: Claim expiry (settings.enrichment_claim_ttl_seconds)
+        since: Only enrich comments created after this date
+
+    Returns:
+        Summed worker statistics plus workers, elapsed_seconds,
+        comments_per_second, the per-worker breakdown and the hourly
+        rollup refresh (rollup_*)
+    """
+    batch_size = batch_size or settings.enrichment_claim_batch_size
+    claim_ttl_seconds = claim_ttl_seconds or settings.enrichment_claim_ttl_seconds
+    ClaimQueue.purge_completed(session)
+
+    started = time.perf_counter()
+    # spawn, not fork: workers must not share the parent's DB connections
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+        futures = [
+            pool.submit(run_enrichment_worker, index, batch_size, claim_ttl_seconds, since)
+            for index in range(workers)
+        ]
+        per_worker = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    stats: Dict[str, Any] = {
+        "workers": workers,
+        "comments_processed": sum(w["comments_processed"] for w in per_worker),
+        "signals_created": sum(w["signals_created"] for w in per_worker),
+        "entities_discovered": sum(w["entities_discovered"] for w in per_worker),
+        "per_worker": per_worker,
+        "elapsed_seconds": elapsed,
+    }
+    stats["comments_per_second"] = stats["comments_processed"] / elapsed if elapsed > 0 else 0.0
+    get_metrics().record_value("enrichment.comments_per_second", stats["comments_per_second"])
+    stats.update(refresh_dirty_hours(session))
+    return stats
@@ -0,0 +1,192 @@
+"""
+Entity-context snapshot shared by every comment in an enrichment run.
+
+Enrichment needs three views of the active monitored-entity catalog: the
+disambiguated entity list sent to the LLM, an alias -> entity map for
+resolving the names the LLM returns, and the extractor's lookup index.
+Building them per comment costs one catalog query plus O(entities) string
+work each time, so they are built once into an EntityContextSnapshot and
+rebuilt only when the catalog fingerprint (its version) changes.
+"""
+
+import hashlib
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from et_intel_core.models import MonitoredEntity
+from et_intel_core.nlp import EntityExtractor
+
+
+@dataclass(frozen=True)
+class CatalogEntity:
+    """
+    Plain copy of a MonitoredEntity row.
+
+    Detached from the session, so commits (which expire ORM objects) and
+    chunk expunges never trigger reloads. Duck-types as a MonitoredEntity
+    for EntityExtractor.
+    """
+    id: uuid.UUID
+    name: str
+    canonical_name: Optional[str]
+    entity_type: str
+    aliases: Tuple[str, ...] = ()
+
+
+def entity_prompt_string(entity: CatalogEntity) -> str:
+    """
+    Monitored entity name with disambiguation hints, as passed to the LLM.
+
+    Returns:
+        e.g. "Blake Lively (the actress, not Blake Shelton)"
+    """
+    # Add disambiguation for common confusions
+    entity_info = entity.name
+    if "Justin" in entity.name and "Baldoni" in entity.name:
+        entity_info += " (the director, not Justin Bieber)"
+    elif "Blake" in entity.name and "Lively" in entity.name:
+        entity_info += " (the actress, not Blake Shelton)"
+    elif entity.aliases:
+        aliases_str = ", ".join(entity.aliases[:3])
+        entity_info += f" (aliases: {aliases_str})"
+    return entity_info
+
+
+def entity_search_terms(entity: CatalogEntity) -> Tuple[List[str], List[str]]:
+    """
+    Lowercased substrings a comment (or its post caption) must contain for
+    EntityExtractor to be able to match the entity.
+
+    Returns:
+        (text_terms, caption_terms): name, aliases and first/last name for
+        the comment text; name and aliases for the caption, which is what
+        makes the extractor accept first names and pronouns
+    """
+    name = entity.name.strip().lower()
+    caption_terms = [term for term in (name, *(a.strip().lower() for a in entity.aliases)) if term]
+    tokens = name.split()
+    partial = [tokens[0], tokens[-1]] if tokens else []
+    text_terms = list(dict.fromkeys([*caption_terms, *partial]))
+    return text_terms, list(dict.fromkeys(caption_terms))
+
+
+@dataclass
+class EntityContextSnapshot:
+    """
+    Immutable-by-convention view of the active catalog for one version.
+
+    Attributes:
+        version: Fingerprint of the active catalog (see fingerprint())
+        entities: Active entities, ordered by name
+        prompt_entities: Disambiguated names passed to the LLM
+        alias_map: Lowercased name / canonical name / alias -> entity
+        build_seconds: Time spent building the prompt strings, alias map
+            and extractor index
+    """
+    version: str
+    entities: List[CatalogEntity]
+    prompt_entities: List[str]
+    alias_map: Dict[str, CatalogEntity]
+    build_seconds: float = 0.0
+    by_id: Dict[uuid.UUID, CatalogEntity] = field(default_factory=dict)
+
+    @staticmethod
+    def fetch_catalog(session: Session) -> List[CatalogEntity]:
+        """Load the active catalog as plain CatalogEntity rows (one column query)."""
+        rows = session.query(
+            MonitoredEntity.id,
+            MonitoredEntity.name,
+            MonitoredEntity.canonical_name,
+            MonitoredEntity.entity_type,
+            MonitoredEntity.aliases
+        ).filter(MonitoredEntity.is_active.is_(True)).order_by(MonitoredEntity.name).all()
+        return [
+            CatalogEntity(
+                id=row.id,
+                name=row.name,
+                canonical_name=row.canonical_name,
+                entity_type=row.entity_type,
+                aliases=tuple(alias for alias in (row.aliases or []) if alias)
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def fingerprint(entities: List[CatalogEntity]) -> str:
+        """
+        Version string for a catalog: changes when an entity is added,
+        deactivated, renamed or has its aliases edited.
+        """
+        payload = json.dumps(
+            [
+                [str(e.id), e.name, e.canonical_name, e.entity_type, list(e.aliases)]
+                for e in sorted(entities, key=lambda e: str(e.id))
+            ],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def entity_fingerprints(entities: List[CatalogEntity]) -> Dict[str, str]:
+        """
+        Per-entity fingerprints (entity id -> hash of name, canonical name,
+        type and aliases), stored per catalog version to diff catalogs.
+        """
+        fingerprints = {}
+        for e in entities:
+            payload = json.dumps([e.name, e.canonical_name, e.entity_type, list(e.aliases)], ensure_ascii=False)
+            fingerprints[str(e.id)] = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+        return fingerprints
+    
+    @classmethod
+    def build(
+        cls,
+        entities: List[CatalogEntity],
+        extractor: Optional[EntityExtractor] = None,
+        version: Optional[str] = None
+    ) -> "EntityContextSnapshot":
+        """
+        Build a snapshot and (re)index the extractor for it.
+
+        Args:
+            entities: Active catalog (see fetch_catalog)
+            extractor: Extractor whose lookup index should match the snapshot
+            version: Precomputed fingerprint (computed if None)
+        """
+        started = time.perf_counter()
+
+        alias_map: Dict[str, CatalogEntity] = {}
+        for entity in entities:
+            # Add primary name
+            alias_map[entity.name.lower()] = entity
+
+            # Add canonical name if present
+            if entity.canonical_name:
+                alias_map[entity.canonical_name.lower()] = entity
+
+            # Add all aliases
+            for alias in entity.aliases:
+                alias_map[alias.lower()] = entity
+
+        prompt_entities = [entity_prompt_string(entity) for entity in entities]
+
+        if extractor is not None:
+            extractor.load_catalog(entities)
+
+        return cls(
+            version=version or cls.fingerprint(entities),
+            entities=list(entities),
+            prompt_entities=prompt_entities,
+            alias_map=alias_map,
+            build_seconds=time.perf_counter() - started,
+            by_id={entity.id: entity for entity in entities}
+        )
+
+    def resolve(self, entity_name: str) -> Optional[CatalogEntity]:
+        """Resolve a name the LLM returned (name, canonical name or alias)."""
+        return self.alias_map.get(entity_name.lower().strip())
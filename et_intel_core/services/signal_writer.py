@@ -0,0 +1,145 @@
+"""
+Buffered, set-based signal writes for enrichment.
+
+One comment yields 5-10 signals, and writing each through a SELECT-then-
+UPDATE/INSERT costs a read per signal. SignalBuffer collects a chunk's
+signals and writes them with INSERT ... ON CONFLICT ON CONSTRAINT
+uq_signal_identity DO UPDATE, keeping _create_signal's idempotent
+semantics: re-enriching a comment updates its signals in place.
+
+Comment-level signals (entity_id NULL) need one extra step: NULLs never
+collide in a unique constraint, so those rows are matched to existing ones
+with a single SELECT per flush and upserted on the primary key instead.
+"""
+
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from et_intel_core.db_upsert import chunked, conflict_target, upsert_insert
+from et_intel_core.models import ExtractedSignal
+from et_intel_core.monitoring import get_metrics
+
+SIGNAL_IDENTITY = ["comment_id", "entity_id", "signal_type", "source_model"]
+_LOOKUP_BATCH_SIZE = 500
+
+
+class SignalBuffer:
+    """
+    Collects signal rows and upserts them in one statement per flush.
+
+    Rows sharing an identity (comment, entity, type, model) collapse to the
+    last one added, like repeated _create_signal() calls updating one row.
+    Each flush is timed in MetricsCollector as ``enrichment.signal_flush``.
+    """
+
+    def __init__(self, session: Session):
+        """
+        Initialize buffer.
+
+        Args:
+            session: Session the rows are written through (caller commits)
+        """
+        self.session = session
+        self._rows: Dict[tuple, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(
+        self,
+        comment_id: uuid.UUID,
+        signal_type: Any,
+        value: str,
+        source_model: str = "unknown",
+        entity_id: Optional[uuid.UUID] = None,
+        numeric_value: Optional[float] = None,
+        confidence: float = 0.0,
+        weight_score: float = 1.0
+    ) -> None:
+        """Buffer one signal (same fields as ExtractedSignal)."""
+        row = {
+            "comment_id": comment_id,
+            "entity_id": entity_id,
+            "signal_type": getattr(signal_type, "value", signal_type),
+            "value": value,
+            "numeric_value": numeric_value,
+            "confidence": confidence,
+            "weight_score": weight_score,
+            "source_model": source_model,
+            "created_at": datetime.utcnow(),
+        }
+        self._rows[tuple(row[col] for col in SIGNAL_IDENTITY)] = row
+
+    def flush(self) -> int:
+        """
+        Write buffered signals and clear the buffer.
+
+        Returns:
+            Number of rows written (inserted or updated)
+        """
+        if not self._rows:
+            return 0
+
+        started = time.perf_counter()
+        rows = list(self._rows.values())
+        self._rows = {}
+
+        entity_rows = [row for row in rows if row["entity_id"] is not None]
+        comment_rows = [row for row in rows if row["entity_id"] is None]
+
+        for row in entity_rows:
+            row["id"] = uuid.uuid4()
+        self._upsert(entity_rows, conflict_target(self.session, "uq_signal_identity", SIGNAL_IDENTITY))
+
+        self._assign_existing_ids(comment_rows)
+        self._upsert(comment_rows, {"index_elements": ["id"]})
+
+        metrics = get_metrics()
+        metrics.record_timing("enrichment.signal_flush", time.perf_counter() - started)
+        metrics.increment("enrichment.signals_written", len(rows))
+        return len(rows)
+
+    def _assign_existing_ids(self, rows: List[Dict[str, Any]]) -> None:
+        """Reuse the ids of existing comment-level signals so they update in place."""
+        if not rows:
+            return
+        existing: Dict[tuple, uuid.UUID] = {}
+        comment_ids = list({row["comment_id"] for row in rows})
+        for batch in chunked(comment_ids, _LOOKUP_BATCH_SIZE):
+            result = self.session.execute(
+                select(
+                    ExtractedSignal.id,
+                    ExtractedSignal.comment_id,
+                    ExtractedSignal.signal_type,
+                    ExtractedSignal.source_model
+                ).where(
+                    ExtractedSignal.comment_id.in_(batch),
+                    ExtractedSignal.entity_id.is_(None)
+                )
+            )
+            for signal_id, comment_id, signal_type, source_model in result:
+                existing[(comment_id, signal_type, source_model)] = signal_id
+        for row in rows:
+            key = (row["comment_id"], row["signal_type"], row["source_model"])
+            row["id"] = existing.get(key) or uuid.uuid4()
+
+    def _upsert(self, rows: List[Dict[str, Any]], target: Dict[str, Any]) -> None:
+        if not rows:
+            return
+        stmt = upsert_insert(self.session, ExtractedSignal)
+        stmt = stmt.on_conflict_do_update(
+            **target,
+            set_={
+                "value": stmt.excluded.value,
+                "numeric_value": stmt.excluded.numeric_value,
+                "confidence": stmt.excluded.confidence,
+                "weight_score": stmt.excluded.weight_score,
+                "created_at": stmt.excluded.created_at,
+            }
+        )
+        self.session.execute(stmt, rows)
@@ -36,7 +36,8 @@ class ApifySource:
         
         Auto-detects CSV format and handles both simple and raw dataset formats.
         """
-        df = pd.read_csv(self.csv_path)
+        # Keep comment ids as strings (large ints lose precision as floats)
+        df = pd.read_csv(self.csv_path, dtype={'pk': str})
         
         # Detect format by checking for key columns
         if 'shortCode' in df.columns:
@@ -116,6 +117,10 @@ class ApifySource:
                 comment_text = ''
             comment_text = str(comment_text)
             
+            # Platform comment id (stable across re-scrapes)
+            comment_pk = row.get('pk')
+            comment_pk = None if pd.isna(comment_pk) or comment_pk == '' else str(comment_pk)
+            
             # Ensure post_id and post_url are strings
             post_id = str(post_id) if post_id else 'unknown'
             post_url = str(post_url) if post_url else f"https://www.instagram.com/p/{post_id}/"
@@ -130,6 +135,7 @@ class ApifySource:
                 comment_text=comment_text,
                 comment_timestamp=timestamp,
                 like_count=like_count,
+                external_comment_id=comment_pk,
                 raw=raw_dict
             )
 
@@ -336,6 +336,7 @@ class ApifyLiveSource(IngestionSource):
             comment_text=item.get("text", ""),
             comment_timestamp=created_at,
             like_count=like_count,
+            external_comment_id=str(item["pk"]) if item.get("pk") else None,
             raw=raw_data,
         )
 
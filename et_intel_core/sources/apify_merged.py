@@ -77,6 +77,7 @@ class ApifyMergedAdapter(IngestionSource):
                 comment_text=apify_record.comment_text,
                 comment_timestamp=apify_record.comment_timestamp,
                 like_count=apify_record.comment_likes,
+                external_comment_id=apify_record.comment_id or None,
                 raw={
                     "post_metadata": {
                         "post_id": apify_record.post_id,
@@ -107,6 +107,21 @@ def create_demo_brief_data():
         summary="2 entities with significant sentiment shifts (30%+ change in 72hrs)"
     )
     
+    # Daily sentiment series for the trend chart (BriefBuilder gets these
+    # from AnalyticsService.get_sentiment_history_many)
+    entity_trends = {
+        entity['entity_name']: [
+            {
+                'date': (end - timedelta(days=6 - i)).replace(hour=0, minute=0, second=0, microsecond=0),
+                'avg_sentiment': entity['avg_sentiment'] + (i - 3) * 0.05,
+                'mention_count': entity['mention_count'] // 7,
+                'total_likes': entity['total_likes'] // 7
+            }
+            for i in range(7)
+        ]
+        for entity in top_entities.items
+    }
+    
     # Create brief data
     brief = IntelligenceBriefData(
         timeframe={'start': start, 'end': end},
@@ -282,6 +297,7 @@ def create_demo_brief_data():
             items=[],
             summary="Risk signal detection not yet implemented"
         ),
+        entity_trends=entity_trends,
         metadata={
             'generated_at': datetime.utcnow(),
             'platforms': ['instagram', 'youtube'],
@@ -2,8 +2,10 @@
 Tests for analytics service.
 """
 
+import uuid
 from datetime import datetime, timedelta
 import pytest
+from sqlalchemy import event
 
 from et_intel_core.models import (
     Post,
@@ -15,6 +17,7 @@ from et_intel_core.models import (
     PlatformType
 )
 from et_intel_core.analytics import AnalyticsService
+from et_intel_core.analytics.hourly_rollup import refresh_dirty_hours
 
 
 def create_test_data(db_session):
@@ -337,3 +340,309 @@ def test_top_entities_with_platform_filter(db_session):
     # Should still have data (all our test data is Instagram)
     assert len(df) == 2
 
+
+
+def test_get_dynamic_entities_counts_discovered_mentions(db_session):
+    """Test discovered-entity window counts and sentiment from mention links."""
+    from et_intel_core.models import DiscoveredEntity, DiscoveredEntityMention
+    
+    taylor, _, _ = create_test_data(db_session)
+    post = db_session.query(Post).first()
+    now = datetime.utcnow()
+    hoover, getty, rare = [
+        DiscoveredEntity(name=name, entity_type="PERSON", mention_count=20, first_seen_at=now, last_seen_at=now)
+        for name in ("Colleen Hoover", "Getty", "Rare Name")
+    ]
+    db_session.add_all([hoover, getty, rare])
+    ages = [1, 2, 3, 24 * 10]  # the last one is outside the window
+    comments = [
+        Comment(post_id=post.id, author_name=f"fan_{i}", text="some text", created_at=now - timedelta(hours=hours), likes=5)
+        for i, hours in enumerate(ages)
+    ]
+    db_session.add_all(comments)
+    db_session.flush()
+    for comment, score in zip(comments, [0.6, 0.2, -0.2, 0.9]):
+        # Two signals per comment: likes must still count once
+        for entity_id in (None, taylor.id):
+            db_session.add(ExtractedSignal(
+                comment_id=comment.id,
+                entity_id=entity_id,
+                signal_type=SignalType.SENTIMENT,
+                value="positive",
+                numeric_value=score,
+                weight_score=1.0,
+                confidence=0.8,
+                source_model="test"
+            ))
+        db_session.add(DiscoveredEntityMention(discovered_entity_id=hoover.id, comment_id=comment.id))
+        db_session.add(DiscoveredEntityMention(discovered_entity_id=getty.id, comment_id=comment.id))
+    db_session.add(DiscoveredEntityMention(discovered_entity_id=rare.id, comment_id=comments[-1].id))
+    db_session.commit()
+    
+    analytics = AnalyticsService(db_session)
+    window = (now - timedelta(days=1), now + timedelta(hours=1))
+    df = analytics.get_dynamic_entities(*window, min_mentions=1)
+    discovered = df[~df['is_monitored'].astype(bool)].set_index('entity_name')
+    
+    assert set(discovered.index) == {"Colleen Hoover"}  # Getty is blocklisted
+    assert discovered.loc["Colleen Hoover", "mention_count"] == 3
+    assert discovered.loc["Colleen Hoover", "total_likes"] == 15
+    assert discovered.loc["Colleen Hoover", "avg_sentiment"] == pytest.approx(0.2)
+    assert discovered.loc["Colleen Hoover", "weighted_sentiment"] == pytest.approx(0.2)
+    assert taylor.name in set(df['entity_name'])
+    
+    windowed = analytics.get_discovered_entities(min_mentions=3, time_window=window)
+    assert list(windowed['name']) == ["Colleen Hoover", "Getty"]
+    assert list(windowed['mention_count']) == [3, 3]
+    assert len(analytics.get_discovered_entities(min_mentions=4, time_window=window)) == 0
+    assert len(analytics.get_discovered_entities(min_mentions=5)) == 3
+
+
+def test_compute_velocity_many_matches_compute_velocity(db_session):
+    """Batched velocity returns the single-entity results, errors included."""
+    taylor, blake, comments = create_test_data(db_session)
+    unknown = uuid.uuid4()
+    
+    analytics = AnalyticsService(db_session, use_rollup=False)
+    batched = analytics.compute_velocity_many([taylor.id, blake.id, unknown], window_hours=72)
+    
+    assert set(batched) == {taylor.id, blake.id, unknown}
+    for entity_id in (taylor.id, blake.id, unknown):
+        single = analytics.compute_velocity(entity_id, window_hours=72)
+        single.pop("calculated_at", None)
+        batched[entity_id].pop("calculated_at", None)
+        assert batched[entity_id] == single
+    assert batched[unknown]["error"] == "Insufficient data"
+
+
+def test_hourly_rollup_matches_raw_queries(db_session):
+    """Rollup hours plus raw partial-hour edges give the raw-row results."""
+    taylor, blake, comments = create_test_data(db_session)
+    stats = refresh_dirty_hours(db_session)
+    assert stats["rollup_hours_refreshed"] is None  # first refresh rebuilds everything
+    assert stats["rollup_rows_written"] > 0
+    
+    rollup = AnalyticsService(db_session, use_rollup=True)
+    raw = AnalyticsService(db_session, use_rollup=False)
+    assert rollup._rollup_ready()
+    
+    now = datetime.utcnow()
+    # Not aligned to hours, so both edges are read from raw rows
+    window = (now - timedelta(hours=50, minutes=17), now - timedelta(minutes=3))
+    
+    def rows(df):
+        return sorted(df.to_dict("records"), key=lambda row: row["entity_name"])
+    
+    top_rollup, top_raw = rows(rollup.get_top_entities(window)), rows(raw.get_top_entities(window))
+    assert len(top_rollup) == 2
+    for got, expected in zip(top_rollup, top_raw):
+        assert got["entity_name"] == expected["entity_name"]
+        assert got["mention_count"] == expected["mention_count"]
+        assert got["total_likes"] == expected["total_likes"]
+        assert got["avg_sentiment"] == pytest.approx(expected["avg_sentiment"])
+        assert got["weighted_sentiment"] == pytest.approx(expected["weighted_sentiment"])
+    
+    compare_rollup = rows(rollup.get_entity_comparison([taylor.id, blake.id], window))
+    compare_raw = rows(raw.get_entity_comparison([taylor.id, blake.id], window))
+    assert [r["mention_count"] for r in compare_rollup] == [r["mention_count"] for r in compare_raw]
+    assert [r["min_sentiment"] for r in compare_rollup] == pytest.approx([r["min_sentiment"] for r in compare_raw])
+    assert [r["max_sentiment"] for r in compare_rollup] == pytest.approx([r["max_sentiment"] for r in compare_raw])
+    
+    assert rollup.get_sentiment_distribution(window, entity_id=taylor.id) == \
+        raw.get_sentiment_distribution(window, entity_id=taylor.id)
+    
+    history_rollup = rollup.get_entity_sentiment_history(taylor.id, days=5)
+    history_raw = raw.get_entity_sentiment_history(taylor.id, days=5)
+    assert list(history_rollup["date"]) == list(history_raw["date"])
+    assert list(history_rollup["mention_count"]) == list(history_raw["mention_count"])
+    assert list(history_rollup["avg_sentiment"]) == pytest.approx(list(history_raw["avg_sentiment"]))
+    
+    velocity_rollup = rollup.compute_velocity_many([taylor.id, blake.id], window_hours=72)
+    velocity_raw = raw.compute_velocity_many([taylor.id, blake.id], window_hours=72)
+    for entity_id in (taylor.id, blake.id):
+        got, expected = velocity_rollup[entity_id], velocity_raw[entity_id]
+        for key in ("recent_sample_size", "previous_sample_size", "alert", "direction"):
+            assert got[key] == expected[key]
+        # Sums run in a different order, so the rounded values may differ in the last digit
+        assert got["recent_sentiment"] == pytest.approx(expected["recent_sentiment"], abs=1.5e-3)
+        assert got["previous_sentiment"] == pytest.approx(expected["previous_sentiment"], abs=1.5e-3)
+        assert got["percent_change"] == pytest.approx(expected["percent_change"], abs=0.15)
+
+
+def test_hourly_rollup_refreshes_incrementally(db_session):
+    """New signals make the rollup stale until their hours are refreshed."""
+    taylor, blake, comments = create_test_data(db_session)
+    refresh_dirty_hours(db_session)
+    
+    comment = comments[5]
+    db_session.add(ExtractedSignal(
+        comment_id=comment.id,
+        entity_id=taylor.id,
+        signal_type=SignalType.SENTIMENT,
+        value="positive",
+        numeric_value=0.9,
+        weight_score=1.0,
+        confidence=0.8,
+        source_model="late",
+        created_at=datetime.utcnow()
+    ))
+    db_session.commit()
+    
+    analytics = AnalyticsService(db_session, use_rollup=True)
+    assert not analytics._rollup_ready()
+    
+    stats = refresh_dirty_hours(db_session, overlap_seconds=0)
+    assert stats["rollup_hours_refreshed"] == 1
+    assert analytics._rollup_ready()
+    
+    window = (comment.created_at - timedelta(hours=3), comment.created_at + timedelta(hours=3))
+    df = analytics.get_entity_comparison([taylor.id], window)
+    expected = AnalyticsService(db_session, use_rollup=False).get_entity_comparison([taylor.id], window)
+    assert df.iloc[0]["mention_count"] == expected.iloc[0]["mention_count"]
+    assert df.iloc[0]["max_sentiment"] == pytest.approx(0.9)
+    assert df.iloc[0]["avg_sentiment"] == pytest.approx(expected.iloc[0]["avg_sentiment"])
+
+
+def test_get_sentiment_history_many_single_query(db_session):
+    """Daily series for several entities come from one query, rollup or not."""
+    taylor, blake, comments = create_test_data(db_session)
+    now = datetime.utcnow()
+    window = (now - timedelta(days=4, hours=5), now)
+    
+    statements = []
+    
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    engine = db_session.get_bind()
+    raw = AnalyticsService(db_session, use_rollup=False)
+    entity_ids = [taylor.id, blake.id, uuid.uuid4()]
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        series = raw.get_sentiment_history_many(entity_ids, window)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert len(statements) == 1
+    
+    assert len(series) == 3
+    taylor_days = series[taylor.id]
+    assert taylor_days and [p["date"] for p in taylor_days] == sorted(p["date"] for p in taylor_days)
+    # 4 days 5 hours of comments every 4 hours, window end included
+    assert sum(p["mention_count"] for p in taylor_days) == 26
+    assert all(p["date"].hour == 0 for p in taylor_days)
+    
+    refresh_dirty_hours(db_session)
+    from_rollup = AnalyticsService(db_session, use_rollup=True).get_sentiment_history_many(
+        [taylor.id, blake.id], window
+    )
+    for entity_id in (taylor.id, blake.id):
+        assert [p["date"] for p in from_rollup[entity_id]] == [p["date"] for p in series[entity_id]]
+        assert [p["mention_count"] for p in from_rollup[entity_id]] == \
+            [p["mention_count"] for p in series[entity_id]]
+        assert [p["avg_sentiment"] for p in from_rollup[entity_id]] == \
+            pytest.approx([p["avg_sentiment"] for p in series[entity_id]])
+
+
+def test_get_top_posts_single_grouped_query(db_session):
+    """Per-post stats and top entities come from one grouped query."""
+    taylor, blake, comments = create_test_data(db_session)
+    now = datetime.utcnow()
+    
+    # Caption names Blake (by alias) although comments mention both equally
+    blake.aliases = ["blake"]
+    captioned = Post(
+        platform=PlatformType.YOUTUBE,
+        external_id="CAPTIONED",
+        url="https://youtube.com/watch?v=CAPTIONED",
+        caption="Blake at the premiere",
+        posted_at=now
+    )
+    db_session.add(captioned)
+    db_session.flush()
+    for i in range(3):
+        comment = Comment(
+            post_id=captioned.id,
+            author_name=f"fan_{i}",
+            text=f"Fan comment {i}",
+            created_at=now - timedelta(hours=1),
+            likes=5
+        )
+        db_session.add(comment)
+        db_session.flush()
+        db_session.add(ExtractedSignal(
+            comment_id=comment.id,
+            entity_id=taylor.id,
+            signal_type=SignalType.SENTIMENT,
+            value="positive",
+            numeric_value=0.6,
+            source_model="test"
+        ))
+    db_session.commit()
+    
+    statements = []
+    
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    engine = db_session.get_bind()
+    analytics = AnalyticsService(db_session)
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        posts = analytics.get_top_posts(now - timedelta(days=7), now + timedelta(minutes=1))
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    # Grouped post query + active catalog for caption matching
+    assert len(statements) == 2
+    
+    assert [p['comment_count'] for p in posts] == [40, 3]
+    assert posts[0]['total_likes'] == sum(c.likes for c in comments)
+    assert posts[0]['avg_sentiment'] == pytest.approx(0.01, abs=0.01)
+    # Tied comment mentions resolve by name; caption match wins over comments
+    assert posts[0]['top_entity'] == "Blake Lively"
+    assert posts[1]['top_entity'] == "Blake Lively"
+    assert posts[1]['avg_sentiment'] == pytest.approx(0.6)
+    
+    youtube = analytics.get_top_posts(now - timedelta(days=7), now + timedelta(minutes=1), platform="youtube")
+    assert [p['post_id'] for p in youtube] == [str(captioned.id)]
+
+
+def test_get_platform_sentiment_many(db_session):
+    """Per-(entity, platform) sentiment for several entities in one query."""
+    taylor, blake, comments = create_test_data(db_session)
+    now = datetime.utcnow()
+    
+    youtube = Post(
+        platform=PlatformType.YOUTUBE,
+        external_id="YT1",
+        url="https://youtube.com/watch?v=YT1",
+        posted_at=now
+    )
+    db_session.add(youtube)
+    db_session.flush()
+    comment = Comment(post_id=youtube.id, author_name="viewer", text="Taylor!", created_at=now - timedelta(hours=1))
+    db_session.add(comment)
+    db_session.flush()
+    db_session.add(ExtractedSignal(
+        comment_id=comment.id,
+        entity_id=taylor.id,
+        signal_type=SignalType.SENTIMENT,
+        value="negative",
+        numeric_value=-0.8,
+        source_model="test"
+    ))
+    db_session.commit()
+    
+    analytics = AnalyticsService(db_session)
+    window = (now - timedelta(days=7), now)
+    breakdown = analytics.get_platform_sentiment_many([taylor.id, blake.id, uuid.uuid4()], window)
+    
+    assert len(breakdown) == 3
+    assert [p["platform"] for p in breakdown[taylor.id]] == ["instagram", "youtube"]
+    assert breakdown[taylor.id][1]["avg_sentiment"] == pytest.approx(-0.8)
+    assert breakdown[taylor.id][1]["mention_count"] == 1
+    assert [p["platform"] for p in breakdown[blake.id]] == ["instagram"]
+    assert breakdown[blake.id][0]["mention_count"] == 40
+    
+    only_youtube = analytics.get_platform_sentiment_many([taylor.id, blake.id], window, platforms=["youtube"])
+    assert [p["platform"] for p in only_youtube[taylor.id]] == ["youtube"]
+    assert only_youtube[blake.id] == []
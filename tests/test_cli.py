@@ -214,6 +214,41 @@ class TestAddEntityCommand:
         assert result.exit_code == 0
         assert "already exists" in result.output.lower() or "duplicate" in result.output.lower()
 
+    
+    def test_add_entity_backfills_without_spacy_or_provider(self, runner, test_session, monkeypatch):
+        """Test the add-entity backfill only needs the catalog matcher."""
+        from datetime import datetime
+        import spacy
+        from et_intel_core.models.enums import SignalType
+        
+        def unavailable(*args, **kwargs):
+            raise AssertionError("backfill must not load spaCy or a sentiment provider")
+        
+        post = Post(
+            platform=PlatformType.INSTAGRAM,
+            external_id="BACKFILLCLI",
+            url="https://instagram.com/p/BACKFILLCLI/",
+            posted_at=datetime.utcnow()
+        )
+        test_session.add(post)
+        test_session.flush()
+        comment = Comment(post_id=post.id, author_name="fan", text="New Person is great", created_at=datetime.utcnow())
+        test_session.add(comment)
+        test_session.flush()
+        test_session.add(ExtractedSignal(
+            comment_id=comment.id, signal_type=SignalType.SENTIMENT, value="positive",
+            numeric_value=0.5, confidence=0.8, weight_score=1.0, source_model="rule_based"
+        ))
+        test_session.commit()
+        
+        cli = setup_cli_mocks(monkeypatch, test_session)
+        monkeypatch.setattr(spacy, "load", unavailable)
+        monkeypatch.setattr(sys.modules['cli'], "get_sentiment_provider", unavailable)
+        result = runner.invoke(cli, ['add-entity', 'New Person', '--type', 'person'])
+        
+        assert result.exit_code == 0, result.output
+        assert "Signals created: 1" in result.output
+
 
 class TestReviewEntitiesCommand:
     """Tests for review-entities command."""
@@ -302,6 +337,36 @@ class TestCreateIndexesCommand:
         assert "created" in result.output.lower() or "already exists" in result.output.lower() or "index" in result.output.lower()
 
 
+class TestLLMCacheCommand:
+    """Tests for llm-cache command."""
+    
+    def test_llm_cache_inspect_and_purge(self, runner, test_session, tmp_path, monkeypatch):
+        """Test inspecting the cache and purging one prompt version."""
+        from et_intel_core.config import settings
+        from et_intel_core.nlp.llm_cache import LLMResultCache
+        
+        path = tmp_path / "llm_cache.sqlite3"
+        monkeypatch.setattr(settings, 'llm_cache_path', str(path))
+        cache = LLMResultCache(path)
+        cache.put("k1", {"score": 0.5}, "score", "gpt-4o-mini", "score-v1")
+        cache.put("k2", {"score": 0.1}, "score", "gpt-4o-mini", "score-v0")
+        cache.close()
+        
+        cli = setup_cli_mocks(monkeypatch, test_session)
+        result = runner.invoke(cli, ['llm-cache'])
+        assert result.exit_code == 0
+        assert "score-v0" in result.output
+        assert "score-v1" in result.output
+        
+        result = runner.invoke(cli, ['llm-cache', '--purge', 'score-v0'])
+        assert result.exit_code == 0
+        assert "Removed 1" in result.output
+        
+        cache = LLMResultCache(path)
+        assert cache.stats()["entries"] == 1
+        cache.close()
+
+
 class TestVersionCommand:
     """Tests for version command."""
     
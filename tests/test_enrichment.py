@@ -2,7 +2,11 @@
 Tests for enrichment service.
 """
 
+import json
+import re
+import threading
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import pytest
 
 from et_intel_core.models import (
@@ -188,6 +192,516 @@ def test_enrichment_idempotent(db_session):
     assert signal_count_1 == signal_count_2
 
 
+def test_enrichment_streams_keyset_chunks(db_session):
+    """Test that chunked enrichment covers every comment and releases each chunk."""
+    from datetime import timedelta
+    
+    post = Post(
+        platform=PlatformType.INSTAGRAM,
+        external_id="ABC123",
+        url="https://instagram.com/p/ABC123/",
+        caption="",
+        subject_line="Subject fallback",
+        posted_at=datetime.utcnow()
+    )
+    db_session.add(post)
+    db_session.flush()
+    
+    # Two comments share a timestamp so the id tie-breaker is exercised
+    created = datetime(2024, 1, 1, 12, 0)
+    offsets = [0, 0, 1, 2, 3]
+    for i, offset in enumerate(offsets):
+        db_session.add(Comment(
+            post_id=post.id,
+            author_name=f"user_{i}",
+            text=f"This is great {i}",
+            created_at=created + timedelta(minutes=offset)
+        ))
+    db_session.commit()
+    
+    service = EnrichmentService(db_session, EntityExtractor([]), RuleBasedSentimentProvider())
+    
+    chunks = list(service._iter_comment_chunks(chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert len({comment.id for chunk in chunks for comment, _ in chunk}) == 5
+    assert all(caption == "Subject fallback" for chunk in chunks for _, caption in chunk)
+    
+    db_session.expunge_all()
+    stats = service.enrich_comments(chunk_size=2)
+    
+    assert stats["comments_processed"] == 5
+    # One post: its caption is a miss once, then a hit for every other comment
+    assert stats["caption_cache_misses"] == 1
+    assert stats["caption_cache_hit_rate"] == 0.8
+    assert not any(isinstance(obj, Comment) for obj in db_session.identity_map.values())
+    assert db_session.query(ExtractedSignal.comment_id).distinct().count() == 5
+    
+    # Everything now has signals, so a second pass selects nothing
+    assert service.enrich_comments(chunk_size=2)["comments_processed"] == 0
+
+
+def test_entity_context_snapshot_rebuilt_only_on_catalog_change(db_session):
+    """Test that the entity-context snapshot is built once per catalog version."""
+    taylor = MonitoredEntity(
+        name="Taylor Swift",
+        canonical_name="Taylor Swift",
+        entity_type=EntityType.PERSON,
+        aliases=["Taylor"]
+    )
+    post = Post(
+        platform=PlatformType.INSTAGRAM,
+        external_id="ABC123",
+        url="https://instagram.com/p/ABC123/",
+        posted_at=datetime.utcnow()
+    )
+    db_session.add_all([taylor, post])
+    db_session.flush()
+    for i in range(3):
+        db_session.add(Comment(
+            post_id=post.id,
+            author_name=f"user_{i}",
+            text=f"Taylor is great {i}",
+            created_at=datetime.utcnow()
+        ))
+    db_session.commit()
+    
+    extractor = EntityExtractor([taylor])
+    service = EnrichmentService(db_session, extractor, RuleBasedSentimentProvider())
+    
+    stats = service.enrich_comments(chunk_size=1)
+    assert stats["comments_processed"] == 3
+    assert stats["entity_context_builds"] == 1
+    assert stats["entity_context_build_seconds"] >= 0.0
+    first_version = stats["entity_context_version"]
+    assert service._resolve_entity_by_name("taylor").id == taylor.id
+    assert service._entity_context.prompt_entities == ["Taylor Swift (aliases: Taylor)"]
+    
+    # Unchanged catalog: the next run reuses the snapshot
+    assert service.enrich_comments()["entity_context_builds"] == 0
+    
+    # An alias edit bumps the version and re-indexes the extractor
+    taylor.aliases = ["Taylor", "Tay"]
+    db_session.commit()
+    db_session.add(Comment(
+        post_id=post.id,
+        author_name="user_new",
+        text="Tay never misses",
+        created_at=datetime.utcnow()
+    ))
+    db_session.commit()
+    
+    stats = service.enrich_comments()
+    assert stats["entity_context_builds"] == 1
+    assert stats["entity_context_version"] != first_version
+    assert service._resolve_entity_by_name("Tay").id == taylor.id
+    mentions, _ = extractor.extract("Tay never misses")
+    assert [m.entity_id for m in mentions] == [taylor.id]
+
+
+def test_stale_only_reenriches_changed_versions(db_session):
+    """Test --stale-only picks comments by pipeline version and edited entities."""
+    from et_intel_core.models import CommentEnrichment
+    
+    taylor = MonitoredEntity(
+        name="Taylor Swift",
+        canonical_name="Taylor Swift",
+        entity_type=EntityType.PERSON,
+        aliases=["Taylor"]
+    )
+    travis = MonitoredEntity(
+        name="Travis Kelce",
+        canonical_name="Travis Kelce",
+        entity_type=EntityType.PERSON,
+        aliases=["Travis"]
+    )
+    post = Post(
+        platform=PlatformType.INSTAGRAM,
+        external_id="STALE1",
+        url="https://instagram.com/p/STALE1/",
+        posted_at=datetime.utcnow()
+    )
+    db_session.add_all([taylor, travis, post])
+    db_session.flush()
+    texts = ["Taylor is amazing", "Travis is great", "Nice weather today"]
+    comments = [
+        Comment(post_id=post.id, author_name=f"user_{i}", text=text, created_at=datetime(2024, 1, 1, 12, i))
+        for i, text in enumerate(texts)
+    ]
+    db_session.add_all(comments)
+    db_session.commit()
+    taylor_comment, travis_comment, plain_comment = [c.id for c in comments]
+    
+    service = EnrichmentService(db_session, EntityExtractor([taylor, travis]), RuleBasedSentimentProvider())
+    assert service.count_comments(stale_only=True) == 3
+    assert service.enrich_comments(stale_only=True)["comments_processed"] == 3
+    
+    records = {r.comment_id: r for r in db_session.query(CommentEnrichment).all()}
+    assert set(records) == {taylor_comment, travis_comment, plain_comment}
+    assert {r.pipeline_version for r in records.values()} == {"rule_based-v1"}
+    assert service.count_comments(stale_only=True) == 0
+    assert service.enrich_comments(stale_only=True)["comments_processed"] == 0
+    
+    # Editing one entity's aliases only touches comments that mention it
+    taylor.aliases = ["Taylor", "Tay"]
+    db_session.commit()
+    old_catalog = records[taylor_comment].catalog_version
+    stats = service.enrich_comments(stale_only=True)
+    assert stats["comments_processed"] == 1
+    db_session.expire_all()
+    catalogs = {r.comment_id: r.catalog_version for r in db_session.query(CommentEnrichment).all()}
+    assert catalogs[taylor_comment] == stats["entity_context_version"] != old_catalog
+    assert catalogs[travis_comment] == catalogs[plain_comment] == old_catalog
+    assert service.count_comments(stale_only=True) == 0
+    
+    # A new pipeline version makes everything stale
+    class NewLexiconProvider(RuleBasedSentimentProvider):
+        version = "rule_based-v2"
+    
+    service = EnrichmentService(db_session, EntityExtractor([taylor, travis]), NewLexiconProvider())
+    assert service.count_comments(stale_only=True) == 3
+
+
+def test_stale_only_picks_up_comments_matching_a_new_alias(db_session):
+    """Test that a new alias makes a previously unmatched comment stale."""
+    taylor = MonitoredEntity(
+        name="Taylor Swift",
+        canonical_name="Taylor Swift",
+        entity_type=EntityType.PERSON,
+        aliases=["Taylor"]
+    )
+    post = Post(
+        platform=PlatformType.INSTAGRAM,
+        external_id="STALE2",
+        url="https://instagram.com/p/STALE2/",
+        posted_at=datetime.utcnow()
+    )
+    db_session.add_all([taylor, post])
+    db_session.flush()
+    texts = ["Tswizzle forever", "Nice weather today"]
+    comments = [
+        Comment(post_id=post.id, author_name=f"user_{i}", text=text, created_at=datetime(2024, 1, 1, 12, i))
+        for i, text in enumerate(texts)
+    ]
+    db_session.add_all(comments)
+    db_session.commit()
+    nickname_comment = comments[0].id
+    
+    service = EnrichmentService(db_session, EntityExtractor([taylor]), RuleBasedSentimentProvider())
+    service.enrich_comments(stale_only=True)
+    assert db_session.query(ExtractedSignal).filter(ExtractedSignal.entity_id == taylor.id).count() == 0
+    
+    taylor.aliases = ["Taylor", "Tswizzle"]
+    db_session.commit()
+    assert service.count_comments(stale_only=True) == 1
+    
+    service.extractor = EntityExtractor([taylor])
+    assert service.enrich_comments(stale_only=True)["comments_processed"] == 1
+    signal = db_session.query(ExtractedSignal).filter(ExtractedSignal.entity_id == taylor.id).one()
+    assert signal.comment_id == nickname_comment
+
+
+def test_backfill_entity_matches_only_new_aliases(db_session):
+    """Test backfill_entity attaches and removes signals for one entity only."""
+    taylor = MonitoredEntity(
+        name="Taylor Swift",
+        canonical_name="Taylor Swift",
+        entity_type=EntityType.PERSON,
+        aliases=["Taylor"]
+    )
+    travis = MonitoredEntity(
+        name="Travis Kelce",
+        canonical_name="Travis Kelce",
+        entity_type=EntityType.PERSON
+    )
+    post = Post(
+        platform=PlatformType.INSTAGRAM,
+        external_id="BACKFILL1",
+        url="https://instagram.com/p/BACKFILL1/",
+        posted_at=datetime.utcnow()
+    )
+    db_session.add_all([taylor, travis, post])
+    db_session.flush()
+    texts = ["Taylor is amazing", "Tay Tay forever, love her", "Travis Kelce is great", "Nice weather today"]
+    comments = [
+        Comment(post_id=post.id, author_name=f"user_{i}", text=text, likes=50, created_at=datetime(2024, 1, 1, 12, i))
+        for i, text in enumerate(texts)
+    ]
+    db_session.add_all(comments)
+    db_session.commit()
+    taylor_comment, tay_comment, travis_comment, plain_comment = [c.id for c in comments]
+    
+    service = EnrichmentService(db_session, EntityExtractor([taylor, travis]), RuleBasedSentimentProvider())
+    service.enrich_comments()
+    
+    def entity_signals():
+        db_session.expire_all()
+        return {
+            (s.comment_id, s.entity_id): s
+            for s in db_session.query(ExtractedSignal).filter(ExtractedSignal.entity_id.isnot(None))
+        }
+    
+    before = entity_signals()
+    assert (tay_comment, taylor.id) not in before
+    
+    taylor.aliases = ["Taylor", "Tay Tay"]
+    db_session.commit()
+    stats = service.backfill_entity(taylor.id)
+    
+    assert stats["candidates"] == 2  # the plain and Travis comments never match the search
+    assert stats["matched"] == 2
+    assert stats["needs_reanalysis"] == 0
+    after = entity_signals()
+    assert set(after) == set(before) | {(tay_comment, taylor.id)}
+    general = db_session.query(ExtractedSignal).filter_by(comment_id=tay_comment, entity_id=None).one()
+    backfilled = after[(tay_comment, taylor.id)]
+    assert backfilled.numeric_value == general.numeric_value
+    assert backfilled.weight_score == general.weight_score == 1.5
+    assert backfilled.confidence == pytest.approx(0.9 * general.confidence)
+    assert after[(travis_comment, travis.id)].id == before[(travis_comment, travis.id)].id
+    assert not any(comment_id == plain_comment for comment_id, _ in after)
+    
+    # Dropping the alias removes the signals it produced
+    taylor.aliases = ["Taylor"]
+    db_session.commit()
+    stats = service.backfill_entity(taylor.id)
+    assert stats["signals_removed"] == 1
+    assert set(entity_signals()) == set(before)
+
+
+def test_backfill_entity_queues_model_scored_comments(db_session):
+    """Test backfill_entity queues re-analysis instead of calling the model."""
+    from et_intel_core.models import CommentEnrichment
+    
+    class ModelProvider:
+        model = "gpt-4o-mini"
+        
+        def score(self, text):
+            raise AssertionError("backfill must not score comments")
+        
+        def analyze_comment(self, *args, **kwargs):
+            raise AssertionError("backfill must not analyze comments")
+    
+    taylor = MonitoredEntity(
+        name="Taylor Swift",
+        canonical_name="Taylor Swift",
+        entity_type=EntityType.PERSON,
+        aliases=["Tay Tay"]
+    )
+    post = Post(
+        platform=PlatformType.INSTAGRAM,
+        external_id="BACKFILL2",
+        url="https://instagram.com/p/BACKFILL2/",
+        posted_at=datetime.utcnow()
+    )
+    db_session.add_all([taylor, post])
+    db_session.flush()
+    texts = ["Tay Tay forever", "Taylor Swift is overrated", "Tay Tay again", "She is the best"]
+    comments = [
+        Comment(post_id=post.id, author_name=f"user_{i}", text=text, likes=0, created_at=datetime(2024, 1, 1, 12, i))
+        for i, text in enumerate(texts)
+    ]
+    db_session.add_all(comments)
+    db_session.flush()
+    new_alias, scored, unenriched, model_only = [c.id for c in comments]
+    
+    # What _apply_analysis() writes: entity-targeted sentiment and emotion,
+    # or comment-level emotion when no entity was mentioned; never
+    # comment-level sentiment
+    def model_signal(comment_id, signal_type, value, entity_id=None, score=None):
+        db_session.add(ExtractedSignal(
+            comment_id=comment_id, entity_id=entity_id, signal_type=signal_type, value=value,
+            numeric_value=score, confidence=0.8, weight_score=1.0, source_model="gpt-4o-mini"
+        ))
+    
+    model_signal(new_alias, SignalType.EMOTION, "joy")
+    for comment_id in (scored, model_only):
+        model_signal(comment_id, SignalType.SENTIMENT, "negative", taylor.id, -0.7)
+        model_signal(comment_id, SignalType.EMOTION, "anger", taylor.id)
+    for comment_id in (new_alias, scored, model_only):
+        db_session.add(CommentEnrichment(
+            comment_id=comment_id, pipeline_version="gpt-4o-mini:v", catalog_version="old"
+        ))
+    db_session.commit()
+    
+    service = EnrichmentService(db_session, EntityExtractor([taylor]), ModelProvider())
+    stats = service.backfill_entity(taylor.id)
+    
+    assert stats["matched"] == 3
+    assert stats["signals_created"] == 0
+    assert stats["signals_removed"] == 0
+    assert stats["needs_reanalysis"] == 2  # the new alias match and the unenriched comment
+    db_session.expire_all()
+    assert {row.comment_id for row in db_session.query(CommentEnrichment)} == {scored, model_only}
+    entity_scores = {
+        s.comment_id: s.numeric_value
+        for s in db_session.query(ExtractedSignal).filter_by(
+            entity_id=taylor.id, signal_type=SignalType.SENTIMENT
+        )
+    }
+    # Model scores are kept, including on comments the catalog doesn't match
+    assert entity_scores == {scored: -0.7, model_only: -0.7}
+
+
+def test_signal_buffer_upserts_idempotently(db_session):
+    """Test the bulk signal writer updates existing signals, with and without an entity."""
+    from et_intel_core.monitoring import get_metrics
+    from et_intel_core.services.signal_writer import SignalBuffer
+    
+    taylor = MonitoredEntity(
+        name="Taylor Swift",
+        canonical_name="Taylor Swift",
+        entity_type=EntityType.PERSON
+    )
+    post = Post(
+        platform=PlatformType.INSTAGRAM,
+        external_id="ABC123",
+        url="https://instagram.com/p/ABC123/",
+        posted_at=datetime.utcnow()
+    )
+    db_session.add_all([taylor, post])
+    db_session.flush()
+    comment = Comment(
+        post_id=post.id,
+        author_name="test_user",
+        text="Taylor is great",
+        created_at=datetime.utcnow()
+    )
+    db_session.add(comment)
+    db_session.commit()
+    
+    def write(score):
+        buffer = SignalBuffer(db_session)
+        for entity_id in (None, taylor.id):
+            buffer.add(
+                comment_id=comment.id,
+                entity_id=entity_id,
+                signal_type=SignalType.SENTIMENT,
+                value="positive",
+                numeric_value=score,
+                source_model="test",
+                confidence=0.9
+            )
+        # Same identity again inside the buffer: last one wins
+        buffer.add(
+            comment_id=comment.id,
+            signal_type=SignalType.TOPIC,
+            value="tour",
+            source_model="test"
+        )
+        buffer.add(
+            comment_id=comment.id,
+            signal_type=SignalType.TOPIC,
+            value="tour",
+            source_model="test",
+            confidence=0.7
+        )
+        assert len(buffer) == 3
+        assert buffer.flush() == 3
+        assert len(buffer) == 0
+        db_session.commit()
+    
+    flushes_before = (get_metrics().get_timing_stats("enrichment.signal_flush") or {}).get("count", 0)
+    write(0.5)
+    write(0.8)
+    
+    signals = db_session.query(ExtractedSignal).all()
+    assert len(signals) == 3
+    assert sorted(s.numeric_value for s in signals if s.signal_type == SignalType.SENTIMENT) == [0.8, 0.8]
+    assert [s.confidence for s in signals if s.signal_type == SignalType.TOPIC] == [0.7]
+    assert get_metrics().get_timing_stats("enrichment.signal_flush")["count"] == flushes_before + 2
+
+
+def test_discovered_entities_aggregated_per_chunk(db_session):
+    """Test discovered names are counted in memory and merged once per chunk."""
+    import spacy
+    
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([{"label": "PERSON", "pattern": "Colleen Hoover"}])
+    
+    post = Post(
+        platform=PlatformType.INSTAGRAM,
+        external_id="ABC123",
+        url="https://instagram.com/p/ABC123/",
+        posted_at=datetime.utcnow()
+    )
+    db_session.add(post)
+    db_session.flush()
+    for i in range(25):
+        db_session.add(Comment(
+            post_id=post.id,
+            author_name=f"user_{i}",
+            text=f"Colleen Hoover wrote this {i}",
+            created_at=datetime.utcnow()
+        ))
+    db_session.commit()
+    
+    service = EnrichmentService(db_session, EntityExtractor([], nlp=nlp), RuleBasedSentimentProvider())
+    stats = service.enrich_comments(chunk_size=10)
+    
+    assert stats["entities_discovered"] == 25
+    discovered = db_session.query(DiscoveredEntity).all()
+    assert len(discovered) == 1
+    assert discovered[0].mention_count == 25
+    assert len(discovered[0].sample_mentions) == 10
+    assert all(m.startswith("Colleen Hoover wrote this") for m in discovered[0].sample_mentions)
+
+
+def test_discovered_entity_buffer_increments_atomically(db_session):
+    """Test that two buffers flushing the same name (two workers) both count."""
+    import random
+    from et_intel_core.services.discovery_writer import DiscoveredEntityBuffer, merge_samples
+    
+    first = DiscoveredEntityBuffer(db_session, rng=random.Random(1))
+    second = DiscoveredEntityBuffer(db_session, rng=random.Random(2))
+    for i in range(3):
+        first.add("Kelsea Ballerini", "PERSON", f"first worker {i}")
+    for i in range(4):
+        second.add("Kelsea Ballerini", "PERSON", f"second worker {i}")
+    second.add("Chappell Roan", "PERSON", "new name")
+    
+    assert first.flush() == 1
+    assert second.flush() == 2
+    assert len(second) == 0
+    db_session.commit()
+    
+    rows = {d.name: d for d in db_session.query(DiscoveredEntity).all()}
+    assert rows["Kelsea Ballerini"].mention_count == 7
+    assert len(rows["Kelsea Ballerini"].sample_mentions) == 7
+    assert rows["Chappell Roan"].mention_count == 1
+    assert rows["Chappell Roan"].reviewed is False
+    
+    # Past the reservoir size, samples stay bounded and come from both sides
+    merged = merge_samples(["old"] * 10, 1000, ["new"] * 10, 1000, rng=random.Random(3))
+    assert len(merged) == 10
+    assert set(merged) == {"old", "new"}
+
+
+def test_discovered_entity_buffer_links_mentioning_comments(db_session):
+    """Test flushes link comments to the stored discovered entity, once each."""
+    from et_intel_core.models import DiscoveredEntityMention
+    from et_intel_core.services.discovery_writer import DiscoveredEntityBuffer
+    
+    comments = _unprocessed_comments(db_session, 3)
+    first = DiscoveredEntityBuffer(db_session)
+    second = DiscoveredEntityBuffer(db_session)
+    first.add("Kelsea Ballerini", "PERSON", comments[0].text, comment_id=comments[0].id)
+    first.add("Kelsea Ballerini", "PERSON", comments[0].text, comment_id=comments[0].id)
+    second.add("Kelsea Ballerini", "PERSON", comments[1].text, comment_id=comments[1].id)
+    second.add("Kelsea Ballerini", "PERSON", comments[0].text, comment_id=comments[0].id)
+    second.add("Chappell Roan", "PERSON", "no comment id")
+    first.flush()
+    second.flush()
+    db_session.commit()
+    
+    kelsea = db_session.query(DiscoveredEntity).filter_by(name="Kelsea Ballerini").one()
+    links = db_session.query(DiscoveredEntityMention).all()
+    assert {(link.discovered_entity_id, link.comment_id) for link in links} == {
+        (kelsea.id, comments[0].id),
+        (kelsea.id, comments[1].id),
+    }
+    assert kelsea.mention_count == 4
+
+
 def test_enrichment_like_weighting(db_session):
     """Test that like-weighted scoring works."""
     # Create post and comment with high likes
@@ -257,3 +771,416 @@ def test_enrichment_sentiment_labels(db_session):
     
     assert "positive" in labels or "negative" in labels or "neutral" in labels
 
+
+
+class _FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """
+    Minimal /chat/completions endpoint: 429 for the first N calls, then JSON.
+    
+    Packed prompts get a "results" list covering at most
+    ``server.pack_answers`` of their comments.
+    """
+    
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.calls += 1
+            throttle = server.calls <= server.throttle_first
+        
+        if throttle:
+            payload = {"error": {"message": "Rate limit reached", "type": "requests"}}
+            status = 429
+        else:
+            analysis = {
+                "entity_scores": {"Taylor Swift": 0.8},
+                "entity_confidence": {"Taylor Swift": 0.9},
+                "emotion": "joy",
+                "stance": "support",
+                "topics": [],
+                "other_entities": [],
+                "sarcasm": False,
+                "toxicity": 0.1,
+                "ambiguous_mentions": []
+            }
+            packed = re.search(r"^Comments \(JSON array, all on this post\): (.*)$",
+                               body["messages"][1]["content"], re.MULTILINE)
+            if packed:
+                items = json.loads(packed.group(1))[:server.pack_answers]
+                analysis = {"results": [{"id": item["id"], **analysis} for item in items]}
+            payload = {
+                "id": "chatcmpl-test",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": json.dumps(analysis)},
+                    "finish_reason": "stop"
+                }],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+            }
+            status = 200
+        
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if throttle:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_openai():
+    """Local fake OpenAI endpoint; yields the server (base_url, call count)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOpenAIHandler)
+    server.lock = threading.Lock()
+    server.calls = 0
+    server.throttle_first = 2
+    server.pack_answers = None
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_enrichment_concurrent_against_fake_openai(db_session, fake_openai):
+    """Test concurrent enrichment packs comments, retries 429s and writes every comment's signals."""
+    from et_intel_core.nlp import OpenAISentimentProvider
+    
+    taylor = MonitoredEntity(
+        name="Taylor Swift",
+        canonical_name="Taylor Swift",
+        entity_type=EntityType.PERSON,
+        aliases=["Taylor"]
+    )
+    post = Post(
+        platform=PlatformType.INSTAGRAM,
+        external_id="ABC123",
+        url="https://instagram.com/p/ABC123/",
+        posted_at=datetime.utcnow()
+    )
+    db_session.add_all([taylor, post])
+    db_session.flush()
+    for i in range(12):
+        db_session.add(Comment(
+            post_id=post.id,
+            author_name=f"user_{i}",
+            text=f"Taylor Swift is amazing {i}",
+            created_at=datetime.utcnow(),
+            likes=i
+        ))
+    db_session.commit()
+    
+    provider = OpenAISentimentProvider(api_key="test-key", base_url=fake_openai.base_url)
+    service = EnrichmentService(db_session, EntityExtractor([taylor]), provider)
+    # The pack answers 10 of its 12 comments; the other 2 go one by one
+    fake_openai.pack_answers = 10
+    
+    stats = service.enrich_comments_concurrent(
+        concurrency=4,
+        requests_per_minute=6000,
+        tokens_per_minute=10_000_000
+    )
+    
+    assert stats["comments_processed"] == 12
+    assert stats["api_retries"] == 2
+    assert stats["api_failures"] == 0
+    assert stats["comments_per_second"] > 0
+    assert fake_openai.calls == 5
+    
+    sentiment = db_session.query(ExtractedSignal).filter(
+        ExtractedSignal.entity_id == taylor.id,
+        ExtractedSignal.signal_type == SignalType.SENTIMENT
+    ).all()
+    assert len(sentiment) == 12
+    assert all(s.numeric_value == 0.8 for s in sentiment)
+
+
+def test_token_bucket_paces_requests():
+    """Test that the token bucket waits once the burst capacity is spent."""
+    import asyncio
+    from et_intel_core.nlp.rate_limit import TokenBucket
+    
+    now = [0.0]
+    slept = []
+    
+    async def run():
+        bucket = TokenBucket(60, clock=lambda: now[0])  # 1 token/sec
+        
+        async def fake_sleep(delay):
+            slept.append(delay)
+            now[0] += delay
+        
+        original = asyncio.sleep
+        asyncio.sleep = fake_sleep
+        try:
+            waits = [await bucket.acquire(30) for _ in range(3)]
+        finally:
+            asyncio.sleep = original
+        return waits
+    
+    waits = asyncio.run(run())
+    
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(30.0)
+
+
+def _unprocessed_comments(db_session, count):
+    post = Post(
+        platform=PlatformType.INSTAGRAM,
+        external_id="CLAIMS",
+        url="https://instagram.com/p/CLAIMS/",
+        posted_at=datetime.utcnow()
+    )
+    db_session.add(post)
+    db_session.flush()
+    comments = [
+        Comment(
+            post_id=post.id,
+            author_name=f"user_{i}",
+            text=f"Comment number {i} is great",
+            created_at=datetime(2024, 1, 1, 12, i)
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(comments)
+    db_session.commit()
+    return comments
+
+
+def test_claim_queue_hands_out_disjoint_batches(db_session):
+    """Test that two workers never claim the same comment."""
+    from et_intel_core.services.enrichment_workers import ClaimQueue
+    
+    comments = _unprocessed_comments(db_session, 5)
+    first = ClaimQueue(db_session, "worker-a", claim_ttl_seconds=600)
+    second = ClaimQueue(db_session, "worker-b", claim_ttl_seconds=600)
+    
+    claimed_a = first.claim(3)
+    claimed_b = second.claim(3)
+    
+    assert len(claimed_a) == 3
+    assert len(claimed_b) == 2
+    assert not set(claimed_a) & set(claimed_b)
+    assert set(claimed_a) | set(claimed_b) == {c.id for c in comments}
+    assert first.claim(3) == []
+
+
+def test_claim_queue_reclaims_expired_claims(db_session):
+    """Test that a crashed worker's claims expire and are taken over."""
+    from et_intel_core.models import EnrichmentClaim
+    from et_intel_core.services.enrichment_workers import ClaimQueue
+    
+    _unprocessed_comments(db_session, 2)
+    crashed = ClaimQueue(db_session, "worker-crashed", claim_ttl_seconds=0)
+    survivor = ClaimQueue(db_session, "worker-ok", claim_ttl_seconds=600)
+    
+    stale = crashed.claim(2)
+    assert len(stale) == 2
+    
+    reclaimed = survivor.claim(5)
+    assert sorted(reclaimed) == sorted(stale)
+    owners = {c.worker_id for c in db_session.query(EnrichmentClaim).all()}
+    assert owners == {"worker-ok"}
+    
+    # Completed claims are never handed out again, even after expiry
+    survivor.complete(reclaimed)
+    assert ClaimQueue(db_session, "worker-late", claim_ttl_seconds=0).claim(5) == []
+    assert ClaimQueue.purge_completed(db_session) == 2
+
+
+def test_run_claim_loop_enriches_every_comment(db_session):
+    """Test that a worker loop claims, enriches and completes all comments."""
+    from et_intel_core.models import EnrichmentClaim
+    from et_intel_core.services.enrichment_workers import ClaimQueue, run_claim_loop
+    
+    _unprocessed_comments(db_session, 5)
+    service = EnrichmentService(db_session, EntityExtractor([]), RuleBasedSentimentProvider())
+    queue = ClaimQueue(db_session, "worker-a", claim_ttl_seconds=600)
+    
+    stats = run_claim_loop(service, queue, batch_size=2)
+    
+    assert stats["batches"] == 3
+    assert stats["comments_processed"] == 5
+    processed = db_session.query(ExtractedSignal.comment_id).distinct().count()
+    assert processed == 5
+    claims = db_session.query(EnrichmentClaim).all()
+    assert len(claims) == 5
+    assert all(c.completed_at is not None for c in claims)
+
+
+def test_claim_loop_drops_batch_after_claims_are_taken_over(db_session):
+    """Test that a worker whose claims were taken over commits nothing for them."""
+    from et_intel_core.models import EnrichmentClaim
+    from et_intel_core.services.enrichment_workers import ClaimLost, ClaimQueue
+    
+    _unprocessed_comments(db_session, 2)
+    service = EnrichmentService(db_session, EntityExtractor([]), RuleBasedSentimentProvider())
+    slow = ClaimQueue(db_session, "worker-slow", claim_ttl_seconds=0)
+    claimed = slow.claim(2)
+    assert sorted(ClaimQueue(db_session, "worker-b", claim_ttl_seconds=600).claim(2)) == sorted(claimed)
+    
+    with pytest.raises(ClaimLost):
+        service.enrich_comments(comment_ids=claimed, before_commit=slow.complete_owned)
+    
+    assert db_session.query(ExtractedSignal).count() == 0
+    assert db_session.query(DiscoveredEntity).count() == 0
+    claims = db_session.query(EnrichmentClaim).all()
+    assert {c.worker_id for c in claims} == {"worker-b"}
+    assert all(c.completed_at is None for c in claims)
+
+
+def test_enrichment_packs_comments_by_post_caption(db_session):
+    """Test that each post's comments go through one analyze_comments() call."""
+    analysis = {"entity_scores": {}, "emotion": "joy", "stance": "neutral", "topics": []}
+    
+    class PackingProvider:
+        def __init__(self):
+            self.packs = []
+            self.singles = []
+        
+        def analyze_comments(self, comments, post_caption="", monitored_entities=None):
+            self.packs.append((post_caption, [c["text"] for c in comments]))
+            # Leave one comment unanswered to exercise the per-comment fallback
+            return {c["id"]: analysis for c in comments if c["text"] != "Dropped"}
+        
+        def analyze_comment(self, comment_text, **kwargs):
+            self.singles.append(comment_text)
+            return analysis
+    
+    for caption, texts in (("First post", ["One", "Two"]), ("Second post", ["Three", "Dropped"])):
+        post = Post(
+            platform=PlatformType.INSTAGRAM,
+            external_id=caption,
+            url=f"https://instagram.com/p/{caption}/",
+            caption=caption,
+            posted_at=datetime.utcnow()
+        )
+        db_session.add(post)
+        db_session.flush()
+        for i, text in enumerate(texts):
+            db_session.add(Comment(
+                post_id=post.id, author_name=f"user_{i}", text=text, created_at=datetime(2024, 1, 1, 12, i)
+            ))
+    db_session.commit()
+    
+    provider = PackingProvider()
+    stats = EnrichmentService(db_session, EntityExtractor([]), provider).enrich_comments()
+    
+    assert stats["comments_processed"] == 4
+    assert sorted(provider.packs) == [("First post", ["One", "Two"]), ("Second post", ["Three", "Dropped"])]
+    assert provider.singles == ["Dropped"]
+
+
+def test_review_queue_uses_the_chunk_caption(db_session):
+    """Test that ambiguous mentions are queued with the post's subject line when it has no caption."""
+    from et_intel_core.models import ReviewQueue
+    
+    class AmbiguousProvider:
+        def analyze_comment(self, comment_text, **kwargs):
+            return {
+                "entity_scores": {},
+                "ambiguous_mentions": [
+                    {"name": "Justin", "confidence": 0.4, "possible_entities": ["Justin Bieber", "Justin Baldoni"]}
+                ]
+            }
+    
+    post = Post(
+        platform=PlatformType.INSTAGRAM,
+        external_id="REVIEW1",
+        url="https://instagram.com/p/REVIEW1/",
+        subject_line="Justin Baldoni lawsuit update",
+        posted_at=datetime.utcnow()
+    )
+    db_session.add(post)
+    db_session.flush()
+    db_session.add(Comment(post_id=post.id, author_name="user_a", text="Justin is wrong", created_at=datetime.utcnow()))
+    db_session.commit()
+    
+    stats = EnrichmentService(db_session, EntityExtractor([]), AmbiguousProvider()).enrich_comments()
+    
+    assert stats["queued_for_review"] == 1
+    item = db_session.query(ReviewQueue).one()
+    assert item.entity_mention == "Justin"
+    assert item.post_caption == "Justin Baldoni lawsuit update"
+
+
+def test_cached_analyses_skip_the_rate_limiter(db_session):
+    """Test that concurrent enrichment only acquires limiter tokens for real API calls."""
+    import asyncio
+    
+    cached = {"stance": "cached"}
+    
+    class CachingProvider:
+        def __init__(self):
+            self.packs = []
+        
+        def cached_analysis(self, comment_text, post_caption="", monitored_entities=None):
+            return cached if comment_text.endswith("0 is great") else None
+        
+        async def analyze_packed_async(self, comments, post_caption="", monitored_entities=None):
+            self.packs.append([c["text"] for c in comments])
+            return {c["id"]: {"stance": "fresh"} for c in comments}
+        
+        async def analyze_comment_async(self, **kwargs):
+            raise AssertionError("cached comment reached the API")
+    
+    class RecordingLimiter:
+        def __init__(self):
+            self.acquired = []
+        
+        async def acquire(self, tokens):
+            self.acquired.append(tokens)
+            return 0.0
+    
+    comments = _unprocessed_comments(db_session, 3)
+    provider = CachingProvider()
+    service = EnrichmentService(db_session, EntityExtractor([]), provider)
+    stats = {"rate_limit_wait_seconds": 0.0, "api_retries": 0, "api_failures": 0}
+    
+    limiter = RecordingLimiter()
+    analysis = asyncio.run(service._analyze_with_retry(comments[0], "", None, limiter, 2, stats))
+    assert analysis == cached
+    assert limiter.acquired == []
+    
+    analyses = asyncio.run(service._analyze_pack_with_retry(comments, "", None, limiter, 2, stats))
+    assert analyses[comments[0].id] == cached
+    assert {analyses[c.id]["stance"] for c in comments[1:]} == {"fresh"}
+    assert provider.packs == [[c.text for c in comments[1:]]]
+    assert limiter.acquired == [2]
+
+
+def test_failed_llm_analysis_is_logged_and_counted(db_session, caplog, capsys):
+    """Test that a failed analysis is logged and counted instead of printed."""
+    import asyncio
+    import logging
+    from et_intel_core.nlp.rate_limit import RateLimiter
+    
+    class FailingProvider:
+        async def analyze_comment_async(self, **kwargs):
+            raise ValueError("bad request")
+        
+        def _default_analysis(self):
+            return {"stance": "neutral"}
+    
+    comment = _unprocessed_comments(db_session, 1)[0]
+    service = EnrichmentService(db_session, EntityExtractor([]), FailingProvider())
+    stats = {"rate_limit_wait_seconds": 0.0, "api_retries": 0, "api_failures": 0}
+    
+    with caplog.at_level(logging.WARNING, logger="et_intel_core.services.enrichment"):
+        analysis = asyncio.run(service._analyze_with_retry(
+            comment, "", None, RateLimiter(6000, 1_000_000), max_retries=2, stats=stats
+        ))
+    
+    assert analysis == {"stance": "neutral"}
+    assert stats["api_failures"] == 1
+    assert str(comment.id) in caplog.text and "bad request" in caplog.text
+    assert capsys.readouterr().out == ""
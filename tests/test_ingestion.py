@@ -212,3 +212,209 @@ def test_ingestion_service_updates_likes(db_session):
     finally:
         csv_path.unlink()
 
+
+
+class _ListSource:
+    """In-memory IngestionSource for tests."""
+    
+    def __init__(self, records):
+        self.records = records
+    
+    def iter_records(self):
+        return iter(self.records)
+
+
+def _raw_comments(likes_offset=0):
+    """Two posts, one post-metadata row and a repeated comment."""
+    from et_intel_core.schemas import RawComment
+    
+    rows = [
+        ("ABC123", "", "user_a", "First!", 0, {}),
+        ("ABC123", "Caption A", "user_b", "Love this", 1, {}),
+        ("XYZ789", "Caption X", "user_a", "So good", 2, {}),
+        ("ABC123", None, "__POST_METADATA__", "", 3, {"post_metadata": True}),
+        ("XYZ789", "Caption X", "user_a", "So good", 2, {}),
+    ]
+    return [
+        RawComment(
+            platform="instagram",
+            external_post_id=post_id,
+            post_url=f"https://instagram.com/p/{post_id}/",
+            post_caption=caption,
+            post_subject="Subject",
+            comment_author=author,
+            comment_text=text,
+            comment_timestamp=datetime(2024, 1, 1, 12, hour_offset),
+            like_count=10 + likes_offset,
+            raw=raw
+        )
+        for post_id, caption, author, text, hour_offset, raw in rows
+    ]
+
+
+def test_ingest_bulk_matches_ingest(db_session):
+    """Test that bulk ingestion produces the same stats and rows as ingest()."""
+    service = IngestionService(db_session)
+    
+    stats = service.ingest_bulk(_ListSource(_raw_comments()), chunk_size=2)
+    
+    assert stats == {
+        "posts_created": 2,
+        "posts_updated": 3,
+        "comments_created": 3,
+        "comments_updated": 1,
+    }
+    
+    posts = {p.external_id: p for p in db_session.query(Post).all()}
+    assert len(posts) == 2
+    assert posts["ABC123"].caption == "Caption A"
+    assert posts["ABC123"].posted_at.replace(tzinfo=None) == datetime(2024, 1, 1, 12, 3)
+    assert posts["XYZ789"].caption == "Caption X"
+    assert db_session.query(Comment).count() == 3
+
+
+def test_ingest_bulk_idempotent_updates_likes(db_session):
+    """Test that re-running bulk ingestion updates likes without duplicating."""
+    service = IngestionService(db_session)
+    service.ingest_bulk(_ListSource(_raw_comments()))
+    
+    stats = service.ingest_bulk(_ListSource(_raw_comments(likes_offset=90)))
+    
+    assert stats["posts_created"] == 0
+    assert stats["posts_updated"] == 5
+    assert stats["comments_created"] == 0
+    assert stats["comments_updated"] == 4
+    
+    db_session.expire_all()
+    comments = db_session.query(Comment).all()
+    assert len(comments) == 3
+    assert {c.likes for c in comments} == {100}
+
+
+def test_ingest_matches_rescrape_by_platform_comment_id(db_session):
+    """Test that records carrying a platform comment id dedupe on that id."""
+    from et_intel_core.schemas import RawComment
+    
+    def scrape(text, timestamp, likes):
+        return RawComment(
+            platform="instagram",
+            external_post_id="ABC123",
+            post_url="https://instagram.com/p/ABC123/",
+            comment_author="user_a",
+            comment_text=text,
+            comment_timestamp=timestamp,
+            like_count=likes,
+            external_comment_id="17900000000000001"
+        )
+    
+    service = IngestionService(db_session)
+    service.ingest(_ListSource([scrape("Love this", datetime(2024, 1, 1, 12, 0), 1)]))
+    
+    # Live re-scrape: edited text and a slightly different timestamp
+    stats = service.ingest_bulk(
+        _ListSource([scrape("Love this!!", datetime(2024, 1, 1, 12, 0, 1), 7)])
+    )
+    
+    assert stats["comments_created"] == 0
+    assert stats["comments_updated"] == 1
+    
+    db_session.expire_all()
+    comments = db_session.query(Comment).all()
+    assert len(comments) == 1
+    assert comments[0].external_id == "17900000000000001"
+    assert comments[0].likes == 7
+
+
+def test_apify_raw_format_keeps_comment_pk(tmp_path):
+    """Test that the Apify raw dataset format carries pk through as a string."""
+    csv_path = tmp_path / "comments.csv"
+    csv_path.write_text(
+        "pk,media_id,text,user/username,comment_like_count,created_at\n"
+        "17900000000000001,ABC123,Nice,test_user,3,1704110400\n"
+    )
+    
+    records = list(ApifySource(csv_path).iter_records())
+    
+    assert records[0].external_comment_id == "17900000000000001"
+
+
+@pytest.mark.parametrize("method", ["ingest", "ingest_bulk"])
+def test_ingest_adds_no_rows_when_platform_id_appears(db_session, method):
+    """Test that records seen first without a pk and then with one dedupe."""
+    service = IngestionService(db_session)
+    service.ingest(_ListSource(_raw_comments()))
+    
+    with_pk = _raw_comments(likes_offset=5)
+    for i, record in enumerate(with_pk):
+        record.external_comment_id = f"1790000000000000{i}"
+    stats = getattr(service, method)(_ListSource(with_pk))
+    
+    assert stats["comments_created"] == 0
+    assert stats["comments_updated"] == 4
+    
+    db_session.expire_all()
+    comments = db_session.query(Comment).all()
+    assert len(comments) == 3
+    assert {c.likes for c in comments} == {15}
+    assert all(c.external_id for c in comments)
+
+
+@pytest.mark.parametrize("method", ["ingest", "ingest_bulk"])
+def test_identical_comments_with_distinct_platform_ids(db_session, method):
+    """Test that both paths keep the first platform id when two comments share a content hash."""
+    from et_intel_core.schemas import RawComment
+    
+    def record(external_comment_id, likes):
+        return RawComment(
+            platform="instagram",
+            external_post_id="ABC123",
+            post_url="https://instagram.com/p/ABC123/",
+            comment_author="user_a",
+            comment_text="First!",
+            comment_timestamp=datetime(2024, 1, 1, 12, 0),
+            like_count=likes,
+            external_comment_id=external_comment_id
+        )
+    
+    service = IngestionService(db_session)
+    ingest = getattr(service, method)
+    stats = ingest(_ListSource([record("17900000000000001", 1), record("17900000000000002", 2)]))
+    rerun = ingest(_ListSource([record("17900000000000002", 3)]))
+    
+    assert (stats["comments_created"], stats["comments_updated"]) == (1, 1)
+    assert (rerun["comments_created"], rerun["comments_updated"]) == (0, 1)
+    db_session.expire_all()
+    comments = db_session.query(Comment).all()
+    assert len(comments) == 1
+    assert comments[0].external_id == "17900000000000001"
+    assert comments[0].likes == 3
+
+
+@pytest.mark.parametrize("method", ["ingest", "ingest_bulk"])
+def test_reingest_refreshes_rollup_likes(db_session, method):
+    """Test that likes changed by a re-scrape reach the hourly rollup."""
+    from et_intel_core.analytics.hourly_rollup import refresh_dirty_hours
+    from et_intel_core.models import EntitySentimentHourly, ExtractedSignal, MonitoredEntity
+    from et_intel_core.models.enums import EntityType, SignalType
+    
+    service = IngestionService(db_session)
+    service.ingest_bulk(_ListSource(_raw_comments()))
+    entity = MonitoredEntity(name="Taylor Swift", canonical_name="Taylor Swift", entity_type=EntityType.PERSON)
+    db_session.add(entity)
+    db_session.flush()
+    for comment in db_session.query(Comment).all():
+        db_session.add(ExtractedSignal(
+            comment_id=comment.id, entity_id=entity.id, signal_type=SignalType.SENTIMENT,
+            value="positive", numeric_value=0.5, confidence=0.9, weight_score=1.0,
+            source_model="rule_based"
+        ))
+    db_session.commit()
+    refresh_dirty_hours(db_session)
+    
+    def rollup_likes():
+        db_session.expire_all()
+        return sum(row.likes_sum for row in db_session.query(EntitySentimentHourly))
+    
+    assert rollup_likes() == 30
+    getattr(service, method)(_ListSource(_raw_comments(likes_offset=90)))
+    assert rollup_likes() == 300
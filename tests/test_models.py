@@ -65,6 +65,47 @@ def test_create_comment(db_session):
     assert comment.id is not None
     assert comment.author_name == "test_user"
     assert comment.likes == 42
+    assert len(comment.content_hash) == 64
+
+
+def test_comment_content_hash_rejects_duplicates(db_session):
+    """Test that (post_id, content_hash) is unique."""
+    from sqlalchemy.exc import IntegrityError
+    
+    post = Post(
+        platform=PlatformType.INSTAGRAM,
+        external_id="ABC123",
+        url="https://instagram.com/p/ABC123/",
+        posted_at=datetime.utcnow()
+    )
+    db_session.add(post)
+    db_session.flush()
+    
+    created_at = datetime(2024, 1, 1, 12, 0)
+    for _ in range(2):
+        db_session.add(Comment(
+            post_id=post.id,
+            author_name="test_user",
+            text="Same comment",
+            created_at=created_at
+        ))
+    
+    with pytest.raises(IntegrityError):
+        db_session.commit()
+    db_session.rollback()
+
+
+def test_compute_content_hash_normalizes_timestamp():
+    """Test that the hash covers author/text and the UTC-normalized timestamp."""
+    from datetime import timezone
+    from et_intel_core.models.comment import compute_content_hash
+
+    naive = datetime(2024, 1, 1, 12, 0)
+    aware = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+    assert compute_content_hash("a", "hi", naive) == compute_content_hash("a", "hi", aware)
+    assert compute_content_hash("a", "hi", naive) != compute_content_hash("a", "hi!", naive)
+    assert compute_content_hash("a", "hi", naive) != compute_content_hash("b", "hi", naive)
 
 
 def test_create_monitored_entity(db_session):
@@ -195,3 +195,82 @@ class TestNarrativeGenerator:
         # Should fall back to simple summary
         assert "Entity A" in summary
 
+    
+    def test_generate_many_concurrent_and_coalesced(self):
+        """Identical prompts share one call; calls overlap up to the cap."""
+        import threading
+        import time
+        from et_intel_core.reporting import NarrativeRequest
+        
+        calls = []
+        lock = threading.Lock()
+        
+        def create(**kwargs):
+            with lock:
+                calls.append(kwargs)
+            time.sleep(0.2)
+            response = Mock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = f"Narrative for {kwargs['messages'][1]['content']}"
+            return response
+        
+        generator = NarrativeGenerator(api_key="sk-test-key")
+        generator.client = Mock()
+        generator.client.chat.completions.create.side_effect = create
+        
+        requests = [
+            NarrativeRequest(system="sys", prompt=f"entity {i % 4}", max_tokens=200, fallback=f"fallback {i}")
+            for i in range(6)
+        ]
+        start = time.perf_counter()
+        texts = generator.generate_many(requests, max_concurrency=4, timeout=5, budget_seconds=5)
+        elapsed = time.perf_counter() - start
+        
+        assert texts == [f"Narrative for entity {i % 4}" for i in range(6)]
+        assert len(calls) == 4
+        assert all(call['timeout'] == 5 for call in calls)
+        assert elapsed < 0.6  # 4 x 0.2s calls overlapped
+        assert generator.last_batch_stats["calls"] == 4
+        assert generator.last_batch_stats["fallbacks"] == 0
+    
+    def test_generate_many_falls_back_on_error_and_budget(self):
+        """Failed and over-budget calls get their deterministic text."""
+        import time
+        from et_intel_core.reporting import NarrativeRequest
+        
+        def create(**kwargs):
+            prompt = kwargs['messages'][1]['content']
+            if prompt == "boom":
+                raise Exception("API Error")
+            if prompt == "slow":
+                time.sleep(1.0)
+            response = Mock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = "LLM text"
+            return response
+        
+        generator = NarrativeGenerator(api_key="sk-test-key")
+        generator.client = Mock()
+        generator.client.chat.completions.create.side_effect = create
+        
+        requests = [
+            NarrativeRequest(system="sys", prompt=prompt, max_tokens=200, fallback=f"fallback {prompt}")
+            for prompt in ("ok", "boom", "slow")
+        ]
+        start = time.perf_counter()
+        texts = generator.generate_many(requests, max_concurrency=3, timeout=5, budget_seconds=0.3)
+        elapsed = time.perf_counter() - start
+        
+        assert texts == ["LLM text", "fallback boom", "fallback slow"]
+        assert elapsed < 0.8  # didn't wait for the slow call
+        assert generator.last_batch_stats["fallbacks"] == 2
+    
+    def test_generate_many_disabled_uses_fallbacks(self):
+        """Without an API key every request returns its fallback, no calls."""
+        from et_intel_core.reporting import NarrativeRequest
+        
+        generator = NarrativeGenerator(api_key="your-openai-api-key-here")
+        requests = [NarrativeRequest(system="sys", prompt="p", max_tokens=10, fallback="plain text")]
+        
+        assert generator.generate_many(requests) == ["plain text"]
+        assert generator.last_batch_stats["calls"] == 0
@@ -52,6 +52,134 @@ def test_entity_extractor_catalog_matching(db_session):
     assert len(catalog_mentions) == 2
 
 
+def test_catalog_matcher_word_boundaries():
+    """Test the Aho-Corasick matcher finds overlapping patterns at word boundaries only."""
+    from et_intel_core.nlp import CatalogMatcher
+    
+    matcher = CatalogMatcher(["taylor", "taylor swift", "swift", "t-swift", "@jlo", ""])
+    
+    assert matcher.find("i love taylor swift!") == [0, 1, 2]
+    assert matcher.find("taylor's tour, #taylor") == [0]
+    assert matcher.find("taylormade and swiftly") == []
+    assert matcher.find("go t-swift") == [2, 3]
+    assert matcher.find("hi @jlo") == [4]
+    assert matcher.find("") == []
+
+
+def test_entity_extractor_catalog_word_boundaries(db_session):
+    """Test catalog and caption-context matching ignore names embedded in other words."""
+    ryan = MonitoredEntity(
+        name="Ryan Reynolds",
+        canonical_name="Ryan Reynolds",
+        entity_type=EntityType.PERSON,
+        aliases=["Ryan"]
+    )
+    db_session.add(ryan)
+    db_session.commit()
+    
+    extractor = EntityExtractor([ryan])
+    
+    catalog_mentions, _ = extractor.extract("Bryan was great")
+    assert catalog_mentions == []
+    
+    # "he" only resolves to Ryan when the caption really names him
+    assert extractor._get_context_entities("bryan's new film") == set()
+    catalog_mentions, _ = extractor.extract("he was great", post_caption="Ryan's new film")
+    assert [m.entity_id for m in catalog_mentions] == [ryan.id]
+    assert catalog_mentions[0].mention_text == "pronoun"
+
+
+def test_extract_many_matches_extract(db_session):
+    """Test batch extraction returns extract()'s results and skips parser/lemmatizer."""
+    import spacy
+    from spacy.language import Language
+    
+    @Language.component("et_intel_test_fail_if_run")
+    def fail_if_run(doc):
+        raise AssertionError("disabled component ran")
+    
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([
+        {"label": "PERSON", "pattern": "Blake Lively"},
+        {"label": "ORG", "pattern": "Netflix"},
+        {"label": "PERSON", "pattern": "Ryan Reynolds"},
+    ])
+    nlp.add_pipe("et_intel_test_fail_if_run", name="lemmatizer")
+    
+    ryan = MonitoredEntity(
+        name="Ryan Reynolds",
+        canonical_name="Ryan Reynolds",
+        entity_type=EntityType.PERSON,
+        aliases=["Ryan"]
+    )
+    db_session.add(ryan)
+    db_session.commit()
+    extractor = EntityExtractor([ryan], nlp=nlp)
+    
+    texts = ["Blake Lively and Ryan Reynolds", "he was great", "Netflix again", ""]
+    captions = ["Ryan on set", "Ryan on set", None, "Blake Lively premiere"]
+    
+    batched = extractor.extract_many(texts, captions, batch_size=2)
+    
+    assert batched == [extractor.extract(t, post_caption=c) for t, c in zip(texts, captions)]
+    catalog, discovered = batched[0]
+    assert [m.entity_id for m in catalog] == [ryan.id]
+    assert [d.name for d in discovered] == ["Blake Lively"]
+    assert [m.mention_text for m in batched[1][0]] == ["pronoun"]
+    
+    with pytest.raises(ValueError):
+        extractor.extract_many(texts, captions[:2])
+
+
+def test_caption_context_parsed_once_per_post(db_session):
+    """Test that captions are parsed once and cached results don't change output."""
+    import spacy
+    from spacy.language import Language
+    
+    parsed = []
+    
+    @Language.component("et_intel_test_record_parse")
+    def record_parse(doc):
+        parsed.append(doc.text)
+        return doc
+    
+    def make_extractor(entity):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("entity_ruler").add_patterns([{"label": "PERSON", "pattern": "Blake Lively"}])
+        nlp.add_pipe("et_intel_test_record_parse")
+        return EntityExtractor([entity], nlp=nlp)
+    
+    ryan = MonitoredEntity(
+        name="Ryan Reynolds",
+        canonical_name="Ryan Reynolds",
+        entity_type=EntityType.PERSON,
+        aliases=["Ryan"]
+    )
+    db_session.add(ryan)
+    db_session.commit()
+    
+    caption = "Ryan and Blake Lively at the premiere"
+    texts = ["he looks great", "love her dress", "Ryan!"]
+    
+    extractor = make_extractor(ryan)
+    results = [extractor.extract(text, post_caption=caption) for text in texts]
+    assert parsed.count(caption) == 1
+    assert extractor.caption_cache_stats()["hits"] == 2
+    assert extractor.caption_cache_stats()["misses"] == 1
+    
+    # Same output as a cold extractor per comment
+    for text, result in zip(texts, results):
+        assert make_extractor(ryan).extract(text, post_caption=caption) == result
+    assert [d.name for d in results[0][1]] == ["Blake Lively"]
+    
+    # Batched: one parse per new caption, the first comment counts as the miss
+    parsed.clear()
+    batch_extractor = make_extractor(ryan)
+    assert batch_extractor.extract_many(texts, [caption] * 3) == results
+    assert parsed.count(caption) == 1
+    assert batch_extractor.caption_cache_stats()["hit_rate"] == pytest.approx(2 / 3)
+
+
 def test_entity_extractor_discovery(db_session):
     """Test entity discovery with spaCy."""
     # Empty catalog
@@ -104,6 +232,33 @@ def test_rule_based_sentiment_neutral():
     assert -0.3 <= result.score <= 0.3
 
 
+def test_score_batch_matches_score():
+    """Property test: score_batch() equals score() on random comment-like texts."""
+    import random
+    
+    provider = RuleBasedSentimentProvider()
+    rng = random.Random(1234)
+    # Lexicon entries, overlapping fragments ("h" + "ate"), case variants,
+    # bare emoji codepoints and separator characters
+    pieces = (
+        provider.POSITIVE_TERMS + provider.NEGATIVE_TERMS
+        + provider.POSITIVE_EMOJIS + provider.NEGATIVE_EMOJIS
+        + [term.upper() for term in provider.POSITIVE_TERMS[:5]]
+        + ["h", "cre", "gre", "\u2764", "\ufe0f", "İ", "\x00", "\n", "\x1f",
+           "not", "really", "the", "movie", "lol", "!", "...", "😂", ""]
+    )
+    
+    def random_text():
+        joiner = rng.choice([" ", "", ", "])
+        return joiner.join(rng.choice(pieces) for _ in range(rng.randint(0, 10)))
+    
+    for _ in range(20):
+        texts = [random_text() for _ in range(rng.randint(1, 100))]
+        assert provider.score_batch(texts) == [provider.score(text) for text in texts]
+    
+    assert provider.score_batch([]) == []
+
+
 def test_openai_sentiment_provider():
     """Test OpenAI sentiment provider (if API key available)."""
     try:
@@ -146,6 +301,65 @@ def test_hybrid_sentiment_escalation():
     assert result.score == 0.8
 
 
+def test_hybrid_score_batch_escalates_once_per_text():
+    """Test batch escalation keeps input order, dedupes texts and reports stats."""
+    import threading
+    import time
+    from et_intel_core.nlp.sentiment import SentimentResult
+    
+    class MockCheap:
+        def score(self, text):
+            # "sure" rows are confident; everything else is uncertain
+            if text.startswith("sure"):
+                return SentimentResult(score=0.9, confidence=0.8, source_model="mock_cheap")
+            return SentimentResult(score=0.0, confidence=0.3, source_model="mock_cheap")
+    
+    class MockExpensive:
+        def __init__(self):
+            self.calls = []
+            self.active = 0
+            self.peak = 0
+            self.lock = threading.Lock()
+        
+        def score(self, text):
+            with self.lock:
+                self.calls.append(text)
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(0.02)
+            with self.lock:
+                self.active -= 1
+            return SentimentResult(score=-0.5, confidence=0.9, source_model=f"mock_expensive:{text}")
+        
+        def estimate_score_cost(self, text):
+            return 0.001
+    
+    expensive = MockExpensive()
+    provider = HybridSentimentProvider(cheap=MockCheap(), expensive=expensive, escalation_concurrency=4)
+    texts = ["sure 1", "maybe a", "maybe b", "sure 2", "maybe a", "maybe c", "maybe d"]
+    
+    results = provider.score_batch(texts)
+    
+    assert [r.source_model for r in results] == [
+        "mock_cheap", "mock_expensive:maybe a", "mock_expensive:maybe b", "mock_cheap",
+        "mock_expensive:maybe a", "mock_expensive:maybe c", "mock_expensive:maybe d",
+    ]
+    assert sorted(expensive.calls) == ["maybe a", "maybe b", "maybe c", "maybe d"]
+    assert expensive.peak > 1
+    
+    stats = provider.escalation_stats()
+    assert stats["sentiment_scored"] == 7
+    assert stats["sentiment_escalated"] == 5
+    assert stats["escalation_rate"] == pytest.approx(5 / 7)
+    assert stats["expensive_calls"] == 4
+    assert stats["expensive_calls_saved"] == 3  # two confident rows + one repeat
+    assert stats["cost_saved_usd"] == pytest.approx(0.003)
+    assert stats["expensive_latency_p50"] >= 0.02
+    
+    provider.reset_escalation_stats()
+    assert provider.escalation_stats()["sentiment_scored"] == 0
+
+
 def test_get_sentiment_provider():
     """Test sentiment provider factory."""
     # Rule-based
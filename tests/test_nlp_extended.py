@@ -187,6 +187,203 @@ class TestSentimentProvidersExtended:
             assert -1.0 <= result.score <= 1.0
 
 
+class TestPackedAnalysis:
+    """Tests for OpenAISentimentProvider.analyze_comments() packing."""
+    
+    @staticmethod
+    def _response(results, finish_reason="stop", raw=None):
+        """Fake chat completion carrying a packed (or raw) JSON body."""
+        import json
+        from unittest.mock import MagicMock
+        
+        response = MagicMock()
+        choice = response.choices[0]
+        choice.finish_reason = finish_reason
+        choice.message.content = raw if raw is not None else json.dumps({"results": results})
+        return response
+    
+    @staticmethod
+    def _item(comment_id, score):
+        return {
+            "id": str(comment_id),
+            "entity_scores": {"Taylor Swift": score},
+            "entity_confidence": {"Taylor Swift": 0.9},
+            "emotion": "joy",
+            "stance": "support",
+            "topics": [],
+            "other_entities": [],
+            "sarcasm": False,
+            "toxicity": 0.0,
+            "ambiguous_mentions": []
+        }
+    
+    def _provider(self, responses):
+        from unittest.mock import MagicMock
+        
+        provider = OpenAISentimentProvider(api_key="test-key")
+        provider.client = MagicMock()
+        provider.client.chat.completions.create.side_effect = responses
+        return provider
+    
+    def test_packs_comments_into_one_request(self):
+        """Test that one request covers the batch and results are keyed by id."""
+        provider = self._provider([
+            self._response([self._item(1, 0.5), self._item(2, -0.5), self._item(3, 0.1)])
+        ])
+        comments = [{"id": i, "text": f"Taylor Swift comment {i}", "likes": i} for i in (1, 2, 3)]
+        
+        results = provider.analyze_comments(comments, post_caption="Caption", monitored_entities=["Taylor Swift"])
+        
+        assert provider.client.chat.completions.create.call_count == 1
+        assert set(results) == {1, 2, 3}
+        assert results[2]["entity_scores"] == {"Taylor Swift": -0.5}
+        assert results[1]["emotion"] == "joy"
+        
+        prompt = provider.client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert prompt.count("CRITICAL INSTRUCTIONS") == 1
+    
+    def test_truncated_response_retries_missing_items(self):
+        """Test that items cut off by max_tokens are re-requested."""
+        import json
+        
+        complete = json.dumps({"results": [self._item(1, 0.5), self._item(2, 0.4)]})
+        truncated = complete[:-2] + ', {"id": "3", "entity_scores": {"Taylor Sw'
+        single = json.dumps({k: v for k, v in self._item(3, -0.9).items() if k != "id"})
+        provider = self._provider([
+            self._response(None, finish_reason="length", raw=truncated),
+            self._response(None, raw=single),
+        ])
+        comments = [{"id": i, "text": f"Taylor Swift comment {i}"} for i in (1, 2, 3)]
+        
+        results = provider.analyze_comments(comments, monitored_entities=["Taylor Swift"])
+        
+        assert provider.client.chat.completions.create.call_count == 2
+        assert results[1]["entity_scores"] == {"Taylor Swift": 0.5}
+        assert results[3]["entity_scores"] == {"Taylor Swift": -0.9}
+    
+    def test_dropped_items_are_split_and_retried(self):
+        """Test that items the model silently drops are retried as a smaller pack."""
+        provider = self._provider([
+            self._response([self._item("a", 0.1), self._item("b", 0.2)]),
+            self._response([self._item("c", 0.3), self._item("d", 0.4)]),
+        ])
+        comments = [{"id": key, "text": f"comment {key}"} for key in "abcd"]
+        
+        results = provider.analyze_comments(comments)
+        
+        assert provider.client.chat.completions.create.call_count == 2
+        assert [results[key]["entity_scores"]["Taylor Swift"] for key in "abcd"] == [0.1, 0.2, 0.3, 0.4]
+
+    
+    def test_api_error_is_logged_not_printed(self, caplog, capsys):
+        """Test that a failed packed request is logged and its items split."""
+        import logging
+        
+        provider = self._provider([
+            RuntimeError("boom"),
+            self._response([self._item("a", 0.1)]),
+            self._response([self._item("b", 0.2)]),
+        ])
+        comments = [{"id": key, "text": f"comment {key}"} for key in "ab"]
+        
+        with caplog.at_level(logging.WARNING, logger="et_intel_core.nlp.sentiment"):
+            results = provider.analyze_comments(comments)
+        
+        assert set(results) == {"a", "b"}
+        assert "boom" in caplog.text
+        assert capsys.readouterr().out == ""
+
+class TestLLMResultCache:
+    """Tests for the persistent LLM result cache."""
+    
+    def test_analysis_cache_hit_skips_api(self, tmp_path):
+        """Test that a repeated comment is served from cache, even across instances."""
+        import json
+        from unittest.mock import MagicMock
+        from et_intel_core.nlp.llm_cache import LLMResultCache
+        from et_intel_core.monitoring import get_metrics
+        
+        analysis = TestPackedAnalysis._item(1, 0.7)
+        del analysis["id"]
+        
+        def make_provider(cache):
+            provider = OpenAISentimentProvider(api_key="test-key", cache=cache)
+            provider.client = MagicMock()
+            provider.client.chat.completions.create.return_value = TestPackedAnalysis._response(
+                None, raw=json.dumps(analysis)
+            )
+            return provider
+        
+        path = tmp_path / "cache.sqlite3"
+        hits_before = get_metrics().get_counter("llm_cache.hits")
+        
+        first = make_provider(LLMResultCache(path))
+        result = first.analyze_comment("she ate  ", post_caption="Caption", monitored_entities=["Taylor Swift"])
+        
+        second = make_provider(LLMResultCache(path))
+        cached = second.analyze_comment("she ate", post_caption="Caption", monitored_entities=["Taylor Swift"])
+        
+        assert first.client.chat.completions.create.call_count == 1
+        assert second.client.chat.completions.create.call_count == 0
+        assert cached == result
+        assert get_metrics().get_counter("llm_cache.hits") == hits_before + 1
+        
+        # A different caption is a different key
+        second.analyze_comment("she ate", post_caption="Other post", monitored_entities=["Taylor Swift"])
+        assert second.client.chat.completions.create.call_count == 1
+    
+    def test_lru_eviction_and_purge(self):
+        """Test size-bounded LRU eviction and purge by prompt version."""
+        from et_intel_core.nlp.llm_cache import LLMResultCache
+        
+        cache = LLMResultCache(":memory:", max_entries=2)
+        cache.put("a", {"score": 0.1}, "score", "gpt-4o-mini", "v1")
+        cache.put("b", {"score": 0.2}, "score", "gpt-4o-mini", "v1")
+        assert cache.get("a") == {"score": 0.1}  # "b" is now least recently used
+        cache.put("c", {"score": 0.3}, "score", "gpt-4o-mini", "v2")
+        
+        assert cache.get("b") is None
+        assert cache.stats()["entries"] == 2
+        
+        assert cache.purge("v1") == 1
+        assert cache.get("a") is None
+        assert cache.get("c") == {"score": 0.3}
+        cache.close()
+    
+    def test_shared_file_recounts_and_errors_are_misses(self, tmp_path):
+        """Test WAL mode, eviction across processes' inserts and SQLite errors as misses."""
+        import sqlite3
+        from et_intel_core.nlp.llm_cache import LLMResultCache
+        from et_intel_core.monitoring import get_metrics
+        
+        path = tmp_path / "cache.sqlite3"
+        second = LLMResultCache(path, max_entries=3)
+        for key in "abc":
+            second.put(key, {"score": 0.1}, "score", "gpt-4o-mini", "v1")
+        first = LLMResultCache(path, max_entries=3)
+        assert first._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        
+        # first still counts 3 entries; a stale count would evict on its next insert
+        assert second.purge("v1") == 3
+        first.put("d", {"score": 0.2}, "score", "gpt-4o-mini", "v1")
+        assert second.get("d") == {"score": 0.2}
+        assert second.stats()["entries"] == 1
+        
+        class BrokenConnection:
+            def execute(self, *args):
+                raise sqlite3.OperationalError("database is locked")
+            
+            def rollback(self):
+                pass
+        
+        errors_before = get_metrics().get_counter("llm_cache.errors")
+        first._conn = BrokenConnection()
+        assert first.get("d") is None
+        first.put("e", {"score": 0.3}, "score", "gpt-4o-mini", "v1")
+        assert get_metrics().get_counter("llm_cache.errors") == errors_before + 2
+        second.close()
+
+
 class TestNLPIntegration:
     """Integration tests for NLP components."""
     